@@ -0,0 +1,207 @@
+"""
+Benchmarks for SessionReader, export formatters and API routes at scale.
+
+Generates a deterministic synthetic store (see strands_viewer.synthetic) and
+measures latency and peak memory of list, get, paginate, export and search,
+both directly and through the FastAPI routes.
+
+Usage:
+    python benchmarks/bench_store.py                        # run the "small" profile
+    python benchmarks/bench_store.py --profile large        # bigger store
+    python benchmarks/bench_store.py --check                # fail on regressions vs. baseline
+    python benchmarks/bench_store.py --update-baseline      # record a new baseline
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from fastapi.testclient import TestClient
+
+from strands_viewer.export_formatter import format_session
+from strands_viewer.server import SessionViewerApp
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.synthetic import generate_store
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Store shapes to benchmark; arguments for generate_store()
+PROFILES = {
+    "small": {
+        "sessions": 50,
+        "messages_per_session": 100,
+        "agents_per_session": 1,
+        "tool_result_bytes": 512,
+        "error_rate": 0.05,
+    },
+    "large": {
+        "sessions": 500,
+        "messages_per_session": 1000,
+        "agents_per_session": 2,
+        "tool_result_bytes": 4096,
+        "error_rate": 0.05,
+    },
+}
+
+# Latency and memory must stay within baseline * threshold
+DEFAULT_THRESHOLD = 1.5
+
+# Differences below this many milliseconds are treated as noise
+MIN_REGRESSION_MS = 2.0
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Time fn over several runs, then measure its peak traced memory once."""
+    fn()  # Warm-up (imports, OS file cache)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def build_benchmarks(storage_dir: str) -> Dict[str, Callable[[], Any]]:
+    """Create the benchmark callables for a generated store."""
+    reader = SessionReader(storage_dir)
+    session_ids = sorted(s["session_id"] for s in reader.list_sessions())
+    session_id = session_ids[len(session_ids) // 2]
+    session = reader.get_session(session_id)
+    middle = len(session["messages"]) // 2
+
+    client = TestClient(SessionViewerApp(storage_dir).app)
+
+    def check(response):
+        assert response.status_code == 200, response.text
+        return response
+
+    return {
+        "reader.list_sessions": reader.list_sessions,
+        "reader.get_session": lambda: reader.get_session(session_id),
+        "reader.get_messages_page": lambda: reader.get_messages(session_id, 50, middle),
+        "reader.search_session": lambda: reader.search_messages("timed out", session_id),
+        "reader.search_all": lambda: reader.search_messages("timed out", limit=1000),
+        "export.markdown": lambda: format_session(session, "markdown"),
+        "export.json": lambda: format_session(session, "json"),
+        "export.text": lambda: format_session(session, "text"),
+        "route.list": lambda: check(client.get("/api/sessions")),
+        "route.open": lambda: check(client.get(f"/api/sessions/{session_id}")),
+        "route.paginate": lambda: check(
+            client.get(f"/api/sessions/{session_id}/messages?limit=50&offset={middle}")
+        ),
+        "route.export": lambda: check(client.get(f"/api/sessions/{session_id}/export")),
+        "route.search": lambda: check(client.get("/api/search?q=timed+out")),
+    }
+
+
+def run(profile: str, repeat: int, storage_dir: str = None) -> Dict[str, Dict[str, float]]:
+    """Run all benchmarks for a profile, generating a store if none is given."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        if storage_dir is None:
+            storage_dir = tmpdir
+            start = time.perf_counter()
+            totals = generate_store(storage_dir, seed=0, **PROFILES[profile])
+            print(
+                f"Generated {totals['sessions']} sessions / {totals['messages']} messages "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+
+        results = {}
+        for name, fn in build_benchmarks(storage_dir).items():
+            results[name] = measure(fn, repeat)
+            r = results[name]
+            print(
+                f"{name:28s} {r['median_ms']:10.2f} ms  (min {r['min_ms']:.2f})  "
+                f"{r['peak_kb']:10.1f} KiB"
+            )
+        return results
+
+
+def check_regressions(
+    results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float
+) -> List[str]:
+    """Compare results to a baseline, returning a description of each regression."""
+    regressions = []
+    for name, base in baseline.items():
+        current = results.get(name)
+        if current is None:
+            continue
+
+        limit_ms = max(base["median_ms"] * threshold, base["median_ms"] + MIN_REGRESSION_MS)
+        if current["median_ms"] > limit_ms:
+            regressions.append(
+                f"{name}: {current['median_ms']:.2f} ms > {limit_ms:.2f} ms "
+                f"(baseline {base['median_ms']:.2f} ms)"
+            )
+
+        limit_kb = base["peak_kb"] * threshold + 64
+        if current["peak_kb"] > limit_kb:
+            regressions.append(
+                f"{name}: peak {current['peak_kb']:.1f} KiB > {limit_kb:.1f} KiB "
+                f"(baseline {base['peak_kb']:.1f} KiB)"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark strands-session-viewer at scale")
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="small")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--dir", help="Benchmark an existing store instead of generating one")
+    parser.add_argument("--check", action="store_true", help="Fail if results regress")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = run(args.profile, args.repeat, args.dir)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    baselines = {}
+    if BASELINE_PATH.exists():
+        with open(BASELINE_PATH, "r", encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    if args.update_baseline:
+        baselines[args.profile] = results
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline for '{args.profile}' written to {BASELINE_PATH}")
+
+    if args.check:
+        baseline = baselines.get(args.profile)
+        if not baseline:
+            print(f"\nNo baseline for profile '{args.profile}'")
+            sys.exit(1)
+        regressions = check_regressions(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold}x baseline:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print(f"\n✅ No regressions beyond {args.threshold}x baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,26 @@
 """AI-powered session analysis using Strands agents with custom tools."""
 
-from typing import Dict, Any, List, Optional
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, ContextManager, Dict, List, Optional
+
+from strands_viewer.chunking import (
+    chunk_messages,
+    estimate_message_tokens,
+    estimate_tokens,
+    group_by_budget,
+    render_message,
+    render_session,
+)
+from strands_viewer.heuristics import (
+    collect_tool_errors,
+    count_tool_usage,
+    format_heuristic_report,
+)
+from strands_viewer.metrics import LLM_CALL_DURATION, LLM_TOKENS, record_cache_lookup
+from strands_viewer.stats import percentile
 
 try:
     from strands import Agent, tool
@@ -8,19 +28,101 @@ try:
     STRANDS_AVAILABLE = True
 except ImportError:
     STRANDS_AVAILABLE = False
+    Agent = None  # type: ignore
     tool = None  # type: ignore
 
+# Sessions estimated above this many tokens are summarized with map-reduce.
+DEFAULT_CONTEXT_BUDGET_TOKENS = 100_000
+
+# Token budget for each segment summarized in the map phase.
+DEFAULT_CHUNK_TOKENS = 20_000
+
+# Maximum number of segment summaries requested from the model at once.
+DEFAULT_MAX_PARALLEL = 4
+
+# Token budget for the conversation dump returned by get_conversation_messages.
+CONVERSATION_TOOL_BUDGET_TOKENS = 30_000
+
+# Model classes whose Strands provider translates cachePoint blocks into prompt caching.
+PROMPT_CACHE_MODELS = ("AnthropicModel", "BedrockModel")
+
+# Number of rendered session prefixes kept for cached chat.
+SESSION_PREFIX_CACHE_SIZE = 8
+
+# Number of recent cached-chat turns kept for metrics.
+CHAT_METRICS_HISTORY = 200
+
+# Strands usage keys mapped to the token types exported as metrics.
+USAGE_TOKEN_TYPES = {
+    "inputTokens": "input",
+    "outputTokens": "output",
+    "cacheReadInputTokens": "cache_read",
+    "cacheWriteInputTokens": "cache_write",
+}
+
+# Analysis types accepted by run_analysis().
+ANALYSIS_TYPES = ("summarize", "errors", "improvements")
+
+NO_ERRORS_MESSAGE = "No errors found in this session."
+
+CACHED_CHAT_SYSTEM_PROMPT = """You are an expert at debugging Strands agent sessions.
+The first user message contains a complete rendering of the session being discussed.
+Answer questions about it accurately and concisely, citing message numbers where useful."""
+
+
+class GatedModel:
+    """
+    A Strands model whose every request passes through a gate.
+
+    The agent event loop sends one model request per cycle, and more than
+    one when the agent uses tools, so gating the model's stream (rather than
+    the agent call) applies concurrency and rate limits to each request to
+    the provider. Other attributes are those of the wrapped model.
+    """
+
+    def __init__(self, model: Any, gate: Callable[[], ContextManager[Any]]):
+        """
+        Args:
+            model: Strands model instance
+            gate: Returns a context manager held for each request, such as
+                  AdmissionController.admit or TokenBucket.admit
+        """
+        self.model = model
+        self.gate = gate
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.model, name)
+
+    async def stream(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        # Waiting for the gate blocks this agent's event loop only: synchronous
+        # agent calls run their event loop in a thread of their own
+        with self.gate():
+            async for event in self.model.stream(*args, **kwargs):
+                yield event
+
 
 class SessionAnalyzer:
     """Analyze agent sessions using Strands AI agents with custom analysis tools."""
 
-    def __init__(self, model: Optional[Any] = None):
+    def __init__(
+        self,
+        model: Optional[Any] = None,
+        context_budget_tokens: int = DEFAULT_CONTEXT_BUDGET_TOKENS,
+        chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+        max_parallel: int = DEFAULT_MAX_PARALLEL,
+        call_gate: Optional[Callable[[], ContextManager[Any]]] = None,
+    ):
         """
         Initialize the session analyzer.
 
         Args:
             model: Optional model instance from models.anthropic_model(), models.openai_model(),
                    or models.ollama_model(). Defaults to Claude 4 on Bedrock if not provided.
+            context_budget_tokens: Estimated session size above which summaries use map-reduce
+            chunk_tokens: Token budget for each segment in map-reduce summaries
+            max_parallel: Maximum concurrent model calls during map-reduce summaries
+            call_gate: Optional context manager factory held around every model
+                       request (see GatedModel), for admission control or rate limits
         """
         if not STRANDS_AVAILABLE:
             raise ImportError(
@@ -28,8 +130,17 @@ class SessionAnalyzer:
             )
 
         self.model = model
+        self.context_budget_tokens = context_budget_tokens
+        self.chunk_tokens = chunk_tokens
+        self.max_parallel = max(1, max_parallel)
+        self.call_gate = call_gate
         self._agent = None
         self._current_session = None
+        self._prefix_cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._prefix_hits = 0
+        self._prefix_misses = 0
+        self._chat_metrics: deque = deque(maxlen=CHAT_METRICS_HISTORY)
+        self._lock = threading.Lock()
 
     def _create_session_tools(self, session: Dict[str, Any]) -> List:
         """
@@ -41,8 +152,10 @@ class SessionAnalyzer:
         Returns:
             List of tool functions
         """
-        # Store session in instance for tools to access
+        # Store session in instance for tools to access. The tools close over the
+        # local reference so concurrent analyses of different sessions stay isolated.
         self._current_session = session
+        current_session = session
 
         @tool
         def get_session_summary() -> str:
@@ -51,7 +164,7 @@ class SessionAnalyzer:
             Returns:
                 Summary with session ID, type, message count, creation date
             """
-            s = self._current_session
+            s = current_session
             messages = s.get("messages", [])
 
             # Count different message types
@@ -90,32 +203,7 @@ class SessionAnalyzer:
             Returns:
                 Detailed list of all errors with context, or message if no errors found
             """
-            errors = []
-            messages = self._current_session.get("messages", [])
-
-            for msg_idx, msg_wrapper in enumerate(messages, 1):
-                msg = msg_wrapper.get("message", {})
-                for content_idx, content in enumerate(msg.get("content", [])):
-                    if "toolResult" in content:
-                        tool_result = content["toolResult"]
-                        if tool_result.get("status") == "error":
-                            # Get error details
-                            error_text = ""
-                            for rc in tool_result.get("content", []):
-                                if "text" in rc:
-                                    error_text = rc["text"]
-                                    break
-
-                            # Find the corresponding tool call
-                            tool_use_id = tool_result.get("toolUseId", "unknown")
-
-                            errors.append(
-                                {
-                                    "message_number": msg_idx,
-                                    "tool_use_id": tool_use_id,
-                                    "error_text": error_text[:500],  # Limit length
-                                }
-                            )
+            errors = collect_tool_errors(current_session.get("messages", []))
 
             if not errors:
                 return "No errors found in this session."
@@ -126,7 +214,8 @@ class SessionAnalyzer:
                     f"\nError #{i}:"
                     f"\n- Message: #{error['message_number']}"
                     f"\n- Tool Use ID: {error['tool_use_id']}"
-                    f"\n- Error: {error['error_text']}"
+                    f"\n- Tool: {error['tool_name']}"
+                    f"\n- Error: {error['error_text'][:500]}"  # Limit length
                 )
 
             return "\n".join(result)
@@ -138,15 +227,7 @@ class SessionAnalyzer:
             Returns:
                 Statistics about tool usage in the session
             """
-            tool_stats = {}
-            messages = self._current_session.get("messages", [])
-
-            for msg_wrapper in messages:
-                msg = msg_wrapper.get("message", {})
-                for content in msg.get("content", []):
-                    if "toolUse" in content:
-                        tool_name = content["toolUse"].get("name", "unknown")
-                        tool_stats[tool_name] = tool_stats.get(tool_name, 0) + 1
+            tool_stats = count_tool_usage(current_session.get("messages", []))
 
             if not tool_stats:
                 return "No tools were used in this session."
@@ -164,30 +245,22 @@ class SessionAnalyzer:
             Returns:
                 Complete conversation with user prompts and assistant responses
             """
-            messages = self._current_session.get("messages", [])
+            messages = current_session.get("messages", [])
             result = ["Complete Conversation:\n"]
+            used = 0
 
             for msg_idx, msg_wrapper in enumerate(messages, 1):
-                msg = msg_wrapper.get("message", {})
-                role = msg.get("role", "unknown")
-                result.append(f"\nMessage #{msg_idx} ({role.upper()}):")
-
-                for content in msg.get("content", []):
-                    if "text" in content:
-                        text = content["text"]
-                        # Limit very long texts
-                        if len(text) > 1000:
-                            text = text[:1000] + "... (truncated)"
-                        result.append(f"  {text}")
-
-                    if "toolUse" in content:
-                        tool_use = content["toolUse"]
-                        result.append(f"  [Tool Call: {tool_use.get('name', 'unknown')}]")
-
-                    if "toolResult" in content:
-                        tool_result = content["toolResult"]
-                        status = tool_result.get("status", "unknown")
-                        result.append(f"  [Tool Result: {status}]")
+                # Limit very long texts
+                text = render_message(msg_wrapper, msg_idx, max_text_chars=1000)
+                used += estimate_tokens(text)
+                if used > CONVERSATION_TOOL_BUDGET_TOKENS:
+                    remaining = len(messages) - msg_idx + 1
+                    result.append(
+                        f"\n... ({remaining} more message(s) omitted to fit the context window; "
+                        "use search_session_content to find specific content)"
+                    )
+                    break
+                result.append(f"\n{text}")
 
             return "\n".join(result)
 
@@ -203,7 +276,7 @@ class SessionAnalyzer:
             """
             query_lower = query.lower()
             matches = []
-            messages = self._current_session.get("messages", [])
+            messages = current_session.get("messages", [])
 
             for msg_idx, msg_wrapper in enumerate(messages, 1):
                 msg = msg_wrapper.get("message", {})
@@ -254,23 +327,61 @@ class SessionAnalyzer:
         """Get or create the analysis agent with session-specific tools."""
         # Create tools for this session
         tools = self._create_session_tools(session)
+        return self._new_agent(tools=tools)
 
-        # Create agent with tools
+    def _new_agent(self, **kwargs: Any) -> "Agent":
+        """Create an agent with the configured model, its requests gated by call_gate if set."""
         if self.model:
-            return Agent(model=self.model, tools=tools)
-        else:
-            return Agent(tools=tools)  # Uses default Claude 4 on Bedrock
+            kwargs["model"] = self.model
+        agent = Agent(**kwargs)  # Without a model, uses default Claude 4 on Bedrock
+        if self.call_gate is not None:
+            agent.model = GatedModel(agent.model, self.call_gate)
+        return agent
+
+    def _complete(self, prompt: str, operation: str) -> str:
+        """Run a single tool-less model call and return the response text."""
+        agent = self._new_agent(tools=[], callback_handler=None)
+        return str(self._invoke(agent, prompt, operation))
+
+    @staticmethod
+    def _invoke(agent: Any, prompt: str, operation: str) -> Any:
+        """Call an agent, recording the call duration and token usage metrics."""
+        start = time.perf_counter()
+        try:
+            return_value = agent(prompt)
+        finally:
+            LLM_CALL_DURATION.observe(time.perf_counter() - start, operation=operation)
+
+        usage = _usage(return_value)
+        for key, token_type in USAGE_TOKEN_TYPES.items():
+            tokens = int(usage.get(key, 0) or 0)
+            if tokens:
+                LLM_TOKENS.inc(tokens, type=token_type)
+        return return_value
+
+    def estimate_session_tokens(self, session: Dict[str, Any]) -> int:
+        """Estimate the token cost of the full conversation of a session."""
+        return sum(
+            estimate_message_tokens(msg, number)
+            for number, msg in enumerate(session.get("messages", []), 1)
+        )
 
     def summarize_session(self, session: Dict[str, Any]) -> str:
         """
         Generate an AI summary of the session.
 
+        Sessions whose estimated size exceeds the context budget are summarized
+        with summarize_session_chunked() instead of a single agent run.
+
         Args:
             session: Session data dictionary
 
         Returns:
             Summary text
         """
+        if self.estimate_session_tokens(session) > self.context_budget_tokens:
+            return self.summarize_session_chunked(session)
+
         agent = self._get_agent(session)
 
         prompt = """Analyze this Strands agent session and provide a concise summary.
@@ -283,9 +394,85 @@ Use the available tools to gather information about the session, then provide:
 
 Keep the summary clear and actionable."""
 
-        result = agent(prompt)
+        result = self._invoke(agent, prompt, "summarize")
         return str(result)
 
+    def summarize_session_chunked(self, session: Dict[str, Any]) -> str:
+        """
+        Summarize a session with map-reduce over token-budgeted segments.
+
+        The conversation is split into segments of at most chunk_tokens, each
+        segment is summarized concurrently (bounded by max_parallel), and the
+        partial summaries are reduced hierarchically until a single summary
+        remains.
+
+        Args:
+            session: Session data dictionary
+
+        Returns:
+            Summary text
+        """
+        chunks = chunk_messages(session.get("messages", []), self.chunk_tokens)
+        if not chunks:
+            return "This session has no messages to summarize."
+
+        header = (
+            f"Session {session.get('session_id', 'Unknown')} "
+            f"({session.get('session_type', 'Unknown')}), "
+            f"{len(session.get('messages', []))} messages"
+        )
+
+        def summarize_chunk(chunk) -> str:
+            prompt = f"""You are summarizing one segment of a long Strands agent session.
+{header}. This segment covers messages #{chunk.first_message}-#{chunk.last_message}.
+
+Summarize what happened in this segment: the user's requests, what the agent did,
+which tools it called and with what outcome, and any errors or failures.
+Refer to message numbers where useful. Be concise.
+
+<segment>
+{chunk.text}
+</segment>"""
+            summary = self._complete(prompt, "summarize_chunk")
+            return f"Messages #{chunk.first_message}-#{chunk.last_message}:\n{summary}"
+
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            summaries = list(executor.map(summarize_chunk, chunks))
+
+            # Reduce partial summaries level by level until one batch remains
+            while True:
+                batches = group_by_budget(summaries, self.chunk_tokens)
+                if len(batches) == 1:
+                    break
+                if len(batches) == len(summaries):
+                    # Every summary fills the budget alone; merge pairwise to make progress
+                    batches = [summaries[i : i + 2] for i in range(0, len(summaries), 2)]
+
+                def reduce_batch(batch: List[str]) -> str:
+                    joined = "\n\n".join(batch)
+                    prompt = f"""Combine these consecutive partial summaries of a Strands agent
+session ({header}) into one summary. Keep message references, tool names and errors.
+
+{joined}"""
+                    return self._complete(prompt, "summarize_reduce")
+
+                summaries = list(executor.map(reduce_batch, batches))
+
+        joined = "\n\n".join(summaries)
+        prompt = f"""These are partial summaries of a Strands agent session ({header}),
+in conversation order:
+
+{joined}
+
+Using them, provide a concise summary of the whole session:
+1. Brief overview of what the agent did
+2. Key tools used and their purposes
+3. Any errors or failures that occurred
+4. Overall assessment of the session
+
+Keep the summary clear and actionable."""
+        return self._complete(prompt, "summarize")
+
     def analyze_errors(self, session: Dict[str, Any]) -> Optional[str]:
         """
         Analyze errors in the session and suggest fixes.
@@ -302,7 +489,7 @@ Keep the summary clear and actionable."""
         prompt_check = (
             "Use extract_session_errors to check if there are any errors in this session."
         )
-        check_result = agent(prompt_check)
+        check_result = self._invoke(agent, prompt_check, "errors_check")
 
         if "No errors found" in str(check_result):
             return None
@@ -317,7 +504,7 @@ Use the available tools to gather information about the errors, then provide:
 
 Be specific and actionable in your recommendations."""
 
-        result = agent(prompt)
+        result = self._invoke(agent, prompt, "errors")
         return str(result)
 
     def answer_question(
@@ -357,7 +544,181 @@ Use the available tools to analyze the session and answer the user's question ac
 
 Use the available tools to analyze the session and answer the user's question accurately."""
 
-        result = agent(prompt)
+        result = self._invoke(agent, prompt, "chat")
+        return str(result)
+
+    def _supports_prompt_cache(self) -> bool:
+        """Check if the configured model provider supports cachePoint blocks."""
+        if self.model is None:
+            return True  # Default Bedrock model
+        return type(self.model).__name__ in PROMPT_CACHE_MODELS
+
+    def _session_prefix(self, session: Dict[str, Any]) -> str:
+        """Get the deterministic session rendering, reusing it across turns."""
+        messages = session.get("messages", [])
+        key = (session.get("session_id"), session.get("updated_at"), len(messages))
+        with self._lock:
+            prefix = self._prefix_cache.get(key)
+            if prefix is not None:
+                self._prefix_cache.move_to_end(key)
+                self._prefix_hits += 1
+                record_cache_lookup("session_prefix", hit=True)
+                return prefix
+            self._prefix_misses += 1
+        record_cache_lookup("session_prefix", hit=False)
+
+        prefix = render_session(session)
+        with self._lock:
+            self._prefix_cache[key] = prefix
+            while len(self._prefix_cache) > SESSION_PREFIX_CACHE_SIZE:
+                self._prefix_cache.popitem(last=False)
+        return prefix
+
+    def can_use_cached_chat(self, session: Dict[str, Any]) -> bool:
+        """Check if the rendered session fits the context budget for cached chat."""
+        return estimate_tokens(self._session_prefix(session)) <= self.context_budget_tokens
+
+    def answer_question_cached(
+        self,
+        session: Dict[str, Any],
+        question: str,
+        chat_history: Optional[List[Dict[str, str]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Answer a question with the session placed in a cacheable prompt prefix.
+
+        Instead of letting the agent rediscover the session through tool calls,
+        the rendered session is sent as the first message followed by a
+        cachePoint. With providers that support prompt caching (Anthropic,
+        Bedrock), follow-up questions read the prefix from the cache.
+
+        Args:
+            session: Session data dictionary
+            question: User's question
+            chat_history: Optional previous conversation history
+
+        Returns:
+            Dictionary with the answer and the turn's metrics
+        """
+        prefix = self._session_prefix(session)
+        prefix_content: List[Dict[str, Any]] = [
+            {"text": f"Here is the Strands agent session to analyze:\n\n{prefix}"}
+        ]
+        if self._supports_prompt_cache():
+            prefix_content.append({"cachePoint": {"type": "default"}})
+
+        messages = [
+            {"role": "user", "content": prefix_content},
+            {
+                "role": "assistant",
+                "content": [{"text": "I have read the session. What would you like to know?"}],
+            },
+        ]
+
+        # Previous exchanges go after the cache point so the prefix stays identical
+        prompt = f"User Question: {question}"
+        if chat_history:
+            conversation_context = "Previous conversation:\n"
+            for entry in chat_history[-3:]:  # Last 3 exchanges for context
+                role = entry.get("role", "user")
+                content = entry.get("content", "")
+                conversation_context += f"{role}: {content}\n"
+            prompt = f"{conversation_context}\n{prompt}"
+
+        agent_kwargs: Dict[str, Any] = {
+            "tools": [],
+            "messages": messages,
+            "system_prompt": CACHED_CHAT_SYSTEM_PROMPT,
+            "callback_handler": None,
+        }
+        agent = self._new_agent(**agent_kwargs)
+
+        start = time.perf_counter()
+        result = self._invoke(agent, prompt, "chat_cached")
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        metrics = self._record_chat_metrics(result, latency_ms)
+        return {"answer": str(result), "metrics": metrics}
+
+    def _record_chat_metrics(self, result: Any, latency_ms: float) -> Dict[str, Any]:
+        """Extract token usage from an agent result and record it for the turn."""
+        usage = _usage(result)
+
+        cache_read = int(usage.get("cacheReadInputTokens", 0) or 0)
+        cache_write = int(usage.get("cacheWriteInputTokens", 0) or 0)
+        uncached = int(usage.get("inputTokens", 0) or 0)
+        total_input = cache_read + cache_write + uncached
+
+        metrics = {
+            "latency_ms": round(latency_ms, 1),
+            "input_tokens": uncached,
+            "cache_read_input_tokens": cache_read,
+            "cache_write_input_tokens": cache_write,
+            "output_tokens": int(usage.get("outputTokens", 0) or 0),
+            "cache_hit_ratio": round(cache_read / total_input, 3) if total_input else 0.0,
+        }
+        with self._lock:
+            self._chat_metrics.append(metrics)
+        return metrics
+
+    def chat_metrics_summary(self) -> Dict[str, Any]:
+        """
+        Summarize token usage and latency of recent cached-chat turns.
+
+        Returns:
+            Totals for cache-read, cache-write and uncached input tokens, cache
+            hit ratio, latency statistics and session prefix cache counters
+        """
+        with self._lock:
+            turns = list(self._chat_metrics)
+            prefix_hits, prefix_misses = self._prefix_hits, self._prefix_misses
+
+        cache_read = sum(t["cache_read_input_tokens"] for t in turns)
+        cache_write = sum(t["cache_write_input_tokens"] for t in turns)
+        uncached = sum(t["input_tokens"] for t in turns)
+        total_input = cache_read + cache_write + uncached
+        latencies = sorted(t["latency_ms"] for t in turns)
+
+        return {
+            "turns": len(turns),
+            "cache_read_input_tokens": cache_read,
+            "cache_write_input_tokens": cache_write,
+            "uncached_input_tokens": uncached,
+            "output_tokens": sum(t["output_tokens"] for t in turns),
+            "cache_hit_ratio": round(cache_read / total_input, 3) if total_input else 0.0,
+            "latency_ms": {
+                "last": turns[-1]["latency_ms"] if turns else None,
+                "mean": round(sum(latencies) / len(latencies), 1) if latencies else None,
+                "p50": percentile(latencies, 50),
+                "max": latencies[-1] if latencies else None,
+            },
+            "prefix_cache": {"hits": prefix_hits, "misses": prefix_misses},
+        }
+
+    def enrich_heuristics(self, session: Dict[str, Any], report: Dict[str, Any]) -> str:
+        """
+        Explain a heuristic report with the model.
+
+        Args:
+            session: Session data dictionary
+            report: Report from heuristics.analyze_session_heuristics()
+
+        Returns:
+            Analysis text building on the rule-based findings
+        """
+        agent = self._get_agent(session)
+
+        prompt = f"""A rule-based analyzer produced these findings for a Strands agent session:
+
+{format_heuristic_report(report)}
+Use the available tools to look at the relevant messages, then provide:
+1. Likely root causes of the error clusters and retry loops
+2. Whether the long gaps point to slow tools, rate limits or user inactivity
+3. Specific suggestions for fixing the failing tools
+
+Be concise and do not repeat the statistics above."""
+
+        result = self._invoke(agent, prompt, "enrich_heuristics")
         return str(result)
 
     def suggest_improvements(self, session: Dict[str, Any]) -> str:
@@ -382,10 +743,43 @@ Use the available tools to understand the session, then provide:
 
 Focus on actionable, specific recommendations."""
 
-        result = agent(prompt)
+        result = self._invoke(agent, prompt, "improvements")
         return str(result)
 
     @staticmethod
     def is_available() -> bool:
         """Check if AI analysis is available."""
         return STRANDS_AVAILABLE
+
+
+def _usage(result: Any) -> Dict[str, Any]:
+    """Get the accumulated token usage of an agent result, if it reports one."""
+    result_metrics = getattr(result, "metrics", None)
+    if result_metrics is None:
+        return {}
+    return getattr(result_metrics, "accumulated_usage", None) or {}
+
+
+def run_analysis(analyzer: SessionAnalyzer, session: Dict[str, Any], analysis_type: str) -> str:
+    """
+    Run one of the standard analyses on a session.
+
+    Args:
+        analyzer: SessionAnalyzer instance
+        session: Session data dictionary
+        analysis_type: One of ANALYSIS_TYPES
+
+    Returns:
+        Analysis text
+
+    Raises:
+        ValueError: If analysis_type is not supported
+    """
+    if analysis_type == "summarize":
+        return analyzer.summarize_session(session)
+    if analysis_type == "errors":
+        result = analyzer.analyze_errors(session)
+        return NO_ERRORS_MESSAGE if result is None else result
+    if analysis_type == "improvements":
+        return analyzer.suggest_improvements(session)
+    raise ValueError(f"Unknown analysis type: {analysis_type}")
@@ -0,0 +1,106 @@
+"""
+On-disk store for precomputed session analyses.
+
+Analyses are keyed by session ID and analysis type, and tagged with the session
+fingerprint they were computed for, so a stored analysis is only served while
+the session is unchanged.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Default location of the store, relative to the sessions directory.
+DEFAULT_STORE_SUBDIR = Path(".strands-viewer") / "analyses"
+
+
+class AnalysisStore:
+    """Stores analysis results as JSON files: <store_dir>/<session_id>/<analysis_type>.json."""
+
+    def __init__(self, store_dir: str):
+        self.store_dir = Path(store_dir)
+
+    @classmethod
+    def for_storage_dir(cls, storage_dir: str) -> "AnalysisStore":
+        """Create a store in the default location for a sessions directory."""
+        return cls(str(Path(storage_dir) / DEFAULT_STORE_SUBDIR))
+
+    def _path(self, session_id: str, analysis_type: str) -> Path:
+        for part in (session_id, analysis_type):
+            if not part or part in (".", "..") or "/" in part or "\\" in part:
+                raise ValueError(f"Invalid store key: {part!r}")
+        return self.store_dir / session_id / f"{analysis_type}.json"
+
+    def get(
+        self, session_id: str, analysis_type: str, fingerprint: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get a stored analysis.
+
+        Args:
+            session_id: Session ID
+            analysis_type: Analysis type (summarize, errors, improvements)
+            fingerprint: If given, only return the analysis if it was computed
+                         for this session fingerprint
+
+        Returns:
+            Stored record, or None if missing or stale
+        """
+        path = self._path(session_id, analysis_type)
+        if not path.exists():
+            return None
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading stored analysis {path}: {e}")
+            return None
+
+        if fingerprint is not None and record.get("fingerprint") != fingerprint:
+            return None
+        return record
+
+    def put(
+        self,
+        session_id: str,
+        analysis_type: str,
+        fingerprint: Optional[str],
+        analysis: str,
+        model: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Store an analysis result, replacing any previous one atomically."""
+        path = self._path(session_id, analysis_type)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        record = {
+            "session_id": session_id,
+            "analysis_type": analysis_type,
+            "fingerprint": fingerprint,
+            "analysis": analysis,
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        return record
+
+    def list_analyses(
+        self, session_id: str, fingerprint: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """List stored analyses for a session, optionally only those still current."""
+        session_path = self._path(session_id, "index").parent
+        if not session_path.is_dir():
+            return []
+
+        records = []
+        for path in sorted(session_path.glob("*.json")):
+            record = self.get(session_id, path.stem, fingerprint)
+            if record is not None:
+                records.append(record)
+        return records
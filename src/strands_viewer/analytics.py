@@ -0,0 +1,723 @@
+"""
+Columnar per-message metadata for cross-session analytics.
+
+Answers questions like "error rate per tool per day", "p95 messages per
+session by session type" or "p95 latency per tool" without loading sessions.
+One row per message is kept in typed columns (session, agent, role,
+timestamp, tool, result status, stored size), and one row per tool call
+(session, agent, tool, timestamp, latency, result status), persisted under
+<sessions dir>/.strands-viewer/analytics/ as one binary file per column plus
+an index of sessions and strings.
+
+The store is updated incrementally: only sessions whose fingerprint changed
+are read again; the rows of unchanged sessions are copied over. Group-bys
+run on NumPy when it is installed (the analytics extra) and fall back to a
+pure-Python loop otherwise; both give the same results.
+"""
+
+import functools
+import json
+import math
+import os
+import sys
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from strands_viewer.stats import percentile
+from strands_viewer.timeline import pair_tool_calls, parse_timestamp
+
+# Default location of the store, relative to the sessions directory.
+DEFAULT_ANALYTICS_SUBDIR = Path(".strands-viewer") / "analytics"
+
+# Bumped when the column layout changes
+ANALYTICS_VERSION = 2
+
+# Column name -> array typecode
+COLUMNS = {
+    "session": "i",  # index into the sessions table
+    "agent": "i",  # string code
+    "role": "i",  # string code
+    "timestamp": "d",  # seconds since the epoch, NaN if unknown
+    "tool": "i",  # string code, -1 without a tool call or result
+    "status": "b",  # STATUS_*
+    "size": "q",  # stored bytes
+}
+
+# Tool call column name -> array typecode
+CALL_COLUMNS = {
+    "session": "i",
+    "agent": "i",
+    "tool": "i",
+    "timestamp": "d",  # created_at of the call
+    "latency": "d",  # milliseconds until the result, NaN without a result
+    "status": "b",  # STATUS_*
+}
+
+# Tool result status of a message: none, all results succeeded, any result failed
+STATUS_NONE = 0
+STATUS_SUCCESS = 1
+STATUS_ERROR = 2
+STATUS_LABELS = ("none", "success", "error")
+
+# Message-level group-by keys
+MESSAGE_KEYS = ("session", "session_type", "agent", "role", "tool", "status", "day")
+
+# Tool call group-by keys
+CALL_KEYS = ("session", "session_type", "agent", "tool", "status", "day")
+
+# Session-level group-by and filter keys (for messages-per-session percentiles)
+SESSION_KEYS = ("session_type", "day")
+
+# Group-by keys of each level when none are given
+DEFAULT_GROUP_BY = {"message": ("tool",), "call": ("tool",), "session": ("session_type",)}
+
+SECONDS_PER_DAY = 86400
+
+
+@functools.lru_cache(maxsize=None)
+def _import_numpy() -> Any:
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _epoch_seconds(timestamp: Optional[str]) -> float:
+    parsed = parse_timestamp(timestamp)
+    if parsed is None:
+        return math.nan
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _day_label(day: int) -> Optional[str]:
+    if day < 0:
+        return None
+    return datetime.fromtimestamp(day * SECONDS_PER_DAY, tz=timezone.utc).date().isoformat()
+
+
+def message_metadata(
+    message: Dict[str, Any], tool_names: Dict[str, str]
+) -> Tuple[str, float, Optional[str], int]:
+    """
+    Extract (role, timestamp, tool name, status) from a message.
+
+    The tool is that of the first tool call in the message, or for tool
+    results the tool of the call they answer (looked up by toolUseId in
+    tool_names, which tool calls are added to as messages are seen).
+    """
+    msg = message.get("message") or {}
+    tool: Optional[str] = None
+    status = STATUS_NONE
+    for content in msg.get("content") or []:
+        if not isinstance(content, dict):
+            continue
+        if "toolUse" in content:
+            tool_use = content["toolUse"]
+            name = tool_use.get("name") or "unknown"
+            tool_names[tool_use.get("toolUseId", "")] = name
+            tool = tool or name
+        if "toolResult" in content:
+            tool_result = content["toolResult"]
+            tool = tool or tool_names.get(tool_result.get("toolUseId", ""), "unknown")
+            if tool_result.get("status") == "error":
+                status = STATUS_ERROR
+            elif status == STATUS_NONE:
+                status = STATUS_SUCCESS
+    return msg.get("role") or "unknown", _epoch_seconds(message.get("created_at")), tool, status
+
+
+def _call_status(call: Dict[str, Any]) -> int:
+    if call["result_message"] is None:
+        return STATUS_NONE
+    return STATUS_ERROR if call["status"] == "error" else STATUS_SUCCESS
+
+
+def _empty(layout: Dict[str, str]) -> Dict[str, array]:
+    return {name: array(code) for name, code in layout.items()}
+
+
+def _copy_rows(
+    target: Dict[str, array], source: Dict[str, array], session: int, start: int, count: int
+) -> None:
+    """Append count rows of source from start, renumbering their session."""
+    for name, column in source.items():
+        if name != "session":
+            target[name].extend(column[start : start + count])
+    target["session"].extend(array("i", [session]) * count)
+
+
+class MessageStore:
+    """Per-message and per-tool-call metadata columns with vectorized group-bys."""
+
+    def __init__(self, store_dir: str):
+        self.store_dir = Path(store_dir)
+        self.columns: Dict[str, array] = _empty(COLUMNS)
+        self.calls: Dict[str, array] = _empty(CALL_COLUMNS)
+        # session_id, session_type, created_at, fingerprint, start row, row count,
+        # call start row, call row count
+        self.sessions: List[Dict[str, Any]] = []
+        self.strings: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._load()
+
+    @classmethod
+    def for_storage_dir(cls, storage_dir: str) -> "MessageStore":
+        """Create a store in the default location for a sessions directory."""
+        return cls(str(Path(storage_dir) / DEFAULT_ANALYTICS_SUBDIR))
+
+    @property
+    def rows(self) -> int:
+        return len(self.columns["session"])
+
+    @property
+    def call_rows(self) -> int:
+        return len(self.calls["session"])
+
+    @property
+    def engine(self) -> str:
+        """Group-by implementation in use: numpy or python."""
+        return "numpy" if _import_numpy() is not None else "python"
+
+    def _code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    # Persistence
+
+    def _tables(self) -> Dict[str, Dict[str, array]]:
+        # File name prefix -> columns
+        return {"": self.columns, "calls_": self.calls}
+
+    def _load(self) -> None:
+        try:
+            with open(self.store_dir / "index.json", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") != ANALYTICS_VERSION or index.get("byteorder") != sys.byteorder:
+                return
+            tables = {}
+            for prefix, layout in (("", COLUMNS), ("calls_", CALL_COLUMNS)):
+                rows = index["rows"][prefix]
+                columns = {}
+                for name, code in layout.items():
+                    column = array(code)
+                    if column.itemsize != index["itemsizes"][prefix + name]:
+                        return
+                    with open(self.store_dir / f"{prefix}{name}.bin", "rb") as f:
+                        column.fromfile(f, rows)
+                        if f.read(1):
+                            raise ValueError(f"{prefix}{name}.bin does not match the index")
+                    columns[name] = column
+                tables[prefix] = columns
+        except (OSError, ValueError, KeyError, EOFError) as e:
+            if (self.store_dir / "index.json").exists():
+                print(f"⚠️  Rebuilding analytics store {self.store_dir}: {e}")
+            return
+        self.columns, self.calls = tables[""], tables["calls_"]
+        self.sessions = index["sessions"]
+        self.strings = index["strings"]
+        self._codes = {value: code for code, value in enumerate(self.strings)}
+
+    def save(self) -> None:
+        """Write the columns, then the index that refers to them."""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        suffix = f".{os.getpid()}.tmp"
+        itemsizes = {}
+        for prefix, columns in self._tables().items():
+            for name, column in columns.items():
+                path = self.store_dir / f"{prefix}{name}.bin"
+                with open(path.with_name(path.name + suffix), "wb") as f:
+                    column.tofile(f)
+                os.replace(path.with_name(path.name + suffix), path)
+                itemsizes[prefix + name] = column.itemsize
+        index = {
+            "version": ANALYTICS_VERSION,
+            "byteorder": sys.byteorder,
+            "itemsizes": itemsizes,
+            "rows": {prefix: len(columns["session"]) for prefix, columns in self._tables().items()},
+            "sessions": self.sessions,
+            "strings": self.strings,
+        }
+        path = self.store_dir / "index.json"
+        with open(path.with_name(path.name + suffix), "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(path.with_name(path.name + suffix), path)
+
+    # Updates
+
+    def update(self, reader: Any) -> Dict[str, int]:
+        """
+        Bring the store up to date with a reader's sessions.
+
+        Sessions whose fingerprint is unchanged keep their rows; others are
+        read with get_messages_with_sizes. The store is saved if anything changed.
+
+        Args:
+            reader: SessionReader (or CachingSessionReader / MultiRootReader)
+
+        Returns:
+            Counts of sessions, sessions read, and rows
+        """
+        previous = {session["session_id"]: session for session in self.sessions}
+        columns = _empty(COLUMNS)
+        calls = _empty(CALL_COLUMNS)
+        sessions: List[Dict[str, Any]] = []
+        read = 0
+
+        for summary in reader.list_sessions():
+            session_id = summary["session_id"]
+            fingerprint = reader.get_fingerprint(session_id)
+            if fingerprint is None:
+                continue
+            index = len(sessions)
+            start = len(columns["session"])
+            call_start = len(calls["session"])
+            old = previous.get(session_id)
+            if old is not None and old["fingerprint"] == fingerprint:
+                _copy_rows(columns, self.columns, index, old["start"], old["count"])
+                _copy_rows(calls, self.calls, index, old["call_start"], old["call_count"])
+            else:
+                records = reader.get_messages_with_sizes(session_id)
+                if records is None:
+                    continue
+                read += 1
+                self._add_session(columns, calls, index, records)
+            sessions.append(
+                {
+                    "session_id": session_id,
+                    "session_type": summary.get("session_type"),
+                    "created_at": summary.get("created_at"),
+                    "fingerprint": fingerprint,
+                    "start": start,
+                    "count": len(columns["session"]) - start,
+                    "call_start": call_start,
+                    "call_count": len(calls["session"]) - call_start,
+                }
+            )
+
+        changed = read > 0 or len(sessions) != len(self.sessions)
+        self.columns, self.calls, self.sessions = columns, calls, sessions
+        if changed:
+            try:
+                self.save()
+            except OSError as e:
+                print(f"⚠️  Could not save analytics store {self.store_dir}: {e}")
+        return {"sessions": len(sessions), "read": read, "rows": self.rows}
+
+    def _add_session(
+        self,
+        columns: Dict[str, array],
+        calls: Dict[str, array],
+        index: int,
+        records: List[Tuple[Dict[str, Any], int]],
+    ) -> None:
+        """Append the message and tool call rows of one session."""
+        tool_names: Dict[str, str] = {}
+        for message, size in records:
+            role, timestamp, tool, status = message_metadata(message, tool_names)
+            columns["session"].append(index)
+            columns["agent"].append(self._code(str(message.get("agent_id"))))
+            columns["role"].append(self._code(role))
+            columns["timestamp"].append(timestamp)
+            columns["tool"].append(self._code(tool) if tool is not None else -1)
+            columns["status"].append(status)
+            columns["size"].append(size)
+
+        for call in pair_tool_calls([message for message, _ in records]).values():
+            latency = call["latency_ms"]
+            calls["session"].append(index)
+            calls["agent"].append(self._code(str(call["agent_id"])))
+            calls["tool"].append(self._code(call["name"]))
+            calls["timestamp"].append(_epoch_seconds(call["started_at"]))
+            calls["latency"].append(math.nan if latency is None else latency)
+            calls["status"].append(_call_status(call))
+
+    # Queries
+
+    def _session_codes(self, key: str) -> List[int]:
+        """Code of every session for a session-level key (-1: unknown)."""
+        if key == "session_type":
+            return [self._code(s["session_type"] or "unknown") for s in self.sessions]
+        # day the session was created
+        days = []
+        for session in self.sessions:
+            seconds = _epoch_seconds(session["created_at"])
+            days.append(-1 if math.isnan(seconds) else int(seconds // SECONDS_PER_DAY))
+        return days
+
+    def _label(self, key: str, code: int) -> Any:
+        if key == "day":
+            return _day_label(code)
+        if key == "status":
+            return STATUS_LABELS[code]
+        if key == "session":
+            return self.sessions[code]["session_id"]
+        return self.strings[code] if code >= 0 else None
+
+    def _filter_code(self, key: str, value: str) -> Optional[int]:
+        if key == "status":
+            return STATUS_LABELS.index(value) if value in STATUS_LABELS else None
+        if key == "session":
+            ids = [s["session_id"] for s in self.sessions]
+            return ids.index(value) if value in ids else None
+        if key == "day":
+            try:
+                day = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+            except ValueError:
+                return None
+            return int(day.timestamp() // SECONDS_PER_DAY)
+        return self._codes.get(value)
+
+    def _wanted(
+        self,
+        keys: Sequence[str],
+        group_by: Sequence[str],
+        filters: Dict[str, str],
+    ) -> Optional[Dict[str, Optional[int]]]:
+        """Validate keys and look up filter codes (None if a filter matches nothing)."""
+        for key in list(group_by) + list(filters):
+            if key not in keys:
+                raise ValueError(f"Unknown group or filter key: {key} (use {', '.join(keys)})")
+        wanted = {key: self._filter_code(key, value) for key, value in filters.items()}
+        if any(code is None for code in wanted.values()):
+            return None
+        return wanted
+
+    def _labels(self, group_by: Sequence[str], codes: Tuple[int, ...]) -> Dict[str, Any]:
+        return {key: self._label(key, code) for key, code in zip(group_by, codes)}
+
+    def query(
+        self, group_by: Sequence[str], filters: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Count messages, tool results, errors and bytes per group.
+
+        Args:
+            group_by: Keys from MESSAGE_KEYS
+            filters: Key -> label (e.g. {"role": "user", "day": "2025-11-05"})
+
+        Returns:
+            One row per group, with the group's labels, messages, tool_results,
+            errors, error_rate (errors per tool result) and bytes, largest first
+
+        Raises:
+            ValueError: For unknown keys
+        """
+        wanted = self._wanted(MESSAGE_KEYS, group_by, filters or {})
+        if wanted is None or not self.rows:
+            return []
+        # Session-level codes are interned before the query runs
+        session_codes = {"session_type": self._session_codes("session_type")}
+
+        numpy = _import_numpy()
+        if numpy is not None:
+            groups = self._totals_numpy(numpy, group_by, wanted, session_codes)
+        else:
+            groups = self._totals_python(group_by, wanted, session_codes)
+
+        rows = []
+        for codes, (messages, results, errors, size) in groups.items():
+            row = self._labels(group_by, codes)
+            row.update(
+                {
+                    "messages": messages,
+                    "tool_results": results,
+                    "errors": errors,
+                    "error_rate": errors / results if results else None,
+                    "bytes": size,
+                }
+            )
+            rows.append(row)
+        rows.sort(key=lambda r: (-r["messages"], [str(r[key]) for key in group_by]))
+        return rows
+
+    def tool_latency(
+        self, group_by: Sequence[str] = ("tool",), filters: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Tool call latency percentiles per group.
+
+        Latency is the time from the message with a toolUse to the message
+        with its toolResult (see timeline.pair_tool_calls).
+
+        Args:
+            group_by: Keys from CALL_KEYS
+            filters: Key -> label (status "none" selects calls without a result)
+
+        Returns:
+            One row per group, with the group's labels, calls, completed (calls
+            with a latency), errors, total_ms, mean_ms, p50_ms, p95_ms, p99_ms
+            and max_ms, most total time first
+
+        Raises:
+            ValueError: For unknown keys
+        """
+        wanted = self._wanted(CALL_KEYS, group_by, filters or {})
+        if wanted is None or not self.call_rows:
+            return []
+        session_codes = {"session_type": self._session_codes("session_type")}
+
+        numpy = _import_numpy()
+        if numpy is not None:
+            groups = self._latencies_numpy(numpy, group_by, wanted, session_codes)
+        else:
+            groups = self._latencies_python(group_by, wanted, session_codes)
+
+        rows = []
+        for codes, (calls, completed, errors, total, latencies) in groups.items():
+            row = self._labels(group_by, codes)
+            row.update(
+                {
+                    "calls": calls,
+                    "completed": completed,
+                    "errors": errors,
+                    "total_ms": round(total, 3),
+                    "mean_ms": round(total / completed, 3) if completed else None,
+                    "p50_ms": latencies[50],
+                    "p95_ms": latencies[95],
+                    "p99_ms": latencies[99],
+                    "max_ms": latencies[100],
+                }
+            )
+            rows.append(row)
+        rows.sort(key=lambda r: (-r["total_ms"], [str(r[key]) for key in group_by]))
+        return rows
+
+    # Group-bys without NumPy
+
+    def _row_code(
+        self, table: Dict[str, array], key: str, i: int, session_codes: Dict[str, List[int]]
+    ) -> int:
+        if key == "session_type":
+            return session_codes[key][table["session"][i]]
+        if key == "day":
+            seconds = table["timestamp"][i]
+            return -1 if math.isnan(seconds) else int(seconds // SECONDS_PER_DAY)
+        return table[key][i]
+
+    def _group_python(
+        self,
+        table: Dict[str, array],
+        group_by: Sequence[str],
+        wanted: Dict[str, Optional[int]],
+        session_codes: Dict[str, List[int]],
+    ) -> Dict[Tuple[int, ...], List[int]]:
+        """Indexes of the rows of each group, in row order."""
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for i in range(len(table["session"])):
+            if any(
+                self._row_code(table, key, i, session_codes) != code for key, code in wanted.items()
+            ):
+                continue
+            codes = tuple(self._row_code(table, key, i, session_codes) for key in group_by)
+            groups.setdefault(codes, []).append(i)
+        return groups
+
+    def _totals_python(
+        self,
+        group_by: Sequence[str],
+        wanted: Dict[str, Optional[int]],
+        session_codes: Dict[str, List[int]],
+    ) -> Dict[Tuple[int, ...], List[int]]:
+        status, size = self.columns["status"], self.columns["size"]
+        return {
+            codes: [
+                len(rows),
+                sum(status[i] != STATUS_NONE for i in rows),
+                sum(status[i] == STATUS_ERROR for i in rows),
+                sum(size[i] for i in rows),
+            ]
+            for codes, rows in self._group_python(
+                self.columns, group_by, wanted, session_codes
+            ).items()
+        }
+
+    def _latencies_python(
+        self,
+        group_by: Sequence[str],
+        wanted: Dict[str, Optional[int]],
+        session_codes: Dict[str, List[int]],
+    ) -> Dict[Tuple[int, ...], Tuple[int, int, int, float, Dict[int, Optional[float]]]]:
+        status, latency = self.calls["status"], self.calls["latency"]
+        groups = {}
+        for codes, rows in self._group_python(self.calls, group_by, wanted, session_codes).items():
+            values = [latency[i] for i in rows if not math.isnan(latency[i])]
+            total = sum(values)
+            values.sort()
+            groups[codes] = (
+                len(rows),
+                len(values),
+                sum(status[i] == STATUS_ERROR for i in rows),
+                total,
+                {p: percentile(values, p) for p in (50, 95, 99, 100)},
+            )
+        return groups
+
+    # Group-bys with NumPy
+
+    def _group_numpy(
+        self,
+        np: Any,
+        table: Dict[str, array],
+        group_by: Sequence[str],
+        wanted: Dict[str, Optional[int]],
+        session_codes: Dict[str, List[int]],
+    ) -> Tuple[List[Tuple[int, ...]], Any, Any, Dict[str, Any]]:
+        """
+        Group the rows of a table.
+
+        Returns:
+            Tuple of (codes of each group, mask of the selected rows, group
+            number of each selected row, the table's columns as NumPy arrays)
+        """
+        columns = {
+            name: np.frombuffer(column, dtype=np.dtype(column.typecode))
+            for name, column in table.items()
+        }
+
+        def key_codes(key: str) -> Any:
+            if key == "session_type":
+                return np.asarray(session_codes[key], dtype=np.int64)[columns["session"]]
+            if key == "day":
+                seconds = columns["timestamp"]
+                days = np.floor_divide(np.nan_to_num(seconds, nan=-1.0), SECONDS_PER_DAY)
+                return np.where(np.isnan(seconds), -1, days).astype(np.int64)
+            return columns[key].astype(np.int64)
+
+        mask = np.ones(len(table["session"]), dtype=bool)
+        for key, code in wanted.items():
+            mask &= key_codes(key) == code
+
+        # Combine the keys' codes (shifted so -1 becomes 0) into one mixed-radix key
+        combined = np.zeros(int(mask.sum()), dtype=np.int64)
+        radixes = []
+        for key in group_by:
+            codes = key_codes(key)[mask] + 1
+            radix = int(codes.max()) + 1 if len(codes) else 1
+            combined = combined * radix + codes
+            radixes.append(radix)
+        unique, inverse = np.unique(combined, return_inverse=True)
+
+        keys = []
+        for value in unique.tolist():
+            group: List[int] = []
+            for radix in reversed(radixes):
+                value, code = divmod(value, radix)
+                group.append(code - 1)
+            keys.append(tuple(reversed(group)))
+        return keys, mask, inverse.reshape(-1), columns
+
+    def _totals_numpy(
+        self,
+        np: Any,
+        group_by: Sequence[str],
+        wanted: Dict[str, Optional[int]],
+        session_codes: Dict[str, List[int]],
+    ) -> Dict[Tuple[int, ...], List[int]]:
+        keys, mask, inverse, columns = self._group_numpy(
+            np, self.columns, group_by, wanted, session_codes
+        )
+        status = columns["status"][mask]
+        size = columns["size"][mask]
+        messages = np.bincount(inverse, minlength=len(keys))
+        results = np.bincount(inverse, weights=status != STATUS_NONE, minlength=len(keys))
+        errors = np.bincount(inverse, weights=status == STATUS_ERROR, minlength=len(keys))
+        sizes = np.bincount(inverse, weights=size, minlength=len(keys))
+        return {
+            codes: [int(messages[g]), int(results[g]), int(errors[g]), int(sizes[g])]
+            for g, codes in enumerate(keys)
+        }
+
+    def _latencies_numpy(
+        self,
+        np: Any,
+        group_by: Sequence[str],
+        wanted: Dict[str, Optional[int]],
+        session_codes: Dict[str, List[int]],
+    ) -> Dict[Tuple[int, ...], Tuple[int, int, int, float, Dict[int, Optional[float]]]]:
+        keys, mask, inverse, columns = self._group_numpy(
+            np, self.calls, group_by, wanted, session_codes
+        )
+        status = columns["status"][mask]
+        latency = columns["latency"][mask]
+        calls = np.bincount(inverse, minlength=len(keys))
+        errors = np.bincount(inverse, weights=status == STATUS_ERROR, minlength=len(keys))
+
+        # Sort the latencies of completed calls by group, then value
+        completed = ~np.isnan(latency)
+        groups, values = inverse[completed], latency[completed]
+        totals = np.bincount(groups, weights=values, minlength=len(keys))
+        values = values[np.lexsort((values, groups))]
+        counts = np.bincount(groups, minlength=len(keys))
+        starts = np.cumsum(counts) - counts
+
+        # Nearest-rank percentiles, as in stats.percentile
+        ranks = {}
+        for p in (50, 95, 99, 100):
+            rank = np.clip(np.ceil(p / 100.0 * counts), 1, np.maximum(counts, 1)).astype(np.int64)
+            ranks[p] = (starts + rank - 1).tolist()
+        counts = counts.tolist()
+        values = values.tolist()
+
+        return {
+            codes: (
+                int(calls[g]),
+                counts[g],
+                int(errors[g]),
+                float(totals[g]),
+                {p: values[ranks[p][g]] if counts[g] else None for p in ranks},
+            )
+            for g, codes in enumerate(keys)
+        }
+
+    def session_stats(
+        self, group_by: Sequence[str], filters: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Messages-per-session distribution per group of sessions.
+
+        Args:
+            group_by: Keys from SESSION_KEYS (day is the day the session was created)
+            filters: Key -> value to keep only matching sessions; keys from SESSION_KEYS
+
+        Returns:
+            One row per group with sessions, mean, p50, p95, p99 and max messages
+
+        Raises:
+            ValueError: For unknown keys, including filters on message or call keys
+        """
+        filters = filters or {}
+        wanted = self._wanted(SESSION_KEYS, group_by, filters)
+        if wanted is None:
+            return []
+        codes = {key: self._session_codes(key) for key in set(group_by) | set(wanted)}
+        groups: Dict[Tuple[int, ...], List[int]] = {}
+        for i, session in enumerate(self.sessions):
+            if any(codes[key][i] != code for key, code in wanted.items()):
+                continue
+            groups.setdefault(tuple(codes[key][i] for key in group_by), []).append(session["count"])
+
+        rows = []
+        for group, counts in groups.items():
+            counts.sort()
+            row = self._labels(group_by, group)
+            row.update(
+                {
+                    "sessions": len(counts),
+                    "mean": sum(counts) / len(counts),
+                    "p50": percentile(counts, 50),
+                    "p95": percentile(counts, 95),
+                    "p99": percentile(counts, 99),
+                    "max": counts[-1],
+                }
+            )
+            rows.append(row)
+        rows.sort(key=lambda r: (-r["sessions"], [str(r[key]) for key in group_by]))
+        return rows
@@ -0,0 +1,348 @@
+"""
+Read-only storage roots in tar and zip archives.
+
+An archived sessions directory (or single session directory) is mounted
+without extracting it. On first open the archive is scanned once and a
+member index (name -> data offset, size, compression) is written to
+<archive dir>/.strands-viewer/archives/<archive name>.index.json; later opens
+load the index, and members are read by seeking to their offset.
+
+Zip members and members of uncompressed tars are read with a single seek.
+Gzip streams can't be entered at an arbitrary offset, so members of
+.tar.gz archives are read by decompressing forward from the nearest
+checkpoint: a copy of the decompressor state, taken every
+GZIP_CHECKPOINT_SPACING bytes of output as reads pass through the stream
+(in the style of zlib's zran example). Checkpoints are kept in memory only,
+so a fresh process decompresses from the start up to its first read; this
+makes .tar.gz a sequential fallback, and zip (or packed sessions) the better
+format for large archives. read_many reads members in archive order to keep
+a batch a single forward pass.
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import struct
+import tarfile
+import threading
+import time
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from strands_viewer.storage import FileInfo, StorageBackend
+
+# Archive file suffixes and their formats
+ARCHIVE_FORMATS = {
+    ".zip": "zip",
+    ".tar": "tar",
+    ".tar.gz": "tar.gz",
+    ".tgz": "tar.gz",
+}
+
+# Index location, relative to the archive's directory
+INDEX_SUBDIR = Path(".strands-viewer") / "archives"
+
+# Bumped when the index layout changes
+INDEX_VERSION = 1
+
+# Uncompressed bytes between checkpoints of a .tar.gz stream; each keeps a
+# copy of the decompressor state (about 40 KiB)
+GZIP_CHECKPOINT_SPACING = 4 * 1024 * 1024
+
+# Compressed bytes fed to the decompressor at a time, and the most output
+# taken from one feed
+_GZIP_READ_SIZE = 64 * 1024
+_GZIP_OUTPUT_SIZE = 1024 * 1024
+
+# Zip local file header: signature, versions, flags, method, time, date, crc,
+# sizes, then the file name and extra field lengths
+_ZIP_LOCAL_HEADER = struct.Struct("<4s5HLLLHH")
+_ZIP_STORED = 0
+_ZIP_DEFLATED = 8
+
+
+def archive_format(path: str) -> Optional[str]:
+    """Get the archive format of a path from its suffix, or None if it isn't an archive."""
+    name = Path(path).name.lower()
+    for suffix, fmt in ARCHIVE_FORMATS.items():
+        if name.endswith(suffix):
+            return fmt
+    return None
+
+
+def _member_name(name: str) -> str:
+    while name.startswith("./"):
+        name = name[2:]
+    return name.lstrip("/")
+
+
+def archive_stem(path: str) -> str:
+    """Archive file name without its archive suffix."""
+    name = Path(path).name
+    for suffix in ARCHIVE_FORMATS:
+        if name.lower().endswith(suffix):
+            return name[: -len(suffix)]
+    return name
+
+
+class _GzipStream:
+    """Random reads from a gzip file, resumed from in-memory decompressor checkpoints."""
+
+    def __init__(self, path: Path, spacing: int):
+        self._file = open(path, "rb")
+        self.spacing = spacing
+        # (uncompressed offset, compressed offset, decompressor), by offset
+        self.checkpoints: List[Tuple[int, int, Any]] = [(0, 0, zlib.decompressobj(31))]
+        self._offsets = [0]
+        self._restore(self.checkpoints[0])
+
+    def _restore(self, checkpoint: Tuple[int, int, Any]) -> None:
+        self._position, compressed_offset, decompressor = checkpoint
+        self._decompressor = decompressor.copy()
+        self._file.seek(compressed_offset)
+        # Decompressed bytes not yet consumed, starting at self._position
+        self._pending = b""
+
+    def _feed(self) -> bool:
+        """Decompress the next piece of the stream into _pending; False at the end."""
+        decompressor = self._decompressor
+        data = decompressor.unconsumed_tail
+        if not data:
+            if decompressor.eof and decompressor.unused_data:
+                # Next member of a multi-member gzip file
+                data = decompressor.unused_data
+                decompressor = self._decompressor = zlib.decompressobj(31)
+            else:
+                data = self._file.read(_GZIP_READ_SIZE)
+                if not data:
+                    return False
+        self._pending += decompressor.decompress(data, _GZIP_OUTPUT_SIZE)
+
+        # Input is consumed up to the file position: the state can be resumed from here
+        end = self._position + len(self._pending)
+        if (
+            not decompressor.unconsumed_tail
+            and not decompressor.eof
+            and end >= self._offsets[-1] + self.spacing
+        ):
+            self.checkpoints.append((end, self._file.tell(), decompressor.copy()))
+            self._offsets.append(end)
+        return True
+
+    def read(self, offset: int, size: int) -> bytes:
+        """Read up to size bytes at an offset of the decompressed stream."""
+        # Resume from the nearest checkpoint before the offset when going back,
+        # or when it is further ahead than the current position
+        checkpoint = self.checkpoints[bisect.bisect_right(self._offsets, offset) - 1]
+        if offset < self._position or checkpoint[0] > self._position + len(self._pending):
+            self._restore(checkpoint)
+
+        while self._position + len(self._pending) < offset + size and self._feed():
+            # Drop what lies before the offset as the stream is passed
+            skip = min(offset - self._position, len(self._pending))
+            self._pending = self._pending[skip:]
+            self._position += skip
+        skip = min(offset - self._position, len(self._pending))
+        data = self._pending[skip : skip + size]
+        self._pending = self._pending[skip + len(data) :]
+        self._position += skip + len(data)
+        return data
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ArchiveBackend(StorageBackend):
+    """Sessions in a .zip, .tar, .tar.gz or .tgz archive, read through a member index."""
+
+    def __init__(self, path: str, index_dir: Optional[str] = None):
+        self.path = Path(path)
+        self.format = archive_format(path)
+        if self.format is None:
+            raise ValueError(f"Unsupported archive type: {path}")
+        if not self.path.is_file():
+            raise ValueError(f"Archive does not exist: {path}")
+        self.state_dir = self.path.parent
+        self.index_path = Path(index_dir or self.path.parent / INDEX_SUBDIR) / (
+            f"{self.path.name}.index.json"
+        )
+
+        stat = self.path.stat()
+        self._archive_stat = (stat.st_size, stat.st_mtime_ns)
+        self._lock = threading.Lock()
+        self._handle: Any = None
+
+        # name -> [data offset, size, mtime_ns, compressed size, compression method]
+        self.members: Dict[str, List[int]] = self._load_index() or self._build_index()
+        self._dirs: Dict[str, Set[str]] = {}
+        self._files: Dict[str, List[str]] = {}
+        for name in self.members:
+            parts = name.split("/")
+            for depth in range(len(parts) - 1):
+                self._dirs.setdefault("/".join(parts[:depth]), set()).add(parts[depth])
+            self._files.setdefault("/".join(parts[:-1]), []).append(name)
+
+    def describe(self) -> str:
+        return str(self.path)
+
+    # Index
+
+    def _load_index(self) -> Optional[Dict[str, List[int]]]:
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            index.get("version") != INDEX_VERSION
+            or index.get("format") != self.format
+            or tuple(index.get("archive", ())) != self._archive_stat
+        ):
+            return None
+        return index["members"]
+
+    def _build_index(self) -> Dict[str, List[int]]:
+        if self.format == "zip":
+            members = self._scan_zip()
+        else:
+            members = self._scan_tar()
+
+        # Archives of a sessions directory may keep it under one top-level directory
+        top_level = {name.split("/", 1)[0] for name in members}
+        if len(top_level) == 1 and not next(iter(top_level)).startswith("session_"):
+            strip = len(next(iter(top_level))) + 1
+            members = {name[strip:]: entry for name, entry in members.items() if name[strip:]}
+
+        index = {
+            "version": INDEX_VERSION,
+            "format": self.format,
+            "archive": list(self._archive_stat),
+            "members": members,
+        }
+        try:
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(index, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"⚠️  Could not save archive index {self.index_path}: {e}")
+        return members
+
+    def _scan_zip(self) -> Dict[str, List[int]]:
+        members: Dict[str, List[int]] = {}
+        with zipfile.ZipFile(self.path) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                mtime_ns = int(time.mktime(info.date_time + (0, 0, -1)) * 1_000_000_000)
+                members[_member_name(info.filename)] = [
+                    info.header_offset,
+                    info.file_size,
+                    mtime_ns,
+                    info.compress_size,
+                    info.compress_type,
+                ]
+        return members
+
+    def _scan_tar(self) -> Dict[str, List[int]]:
+        members: Dict[str, List[int]] = {}
+        mode = "r:gz" if self.format == "tar.gz" else "r:"
+        with tarfile.open(self.path, mode) as archive:
+            for info in archive:
+                if not info.isfile():
+                    continue
+                members[_member_name(info.name)] = [
+                    info.offset_data,
+                    info.size,
+                    int(info.mtime * 1_000_000_000),
+                    info.size,
+                    0,
+                ]
+        return members
+
+    # Reads
+
+    def _open(self) -> Any:
+        if self._handle is None:
+            if self.format == "tar.gz":
+                self._handle = _GzipStream(self.path, GZIP_CHECKPOINT_SPACING)
+            else:
+                self._handle = open(self.path, "rb")
+        return self._handle
+
+    def _read_member(self, name: str) -> bytes:
+        offset, size, _, compressed_size, method = self.members[name]
+        with self._lock:
+            handle = self._open()
+            if self.format == "tar.gz":
+                return handle.read(offset, size)
+            if self.format != "zip":
+                handle.seek(offset)
+                return handle.read(size)
+
+            handle.seek(offset)
+            header = _ZIP_LOCAL_HEADER.unpack(handle.read(_ZIP_LOCAL_HEADER.size))
+            handle.seek(header[-2] + header[-1], os.SEEK_CUR)
+            if method == _ZIP_STORED:
+                return handle.read(size)
+            if method == _ZIP_DEFLATED:
+                return zlib.decompress(handle.read(compressed_size), -zlib.MAX_WBITS)
+
+        # Other compression methods go through zipfile
+        with zipfile.ZipFile(self.path) as archive:
+            for info in archive.infolist():
+                if info.header_offset == offset:
+                    return archive.read(info)
+        raise FileNotFoundError(f"{self.path}:{name}")
+
+    def _info(self, name: str) -> FileInfo:
+        entry = self.members[name]
+        return FileInfo(name, entry[1], entry[2])
+
+    def list_dirs(self, prefix: str = "") -> List[str]:
+        return sorted(self._dirs.get(prefix.strip("/"), ()))
+
+    def list_files(self, prefix: str = "", recursive: bool = False) -> List[FileInfo]:
+        prefix = prefix.strip("/")
+        if not recursive:
+            names = self._files.get(prefix, [])
+        else:
+            start = f"{prefix}/" if prefix else ""
+            names = [name for name in self.members if name.startswith(start)]
+        return sorted(self._info(name) for name in names)
+
+    def stat(self, path: str) -> Optional[FileInfo]:
+        path = path.strip("/")
+        return self._info(path) if path in self.members else None
+
+    def read_bytes(self, path: str) -> bytes:
+        path = path.strip("/")
+        if path not in self.members:
+            raise FileNotFoundError(f"{self.path}:{path}")
+        return self._read_member(path)
+
+    def read_many(self, files: Sequence[FileInfo]) -> List[Optional[bytes]]:
+        # Read in archive order so compressed streams are read in one forward pass
+        order = sorted(range(len(files)), key=lambda i: self.members.get(files[i].path, [0])[0])
+        contents: List[Optional[bytes]] = [None] * len(files)
+        for i in order:
+            try:
+                contents[i] = self.read_bytes(files[i].path)
+            except (OSError, zlib.error, struct.error) as e:
+                print(f"Error reading {files[i].path}: {e}")
+        return contents
+
+    def signature(self, patterns: Sequence[str]) -> str:
+        # Archives change only as a whole
+        size, mtime_ns = self._archive_stat
+        return hashlib.sha256(f"{self.path}\0{size}\0{mtime_ns}".encode("utf-8")).hexdigest()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
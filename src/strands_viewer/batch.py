@@ -0,0 +1,129 @@
+"""
+Offline batch analysis of all sessions in a storage directory.
+
+Sessions are analyzed ahead of time and the results written to an
+AnalysisStore, which the server reads so precomputed analyses show instantly.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from strands_viewer.ai_analysis import run_analysis
+from strands_viewer.analysis_store import AnalysisStore
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.timeline import seconds_since
+
+# Analyses run by default: a summary and error triage.
+DEFAULT_BATCH_ANALYSES = ("summarize", "errors")
+
+# Sessions updated more recently than this (seconds) are considered still running.
+DEFAULT_MIN_IDLE_SECONDS = 300
+
+
+class BatchReport:
+    """Counts of what a batch run did."""
+
+    def __init__(self):
+        self.analyzed = 0
+        self.skipped_cached = 0
+        self.skipped_active = 0
+        self.failed = 0
+        self.errors: List[Dict[str, str]] = []
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "analyzed": self.analyzed,
+            "skipped_cached": self.skipped_cached,
+            "skipped_active": self.skipped_active,
+            "failed": self.failed,
+            "errors": self.errors,
+        }
+
+
+def run_batch_analysis(
+    reader: SessionReader,
+    analyzer: Any,
+    store: AnalysisStore,
+    analysis_types: Sequence[str] = DEFAULT_BATCH_ANALYSES,
+    concurrency: int = 2,
+    min_idle_seconds: float = DEFAULT_MIN_IDLE_SECONDS,
+    force: bool = False,
+    model_name: Optional[str] = None,
+    progress: Callable[[str], None] = print,
+) -> BatchReport:
+    """
+    Analyze every finished session whose analysis is missing or stale.
+
+    Args:
+        reader: SessionReader for the storage directory
+        analyzer: SessionAnalyzer (or any object with the same analysis methods); rate
+                  limits are applied per model request through its call_gate
+        store: AnalysisStore to read cached results from and write new ones to
+        analysis_types: Analyses to run for each session
+        concurrency: Number of sessions analyzed in parallel
+        min_idle_seconds: Skip sessions updated more recently than this
+        force: Re-run analyses even if a current result is stored
+        model_name: Model description recorded with each result
+        progress: Callback receiving progress lines
+
+    Returns:
+        BatchReport with counts of analyzed, skipped and failed analyses
+    """
+    report = BatchReport()
+    now = datetime.now(timezone.utc)
+    jobs = []
+
+    for summary in reader.list_sessions():
+        session_id = summary.get("session_id")
+        if not session_id:
+            continue
+
+        idle = seconds_since(summary.get("updated_at"), now)
+        if idle is not None and idle < min_idle_seconds:
+            report.skipped_active += len(analysis_types)
+            continue
+
+        fingerprint = reader.get_fingerprint(session_id)
+        pending = [
+            analysis_type
+            for analysis_type in analysis_types
+            if force or store.get(session_id, analysis_type, fingerprint) is None
+        ]
+        report.skipped_cached += len(analysis_types) - len(pending)
+        if pending:
+            jobs.append((session_id, fingerprint, pending))
+
+    progress(f"{len(jobs)} session(s) to analyze")
+
+    def analyze(job) -> List[tuple]:
+        """Run the pending analyses of one session, returning (type, error) pairs."""
+        session_id, fingerprint, pending = job
+        session = reader.get_session(session_id)
+        if session is None:
+            return [(analysis_type, "Session could not be read") for analysis_type in pending]
+
+        outcomes = []
+        for analysis_type in pending:
+            try:
+                result = run_analysis(analyzer, session, analysis_type)
+                store.put(session_id, analysis_type, fingerprint, result, model=model_name)
+                outcomes.append((analysis_type, None))
+                progress(f"✅ {session_id}: {analysis_type}")
+            except Exception as e:
+                outcomes.append((analysis_type, str(e)))
+                progress(f"❌ {session_id}: {analysis_type} failed: {e}")
+        return outcomes
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for job, outcomes in zip(jobs, executor.map(analyze, jobs)):
+            for analysis_type, error in outcomes:
+                if error is None:
+                    report.analyzed += 1
+                else:
+                    report.failed += 1
+                    report.errors.append(
+                        {"session_id": job[0], "analysis_type": analysis_type, "error": error}
+                    )
+
+    return report
@@ -0,0 +1,201 @@
+"""
+Token estimation and chunking of session messages for analysis.
+
+Sessions can be far larger than a model's context window. These helpers render
+messages to compact text, estimate their token cost up front and split a
+conversation into token-budgeted segments that can be summarized independently.
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+# Rough average for English text and JSON with the common LLM tokenizers.
+CHARS_PER_TOKEN = 4
+
+# Fixed cost of the per-message header ("Message #12 (ASSISTANT):") and separators.
+MESSAGE_OVERHEAD_TOKENS = 8
+
+TRUNCATION_MARKER = "... (truncated)"
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a piece of text."""
+    if not text:
+        return 0
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _truncate(text: str, max_chars: Optional[int]) -> str:
+    """Truncate text to max_chars, marking the cut."""
+    if max_chars is None or len(text) <= max_chars:
+        return text
+    return text[:max_chars] + TRUNCATION_MARKER
+
+
+def render_message(
+    msg_wrapper: Dict[str, Any], number: int, max_text_chars: Optional[int] = None
+) -> str:
+    """
+    Render a message as compact, deterministic plain text.
+
+    Args:
+        msg_wrapper: Message as returned by SessionReader (with "message" key)
+        number: 1-based position of the message in the conversation
+        max_text_chars: Optional per-block character limit
+
+    Returns:
+        Text rendering of the message
+    """
+    msg = msg_wrapper.get("message", {})
+    role = msg.get("role", "unknown")
+    lines = [f"Message #{number} ({role.upper()}):"]
+
+    for content in msg.get("content", []):
+        if "text" in content:
+            lines.append(f"  {_truncate(content['text'], max_text_chars)}")
+
+        if "toolUse" in content:
+            tool_use = content["toolUse"]
+            tool_input = json.dumps(tool_use.get("input", {}), sort_keys=True, ensure_ascii=False)
+            lines.append(
+                f"  [Tool Call: {tool_use.get('name', 'unknown')} "
+                f"id={tool_use.get('toolUseId', 'unknown')}] "
+                f"{_truncate(tool_input, max_text_chars)}"
+            )
+
+        if "toolResult" in content:
+            tool_result = content["toolResult"]
+            lines.append(
+                f"  [Tool Result: {tool_result.get('status', 'unknown')} "
+                f"id={tool_result.get('toolUseId', 'unknown')}]"
+            )
+            for result_content in tool_result.get("content", []):
+                if "text" in result_content:
+                    lines.append(f"    {_truncate(result_content['text'], max_text_chars)}")
+
+    return "\n".join(lines)
+
+
+def estimate_message_tokens(msg_wrapper: Dict[str, Any], number: int = 1) -> int:
+    """Estimate the token cost of a message in its rendered form."""
+    return estimate_tokens(render_message(msg_wrapper, number)) + MESSAGE_OVERHEAD_TOKENS
+
+
+def render_session(session: Dict[str, Any], max_text_chars: Optional[int] = 2000) -> str:
+    """
+    Render a whole session as compact, deterministic plain text.
+
+    The same session data always renders to the same text, so the result can
+    be used as a cacheable prompt prefix.
+
+    Args:
+        session: Session data dictionary as returned by SessionReader.get_session()
+        max_text_chars: Optional per-block character limit
+
+    Returns:
+        Text rendering of the session header and all messages
+    """
+    messages = session.get("messages", [])
+    agent_ids = sorted(str(agent.get("agent_id", "unknown")) for agent in session.get("agents", []))
+    lines = [
+        f"Session ID: {session.get('session_id', 'Unknown')}",
+        f"Type: {session.get('session_type', 'Unknown')}",
+        f"Created: {session.get('created_at', 'Unknown')}",
+        f"Updated: {session.get('updated_at', 'Unknown')}",
+        f"Agents: {', '.join(agent_ids) if agent_ids else 'Unknown'}",
+        f"Total Messages: {len(messages)}",
+        "",
+    ]
+    for number, msg_wrapper in enumerate(messages, 1):
+        lines.append(render_message(msg_wrapper, number, max_text_chars=max_text_chars))
+        lines.append("")
+    return "\n".join(lines)
+
+
+class MessageChunk:
+    """A contiguous, token-budgeted run of rendered messages."""
+
+    def __init__(self, first_message: int, last_message: int, text: str, tokens: int):
+        self.first_message = first_message
+        self.last_message = last_message
+        self.text = text
+        self.tokens = tokens
+
+    def __repr__(self) -> str:
+        return (
+            f"MessageChunk(messages={self.first_message}-{self.last_message}, "
+            f"tokens={self.tokens})"
+        )
+
+
+def chunk_messages(messages: List[Dict[str, Any]], max_tokens: int) -> List[MessageChunk]:
+    """
+    Split messages into chunks that each fit within a token budget.
+
+    Messages are never split across chunks. A single message that exceeds the
+    budget on its own is truncated so that every chunk respects max_tokens.
+
+    Args:
+        messages: Messages in conversation order
+        max_tokens: Token budget per chunk
+
+    Returns:
+        List of MessageChunk objects in conversation order
+    """
+    if max_tokens <= MESSAGE_OVERHEAD_TOKENS:
+        raise ValueError(f"max_tokens must be greater than {MESSAGE_OVERHEAD_TOKENS}")
+
+    chunks: List[MessageChunk] = []
+    parts: List[str] = []
+    first = 0
+    used = 0
+
+    def flush(last: int) -> None:
+        if parts:
+            chunks.append(MessageChunk(first, last, "\n\n".join(parts), used))
+
+    for number, msg_wrapper in enumerate(messages, 1):
+        text = render_message(msg_wrapper, number)
+        tokens = estimate_tokens(text) + MESSAGE_OVERHEAD_TOKENS
+
+        if tokens > max_tokens:
+            budget_chars = (max_tokens - MESSAGE_OVERHEAD_TOKENS) * CHARS_PER_TOKEN
+            text = text[: max(0, budget_chars - len(TRUNCATION_MARKER))] + TRUNCATION_MARKER
+            tokens = estimate_tokens(text) + MESSAGE_OVERHEAD_TOKENS
+
+        if parts and used + tokens > max_tokens:
+            flush(number - 1)
+            parts = []
+            used = 0
+
+        if not parts:
+            first = number
+        parts.append(text)
+        used += tokens
+
+    flush(len(messages))
+    return chunks
+
+
+def group_by_budget(texts: List[str], max_tokens: int) -> List[List[str]]:
+    """
+    Group texts into consecutive batches whose estimated size fits max_tokens.
+
+    A text larger than the budget is placed in a batch of its own.
+    """
+    batches: List[List[str]] = []
+    current: List[str] = []
+    used = 0
+
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and used + tokens > max_tokens:
+            batches.append(current)
+            current = []
+            used = 0
+        current.append(text)
+        used += tokens
+
+    if current:
+        batches.append(current)
+    return batches
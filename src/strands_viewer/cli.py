@@ -5,12 +5,574 @@ CLI entry point for Strands Session Viewer.
 import argparse
 import sys
 from pathlib import Path
+from typing import Dict, List, Optional, Union
 
 from strands_viewer.__version__ import __version__
 
+# Default model ID per provider, matching the factory defaults in strands_viewer.models
+DEFAULT_MODEL_IDS = {
+    "anthropic": "claude-haiku-4-5-20251001",
+    "openai": "gpt-5-mini-2025-08-07",
+    "ollama": "qwen3:4b",
+}
+
+
+def _resolve_sessions_dir(directory: str) -> Path:
+    """Resolve and validate the sessions directory, exiting on error."""
+    sessions_dir = Path(directory).resolve()
+    if not sessions_dir.exists():
+        print(f"❌ Error: Sessions directory does not exist: {directory}")
+        print(f"   Resolved path: {sessions_dir}")
+        print("   Please check the path and try again.")
+        sys.exit(1)
+
+    if not sessions_dir.is_dir():
+        print(f"❌ Error: Path is not a directory: {directory}")
+        sys.exit(1)
+
+    return sessions_dir
+
+
+def _resolve_location(location: str) -> str:
+    """Resolve and validate a sessions directory; archives and object storage URLs pass through."""
+    from strands_viewer.archive import archive_format
+    from strands_viewer.storage import is_remote
+
+    if is_remote(location):
+        return location
+    if archive_format(location) is not None and Path(location).is_file():
+        return str(Path(location).resolve())
+    return str(_resolve_sessions_dir(location))
+
+
+def _resolve_storage_roots(specs: List[str]) -> Union[str, Dict[str, str]]:
+    """
+    Resolve the viewer's sessions directories, exiting on error.
+
+    A single plain directory is returned as a path; several directories,
+    globs or NAME=PATH pairs are returned as a namespace -> path mapping.
+    """
+    if len(specs) == 1 and "=" not in specs[0] and not any(c in specs[0] for c in "*?["):
+        return _resolve_location(specs[0])
+
+    from strands_viewer.multi_root import resolve_roots
+
+    try:
+        roots = resolve_roots(specs)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    if len(roots) == 1:
+        return _resolve_location(str(next(iter(roots.values()))))
+    return {namespace: _resolve_location(str(path)) for namespace, path in roots.items()}
+
+
+def _add_model_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the model provider options shared by the viewer and subcommands."""
+    parser.add_argument(
+        "--model-provider",
+        choices=["anthropic", "openai", "ollama"],
+        default="anthropic",  # Default to Anthropic Haiku for cost savings
+        help="Model provider for session analysis (default: anthropic, requires AI extra)",
+    )
+
+    parser.add_argument(
+        "--model-id",
+        help="Model ID to use (e.g., claude-haiku-4-5-20251001, gpt-5-mini-2025-08-07)",
+    )
+
+
+def _create_model(model_provider: str, model_id: Optional[str] = None):
+    """
+    Create a model instance for the given provider.
+
+    Returns:
+        Tuple of (model, model_name)
+
+    Raises:
+        ImportError: If the AI extra is not installed
+    """
+    from strands_viewer.models import (
+        anthropic_model,
+        openai_model,
+        ollama_model,
+    )
+
+    factories = {
+        "anthropic": anthropic_model,
+        "openai": openai_model,
+        "ollama": ollama_model,
+    }
+
+    model_kwargs = {}
+    if model_id:
+        model_kwargs["model_id"] = model_id
+
+    model = factories[model_provider](**model_kwargs)
+    return model, model_kwargs.get("model_id", DEFAULT_MODEL_IDS[model_provider])
+
+
+def analyze_command(argv: List[str]) -> None:
+    """Run `strands-viewer analyze`: precompute analyses for all finished sessions."""
+    from strands_viewer.ai_analysis import ANALYSIS_TYPES
+    from strands_viewer.batch import (
+        DEFAULT_BATCH_ANALYSES,
+        DEFAULT_MIN_IDLE_SECONDS,
+    )
+    from strands_viewer.limits import DEFAULT_PROVIDER_RATES
+
+    parser = argparse.ArgumentParser(
+        prog="strands-viewer analyze",
+        description="Precompute AI analyses for every finished session in a sessions directory",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Summarize and triage errors for all sessions in ./sessions
+  strands-viewer analyze
+
+  # Run all analysis types with 4 parallel sessions, at most 30 requests/minute
+  strands-viewer analyze /path/to/sessions --types summarize,errors,improvements \\
+      --concurrency 4 --rate-limit 30
+        """,
+    )
+
+    parser.add_argument(
+        "directory",
+        nargs="?",
+        default="./sessions",
+        help="Path to sessions directory, archive (.zip, .tar, .tar.gz) or s3://bucket/prefix "
+        "(default: ./sessions)",
+    )
+
+    parser.add_argument(
+        "--dir", dest="directory", help="Path to sessions directory (alternative to positional arg)"
+    )
+
+    parser.add_argument(
+        "--types",
+        default=",".join(DEFAULT_BATCH_ANALYSES),
+        help=f"Comma-separated analysis types to run, from {', '.join(ANALYSIS_TYPES)} "
+        f"(default: {','.join(DEFAULT_BATCH_ANALYSES)})",
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=2,
+        help="Number of sessions analyzed in parallel (default: 2)",
+    )
+
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        help="Maximum model requests started per minute (default: per-provider limit, "
+        "anthropic 50, openai 60, ollama unlimited)",
+    )
+
+    parser.add_argument(
+        "--min-idle",
+        type=float,
+        default=DEFAULT_MIN_IDLE_SECONDS,
+        help="Skip sessions updated less than this many seconds ago, as they may still be "
+        f"running (default: {DEFAULT_MIN_IDLE_SECONDS})",
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run analyses even if a result for the current session contents is stored",
+    )
+
+    parser.add_argument(
+        "--store-dir",
+        help="Directory for stored analyses (default: <sessions dir>/.strands-viewer/analyses)",
+    )
+
+    _add_model_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    analysis_types = [t.strip() for t in args.types.split(",") if t.strip()]
+    unknown = [t for t in analysis_types if t not in ANALYSIS_TYPES]
+    if unknown or not analysis_types:
+        print(f"❌ Error: Unknown analysis type(s): {', '.join(unknown) or args.types}")
+        print(f"   Choose from: {', '.join(ANALYSIS_TYPES)}")
+        sys.exit(1)
+
+    sessions_dir = _resolve_location(args.directory)
+
+    from strands_viewer.limits import TokenBucket
+
+    rate = args.rate_limit
+    if rate is None:
+        rate = DEFAULT_PROVIDER_RATES.get(args.model_provider)
+    # Charged once per model request, not per analysis (which may send several)
+    rate_limiter = TokenBucket(rate) if rate else None
+
+    try:
+        from strands_viewer.ai_analysis import SessionAnalyzer
+
+        model, model_name = _create_model(args.model_provider, args.model_id)
+        analyzer = SessionAnalyzer(
+            model=model, call_gate=rate_limiter.admit if rate_limiter else None
+        )
+    except ImportError:
+        print("❌ Error: AI features not available.")
+        print("   Install with: pip install 'strands-session-viewer[ai]'")
+        sys.exit(1)
+
+    from strands_viewer.analysis_store import AnalysisStore
+    from strands_viewer.batch import run_batch_analysis
+    from strands_viewer.session_reader import SessionReader
+    from strands_viewer.storage import state_dir_for
+
+    store = (
+        AnalysisStore(args.store_dir)
+        if args.store_dir
+        else AnalysisStore.for_storage_dir(str(state_dir_for(sessions_dir)))
+    )
+
+    print(f"🤖 Using {args.model_provider} model: {model_name}")
+    print(f"📁 Storage directory: {sessions_dir}")
+    print(f"💾 Analysis store: {store.store_dir}\n")
+
+    report = run_batch_analysis(
+        SessionReader(sessions_dir),
+        analyzer,
+        store,
+        analysis_types=analysis_types,
+        concurrency=args.concurrency,
+        min_idle_seconds=args.min_idle,
+        force=args.force,
+        model_name=f"{args.model_provider}:{model_name}",
+    )
+
+    print(
+        f"\n📊 Analyzed: {report.analyzed}, already current: {report.skipped_cached}, "
+        f"skipped (recently active): {report.skipped_active}, failed: {report.failed}"
+    )
+    if report.failed:
+        sys.exit(1)
+
+
+def bench_command(argv: List[str]) -> None:
+    """Run `strands-viewer bench`: load-test the viewer's HTTP API."""
+    from strands_viewer.loadtest import DEFAULT_MIX, parse_mix, run_load_test
+
+    default_mix = ",".join(f"{name}={weight}" for name, weight in DEFAULT_MIX.items())
+    parser = argparse.ArgumentParser(
+        prog="strands-viewer bench",
+        description="Load-test the viewer API and report latency percentiles per route",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Serve ./sessions in-process and run the default mix for 10 seconds with 10 clients
+  strands-viewer bench
+
+  # Hit a running viewer with 50 clients, listing-heavy mix
+  strands-viewer bench --url http://localhost:8000 --clients 50 --mix list=5,open=1
+
+  # Replay traffic recorded with `strands-viewer --record-requests requests.jsonl`
+  strands-viewer bench /path/to/sessions --replay requests.jsonl --replay-speed 1
+        """,
+    )
+
+    parser.add_argument(
+        "directory",
+        nargs="?",
+        default="./sessions",
+        help="Sessions directory served in-process when --url is not given (default: ./sessions)",
+    )
+
+    parser.add_argument(
+        "--dir", dest="directory", help="Path to sessions directory (alternative to positional arg)"
+    )
+
+    parser.add_argument("--url", help="Base URL of a running viewer to test instead")
+
+    parser.add_argument(
+        "--clients", type=int, default=10, help="Number of concurrent clients (default: 10)"
+    )
+
+    parser.add_argument(
+        "--duration", type=float, default=10.0, help="Seconds to run the mix for (default: 10)"
+    )
+
+    parser.add_argument(
+        "--requests", type=int, help="Stop after this many requests instead of after --duration"
+    )
+
+    parser.add_argument(
+        "--mix",
+        default=default_mix,
+        help=f"Comma-separated route weights (default: {default_mix})",
+    )
+
+    parser.add_argument("--replay", help="Replay a request log instead of generating a mix")
+
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=0.0,
+        help="Replay pacing relative to the recording, e.g. 2 for twice as fast "
+        "(default: 0, as fast as possible)",
+    )
+
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+
+    parser.add_argument("--json", dest="json_output", help="Also write the summary to this file")
+
+    args = parser.parse_args(argv)
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    storage_dir = None if args.url else _resolve_location(args.directory)
+    target = args.url or f"in-process viewer on {storage_dir}"
+    print(f"🏋️  Load testing {target} with {args.clients} client(s)\n")
+
+    try:
+        result = run_load_test(
+            base_url=args.url,
+            storage_dir=storage_dir,
+            mix=mix,
+            clients=args.clients,
+            duration=None if args.requests else args.duration,
+            total_requests=args.requests,
+            replay_log=args.replay,
+            replay_speed=args.replay_speed,
+            seed=args.seed,
+        )
+    except ImportError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print(result.format_table())
+
+    if args.json_output:
+        import json
+
+        with open(args.json_output, "w", encoding="utf-8") as f:
+            json.dump(result.summary(), f, indent=2)
+        print(f"\n💾 Summary written to {args.json_output}")
+
+
+def pack_command(argv: List[str]) -> None:
+    """Run `strands-viewer pack`: compact finished sessions into single packed files."""
+    from strands_viewer.batch import DEFAULT_MIN_IDLE_SECONDS
+
+    parser = argparse.ArgumentParser(
+        prog="strands-viewer pack",
+        description="Compact finished session directories into single session_<id>.pack files",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Pack every session in ./sessions idle for at least 5 minutes
+  strands-viewer pack
+
+  # Show what would be packed, then pack and remove the packed directories
+  strands-viewer pack /path/to/sessions --dry-run
+  strands-viewer pack /path/to/sessions --delete
+        """,
+    )
+
+    parser.add_argument(
+        "directory",
+        nargs="?",
+        default="./sessions",
+        help="Path to sessions directory (default: ./sessions)",
+    )
+
+    parser.add_argument(
+        "--min-idle",
+        type=float,
+        default=DEFAULT_MIN_IDLE_SECONDS,
+        help=f"Skip sessions updated within this many seconds "
+        f"(default: {DEFAULT_MIN_IDLE_SECONDS})",
+    )
+
+    parser.add_argument(
+        "--delete",
+        action="store_true",
+        help="Remove session directories once their pack is verified "
+        "(by default they are kept, and read while they exist)",
+    )
+
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Only list the sessions that would be packed"
+    )
+
+    args = parser.parse_args(argv)
+    sessions_dir = _resolve_sessions_dir(args.directory)
+
+    from strands_viewer.pack import pack_store
+
+    print(f"📦 Packing sessions in {sessions_dir}\n")
+    report = pack_store(
+        str(sessions_dir), min_idle_seconds=args.min_idle, delete=args.delete, dry_run=args.dry_run
+    )
+    print(
+        f"\n✅ {'Would pack' if args.dry_run else 'Packed'} {report['packed']} session(s) "
+        f"({report['messages']} messages); {report['skipped_active']} still active, "
+        f"{report['failed']} failed"
+    )
+    if report["failed"]:
+        sys.exit(1)
+
+
+def export_command(argv: List[str]) -> None:
+    """Run `strands-viewer export`: convert every session of a storage location to files."""
+    from strands_viewer.export_formatter import EXPORT_FORMATS
+
+    parser = argparse.ArgumentParser(
+        prog="strands-viewer export",
+        description="Export every session of a sessions directory, e.g. as OpenTelemetry traces",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # One OTLP-JSON trace file per session in ./traces
+  strands-viewer export /path/to/sessions --format otlp --output traces
+
+  # All sessions as one OTLP-JSON lines file (OpenTelemetry Collector file exporter layout)
+  strands-viewer export /path/to/sessions --format otlp --output traces.jsonl
+
+  # Markdown transcripts of an archive
+  strands-viewer export sessions-2024.tar.gz --format markdown --output transcripts
+        """,
+    )
+
+    parser.add_argument(
+        "directory",
+        nargs="?",
+        default="./sessions",
+        help="Path to sessions directory, archive (.zip, .tar, .tar.gz) or s3://bucket/prefix "
+        "(default: ./sessions)",
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default="otlp",
+        help="Export format (default: otlp)",
+    )
+
+    parser.add_argument(
+        "--output",
+        default="./exports",
+        help="Output directory, or a .jsonl file for otlp (default: ./exports)",
+    )
+
+    args = parser.parse_args(argv)
+    sessions_dir = _resolve_location(args.directory)
+
+    from strands_viewer.export_formatter import export_store
+    from strands_viewer.session_reader import SessionReader
+
+    print(f"📤 Exporting sessions in {sessions_dir} as {args.format} to {args.output}\n")
+    try:
+        report = export_store(SessionReader(sessions_dir), args.output, args.format)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    print(f"\n✅ Exported {report['exported']} session(s), {report['failed']} failed")
+    if report["failed"]:
+        sys.exit(1)
+
+
+def dump_command(argv: List[str]) -> None:
+    """Run `strands-viewer dump`: write all sessions as partitioned tables."""
+    from strands_viewer.dump import DUMP_BATCH_ROWS, DUMP_FORMATS
+
+    parser = argparse.ArgumentParser(
+        prog="strands-viewer dump",
+        description="Flatten all sessions into sessions, messages, content_blocks, tool_calls "
+        "and tool_results tables for DuckDB or pandas",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Dump ./sessions to ./dump (Parquet with the parquet extra, JSON lines otherwise)
+  strands-viewer dump
+
+  # Dump again later: only new or changed sessions are written
+  strands-viewer dump /path/to/sessions --output /data/strands
+
+  # Query the tables with DuckDB
+  duckdb -c "SELECT name, count(*), median(latency_ms)
+             FROM '/data/strands/tool_calls/*/*.parquet' GROUP BY name"
+        """,
+    )
+
+    parser.add_argument(
+        "directory",
+        nargs="?",
+        default="./sessions",
+        help="Path to sessions directory, archive (.zip, .tar, .tar.gz) or s3://bucket/prefix "
+        "(default: ./sessions)",
+    )
+
+    parser.add_argument(
+        "--output", default="./dump", help="Output directory for the tables (default: ./dump)"
+    )
+
+    parser.add_argument(
+        "--format",
+        choices=DUMP_FORMATS,
+        help="Table file format (default: parquet if pyarrow is installed, otherwise jsonl)",
+    )
+
+    parser.add_argument(
+        "--batch-rows",
+        type=int,
+        default=DUMP_BATCH_ROWS,
+        help=f"Rows buffered per table before they are written (default: {DUMP_BATCH_ROWS})",
+    )
+
+    args = parser.parse_args(argv)
+    sessions_dir = _resolve_location(args.directory)
+
+    from strands_viewer.dump import default_format, dump_store
+    from strands_viewer.session_reader import SessionReader
+
+    file_format = args.format or default_format()
+    print(f"🗃️  Dumping sessions in {sessions_dir} to {args.output} ({file_format})\n")
+    try:
+        report = dump_store(
+            SessionReader(sessions_dir), args.output, file_format, max(1, args.batch_rows)
+        )
+    except ImportError as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+    print(
+        f"✅ Wrote {report['written']} session(s) ({report['rows']} rows), "
+        f"{report['unchanged']} unchanged, {report['removed']} removed, "
+        f"{report['failed']} failed"
+    )
+    if report["failed"]:
+        sys.exit(1)
+
+
+# Subcommands dispatched on the first argument unless it names an existing path;
+# anything else runs the viewer
+COMMANDS = {
+    "analyze": analyze_command,
+    "bench": bench_command,
+    "dump": dump_command,
+    "export": export_command,
+    "pack": pack_command,
+}
+
 
 def main():
     """Main CLI entry point."""
+    argv = sys.argv[1:]
+    # "--" or an existing path of the same name keeps e.g. ./export a sessions directory
+    if argv and argv[0] in COMMANDS and not Path(argv[0]).exists():
+        COMMANDS[argv[0]](argv[1:])
+        return
+
     parser = argparse.ArgumentParser(
         description="Strands Session Viewer - View your agent sessions in the browser",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -27,6 +589,38 @@ Examples:
 
   # Don't auto-open browser
   strands-viewer --no-open
+
+  # Serve a sessions directory named like a subcommand (./export is also read as a path
+  # whenever it exists)
+  strands-viewer -- export
+
+  # Serve several services' sessions, each under its own namespace
+  strands-viewer billing=/srv/billing/sessions search=/srv/search/sessions
+  strands-viewer '/srv/*/sessions'
+
+  # View sessions written by S3SessionManager (requires the s3 extra)
+  strands-viewer s3://my-bucket/sessions
+
+  # View archived sessions without extracting them
+  strands-viewer sessions-2024.tar.gz '/archive/*.zip'
+
+  # Serve from 4 worker processes
+  strands-viewer --workers 4
+
+  # Precompute analyses for all finished sessions (see: strands-viewer analyze --help)
+  strands-viewer analyze /path/to/sessions
+
+  # Compact finished sessions into single files (see: strands-viewer pack --help)
+  strands-viewer pack /path/to/sessions
+
+  # Export all sessions as OpenTelemetry traces (see: strands-viewer export --help)
+  strands-viewer export /path/to/sessions --output traces.jsonl
+
+  # Write all sessions as Parquet/JSONL tables (see: strands-viewer dump --help)
+  strands-viewer dump /path/to/sessions --output dump
+
+  # Load-test the API (see: strands-viewer bench --help)
+  strands-viewer bench /path/to/sessions
         """,
     )
 
@@ -36,13 +630,18 @@ Examples:
 
     parser.add_argument(
         "directory",
-        nargs="?",
-        default="./sessions",
-        help="Path to sessions directory (default: ./sessions)",
+        nargs="*",
+        help="Path to sessions directory, archive (.zip, .tar, .tar.gz) or s3://bucket/prefix "
+        "(default: ./sessions). Several locations, globs or NAME=PATH pairs serve several roots, "
+        "each under its own namespace",
     )
 
     parser.add_argument(
-        "--dir", dest="directory", help="Path to sessions directory (alternative to positional arg)"
+        "--dir",
+        dest="dirs",
+        action="append",
+        default=[],
+        help="Path to sessions directory (alternative to positional arg, may be repeated)",
     )
 
     parser.add_argument(
@@ -59,71 +658,186 @@ Examples:
         help="Host to bind to (default: 0.0.0.0)",
     )
 
+    _add_model_arguments(parser)
+
     parser.add_argument(
-        "--model-provider",
-        choices=["anthropic", "openai", "ollama"],
-        default="anthropic",  # Default to Anthropic Haiku for cost savings
-        help="Model provider for session analysis (default: anthropic, requires AI extra)",
+        "--chat-mode",
+        choices=["tools", "cached"],
+        default="tools",
+        help="How AI chat reads the session: agent tool calls, or a prompt-cached "
+        "rendering of the session (default: tools)",
     )
 
     parser.add_argument(
-        "--model-id",
-        help="Model ID to use (e.g., claude-haiku-4-5-20251001, gpt-5-mini-2025-08-07)",
+        "--store-dir",
+        help="Directory of precomputed analyses (default: <sessions dir>/.strands-viewer/analyses)",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--llm-concurrency",
+        type=int,
+        help="Maximum concurrent model calls from analyze/chat requests "
+        "(default: per provider, anthropic/openai 4, ollama 1)",
+    )
 
-    # Validate sessions directory exists
-    sessions_dir = Path(args.directory).resolve()
-    if not sessions_dir.exists():
-        print(f"❌ Error: Sessions directory does not exist: {args.directory}")
-        print(f"   Resolved path: {sessions_dir}")
-        print("   Please check the path and try again.")
-        sys.exit(1)
+    parser.add_argument(
+        "--llm-rate-limit",
+        type=float,
+        help="Maximum model calls started per minute (default: per provider, anthropic 50, "
+        "openai 60, ollama unlimited)",
+    )
 
-    if not sessions_dir.is_dir():
-        print(f"❌ Error: Path is not a directory: {args.directory}")
-        sys.exit(1)
+    parser.add_argument(
+        "--llm-queue-depth",
+        type=int,
+        default=16,
+        help="Requests allowed to wait for a model slot before new ones get 503 (default: 16)",
+    )
+
+    parser.add_argument(
+        "--llm-queue-timeout",
+        type=float,
+        default=30.0,
+        help="Seconds a request may wait for a model slot (default: 30)",
+    )
+
+    parser.add_argument(
+        "--record-requests",
+        metavar="FILE",
+        help="Append every HTTP request to FILE (JSON Lines) for `strands-viewer bench --replay`",
+    )
+
+    parser.add_argument(
+        "--profile-dir",
+        help="Enable profiling: requests sent with an X-Profile header are profiled and "
+        "one profile per request is written to this directory",
+    )
+
+    parser.add_argument(
+        "--profile-format",
+        choices=["speedscope", "pstats"],
+        default="speedscope",
+        help="Default profile format: speedscope timeline of reader, formatter and encoding "
+        "hooks, or a cProfile pstats dump (default: speedscope)",
+    )
+
+    parser.add_argument(
+        "--profile-all",
+        action="store_true",
+        help="With --profile-dir, profile every request, not only those with X-Profile",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes serving requests (default: 1). With more than one, "
+        "parsed sessions are shared through an on-disk cache",
+    )
+
+    parser.add_argument(
+        "--shared-cache",
+        metavar="FILE",
+        help="SQLite file caching parsed sessions across workers and restarts "
+        "(default with --workers > 1: <sessions dir>/.strands-viewer/cache.sqlite3; with "
+        "several roots, each root always uses its own default file)",
+    )
+
+    parser.add_argument(
+        "--no-warmup",
+        action="store_true",
+        help="Don't scan sessions in the background at startup (/readyz is then ready at once)",
+    )
+
+    args = parser.parse_args(argv)
+
+    # Validate sessions directories exist
+    sessions_dir = _resolve_storage_roots(args.directory + args.dirs or ["./sessions"])
 
     # Import and run the server
     try:
+        from strands_viewer.limits import AdmissionController
         from strands_viewer.server import SessionViewerApp
 
-        # Create model instance (defaults to Anthropic Haiku if AI is available)
-        model = None
-        if args.model_provider:
-            try:
-                from strands_viewer.models import (
-                    anthropic_model,
-                    openai_model,
-                    ollama_model,
-                )
-
-                model_kwargs = {}
-                if args.model_id:
-                    model_kwargs["model_id"] = args.model_id
-
-                if args.model_provider == "anthropic":
-                    model = anthropic_model(**model_kwargs)
-                    model_name = model_kwargs.get("model_id", "claude-haiku-4-5-20251001")
-                elif args.model_provider == "openai":
-                    model = openai_model(**model_kwargs)
-                    model_name = model_kwargs.get("model_id", "gpt-5-mini-2025-08-07")
-                elif args.model_provider == "ollama":
-                    model = ollama_model(**model_kwargs)
-                    model_name = model_kwargs.get("model_id", "qwen3:4b")
-
-                print(f"🤖 Using {args.model_provider} model: {model_name}")
-            except ImportError:
-                print("⚠️  Warning: AI features not available.")
-                print("   Install with: pip install 'strands-session-viewer[ai]'")
+        from strands_viewer.models import models_available
+
+        # The model (defaults to Anthropic Haiku) is created on the first AI request
+        model_factory = None
+        if args.model_provider and models_available():
+            model_name = args.model_id or DEFAULT_MODEL_IDS[args.model_provider]
+            print(f"🤖 Using {args.model_provider} model: {model_name}")
+
+            def model_factory():
+                return _create_model(args.model_provider, args.model_id)[0]
+
+        elif args.model_provider:
+            print("⚠️  Warning: AI features not available.")
+            print("   Install with: pip install 'strands-session-viewer[ai]'")
 
         print(f"\n🚀 Strands Session Viewer v{__version__}")
-        print(f"📁 Storage directory: {sessions_dir}")
+        if isinstance(sessions_dir, dict):
+            print(f"📁 Storage roots: {len(sessions_dir)}")
+            for namespace, path in sessions_dir.items():
+                print(f"   {namespace}: {path}")
+        else:
+            print(f"📁 Storage directory: {sessions_dir}")
+        if args.profile_dir:
+            print(f"🔬 Writing request profiles to: {args.profile_dir}")
         print(f"🌐 Starting server on http://localhost:{args.port}\n")
 
-        viewer = SessionViewerApp(str(sessions_dir), args.port, model=model)
-        viewer.run(open_browser=not args.no_open)
+        if args.workers > 1:
+            from strands_viewer.server import run_workers
+
+            run_workers(
+                {
+                    "storage_dir": sessions_dir,
+                    "model_provider": args.model_provider if model_factory else None,
+                    "model_id": args.model_id,
+                    "chat_mode": args.chat_mode,
+                    "analysis_dir": args.store_dir,
+                    "llm": {
+                        "max_concurrent": args.llm_concurrency,
+                        "rate_per_minute": args.llm_rate_limit,
+                        "max_queue": args.llm_queue_depth,
+                        "queue_timeout": args.llm_queue_timeout,
+                    },
+                    "request_log": args.record_requests,
+                    "profile_dir": args.profile_dir,
+                    "profile_format": args.profile_format,
+                    "profile_all": args.profile_all,
+                    "shared_cache": args.shared_cache,
+                    "warmup": not args.no_warmup,
+                },
+                host=args.host,
+                port=args.port,
+                workers=args.workers,
+                open_browser=not args.no_open,
+            )
+            return
+
+        admission = AdmissionController.for_provider(
+            args.model_provider if model_factory else "bedrock",
+            max_concurrent=args.llm_concurrency,
+            rate_per_minute=args.llm_rate_limit,
+            max_queue=args.llm_queue_depth,
+            queue_timeout=args.llm_queue_timeout,
+        )
+
+        viewer = SessionViewerApp(
+            sessions_dir,
+            args.port,
+            model_factory=model_factory,
+            chat_mode=args.chat_mode,
+            analysis_dir=args.store_dir,
+            admission=admission,
+            request_log=args.record_requests,
+            profile_dir=args.profile_dir,
+            profile_format=args.profile_format,
+            profile_all=args.profile_all,
+            shared_cache=args.shared_cache,
+            warmup=not args.no_warmup,
+        )
+        viewer.run(open_browser=not args.no_open, host=args.host)
 
     except ImportError as e:
         print("❌ Error: Missing required dependencies.")
@@ -0,0 +1,81 @@
+"""
+Compressed session files.
+
+Older session files may be compressed in place: session.json, agent.json and
+message_<n>.json can be stored as <name>.json.gz (gzip) or <name>.json.zst
+(zstd). Readers match files by their name without the compression suffix and
+decompress them on load. zstd needs the optional zstandard package.
+"""
+
+import gzip
+import io
+from typing import Any, Optional, Tuple
+
+# Compression suffixes and their Content-Encoding names
+COMPRESSION_SUFFIXES = {
+    ".gz": "gzip",
+    ".zst": "zstd",
+}
+
+_SUFFIX_TUPLE = tuple(COMPRESSION_SUFFIXES)
+
+# Suffixes a JSON session file may have, tried in this order
+JSON_SUFFIXES = (".json",) + tuple(f".json{suffix}" for suffix in COMPRESSION_SUFFIXES)
+
+
+def _import_zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "Reading .zst session files requires zstandard; install it with: "
+            "pip install 'strands-session-viewer[zstd]'"
+        ) from e
+    return zstandard
+
+
+def split_compression(name: str) -> Tuple[str, Optional[str]]:
+    """
+    Split a compression suffix off a file name.
+
+    Returns:
+        Tuple of (name without the suffix, Content-Encoding name or None)
+    """
+    if not name.endswith(_SUFFIX_TUPLE):
+        return name, None
+    for suffix, encoding in COMPRESSION_SUFFIXES.items():
+        if name.endswith(suffix):
+            return name[: -len(suffix)], encoding
+    return name, None
+
+
+def decompress(data: bytes, encoding: Optional[str]) -> bytes:
+    """
+    Decompress file contents by their Content-Encoding name (None: as they are).
+
+    Both formats are read as streams, so multi-member gzip files and zstd
+    frames written without a content size decode too.
+
+    Raises:
+        ValueError: If the data is corrupt or the encoding is unknown
+    """
+    if encoding is None:
+        return data
+    if encoding == "gzip":
+        try:
+            return gzip.decompress(data)
+        except (OSError, EOFError) as e:
+            raise ValueError(f"Invalid gzip data: {e}") from e
+    if encoding == "zstd":
+        zstandard = _import_zstandard()
+        try:
+            with zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+                return reader.read()
+        except zstandard.ZstdError as e:
+            raise ValueError(f"Invalid zstd data: {e}") from e
+    raise ValueError(f"Unsupported compression: {encoding}")
+
+
+def decompress_file(name: str, data: bytes) -> bytes:
+    """Decompress file contents according to the compression suffix of the file name."""
+    return decompress(data, split_compression(name)[1])
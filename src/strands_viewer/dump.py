@@ -0,0 +1,419 @@
+"""
+Bulk export of all sessions into normalized tables for offline analytics.
+
+Sessions are flattened into five tables, to be queried with DuckDB, pandas
+or similar tools:
+
+- sessions: one row per session
+- messages: one row per message, with its position in the session timeline
+- content_blocks: one row per content block of a message
+- tool_calls: one row per toolUse, with the status and latency of its result
+- tool_results: one row per toolResult
+
+Each table is a directory partitioned by session
+(<output>/<table>/session=<id>/part-0.parquet), written as Parquet when
+pyarrow is installed (the parquet extra) and as JSON lines otherwise. Rows
+are written in batches while a session's messages are streamed, so memory
+use stays bounded. A manifest of session fingerprints makes dumps
+incremental: only new or changed sessions are written again, and the
+partitions of deleted sessions are removed.
+"""
+
+import functools
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from strands_viewer.timeline import latency_ms, parse_timestamp
+
+# Column names and types of each table
+TABLES: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "sessions": (
+        ("session_id", "string"),
+        ("session_type", "string"),
+        ("created_at", "string"),
+        ("updated_at", "string"),
+        ("messages", "int64"),
+        ("fingerprint", "string"),
+    ),
+    "messages": (
+        ("session_id", "string"),
+        ("agent_id", "string"),
+        ("message_id", "int64"),
+        ("position", "int64"),
+        ("role", "string"),
+        ("created_at", "string"),
+        ("updated_at", "string"),
+        ("content_blocks", "int64"),
+        ("text_chars", "int64"),
+    ),
+    "content_blocks": (
+        ("session_id", "string"),
+        ("agent_id", "string"),
+        ("message_id", "int64"),
+        ("block_index", "int64"),
+        ("type", "string"),
+        ("text", "string"),
+    ),
+    "tool_calls": (
+        ("session_id", "string"),
+        ("agent_id", "string"),
+        ("message_id", "int64"),
+        ("tool_use_id", "string"),
+        ("name", "string"),
+        ("input", "string"),
+        ("created_at", "string"),
+        ("result_message_id", "int64"),
+        ("status", "string"),
+        ("latency_ms", "double"),
+    ),
+    "tool_results": (
+        ("session_id", "string"),
+        ("agent_id", "string"),
+        ("message_id", "int64"),
+        ("tool_use_id", "string"),
+        ("status", "string"),
+        ("text", "string"),
+        ("created_at", "string"),
+    ),
+}
+
+# Default output directory of dumps made by the viewer, relative to the sessions directory
+DEFAULT_DUMP_SUBDIR = Path(".strands-viewer") / "dump"
+
+# Output formats
+DUMP_FORMATS = ("parquet", "jsonl")
+
+# Rows buffered per table before they are written
+DUMP_BATCH_ROWS = 10_000
+
+# Name of the manifest of dumped sessions in the output directory
+MANIFEST_FILE = "_manifest.json"
+
+# Bumped when the tables change, so existing dumps are written again
+DUMP_VERSION = 1
+
+
+@functools.lru_cache(maxsize=None)
+def _import_pyarrow() -> Any:
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def default_format() -> str:
+    """Parquet if pyarrow is installed, otherwise JSON lines."""
+    return "parquet" if _import_pyarrow() is not None else "jsonl"
+
+
+def _partition(session_id: str) -> str:
+    # Hive-style partition directory, with the session ID escaped as a path segment
+    return f"session={quote(session_id, safe='')}"
+
+
+def _block_type(content: Dict[str, Any]) -> str:
+    for key in ("text", "toolUse", "toolResult"):
+        if key in content:
+            return key
+    return next(iter(content), "unknown")
+
+
+def _block_text(content: Dict[str, Any]) -> Optional[str]:
+    if "text" in content:
+        return content["text"]
+    if "toolResult" in content:
+        texts = [rc["text"] for rc in content["toolResult"].get("content", []) if "text" in rc]
+        return "\n".join(texts) if texts else None
+    if "toolUse" in content:
+        return json.dumps(content["toolUse"].get("input", {}), ensure_ascii=False, sort_keys=True)
+    return None
+
+
+class _TableWriter:
+    """Writes one table's rows for one session partition, batch by batch."""
+
+    def __init__(self, directory: Path, table: str, file_format: str, batch_rows: int):
+        self.path = directory / f"part-0.{file_format}"
+        self.columns = [name for name, _ in TABLES[table]]
+        self.types = dict(TABLES[table])
+        self.file_format = file_format
+        self.batch_rows = batch_rows
+        self.rows: List[Dict[str, Any]] = []
+        self.written = 0
+        self._writer: Any = None
+        self._file: Any = None
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self.rows.append(row)
+        if len(self.rows) >= self.batch_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.rows:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.file_format == "parquet":
+            pa = _import_pyarrow()
+            schema = pa.schema([(name, self.types[name]) for name in self.columns])
+            if self._writer is None:
+                self._writer = pa.parquet.ParquetWriter(str(self.path), schema)
+            self._writer.write_table(pa.Table.from_pylist(self.rows, schema=schema))
+        else:
+            if self._file is None:
+                self._file = open(self.path, "w", encoding="utf-8")
+            for row in self.rows:
+                self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.written += len(self.rows)
+        self.rows = []
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def dump_session(
+    reader: Any,
+    summary: Dict[str, Any],
+    fingerprint: str,
+    output: Path,
+    file_format: str,
+    batch_rows: int = DUMP_BATCH_ROWS,
+) -> Optional[int]:
+    """
+    Write one session's rows into its partition of every table.
+
+    Existing partitions of the session are replaced. Messages are read
+    through reader.iter_messages, so only a batch of rows per table is held
+    in memory; tool calls are held until their result is seen.
+
+    Returns:
+        Number of rows written, or None if the session does not exist
+    """
+    session_id = summary["session_id"]
+    messages = reader.iter_messages(session_id)
+    if messages is None:
+        return None
+
+    partition = _partition(session_id)
+    for table in TABLES:
+        shutil.rmtree(output / table / partition, ignore_errors=True)
+    writers = {
+        table: _TableWriter(output / table / partition, table, file_format, batch_rows)
+        for table in TABLES
+    }
+    pending: Dict[str, Dict[str, Any]] = {}
+    count = 0
+    try:
+        for position, message in enumerate(messages):
+            count += 1
+            msg = message.get("message") or {}
+            agent_id = message.get("agent_id")
+            message_id = message.get("message_id")
+            created_at = message.get("created_at")
+            content = [c for c in msg.get("content") or [] if isinstance(c, dict)]
+            text_chars = 0
+            for index, block in enumerate(content):
+                text = _block_text(block)
+                text_chars += len(block.get("text") or "")
+                writers["content_blocks"].add(
+                    {
+                        "session_id": session_id,
+                        "agent_id": agent_id,
+                        "message_id": message_id,
+                        "block_index": index,
+                        "type": _block_type(block),
+                        "text": text,
+                    }
+                )
+                if "toolUse" in block:
+                    tool_use = block["toolUse"]
+                    call = {
+                        "session_id": session_id,
+                        "agent_id": agent_id,
+                        "message_id": message_id,
+                        "tool_use_id": tool_use.get("toolUseId"),
+                        "name": tool_use.get("name", "unknown"),
+                        "input": text,
+                        "created_at": created_at,
+                        "result_message_id": None,
+                        "status": None,
+                        "latency_ms": None,
+                    }
+                    if call["tool_use_id"] and call["tool_use_id"] not in pending:
+                        pending[call["tool_use_id"]] = call
+                    else:
+                        writers["tool_calls"].add(call)
+                if "toolResult" in block:
+                    tool_result = block["toolResult"]
+                    tool_use_id = tool_result.get("toolUseId")
+                    writers["tool_results"].add(
+                        {
+                            "session_id": session_id,
+                            "agent_id": agent_id,
+                            "message_id": message_id,
+                            "tool_use_id": tool_use_id,
+                            "status": tool_result.get("status"),
+                            "text": text,
+                            "created_at": created_at,
+                        }
+                    )
+                    call = pending.pop(tool_use_id or "", None)
+                    if call is not None:
+                        call["result_message_id"] = message_id
+                        call["status"] = tool_result.get("status")
+                        call["latency_ms"] = latency_ms(
+                            parse_timestamp(call["created_at"]), parse_timestamp(created_at)
+                        )
+                        writers["tool_calls"].add(call)
+            writers["messages"].add(
+                {
+                    "session_id": session_id,
+                    "agent_id": agent_id,
+                    "message_id": message_id,
+                    "position": position,
+                    "role": msg.get("role"),
+                    "created_at": created_at,
+                    "updated_at": message.get("updated_at"),
+                    "content_blocks": len(content),
+                    "text_chars": text_chars,
+                }
+            )
+
+        # Calls still waiting for a result
+        for call in pending.values():
+            writers["tool_calls"].add(call)
+        writers["sessions"].add(
+            {
+                "session_id": session_id,
+                "session_type": summary.get("session_type"),
+                "created_at": summary.get("created_at"),
+                "updated_at": summary.get("updated_at"),
+                "messages": count,
+                "fingerprint": fingerprint,
+            }
+        )
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return sum(writer.written for writer in writers.values())
+
+
+def _load_manifest(output: Path) -> Dict[str, Any]:
+    try:
+        with open(output / MANIFEST_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(output: Path, manifest: Dict[str, Any]) -> None:
+    path = output / MANIFEST_FILE
+    temp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(temp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(temp, path)
+
+
+def dump_store(
+    reader: Any,
+    output: str,
+    file_format: Optional[str] = None,
+    batch_rows: int = DUMP_BATCH_ROWS,
+    progress: Callable[[str], None] = print,
+) -> Dict[str, Any]:
+    """
+    Dump every session of a reader into partitioned tables, incrementally.
+
+    Sessions whose fingerprint matches the manifest of a previous dump (in
+    the same format) are skipped. Changing the format rewrites every session.
+
+    Args:
+        reader: SessionReader (or CachingSessionReader / MultiRootReader)
+        output: Output directory
+        file_format: parquet or jsonl (default: parquet if pyarrow is installed)
+        batch_rows: Rows buffered per table before they are written
+        progress: Callback for progress messages
+
+    Returns:
+        Format, counts of sessions, sessions written, unchanged, removed and
+        failed, and rows written
+
+    Raises:
+        ValueError: If the format is unknown
+        ImportError: If parquet is requested without pyarrow
+    """
+    file_format = file_format or default_format()
+    if file_format not in DUMP_FORMATS:
+        raise ValueError(f"Unsupported dump format: {file_format} (use {', '.join(DUMP_FORMATS)})")
+    if file_format == "parquet" and _import_pyarrow() is None:
+        raise ImportError(
+            "Parquet dumps require pyarrow; install it with: "
+            "pip install 'strands-session-viewer[parquet]'"
+        )
+
+    target = Path(output)
+    target.mkdir(parents=True, exist_ok=True)
+    manifest = _load_manifest(target)
+    if manifest.get("version") != DUMP_VERSION or manifest.get("format") != file_format:
+        for table in TABLES:
+            shutil.rmtree(target / table, ignore_errors=True)
+        manifest = {}
+    previous: Dict[str, str] = manifest.get("sessions", {})
+    sessions: Dict[str, str] = {}
+    report = {
+        "format": file_format,
+        "sessions": 0,
+        "written": 0,
+        "unchanged": 0,
+        "removed": 0,
+        "failed": 0,
+        "rows": 0,
+    }
+
+    completed = False
+    try:
+        for summary in reader.list_sessions():
+            session_id = summary["session_id"]
+            fingerprint = reader.get_fingerprint(session_id)
+            if fingerprint is None:
+                continue
+            report["sessions"] += 1
+            if previous.get(session_id) == fingerprint:
+                sessions[session_id] = fingerprint
+                report["unchanged"] += 1
+                continue
+            try:
+                rows = dump_session(reader, summary, fingerprint, target, file_format, batch_rows)
+            except (OSError, ValueError) as e:
+                progress(f"⚠️  Could not dump session {session_id}: {e}")
+                rows = None
+            if rows is None:
+                report["failed"] += 1
+                continue
+            sessions[session_id] = fingerprint
+            report["written"] += 1
+            report["rows"] += rows
+
+        for session_id in set(previous) - set(sessions):
+            for table in TABLES:
+                shutil.rmtree(target / table / _partition(session_id), ignore_errors=True)
+            report["removed"] += 1
+        completed = True
+    finally:
+        # An interrupted dump keeps the entries of sessions it did not get to
+        # (a session being written has a new fingerprint, so it is written again)
+        if not completed:
+            sessions = {**previous, **sessions}
+        _save_manifest(
+            target, {"version": DUMP_VERSION, "format": file_format, "sessions": sessions}
+        )
+    return report
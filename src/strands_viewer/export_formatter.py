@@ -4,7 +4,13 @@ Export formatters for converting sessions to different formats.
 
 import json
 from datetime import datetime
-from typing import Dict, Any
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+from strands_viewer.otlp import format_otlp
+
+# Supported export formats
+EXPORT_FORMATS = ("markdown", "json", "text", "otlp")
 
 
 def format_timestamp(timestamp: str) -> str:
@@ -157,7 +163,7 @@ def format_text(session: Dict[str, Any]) -> str:
 
 def get_filename(session_id: str, format_type: str) -> str:
     """Generate appropriate filename for export."""
-    extensions = {"markdown": "md", "json": "json", "text": "txt"}
+    extensions = {"markdown": "md", "json": "json", "text": "txt", "otlp": "otlp.json"}
     ext = extensions.get(format_type, "txt")
     return f"session_{session_id}.{ext}"
 
@@ -168,7 +174,7 @@ def format_session(session: Dict[str, Any], format_type: str) -> str:
 
     Args:
         session: Session data dictionary
-        format_type: One of 'markdown', 'json', 'text'
+        format_type: One of 'markdown', 'json', 'text', 'otlp'
 
     Returns:
         Formatted string content
@@ -176,7 +182,12 @@ def format_session(session: Dict[str, Any], format_type: str) -> str:
     Raises:
         ValueError: If format_type is not supported
     """
-    formatters = {"markdown": format_markdown, "json": format_json, "text": format_text}
+    formatters = {
+        "markdown": format_markdown,
+        "json": format_json,
+        "text": format_text,
+        "otlp": format_otlp,
+    }
 
     formatter = formatters.get(format_type)
     if not formatter:
@@ -185,3 +196,61 @@ def format_session(session: Dict[str, Any], format_type: str) -> str:
         )
 
     return formatter(session)
+
+
+def export_store(
+    reader: Any,
+    output: str,
+    format_type: str,
+    progress: Callable[[str], None] = print,
+) -> Dict[str, int]:
+    """
+    Export every session of a reader.
+
+    Sessions are written to one file each in the output directory, or, for
+    an output ending in .jsonl, as one line each of a single file (for OTLP,
+    the layout the OpenTelemetry Collector's file exporter writes).
+
+    Args:
+        reader: SessionReader (or MultiRootReader)
+        output: Output directory, or .jsonl file
+        format_type: Export format, see format_session
+        progress: Callback for progress messages
+
+    Returns:
+        Counts of exported and failed sessions
+
+    Raises:
+        ValueError: If format_type is not supported, or is not single-line for a .jsonl output
+    """
+    if format_type not in EXPORT_FORMATS:
+        raise ValueError(
+            f"Unsupported format: {format_type}. Must be one of: {list(EXPORT_FORMATS)}"
+        )
+    combined = output.endswith(".jsonl")
+    if combined and format_type != "otlp":
+        raise ValueError(f"Only otlp exports can be combined into a .jsonl file, not {format_type}")
+
+    report = {"exported": 0, "failed": 0}
+    target = Path(output)
+    (target.parent if combined else target).mkdir(parents=True, exist_ok=True)
+    lines = open(target, "w", encoding="utf-8") if combined else None
+    try:
+        for summary in reader.list_sessions():
+            session_id = summary["session_id"]
+            session = reader.get_session(session_id)
+            if session is None:
+                progress(f"⚠️  Could not read session {session_id}")
+                report["failed"] += 1
+                continue
+            content = format_session(session, format_type)
+            if lines is not None:
+                lines.write(content + "\n")
+            else:
+                filename = get_filename(session_id.replace(":", "_"), format_type)
+                (target / filename).write_text(content, encoding="utf-8")
+            report["exported"] += 1
+    finally:
+        if lines is not None:
+            lines.close()
+    return report
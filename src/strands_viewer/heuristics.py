@@ -0,0 +1,367 @@
+"""
+Rule-based session analysis that needs no model.
+
+Answers "what failed and which tools ran" deterministically from session data:
+error clusters grouped by normalized error text, retry loops, failing tools and
+long gaps between messages. Runs in milliseconds and works without the [ai] extra.
+"""
+
+import json
+import re
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from strands_viewer.stats import percentile
+from strands_viewer.timeline import iter_content, parse_timestamp, result_text
+
+# Gaps between consecutive messages longer than this (seconds) are reported.
+DEFAULT_GAP_THRESHOLD_SECONDS = 60.0
+
+# Consecutive calls of the same tool needed to report a retry loop.
+DEFAULT_RETRY_THRESHOLD = 3
+
+_NORMALIZE_PATTERNS = [
+    (re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"), "<uuid>"),
+    (re.compile(r"0x[0-9a-f]+"), "<hex>"),
+    (re.compile(r"\b[0-9a-f]{16,}\b"), "<hex>"),
+    (re.compile(r"(?:[a-z]:)?(?:[\\/][\w.\-]+){2,}[\\/]?"), "<path>"),
+    (re.compile(r"'[^']*'|\"[^\"]*\""), "<str>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+    (re.compile(r"\s+"), " "),
+]
+
+
+def normalize_error_text(text: str, max_length: int = 200) -> str:
+    """
+    Normalize an error message so that variants of the same error compare equal.
+
+    IDs, numbers, paths and quoted values are replaced with placeholders.
+    """
+    normalized = text.strip().lower()
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+    return normalized.strip()[:max_length]
+
+
+def count_tool_usage(messages: List[Dict[str, Any]]) -> Dict[str, int]:
+    """Count tool calls per tool name."""
+    tool_stats: Dict[str, int] = {}
+    for _, content in iter_content(messages):
+        if "toolUse" in content:
+            tool_name = content["toolUse"].get("name", "unknown")
+            tool_stats[tool_name] = tool_stats.get(tool_name, 0) + 1
+    return tool_stats
+
+
+def collect_tool_errors(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Find all tool results with error status.
+
+    Returns:
+        List of errors with message number, tool use ID, tool name and error text
+    """
+    tool_names: Dict[str, str] = {}
+    errors = []
+
+    for msg_idx, content in iter_content(messages):
+        if "toolUse" in content:
+            tool_use = content["toolUse"]
+            tool_names[tool_use.get("toolUseId", "")] = tool_use.get("name", "unknown")
+
+        if "toolResult" in content:
+            tool_result = content["toolResult"]
+            if tool_result.get("status") == "error":
+                tool_use_id = tool_result.get("toolUseId", "unknown")
+                errors.append(
+                    {
+                        "message_number": msg_idx,
+                        "tool_use_id": tool_use_id,
+                        "tool_name": tool_names.get(tool_use_id, "unknown"),
+                        "error_text": result_text(tool_result),
+                    }
+                )
+
+    return errors
+
+
+def cluster_errors(errors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group errors by normalized error text, most frequent first."""
+    clusters: Dict[str, Dict[str, Any]] = {}
+    for error in errors:
+        signature = normalize_error_text(error["error_text"]) or "<empty error>"
+        cluster = clusters.get(signature)
+        if cluster is None:
+            cluster = clusters[signature] = {
+                "signature": signature,
+                "count": 0,
+                "tools": [],
+                "message_numbers": [],
+                "example": error["error_text"][:500],
+            }
+        cluster["count"] += 1
+        cluster["message_numbers"].append(error["message_number"])
+        if error["tool_name"] not in cluster["tools"]:
+            cluster["tools"].append(error["tool_name"])
+
+    return sorted(clusters.values(), key=lambda c: (-c["count"], c["message_numbers"][0]))
+
+
+def _tool_calls(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """List tool calls in order, with their result status where available."""
+    calls = []
+    by_id: Dict[str, Dict[str, Any]] = {}
+
+    for msg_idx, content in iter_content(messages):
+        if "toolUse" in content:
+            tool_use = content["toolUse"]
+            call = {
+                "message_number": msg_idx,
+                "tool_use_id": tool_use.get("toolUseId"),
+                "name": tool_use.get("name", "unknown"),
+                "input": json.dumps(tool_use.get("input", {}), sort_keys=True),
+                "status": None,
+            }
+            calls.append(call)
+            if call["tool_use_id"]:
+                by_id[call["tool_use_id"]] = call
+
+        if "toolResult" in content:
+            tool_result = content["toolResult"]
+            call = by_id.get(tool_result.get("toolUseId", ""))
+            if call is not None:
+                call["status"] = tool_result.get("status")
+
+    return calls
+
+
+def summarize_tool_latency(calls: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Per-tool latency percentiles of paired tool calls (see pair_tool_calls).
+
+    Returns:
+        One entry per tool with calls, completed (calls with a latency), errors,
+        total_ms, mean_ms, p50_ms, p95_ms, p99_ms and max_ms, most total time first
+    """
+    latencies: Dict[str, List[float]] = {}
+    stats: Dict[str, Dict[str, Any]] = {}
+    for call in calls:
+        entry = stats.setdefault(call["name"], {"tool": call["name"], "calls": 0, "errors": 0})
+        entry["calls"] += 1
+        if call["status"] == "error":
+            entry["errors"] += 1
+        values = latencies.setdefault(call["name"], [])
+        if call["latency_ms"] is not None:
+            values.append(call["latency_ms"])
+
+    for name, entry in stats.items():
+        values = sorted(latencies[name])
+        total = sum(values)
+        entry.update(
+            {
+                "completed": len(values),
+                "total_ms": round(total, 3),
+                "mean_ms": round(total / len(values), 3) if values else None,
+                "p50_ms": percentile(values, 50),
+                "p95_ms": percentile(values, 95),
+                "p99_ms": percentile(values, 99),
+                "max_ms": values[-1] if values else None,
+            }
+        )
+    return sorted(stats.values(), key=lambda e: (-e["total_ms"], e["tool"]))
+
+
+def detect_retry_loops(
+    messages: List[Dict[str, Any]], min_repeats: int = DEFAULT_RETRY_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """
+    Find runs of consecutive calls to the same tool that look like retries.
+
+    A run counts as a retry loop when it has at least min_repeats calls and
+    either repeats identical input or contains failed calls.
+    """
+    loops = []
+    calls = _tool_calls(messages)
+
+    start = 0
+    while start < len(calls):
+        end = start
+        while end + 1 < len(calls) and calls[end + 1]["name"] == calls[start]["name"]:
+            end += 1
+
+        run = calls[start : end + 1]
+        errors = sum(1 for call in run if call["status"] == "error")
+        identical = len({call["input"] for call in run}) == 1
+        if len(run) >= min_repeats and (identical or errors):
+            loops.append(
+                {
+                    "tool": calls[start]["name"],
+                    "count": len(run),
+                    "errors": errors,
+                    "identical_input": identical,
+                    "first_message": run[0]["message_number"],
+                    "last_message": run[-1]["message_number"],
+                }
+            )
+        start = end + 1
+
+    return loops
+
+
+def summarize_failing_tools(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-tool call and error counts for tools with at least one error."""
+    stats: Dict[str, Dict[str, Any]] = {}
+    for call in _tool_calls(messages):
+        entry = stats.setdefault(call["name"], {"tool": call["name"], "calls": 0, "errors": 0})
+        entry["calls"] += 1
+        if call["status"] == "error":
+            entry["errors"] += 1
+
+    failing = [entry for entry in stats.values() if entry["errors"]]
+    for entry in failing:
+        entry["error_rate"] = round(entry["errors"] / entry["calls"], 3)
+    return sorted(failing, key=lambda e: (-e["errors"], e["tool"]))
+
+
+def find_long_gaps(
+    messages: List[Dict[str, Any]], threshold_seconds: float = DEFAULT_GAP_THRESHOLD_SECONDS
+) -> List[Dict[str, Any]]:
+    """Find gaps between consecutive messages longer than threshold_seconds."""
+    gaps = []
+    previous: Optional[datetime] = None
+
+    for msg_idx, msg_wrapper in enumerate(messages, 1):
+        current = parse_timestamp(msg_wrapper.get("created_at"))
+        if current is None:
+            continue
+        if previous is not None:
+            try:
+                seconds = (current - previous).total_seconds()
+            except TypeError:  # Mixed naive and aware timestamps
+                seconds = 0.0
+            if seconds > threshold_seconds:
+                gaps.append(
+                    {
+                        "after_message": msg_idx - 1,
+                        "before_message": msg_idx,
+                        "seconds": round(seconds, 3),
+                    }
+                )
+        previous = current
+
+    return sorted(gaps, key=lambda g: -g["seconds"])
+
+
+def analyze_session_heuristics(
+    session: Dict[str, Any],
+    gap_threshold_seconds: float = DEFAULT_GAP_THRESHOLD_SECONDS,
+    retry_threshold: int = DEFAULT_RETRY_THRESHOLD,
+) -> Dict[str, Any]:
+    """
+    Produce a structured, rule-based summary of a session.
+
+    Args:
+        session: Session data dictionary
+        gap_threshold_seconds: Minimum gap between messages to report
+        retry_threshold: Minimum consecutive calls of one tool to report as a retry loop
+
+    Returns:
+        Dictionary with message and tool statistics, error clusters, retry loops,
+        failing tools and long gaps
+    """
+    start = time.perf_counter()
+    messages = session.get("messages", [])
+
+    roles: Dict[str, int] = {}
+    for msg_wrapper in messages:
+        role = msg_wrapper.get("message", {}).get("role", "unknown")
+        roles[role] = roles.get(role, 0) + 1
+
+    tool_usage = count_tool_usage(messages)
+    errors = collect_tool_errors(messages)
+
+    timestamps = [parse_timestamp(m.get("created_at")) for m in messages]
+    timestamps = [t for t in timestamps if t is not None]
+    duration = None
+    if len(timestamps) >= 2:
+        try:
+            duration = round((timestamps[-1] - timestamps[0]).total_seconds(), 3)
+        except TypeError:
+            duration = None
+
+    report = {
+        "session_id": session.get("session_id"),
+        "message_count": len(messages),
+        "messages_by_role": roles,
+        "duration_seconds": duration,
+        "tool_calls": sum(tool_usage.values()),
+        "tool_usage": dict(sorted(tool_usage.items(), key=lambda x: x[1], reverse=True)),
+        "error_count": len(errors),
+        "error_clusters": cluster_errors(errors),
+        "retry_loops": detect_retry_loops(messages, retry_threshold),
+        "failing_tools": summarize_failing_tools(messages),
+        "long_gaps": find_long_gaps(messages, gap_threshold_seconds),
+    }
+    report["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+    return report
+
+
+def format_heuristic_report(report: Dict[str, Any]) -> str:
+    """Render a heuristic report as Markdown."""
+    lines = ["## Quick Analysis", ""]
+    roles = ", ".join(f"{count} {role}" for role, count in report["messages_by_role"].items())
+    lines.append(f"**Messages:** {report['message_count']}" + (f" ({roles})" if roles else ""))
+    if report["duration_seconds"] is not None:
+        lines.append(f"**Duration:** {report['duration_seconds']:.0f}s")
+    lines.append(f"**Tool calls:** {report['tool_calls']}")
+    lines.append(f"**Errors:** {report['error_count']}")
+    lines.append("")
+
+    if report["tool_usage"]:
+        lines.append("### Tools Used")
+        for tool_name, count in report["tool_usage"].items():
+            lines.append(f"- `{tool_name}`: {count} call(s)")
+        lines.append("")
+
+    if report["failing_tools"]:
+        lines.append("### Failing Tools")
+        for entry in report["failing_tools"]:
+            lines.append(
+                f"- `{entry['tool']}`: {entry['errors']}/{entry['calls']} calls failed "
+                f"({entry['error_rate']:.0%})"
+            )
+        lines.append("")
+
+    if report["error_clusters"]:
+        lines.append("### Error Clusters")
+        for cluster in report["error_clusters"]:
+            messages = ", ".join(f"#{n}" for n in cluster["message_numbers"][:10])
+            lines.append(
+                f"- **{cluster['count']}×** in {', '.join(f'`{t}`' for t in cluster['tools'])} "
+                f"(messages {messages}): {cluster['example'][:200]}"
+            )
+        lines.append("")
+
+    if report["retry_loops"]:
+        lines.append("### Retry Loops")
+        for loop in report["retry_loops"]:
+            detail = "identical input" if loop["identical_input"] else f"{loop['errors']} failed"
+            lines.append(
+                f"- `{loop['tool']}` called {loop['count']}× in a row "
+                f"(messages #{loop['first_message']}-#{loop['last_message']}, {detail})"
+            )
+        lines.append("")
+
+    if report["long_gaps"]:
+        lines.append("### Long Gaps")
+        for gap in report["long_gaps"][:10]:
+            lines.append(
+                f"- {gap['seconds']:.0f}s between messages "
+                f"#{gap['after_message']} and #{gap['before_message']}"
+            )
+        lines.append("")
+
+    if not (report["error_clusters"] or report["retry_loops"] or report["long_gaps"]):
+        lines.append("No errors, retry loops or long gaps detected.")
+
+    return "\n".join(lines).rstrip() + "\n"
@@ -0,0 +1,311 @@
+"""
+Rate limiting and admission control for calls to LLM model providers.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from strands_viewer.stats import percentile
+
+# Default request rates (requests per minute) per model provider. None means unlimited.
+DEFAULT_PROVIDER_RATES: Dict[str, Optional[float]] = {
+    "anthropic": 50,
+    "openai": 60,
+    "ollama": None,
+}
+
+# Default number of concurrent model calls per provider.
+DEFAULT_PROVIDER_CONCURRENCY: Dict[str, int] = {
+    "anthropic": 4,
+    "openai": 4,
+    "ollama": 1,
+}
+
+# Model class names of the Strands providers, mapped to provider names.
+MODEL_PROVIDERS = {
+    "AnthropicModel": "anthropic",
+    "OpenAIModel": "openai",
+    "OllamaModel": "ollama",
+    "BedrockModel": "bedrock",
+}
+
+# Number of recent queue waits kept for percentiles.
+QUEUE_WAIT_HISTORY = 500
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter."""
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate_per_minute: Sustained number of acquisitions allowed per minute
+            burst: Maximum number of tokens stored (default: one second of rate, at least 1)
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst if burst is not None else max(1, int(self.rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available, without waiting."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def time_until_available(self) -> float:
+        """Seconds until the next token becomes available."""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1:
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Take a token, waiting until one is available.
+
+        Args:
+            timeout: Maximum seconds to wait (default: wait indefinitely)
+
+        Returns:
+            True if a token was taken, False if the timeout expired
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.try_acquire():
+                return True
+            wait = self.time_until_available()
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or wait > remaining:
+                    return False
+            time.sleep(max(wait, 0.001))
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """
+        Take a token, waiting for one, before a model request.
+
+        Matches AdmissionController.admit, so a bucket can be given as a
+        SessionAnalyzer call_gate to charge it once per model request.
+        """
+        self.acquire()
+        yield
+
+
+def provider_for_model(model: Any) -> str:
+    """Get the provider name for a model instance (Bedrock when no model is given)."""
+    if model is None:
+        return "bedrock"
+    return MODEL_PROVIDERS.get(type(model).__name__, type(model).__name__.lower())
+
+
+class AdmissionRejected(Exception):
+    """Raised when a call cannot be admitted; maps to an HTTP 429 or 503 response."""
+
+    def __init__(self, status_code: int, retry_after: float, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.retry_after = max(1, int(math.ceil(retry_after)))
+        self.reason = reason
+
+
+def admission_rejection(error: BaseException) -> Optional[AdmissionRejected]:
+    """
+    The AdmissionRejected an error is or was raised from, or None.
+
+    Rejections happen inside model requests, and the agent event loop may
+    wrap them in its own exception types.
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        if isinstance(current, AdmissionRejected):
+            return current
+        seen.add(id(current))
+        current = current.__cause__ or current.__context__
+    return None
+
+
+class AdmissionController:
+    """
+    Bounds concurrent requests to one model provider, with a token-bucket rate limit.
+
+    admit() is held around each request to the provider (see
+    ai_analysis.GatedModel), not around a whole analysis, which may send
+    several.
+
+    Callers beyond max_concurrent wait in a queue of at most max_queue entries.
+    When the queue is full the call is rejected immediately with 503; when the
+    rate limit cannot grant a token within queue_timeout it is rejected with 429.
+    Both rejections carry a Retry-After estimate.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        max_queue: int = 16,
+        rate_per_minute: Optional[float] = None,
+        burst: Optional[int] = None,
+        queue_timeout: float = 30.0,
+        provider: str = "default",
+    ):
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        if max_queue < 0:
+            raise ValueError("max_queue cannot be negative")
+
+        self.provider = provider
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.bucket = TokenBucket(rate_per_minute, burst) if rate_per_minute else None
+
+        self._slots = threading.Semaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._queued = 0
+        self._admitted = 0
+        self._rejected = {"queue_full": 0, "rate_limited": 0, "timeout": 0}
+        self._waits: deque = deque(maxlen=QUEUE_WAIT_HISTORY)
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._service_avg = 1.0  # Seconds; exponentially weighted
+
+    @classmethod
+    def for_provider(
+        cls,
+        provider: str,
+        max_concurrent: Optional[int] = None,
+        rate_per_minute: Optional[float] = None,
+        max_queue: int = 16,
+        queue_timeout: float = 30.0,
+    ) -> "AdmissionController":
+        """Create a controller using the provider's default limits unless overridden."""
+        return cls(
+            max_concurrent=max_concurrent or DEFAULT_PROVIDER_CONCURRENCY.get(provider, 4),
+            max_queue=max_queue,
+            rate_per_minute=(
+                rate_per_minute
+                if rate_per_minute is not None
+                else DEFAULT_PROVIDER_RATES.get(provider)
+            ),
+            queue_timeout=queue_timeout,
+            provider=provider,
+        )
+
+    def _reject(self, kind: str, status_code: int, retry_after: float, reason: str) -> None:
+        with self._lock:
+            self._rejected[kind] += 1
+        raise AdmissionRejected(status_code, retry_after, reason)
+
+    def _estimated_wait(self, queued: int) -> float:
+        return self._service_avg * (queued + 1) / self.max_concurrent
+
+    @contextmanager
+    def admit(self) -> Iterator[None]:
+        """
+        Wait for a slot (and a rate-limit token) and hold it for the duration of a call.
+
+        Raises:
+            AdmissionRejected: If the queue is full, the rate limit cannot be met
+                               in time, or no slot frees up within queue_timeout
+        """
+        with self._lock:
+            saturated = self._in_flight >= self.max_concurrent
+            if saturated and self._queued >= self.max_queue:
+                self._rejected["queue_full"] += 1
+                raise AdmissionRejected(
+                    503,
+                    self._estimated_wait(self._queued),
+                    f"Too many pending {self.provider} requests; try again later",
+                )
+            self._queued += 1
+
+        start = time.monotonic()
+        deadline = start + self.queue_timeout
+        dequeued = False
+        try:
+            if self.bucket is not None:
+                wait = self.bucket.time_until_available()
+                if wait > self.queue_timeout or not self.bucket.acquire(self.queue_timeout):
+                    self._reject(
+                        "rate_limited",
+                        429,
+                        wait,
+                        f"{self.provider} rate limit reached; try again later",
+                    )
+
+            if not self._slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                self._reject(
+                    "timeout",
+                    503,
+                    self._estimated_wait(self._queued),
+                    f"Timed out waiting for a free {self.provider} request slot",
+                )
+
+            waited = time.monotonic() - start
+            with self._lock:
+                self._queued -= 1
+                dequeued = True
+                self._in_flight += 1
+                self._admitted += 1
+                self._waits.append(waited)
+                self._wait_total += waited
+                self._wait_max = max(self._wait_max, waited)
+        finally:
+            if not dequeued:
+                with self._lock:
+                    self._queued -= 1
+
+        service_start = time.monotonic()
+        try:
+            yield
+        finally:
+            duration = time.monotonic() - service_start
+            with self._lock:
+                self._in_flight -= 1
+                self._service_avg = 0.8 * self._service_avg + 0.2 * duration
+            self._slots.release()
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load, rejection counts and queue wait time statistics (seconds)."""
+        with self._lock:
+            waits = sorted(self._waits)
+            admitted = self._admitted
+            p50, p95 = percentile(waits, 50), percentile(waits, 95)
+            return {
+                "provider": self.provider,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "rate_per_minute": round(self.bucket.rate * 60, 3) if self.bucket else None,
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+                "admitted": admitted,
+                "rejected": dict(self._rejected),
+                "queue_wait_seconds": {
+                    "mean": round(self._wait_total / admitted, 4) if admitted else None,
+                    "p50": round(p50, 4) if p50 is not None else None,
+                    "p95": round(p95, 4) if p95 is not None else None,
+                    "max": round(self._wait_max, 4),
+                },
+            }
@@ -0,0 +1,368 @@
+"""
+HTTP load testing for the session viewer.
+
+Replays a weighted mix of list, open, paginate, export and search requests
+with concurrent async clients, either against a SessionViewerApp started
+in-process or against a running viewer URL, and reports throughput and
+latency percentiles per route. Request logs recorded from a running server
+(see RequestLogMiddleware) can be replayed to compare releases under
+realistic traffic.
+
+Requires httpx: pip install 'strands-session-viewer[bench]'
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from strands_viewer.stats import percentile
+
+# Default request mix: route name -> relative weight
+DEFAULT_MIX = {"list": 1, "open": 3, "paginate": 3, "export": 1, "search": 1}
+
+SEARCH_TERMS = ["error", "failed", "tool", "result", "timeout", "file"]
+
+EXPORT_FORMATS = ["markdown", "json", "text"]
+
+# Path patterns used to label replayed requests, checked in order
+_ROUTE_PATTERNS = [
+    ("list", re.compile(r"^/api/sessions/?$")),
+    ("paginate", re.compile(r"^/api/sessions/[^/]+/messages$")),
+    ("export", re.compile(r"^/api/sessions/[^/]+/export$")),
+    ("search", re.compile(r"^/api/search$")),
+    ("open", re.compile(r"^/api/sessions/[^/]+$")),
+]
+
+
+def classify_path(path: str) -> str:
+    """Get the route label for a request path."""
+    for name, pattern in _ROUTE_PATTERNS:
+        if pattern.match(path):
+            return name
+    return "other"
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse a request mix such as "list=1,open=3,search=1".
+
+    Raises:
+        ValueError: If a route is unknown or a weight is invalid
+    """
+    mix = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown route '{name}'. Must be one of: {list(DEFAULT_MIX)}")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError as e:
+            raise ValueError(f"Invalid weight for '{name}': {weight}") from e
+        if mix[name] < 0:
+            raise ValueError(f"Weight for '{name}' cannot be negative")
+    if not mix or not any(mix.values()):
+        raise ValueError("Request mix must include at least one route with positive weight")
+    return mix
+
+
+class LoadTestResult:
+    """Latencies and status codes collected per route during a load test."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.elapsed = 0.0
+
+    def record(self, route: str, latency: float, ok: bool) -> None:
+        self.latencies.setdefault(route, []).append(latency)
+        if not ok:
+            self.errors[route] = self.errors.get(route, 0) + 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-route and overall count, errors, throughput and latency percentiles (ms)."""
+        routes = dict(self.latencies)
+        routes["all"] = [value for values in self.latencies.values() for value in values]
+
+        summary = {}
+        for route, values in routes.items():
+            ordered = sorted(values)
+            errors = sum(self.errors.values()) if route == "all" else self.errors.get(route, 0)
+            summary[route] = {
+                "requests": len(ordered),
+                "errors": errors,
+                "throughput_rps": round(len(ordered) / self.elapsed, 2) if self.elapsed else 0.0,
+                "mean_ms": round(sum(ordered) / len(ordered) * 1000, 2) if ordered else None,
+                "p50_ms": _ms(percentile(ordered, 50)),
+                "p95_ms": _ms(percentile(ordered, 95)),
+                "p99_ms": _ms(percentile(ordered, 99)),
+                "max_ms": _ms(ordered[-1] if ordered else None),
+            }
+        return summary
+
+    def format_table(self) -> str:
+        """Render the summary as a plain-text table."""
+        lines = [
+            f"{'route':10s} {'requests':>9s} {'errors':>7s} {'req/s':>8s} "
+            f"{'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'max ms':>9s}"
+        ]
+        for route, s in sorted(self.summary().items(), key=lambda item: item[0] == "all"):
+            lines.append(
+                f"{route:10s} {s['requests']:9d} {s['errors']:7d} {s['throughput_rps']:8.1f} "
+                f"{_fmt(s['p50_ms'])} {_fmt(s['p95_ms'])} {_fmt(s['p99_ms'])} {_fmt(s['max_ms'])}"
+            )
+        return "\n".join(lines)
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 2)
+
+
+def _fmt(value: Optional[float]) -> str:
+    return f"{value:9.2f}" if value is not None else f"{'-':>9s}"
+
+
+def _import_httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError(
+            "Load testing requires httpx. Install with: pip install 'strands-session-viewer[bench]'"
+        ) from e
+    return httpx
+
+
+class InProcessServer:
+    """Runs an ASGI app with uvicorn on a background thread, bound to a free local port."""
+
+    def __init__(self, app: Any, host: str = "127.0.0.1"):
+        import uvicorn
+
+        config = uvicorn.Config(app, host=host, port=0, log_level="warning", lifespan="on")
+        self.server = uvicorn.Server(config)
+        self.host = host
+        self._thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        port = self.server.servers[0].sockets[0].getsockname()[1]
+        return f"http://{self.host}:{port}"
+
+    def __enter__(self) -> "InProcessServer":
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline or not self._thread.is_alive():
+                raise RuntimeError("In-process server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.server.should_exit = True
+        self._thread.join(timeout=10)
+
+
+def _build_request(
+    route: str, rng: random.Random, sessions: List[Dict[str, Any]]
+) -> Tuple[str, Dict[str, Any]]:
+    """Build a request path and query parameters for a route label."""
+    if route == "list" or not sessions:
+        return "/api/sessions", {}
+
+    session = rng.choice(sessions)
+    session_id = session["session_id"]
+    if route == "open":
+        return f"/api/sessions/{session_id}", {}
+    if route == "paginate":
+        count = session.get("message_count") or 0
+        offset = rng.randrange(0, max(1, count - 50 + 1))
+        return f"/api/sessions/{session_id}/messages", {"limit": 50, "offset": offset}
+    if route == "export":
+        return f"/api/sessions/{session_id}/export", {"format": rng.choice(EXPORT_FORMATS)}
+    return "/api/search", {"q": rng.choice(SEARCH_TERMS), "session_id": session_id}
+
+
+async def _run_mix(
+    base_url: str,
+    mix: Dict[str, float],
+    clients: int,
+    duration: Optional[float],
+    total_requests: Optional[int],
+    seed: int,
+) -> LoadTestResult:
+    httpx = _import_httpx()
+    result = LoadTestResult()
+    routes = list(mix)
+    weights = [mix[name] for name in routes]
+    remaining = [total_requests]
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        response = await client.get("/api/sessions")
+        response.raise_for_status()
+        sessions = [s for s in response.json().get("sessions", []) if s.get("session_id")]
+
+        start = time.perf_counter()
+        deadline = start + duration if duration else None
+
+        async def worker(index: int) -> None:
+            rng = random.Random(seed * 1000 + index)
+            while True:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                if remaining[0] is not None:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+
+                route = rng.choices(routes, weights)[0]
+                path, params = _build_request(route, rng, sessions)
+                request_start = time.perf_counter()
+                try:
+                    response = await client.get(path, params=params)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                result.record(route, time.perf_counter() - request_start, ok)
+
+        await asyncio.gather(*(worker(i) for i in range(clients)))
+        result.elapsed = time.perf_counter() - start
+
+    return result
+
+
+def load_request_log(path: str) -> List[Dict[str, Any]]:
+    """Load a request log written by RequestLogMiddleware, ordered by time."""
+    entries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                entries.append(json.loads(line))
+    entries.sort(key=lambda e: e.get("t", 0))
+    return entries
+
+
+async def _run_replay(
+    base_url: str, entries: List[Dict[str, Any]], clients: int, speed: float
+) -> LoadTestResult:
+    httpx = _import_httpx()
+    result = LoadTestResult()
+    queue: asyncio.Queue = asyncio.Queue()
+    for entry in entries:
+        queue.put_nowait(entry)
+
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        start = time.perf_counter()
+        first = entries[0].get("t", 0) if entries else 0
+
+        async def worker() -> None:
+            while True:
+                try:
+                    entry = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
+                if speed > 0:
+                    due = (entry.get("t", 0) - first) / speed
+                    delay = due - (time.perf_counter() - start)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+
+                path = entry["path"]
+                url = f"{path}?{entry['query']}" if entry.get("query") else path
+                request_start = time.perf_counter()
+                try:
+                    response = await client.request(entry.get("method", "GET"), url)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                result.record(classify_path(path), time.perf_counter() - request_start, ok)
+
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        result.elapsed = time.perf_counter() - start
+
+    return result
+
+
+def run_load_test(
+    base_url: Optional[str] = None,
+    storage_dir: Optional[str] = None,
+    mix: Optional[Dict[str, float]] = None,
+    clients: int = 10,
+    duration: Optional[float] = 10.0,
+    total_requests: Optional[int] = None,
+    replay_log: Optional[str] = None,
+    replay_speed: float = 0.0,
+    seed: int = 0,
+) -> LoadTestResult:
+    """
+    Run a load test against a viewer URL or an in-process viewer.
+
+    Args:
+        base_url: URL of a running viewer; if None, storage_dir is served in-process
+        storage_dir: Sessions directory for the in-process viewer
+        mix: Route weights (default: DEFAULT_MIX)
+        clients: Number of concurrent clients
+        duration: Seconds to run the mix for (None to rely on total_requests)
+        total_requests: Stop after this many requests
+        replay_log: Replay this request log instead of generating a mix
+        replay_speed: Replay pacing relative to the recording (0 = as fast as possible)
+        seed: Random seed for route and parameter choices
+
+    Returns:
+        LoadTestResult with per-route latencies
+    """
+    entries = load_request_log(replay_log) if replay_log is not None else None
+
+    def drive(url: str) -> LoadTestResult:
+        if entries is not None:
+            return asyncio.run(_run_replay(url, entries, clients, replay_speed))
+        return asyncio.run(
+            _run_mix(url, mix or DEFAULT_MIX, clients, duration, total_requests, seed)
+        )
+
+    if base_url is not None:
+        return drive(base_url.rstrip("/"))
+
+    if storage_dir is None:
+        raise ValueError("Either base_url or storage_dir is required")
+
+    from strands_viewer.server import SessionViewerApp
+
+    viewer = SessionViewerApp(storage_dir)
+    with InProcessServer(viewer.app) as server:
+        return drive(server.url)
+
+
+class RequestLogMiddleware:
+    """ASGI middleware that appends each HTTP request to a JSON Lines log for replay."""
+
+    def __init__(self, app: Any, path: str):
+        self.app = app
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._start = time.time()
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "http":
+            entry = {
+                "t": round(time.time() - self._start, 4),
+                "method": scope.get("method", "GET"),
+                "path": scope.get("path", "/"),
+                "query": scope.get("query_string", b"").decode("latin-1"),
+            }
+            line = json.dumps(entry) + "\n"
+            with self._lock:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+        await self.app(scope, receive, send)
@@ -0,0 +1,478 @@
+"""
+Prometheus metrics and Server-Timing instrumentation.
+
+Metrics are kept in-process and rendered in the Prometheus text exposition
+format by the /metrics endpoint; with several worker processes, WorkerMetrics
+sums the workers' metrics through a shared directory. Request phases (disk, parse, format,
+serialize) are timed per request through a context variable and reported
+in the Server-Timing response header, so slow requests can be broken down
+from browser devtools.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from starlette.responses import JSONResponse
+
+# Content type of the Prometheus text exposition format
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Histogram buckets (seconds) for HTTP request latency
+HTTP_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Histogram buckets (seconds) for model call latency
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0)
+
+# Request phases reported in the Server-Timing header, in header order
+TIMING_PHASES = ("disk", "parse", "format", "serialize")
+
+# Seconds between writes of a worker's metrics to the shared metrics directory
+METRICS_FLUSH_INTERVAL = 5.0
+
+# Snapshots older than this many flush intervals are from workers that have
+# exited; their gauges are left out of the totals
+METRICS_STALE_INTERVALS = 3
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    """Base class for labelled metrics."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {list(self.labelnames)}, got {labels}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _items(self) -> Dict[Tuple[str, ...], Any]:
+        """A copy of the value of every label set."""
+        raise NotImplementedError
+
+    def _add(self, total: Any, value: Any) -> Any:
+        return total + value
+
+    def _samples(self, items: List[Tuple[Tuple[str, ...], Any]]) -> List[str]:
+        raise NotImplementedError
+
+    def export(self) -> List[List[Any]]:
+        """The values as JSON-compatible [label values, value] pairs, for render(exported)."""
+        return [[list(key), value] for key, value in self._items().items()]
+
+    def render(self, exported: Sequence[List[List[Any]]] = ()) -> str:
+        """Render the metric, adding the values exported by other processes."""
+        values = self._items()
+        for pairs in exported:
+            for key, value in pairs:
+                key = tuple(key)
+                values[key] = self._add(values[key], value) if key in values else value
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples(sorted(values.items())))
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing value."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _items(self) -> Dict[Tuple[str, ...], Any]:
+        with self._lock:
+            return dict(self._values)
+
+    def _samples(self, items: List[Tuple[Tuple[str, ...], Any]]) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def _items(self) -> Dict[Tuple[str, ...], Any]:
+        with self._lock:
+            return dict(self._values)
+
+    def _samples(self, items: List[Tuple[Tuple[str, ...], Any]]) -> List[str]:
+        if not items and not self.labelnames:
+            items = [((), 0.0)]
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = HTTP_LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # Per-bucket counts followed by sum and count
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels: str) -> int:
+        series = self._series.get(self._key(labels))
+        return int(series[-1]) if series else 0
+
+    def _items(self) -> Dict[Tuple[str, ...], Any]:
+        with self._lock:
+            return {key: list(series) for key, series in self._series.items()}
+
+    def _add(self, total: Any, value: Any) -> Any:
+        return [a + b for a, b in zip(total, value)]
+
+    def _samples(self, items: List[Tuple[Tuple[str, ...], Any]]) -> List[str]:
+        lines = []
+        for key, series in items:
+            cumulative = 0.0
+            for bound, bucket_count in zip(self.buckets, series):
+                cumulative += bucket_count
+                labels = _format_labels(self.labelnames + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {_format_value(cumulative)}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-2])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(series[-1])}")
+        return lines
+
+
+MetricT = TypeVar("MetricT", bound=_Metric)
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: MetricT) -> MetricT:
+        self._metrics.append(metric)
+        return metric
+
+    def export(self) -> Dict[str, List[List[Any]]]:
+        """The values of all metrics by name, as JSON-compatible data."""
+        return {metric.name: metric.export() for metric in self._metrics}
+
+    def render(self, snapshots: Sequence[Dict[str, List[List[Any]]]] = ()) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            snapshots: Values exported by other processes, added to this one's
+        """
+        return (
+            "\n".join(
+                metric.render([s[metric.name] for s in snapshots if metric.name in s])
+                for metric in self._metrics
+            )
+            + "\n"
+        )
+
+    def gauge_names(self) -> List[str]:
+        """Names of the registered gauges."""
+        return [metric.name for metric in self._metrics if metric.kind == "gauge"]
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.register(
+    Counter(
+        "strands_viewer_http_requests_total",
+        "HTTP requests handled.",
+        ["method", "route", "status"],
+    )
+)
+HTTP_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "strands_viewer_http_request_duration_seconds",
+        "HTTP request latency.",
+        ["method", "route"],
+    )
+)
+HTTP_IN_FLIGHT = REGISTRY.register(
+    Gauge("strands_viewer_http_requests_in_flight", "HTTP requests currently being handled.")
+)
+HTTP_RESPONSE_BYTES = REGISTRY.register(
+    Counter(
+        "strands_viewer_http_response_bytes_total",
+        "Response body bytes served.",
+        ["route"],
+    )
+)
+READER_FILES_READ = REGISTRY.register(
+    Counter("strands_viewer_reader_files_read_total", "Session files read by SessionReader.")
+)
+READER_JSON_BYTES = REGISTRY.register(
+    Counter("strands_viewer_reader_json_bytes_total", "JSON bytes parsed by SessionReader.")
+)
+CACHE_REQUESTS = REGISTRY.register(
+    Counter(
+        "strands_viewer_cache_requests_total",
+        "Cache lookups by cache and result (hit or miss).",
+        ["cache", "result"],
+    )
+)
+LLM_CALL_DURATION = REGISTRY.register(
+    Histogram(
+        "strands_viewer_llm_call_duration_seconds",
+        "Model call latency by SessionAnalyzer operation.",
+        ["operation"],
+        buckets=LLM_LATENCY_BUCKETS,
+    )
+)
+LLM_TOKENS = REGISTRY.register(
+    Counter(
+        "strands_viewer_llm_tokens_total",
+        "Model tokens by type (input, output, cache_read, cache_write).",
+        ["type"],
+    )
+)
+
+
+class WorkerMetrics:
+    """
+    Metrics of several worker processes, summed through a shared directory.
+
+    Every worker writes a snapshot of its registry to <directory>/<pid>.json
+    each METRICS_FLUSH_INTERVAL seconds and when it stops. render() adds the
+    other workers' latest snapshots to this worker's own metrics, so any
+    worker answering a scrape reports the totals (other workers' values may
+    be up to one interval old). Counters and histograms of workers that have
+    exited keep counting, so totals never go down; gauges count only for
+    workers whose snapshot is recent.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        registry: MetricsRegistry = REGISTRY,
+        interval: float = METRICS_FLUSH_INTERVAL,
+    ):
+        self.directory = Path(directory)
+        self.registry = registry
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def write(self) -> None:
+        """Write this worker's snapshot, replacing its previous one."""
+        path = self.directory / f"{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.registry.export()), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"⚠️  Could not write worker metrics: {e}")
+
+    def start(self) -> None:
+        """Write snapshots in a background thread until stop()."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.write()
+        self._thread = threading.Thread(target=self._run, name="worker-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background writes and write a final snapshot."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.write()
+
+    def render(self) -> str:
+        """Render the metrics of all workers, summed, in the Prometheus text format."""
+        own = f"{os.getpid()}.json"
+        stale_before = time.time() - self.interval * METRICS_STALE_INTERVALS
+        gauges = self.registry.gauge_names()
+        snapshots = []
+        for path in self.directory.glob("*.json"):
+            if path.name == own:
+                continue
+            try:
+                snapshot = json.loads(path.read_text(encoding="utf-8"))
+                stale = path.stat().st_mtime < stale_before
+            except (OSError, ValueError):
+                continue
+            if stale:
+                snapshot = {name: pairs for name, pairs in snapshot.items() if name not in gauges}
+            snapshots.append(snapshot)
+        return self.registry.render(snapshots)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count a cache hit or miss."""
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+# Phase durations of the current request, or None outside a timed request
+_request_timings = contextvars.ContextVar("strands_viewer_request_timings", default=None)
+
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    """Add the duration of the block to a Server-Timing phase of the current request."""
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+def format_server_timing(timings: Dict[str, float], total: Optional[float] = None) -> str:
+    """Render phase durations as a Server-Timing header value (milliseconds)."""
+    entries = [
+        f"{phase};dur={timings[phase] * 1000:.2f}" for phase in TIMING_PHASES if phase in timings
+    ]
+    if total is not None:
+        entries.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(entries)
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSONResponse that records encoding time in the serialize phase."""
+
+    def render(self, content: Any) -> bytes:
+        with timed_phase("serialize"):
+            return super().render(content)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording request metrics and adding a Server-Timing header.
+
+    Requests are labelled with the matched route template (e.g.
+    /api/sessions/{session_id}) rather than the raw path, keeping label
+    cardinality bounded.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        state = {"status": 500, "bytes": 0}
+        HTTP_IN_FLIGHT.inc()
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                header = format_server_timing(timings, time.perf_counter() - start)
+                if header:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", header.encode("latin-1")))
+                    message = dict(message, headers=headers)
+            elif message["type"] == "http.response.body":
+                state["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _request_timings.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "GET")
+            HTTP_REQUESTS.inc(method=method, route=route_path, status=str(state["status"]))
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start, method=method, route=route_path
+            )
+            HTTP_RESPONSE_BYTES.inc(state["bytes"], route=route_path)
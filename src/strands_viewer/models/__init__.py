@@ -1,5 +1,5 @@
 """Model configurations for Session Analyzer."""
 
-from .models import anthropic_model, openai_model, ollama_model
+from .models import anthropic_model, openai_model, ollama_model, models_available
 
-__all__ = ["anthropic_model", "openai_model", "ollama_model"]
+__all__ = ["anthropic_model", "openai_model", "ollama_model", "models_available"]
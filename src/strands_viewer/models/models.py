@@ -1,23 +1,38 @@
-"""Model configurations for Session Analyzer."""
+"""Model configurations for Session Analyzer.
 
+Provider SDKs and .env loading are deferred until a model is created, so
+importing this module is cheap.
+"""
+
+import importlib.util
 import os
-from dotenv import load_dotenv
+from typing import Optional
+
+_env_loaded = False
 
-try:
-    from strands.models.anthropic import AnthropicModel
-    from strands.models.openai import OpenAIModel
-    from strands.models.ollama import OllamaModel
 
-    MODELS_AVAILABLE = True
-except ImportError:
-    MODELS_AVAILABLE = False
-    AnthropicModel = None
-    OpenAIModel = None
-    OllamaModel = None
+def _load_env() -> None:
+    """Load environment variables from .env once, if python-dotenv is installed."""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
 
 
-# Load environment variables
-load_dotenv()
+def models_available() -> bool:
+    """Check whether the Strands model providers can be imported, without importing them."""
+    return importlib.util.find_spec("strands") is not None
+
+
+def _models_unavailable() -> ImportError:
+    return ImportError(
+        "Strands models not available. Install with: pip install strands-session-viewer[ai]"
+    )
 
 
 # ============================================================================
@@ -27,13 +42,13 @@ load_dotenv()
 
 
 def anthropic_model(
-    api_key: str = os.getenv("ANTHROPIC_API_KEY"),
+    api_key: Optional[str] = None,
     model_id: str = "claude-haiku-4-5-20251001",
     max_tokens: int = 4000,
     temperature: float = 1,
     thinking: bool = True,
     budget_tokens: int = 1024,
-) -> "AnthropicModel":
+) -> "AnthropicModel":  # noqa: F821
     """
     Create an Anthropic model instance.
 
@@ -55,10 +70,14 @@ def anthropic_model(
         - claude-3-7-sonnet-20250219 - 200k context, 64k max_output
         - claude-3-5-haiku-20241022 - 200k context, 8k max_output
     """
-    if not MODELS_AVAILABLE:
-        raise ImportError(
-            "Strands models not available. Install with: pip install strands-session-viewer[ai]"
-        )
+    try:
+        from strands.models.anthropic import AnthropicModel
+    except ImportError as e:
+        raise _models_unavailable() from e
+
+    _load_env()
+    if api_key is None:
+        api_key = os.getenv("ANTHROPIC_API_KEY")
 
     if thinking:
         if budget_tokens >= max_tokens:
@@ -84,12 +103,12 @@ def anthropic_model(
 
 
 def openai_model(
-    api_key: str = os.getenv("OPENAI_API_KEY"),
+    api_key: Optional[str] = None,
     model_id: str = "gpt-5-mini-2025-08-07",
     max_tokens: int = 16000,
     temperature: float = 1,
     reasoning_effort: str = "medium",
-) -> "OpenAIModel":
+) -> "OpenAIModel":  # noqa: F821
     """
     Create an OpenAI model instance.
 
@@ -113,10 +132,14 @@ def openai_model(
         - gpt-5-pro-2025-10-06 - 400k context, 272K max_output
         - o4-mini-deep-research-2025-06-26 - 200k context, 100k max_output
     """
-    if not MODELS_AVAILABLE:
-        raise ImportError(
-            "Strands models not available. Install with: pip install strands-session-viewer[ai]"
-        )
+    try:
+        from strands.models.openai import OpenAIModel
+    except ImportError as e:
+        raise _models_unavailable() from e
+
+    _load_env()
+    if api_key is None:
+        api_key = os.getenv("OPENAI_API_KEY")
 
     return OpenAIModel(
         client_args={
@@ -138,11 +161,11 @@ def openai_model(
 
 
 def ollama_model(
-    host: str = os.getenv("OLLAMA_HOST"),
+    host: Optional[str] = None,
     model_id: str = "qwen3:4b",
     max_tokens: int = 2000,
     temperature: float = 1,
-) -> "OllamaModel":
+) -> "OllamaModel":  # noqa: F821
     """
     Create an Ollama model instance.
 
@@ -161,10 +184,14 @@ def ollama_model(
         - gemma3n:e4b - 32k context, 8K max_output (does not support tools)
         - nomic-embed-text:latest - 2k context (embedding model)
     """
-    if not MODELS_AVAILABLE:
-        raise ImportError(
-            "Strands models not available. Install with: pip install strands-session-viewer[ai]"
-        )
+    try:
+        from strands.models.ollama import OllamaModel
+    except ImportError as e:
+        raise _models_unavailable() from e
+
+    _load_env()
+    if host is None:
+        host = os.getenv("OLLAMA_HOST")
 
     if model_id == "qwen3:4b":
         max_tokens = 128000
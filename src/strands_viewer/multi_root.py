@@ -0,0 +1,287 @@
+"""
+Serving several session storage roots from one viewer.
+
+Each root is read by its own SessionReader (with its own caches) under a
+namespace, and sessions are addressed as "<namespace>:<session_id>". Root
+listings are scanned concurrently and merged lazily, newest first.
+"""
+
+import glob
+import heapq
+import itertools
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from strands_viewer.archive import archive_format, archive_stem
+from strands_viewer.raw_json import RawJSON
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.storage import is_remote
+
+# Separator between namespace and session ID
+NAMESPACE_SEPARATOR = ":"
+
+# Separator between the roots' signatures in a listing signature
+_SIGNATURE_SEPARATOR = ","
+
+_NAMESPACE_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+
+def _sort_key(summary: Dict[str, Any]) -> str:
+    return summary.get("updated_at") or ""
+
+
+def resolve_roots(specs: Sequence[str]) -> Dict[str, Union[Path, str]]:
+    """
+    Resolve root specifications to namespaced directories or URLs.
+
+    A specification is a directory, an archive, an s3://bucket/prefix URL, a
+    glob matching directories or archives, or NAME=PATH to choose the
+    namespace. Without a name, the namespace is the directory (or archive)
+    name, or its parent's name for directories called "sessions"
+    (/srv/billing/sessions -> billing); duplicates get a numeric suffix.
+
+    Raises:
+        ValueError: If a namespace is invalid or used twice, or a glob matches nothing
+    """
+    roots: Dict[str, Union[Path, str]] = {}
+    for spec in specs:
+        name: Optional[str] = None
+        path_spec = spec
+        if "=" in spec:
+            candidate, _, rest = spec.partition("=")
+            if _NAMESPACE_PATTERN.match(candidate):
+                name, path_spec = candidate, rest
+
+        if any(char in path_spec for char in "*?["):
+            paths = [
+                Path(p)
+                for p in sorted(glob.glob(path_spec))
+                if Path(p).is_dir() or archive_format(p) is not None
+            ]
+            if not paths:
+                raise ValueError(f"No directories or archives match: {path_spec}")
+            if name is not None and len(paths) > 1:
+                raise ValueError(f"Namespace '{name}' cannot name several directories: {spec}")
+        elif is_remote(path_spec):
+            paths = [path_spec]
+        else:
+            paths = [Path(path_spec)]
+
+        for path in paths:
+            location: Union[Path, str]
+            if isinstance(path, str):
+                # Object storage URL: name it after its key prefix
+                location = path.rstrip("/")
+                path = Path(location.partition("://")[2])
+            else:
+                path = location = path.resolve()
+            if name is not None:
+                if name in roots:
+                    raise ValueError(f"Namespace used twice: {name}")
+                namespace = name
+            else:
+                name_path = Path(archive_stem(str(path))) if archive_format(str(path)) else path
+                if name_path.name == "sessions":
+                    base = path.parent.name
+                else:
+                    base = name_path.name
+                base = re.sub(r"[^A-Za-z0-9_.-]+", "-", base) or "root"
+                namespace = base
+                for n in itertools.count(2):
+                    if namespace not in roots:
+                        break
+                    namespace = f"{base}-{n}"
+            roots[namespace] = location
+    return roots
+
+
+class MultiRootReader:
+    """Reads sessions from several storage roots, each under its own namespace."""
+
+    def __init__(self, readers: Dict[str, SessionReader], max_workers: int = 8):
+        if not readers:
+            raise ValueError("At least one storage root is required")
+        self.readers = readers
+        self.max_workers = max(1, min(max_workers, len(readers)))
+
+    @property
+    def state_dir(self) -> Path:
+        """State directory of the first root, used for viewer-wide state (analysis store)."""
+        return next(iter(self.readers.values())).state_dir
+
+    def _split(self, session_id: str) -> Tuple[Optional[SessionReader], str]:
+        namespace, separator, local_id = session_id.partition(NAMESPACE_SEPARATOR)
+        if not separator or namespace not in self.readers:
+            return None, session_id
+        return self.readers[namespace], local_id
+
+    @staticmethod
+    def _namespaced(namespace: str, summary: Dict[str, Any]) -> Dict[str, Any]:
+        return dict(
+            summary,
+            session_id=f"{namespace}{NAMESPACE_SEPARATOR}{summary.get('session_id')}",
+            namespace=namespace,
+        )
+
+    def _root_listings(self) -> List[List[Dict[str, Any]]]:
+        """List every root concurrently, each sorted newest first."""
+
+        def list_root(item: Tuple[str, SessionReader]) -> List[Dict[str, Any]]:
+            namespace, reader = item
+            try:
+                sessions = reader.list_sessions()
+            except Exception as e:
+                print(f"Error listing sessions in {reader.backend.describe()}: {e}")
+                return []
+            return [self._namespaced(namespace, s) for s in sessions]
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(list_root, self.readers.items()))
+
+    def list_sessions_page(
+        self, offset: int = 0, limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get one page of the merged listing, newest first.
+
+        Root listings are merged lazily, so only offset + limit entries are
+        compared and copied.
+
+        Returns:
+            Tuple of (sessions on the page, total number of sessions)
+        """
+        listings = self._root_listings()
+        total = sum(len(listing) for listing in listings)
+        merged = heapq.merge(*listings, key=_sort_key, reverse=True)
+        stop = offset + limit if limit is not None else None
+        return list(itertools.islice(merged, offset, stop)), total
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """List all sessions of all roots, newest first."""
+        return self.list_sessions_page()[0]
+
+    @property
+    def caches_sessions(self) -> bool:
+        """Whether any root's reader caches sessions."""
+        return any(reader.caches_sessions for reader in self.readers.values())
+
+    def listing_signature(self) -> str:
+        """The roots' listing signatures, in root order."""
+        return _SIGNATURE_SEPARATOR.join(
+            reader.listing_signature() for reader in self.readers.values()
+        )
+
+    def prime_listing(self, signature: str, sessions: List[Dict[str, Any]]) -> None:
+        """Hand each root's part of a merged listing to that root's reader."""
+        by_namespace: Dict[str, List[Dict[str, Any]]] = {ns: [] for ns in self.readers}
+        for summary in sessions:
+            local = dict(summary)
+            namespace = local.pop("namespace", None)
+            if namespace in by_namespace:
+                local["session_id"] = str(local["session_id"]).partition(NAMESPACE_SEPARATOR)[2]
+                by_namespace[namespace].append(local)
+        signatures = signature.split(_SIGNATURE_SEPARATOR)
+        for (namespace, reader), root_signature in zip(self.readers.items(), signatures):
+            reader.prime_listing(root_signature, by_namespace[namespace])
+
+    def session_dirs(self) -> List[str]:
+        """Session directories of all roots, as "<namespace>:<directory>"."""
+        return [
+            f"{namespace}{NAMESPACE_SEPARATOR}{session_dir}"
+            for namespace, reader in self.readers.items()
+            for session_dir in reader.session_dirs()
+        ]
+
+    def get_session_summary(self, session_dir: str) -> Optional[Dict[str, Any]]:
+        reader, local_dir = self._split(session_dir)
+        if reader is None:
+            return None
+        summary = reader.get_session_summary(local_dir)
+        namespace = session_dir.partition(NAMESPACE_SEPARATOR)[0]
+        return self._namespaced(namespace, summary) if summary is not None else None
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        reader, local_id = self._split(session_id)
+        if reader is None:
+            return None
+        session = reader.get_session(local_id)
+        if session is None:
+            return None
+        namespace = session_id.partition(NAMESPACE_SEPARATOR)[0]
+        return self._namespaced(namespace, session)
+
+    def get_session_raw(self, session_id: str) -> Optional[Dict[str, Any]]:
+        reader, local_id = self._split(session_id)
+        if reader is None:
+            return None
+        session = reader.get_session_raw(local_id)
+        if session is None:
+            return None
+        namespace = session_id.partition(NAMESPACE_SEPARATOR)[0]
+        return self._namespaced(namespace, session)
+
+    def get_messages_with_sizes(
+        self, session_id: str
+    ) -> Optional[List[Tuple[Dict[str, Any], int]]]:
+        reader, local_id = self._split(session_id)
+        return reader.get_messages_with_sizes(local_id) if reader is not None else None
+
+    def iter_messages(self, session_id: str) -> Optional[Iterator[Dict[str, Any]]]:
+        reader, local_id = self._split(session_id)
+        return reader.iter_messages(local_id) if reader is not None else None
+
+    def get_tool_calls(self, session_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        reader, local_id = self._split(session_id)
+        return reader.get_tool_calls(local_id) if reader is not None else None
+
+    def get_fingerprint(self, session_id: str) -> Optional[str]:
+        reader, local_id = self._split(session_id)
+        return reader.get_fingerprint(local_id) if reader is not None else None
+
+    def get_messages(
+        self, session_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        reader, local_id = self._split(session_id)
+        return reader.get_messages(local_id, limit, offset) if reader is not None else []
+
+    def get_messages_raw(
+        self, session_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[RawJSON]:
+        reader, local_id = self._split(session_id)
+        return reader.get_messages_raw(local_id, limit, offset) if reader is not None else []
+
+    def get_agent_messages_raw(
+        self, session_id: str, agent_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> Optional[List[RawJSON]]:
+        reader, local_id = self._split(session_id)
+        if reader is None:
+            return None
+        return reader.get_agent_messages_raw(local_id, agent_id, limit, offset)
+
+    def get_messages_since(
+        self, session_id: str, cursor: str = ""
+    ) -> Optional[Tuple[List[RawJSON], str]]:
+        reader, local_id = self._split(session_id)
+        return reader.get_messages_since(local_id, cursor) if reader is not None else None
+
+    def search_messages(
+        self, query: str, session_id: Optional[str] = None, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Search one session, or every root in namespace order."""
+        if session_id is not None:
+            targets = []
+            reader, local_id = self._split(session_id)
+            if reader is not None:
+                targets.append((session_id.partition(NAMESPACE_SEPARATOR)[0], reader, local_id))
+        else:
+            targets = [(namespace, reader, None) for namespace, reader in self.readers.items()]
+
+        matches: List[Dict[str, Any]] = []
+        for namespace, reader, local_id in targets:
+            for match in reader.search_messages(query, local_id, limit - len(matches)):
+                matches.append(self._namespaced(namespace, match))
+            if len(matches) >= limit:
+                break
+        return matches
@@ -0,0 +1,232 @@
+"""
+OpenTelemetry trace export.
+
+Converts a session into an OTLP-JSON ExportTraceServiceRequest, the format
+written by the OpenTelemetry Collector's file exporter and loaded by trace
+viewers such as Jaeger. A session becomes one trace:
+
+- a root span covering the whole session,
+- one span per turn: a user message with text, up to the agent's next one,
+- one span per tool call, from the message with the toolUse to the message
+  with the matching toolResult (see timeline.pair_tool_calls).
+
+Span times come from the messages' created_at timestamps. Trace and span IDs
+are derived from the session ID, so exporting a session again gives the same
+IDs. Attribute names follow the OpenTelemetry GenAI semantic conventions.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from strands_viewer.__version__ import __version__
+from strands_viewer.timeline import pair_tool_calls, parse_timestamp, result_text
+
+# service.name of exported traces
+SERVICE_NAME = "strands-agents"
+
+# OTLP SpanKind and StatusCode values
+SPAN_KIND_INTERNAL = 1
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _unix_nanos(timestamp: Optional[str]) -> Optional[int]:
+    parsed = parse_timestamp(timestamp)
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    delta = parsed - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
+def _span_id(session_id: str, key: str, length: int = 16) -> str:
+    return hashlib.sha256(f"{session_id}\0{key}".encode("utf-8")).hexdigest()[:length]
+
+
+def _attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        # int64 values are strings in OTLP-JSON
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _attributes(values: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [_attribute(key, value) for key, value in values.items() if value is not None]
+
+
+def _is_user_turn(message: Dict[str, Any]) -> bool:
+    """Whether a message starts a turn: a user message with text rather than tool results."""
+    msg = message.get("message") or {}
+    content = msg.get("content") or []
+    return msg.get("role") == "user" and not any("toolResult" in c for c in content)
+
+
+def _split_turns(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Group message numbers (1-based) into turns per agent, in timeline order."""
+    turns: List[Dict[str, Any]] = []
+    current: Dict[Any, Dict[str, Any]] = {}
+    for number, message in enumerate(messages, 1):
+        agent_id = message.get("agent_id")
+        turn = current.get(agent_id)
+        if turn is None or _is_user_turn(message):
+            turn = current[agent_id] = {"agent_id": agent_id, "messages": []}
+            turns.append(turn)
+        turn["messages"].append(number)
+    return turns
+
+
+def session_to_otlp(session: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Convert a session into an OTLP-JSON ExportTraceServiceRequest.
+
+    Messages without a parseable created_at take the time of the message
+    before them (or the session's created_at). Turn and tool spans have
+    error status when a tool result in them failed.
+
+    Args:
+        session: Session data dictionary, with messages in timeline order
+
+    Returns:
+        Dictionary with a single resourceSpans entry holding the session's spans
+    """
+    session_id = str(session.get("session_id"))
+    messages = session.get("messages", [])
+    trace_id = _span_id(session_id, "trace", 32)
+    root_id = _span_id(session_id, "session")
+
+    # Time of every message, carrying the last known time over gaps
+    times: List[int] = []
+    last = _unix_nanos(session.get("created_at")) or 0
+    for message in messages:
+        last = _unix_nanos(message.get("created_at")) or last
+        times.append(last)
+    start = min(times) if times else last
+    end = max(times) if times else _unix_nanos(session.get("updated_at")) or last
+
+    calls = list(pair_tool_calls(messages).values())
+    errors: Dict[int, str] = {}
+    for number, message in enumerate(messages, 1):
+        for content in (message.get("message") or {}).get("content") or []:
+            result = content.get("toolResult") if isinstance(content, dict) else None
+            if result is not None and result.get("status") == "error":
+                errors.setdefault(number, result_text(result))
+
+    spans: List[Dict[str, Any]] = []
+    turn_of: Dict[int, str] = {}
+    for index, turn in enumerate(_split_turns(messages)):
+        numbers = turn["messages"]
+        span_id = _span_id(session_id, f"turn\0{turn['agent_id']}\0{numbers[0]}")
+        for number in numbers:
+            turn_of[number] = span_id
+        failed = [number for number in numbers if number in errors]
+        first = messages[numbers[0] - 1]
+        spans.append(
+            {
+                "traceId": trace_id,
+                "spanId": span_id,
+                "parentSpanId": root_id,
+                "name": f"turn {index + 1}",
+                "kind": SPAN_KIND_INTERNAL,
+                "startTimeUnixNano": str(times[numbers[0] - 1]),
+                "endTimeUnixNano": str(times[numbers[-1] - 1]),
+                "attributes": _attributes(
+                    {
+                        "gen_ai.agent.id": turn["agent_id"],
+                        "strands.turn.index": index + 1,
+                        "strands.turn.messages": len(numbers),
+                        "strands.message.first_id": first.get("message_id"),
+                    }
+                ),
+                "status": (
+                    {
+                        "code": STATUS_ERROR,
+                        "message": f"{len(failed)} tool result message(s) failed",
+                    }
+                    if failed
+                    else {"code": STATUS_UNSET}
+                ),
+            }
+        )
+
+    for call in calls:
+        call_time = times[call["call_message"] - 1]
+        result_message = call["result_message"]
+        status: Dict[str, Any] = {"code": STATUS_UNSET}
+        if call["status"] == "error":
+            status = {"code": STATUS_ERROR, "message": errors.get(result_message, "")[:500]}
+        elif result_message is not None:
+            status = {"code": STATUS_OK}
+        spans.append(
+            {
+                "traceId": trace_id,
+                "spanId": _span_id(session_id, f"tool\0{call['tool_use_id']}"),
+                "parentSpanId": turn_of[call["call_message"]],
+                "name": f"execute_tool {call['name']}",
+                "kind": SPAN_KIND_INTERNAL,
+                "startTimeUnixNano": str(call_time),
+                "endTimeUnixNano": str(
+                    times[result_message - 1] if result_message is not None else call_time
+                ),
+                "attributes": _attributes(
+                    {
+                        "gen_ai.operation.name": "execute_tool",
+                        "gen_ai.tool.name": call["name"],
+                        "gen_ai.tool.call.id": call["tool_use_id"],
+                        "gen_ai.agent.id": call["agent_id"],
+                        "strands.tool.status": call["status"],
+                    }
+                ),
+                "status": status,
+            }
+        )
+
+    root = {
+        "traceId": trace_id,
+        "spanId": root_id,
+        "name": f"session {session_id}",
+        "kind": SPAN_KIND_INTERNAL,
+        "startTimeUnixNano": str(start),
+        "endTimeUnixNano": str(end),
+        "attributes": _attributes(
+            {
+                "session.id": session_id,
+                "strands.session.type": session.get("session_type"),
+                "strands.session.messages": len(messages),
+                "strands.session.tool_calls": len(calls),
+            }
+        ),
+        "status": {"code": STATUS_ERROR if errors else STATUS_UNSET},
+    }
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _attributes(
+                        {"service.name": SERVICE_NAME, "session.id": session_id}
+                    )
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": "strands-session-viewer", "version": __version__},
+                        "spans": [root] + spans,
+                    }
+                ],
+            }
+        ]
+    }
+
+
+def format_otlp(session: Dict[str, Any]) -> str:
+    """Format a session as an OTLP-JSON trace on a single line."""
+    return json.dumps(session_to_otlp(session), ensure_ascii=False, separators=(",", ":"))
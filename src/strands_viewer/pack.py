@@ -0,0 +1,400 @@
+"""
+Packed single-file sessions.
+
+`strands-viewer pack` compacts a finished session directory
+(session_<id>/session.json, agents/*/agent.json, agents/*/messages/*.json,
+any of them possibly compressed) into one file, session_<id>.pack, next to it:
+
+    b"SVPACK1\\n"
+    one compact JSON record per line: the session, each agent, each message
+    binary index: agent IDs, then (agent, message ID, offset, length) entries
+    footer: index offset, index length, b"SVPKIDX1"
+
+Records are located through the index and sliced out of a memory map of the
+file, so reading a message costs no open or stat of its own. New records can
+be appended: the index is truncated, the records written, and a new index
+and footer written after them.
+"""
+
+import json
+import os
+import shutil
+import struct
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+from strands_viewer.compression import JSON_SUFFIXES, decompress_file, split_compression
+
+# Suffix of packed session files: session_<id>.pack
+PACK_SUFFIX = ".pack"
+
+PACK_MAGIC = b"SVPACK1\n"
+INDEX_MAGIC = b"SVIX"
+FOOTER_MAGIC = b"SVPKIDX1"
+
+# Index header: magic, agent count, entry count
+_INDEX_HEADER = struct.Struct("<4sII")
+# Agent ID length prefix
+_AGENT_NAME = struct.Struct("<H")
+# Index entry: agent index, message ID, record offset, record length
+_ENTRY = struct.Struct("<iqQI")
+# Footer: index offset, index length, magic
+_FOOTER = struct.Struct("<QQ8s")
+
+# Agent index of the session record; message ID of agent records
+SESSION_RECORD = -1
+AGENT_RECORD = -1
+
+Buffer = Union[bytes, memoryview, Any]
+
+
+class PackFormatError(ValueError):
+    """A packed session file is truncated or not a pack."""
+
+
+def _compact(data: Any) -> bytes:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class PackedSession:
+    """Random access to the records of a packed session held in a buffer (bytes or mmap)."""
+
+    def __init__(self, buffer: Buffer):
+        self.buffer = buffer
+        if len(buffer) < len(PACK_MAGIC) + _FOOTER.size or buffer[: len(PACK_MAGIC)] != PACK_MAGIC:
+            raise PackFormatError("Not a packed session")
+        index_offset, index_length, magic = _FOOTER.unpack_from(buffer, len(buffer) - _FOOTER.size)
+        if magic != FOOTER_MAGIC or index_offset + index_length + _FOOTER.size > len(buffer):
+            raise PackFormatError("Packed session has no valid index")
+        self.index_offset = index_offset
+        self.agents, self.entries = _decode_index(
+            buffer[index_offset : index_offset + index_length]
+        )
+
+    def record(self, offset: int, length: int) -> bytes:
+        """The record at an index entry's offset and length."""
+        return bytes(self.buffer[offset : offset + length])
+
+    def session_bytes(self) -> bytes:
+        """The session record (session.json)."""
+        for agent, _, offset, length in self.entries:
+            if agent == SESSION_RECORD:
+                return self.record(offset, length)
+        raise PackFormatError("Packed session has no session record")
+
+    def agent_records(self) -> List[Tuple[str, bytes]]:
+        """(agent ID, agent.json record) for every agent, by agent ID."""
+        records = [
+            (self.agents[agent], self.record(offset, length))
+            for agent, message_id, offset, length in self.entries
+            if agent != SESSION_RECORD and message_id == AGENT_RECORD
+        ]
+        records.sort(key=lambda r: r[0])
+        return records
+
+    def message_entries(self) -> List[Tuple[str, int, int, int]]:
+        """(agent ID, message ID, offset, length) of every message, by agent and message ID."""
+        entries = [
+            (self.agents[agent], message_id, offset, length)
+            for agent, message_id, offset, length in self.entries
+            if agent != SESSION_RECORD and message_id != AGENT_RECORD
+        ]
+        entries.sort(key=lambda e: (e[0], e[1]))
+        return entries
+
+    def message_records(self) -> List[Tuple[str, int, bytes]]:
+        """(agent ID, message ID, record) of every message, by agent and message ID."""
+        return [
+            (agent_id, message_id, self.record(offset, length))
+            for agent_id, message_id, offset, length in self.message_entries()
+        ]
+
+    @property
+    def message_count(self) -> int:
+        return sum(
+            1
+            for agent, message_id, _, _ in self.entries
+            if agent != SESSION_RECORD and message_id != AGENT_RECORD
+        )
+
+    def close(self) -> None:
+        close = getattr(self.buffer, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self) -> "PackedSession":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _encode_index(agents: List[str], entries: List[Tuple[int, int, int, int]]) -> bytes:
+    parts = [_INDEX_HEADER.pack(INDEX_MAGIC, len(agents), len(entries))]
+    for agent_id in agents:
+        name = agent_id.encode("utf-8")
+        parts.append(_AGENT_NAME.pack(len(name)) + name)
+    parts.extend(_ENTRY.pack(*entry) for entry in entries)
+    return b"".join(parts)
+
+
+def _decode_index(data: Buffer) -> Tuple[List[str], List[Tuple[int, int, int, int]]]:
+    try:
+        magic, agent_count, entry_count = _INDEX_HEADER.unpack_from(data, 0)
+        if magic != INDEX_MAGIC:
+            raise PackFormatError("Packed session index is corrupt")
+        position = _INDEX_HEADER.size
+        agents = []
+        for _ in range(agent_count):
+            (length,) = _AGENT_NAME.unpack_from(data, position)
+            position += _AGENT_NAME.size
+            agents.append(bytes(data[position : position + length]).decode("utf-8"))
+            position += length
+        entries = [_ENTRY.unpack_from(data, position + i * _ENTRY.size) for i in range(entry_count)]
+    except struct.error as e:
+        raise PackFormatError(f"Packed session index is truncated: {e}") from e
+    return agents, entries
+
+
+class PackWriter:
+    """
+    Writes (or appends to) a packed session file.
+
+    With append, the existing records are kept and new ones are written in
+    place of the old index. A record written again with different contents
+    is appended too, and its index entry repointed to the new copy. Call
+    close() to write the index and footer.
+    """
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = Path(path)
+        self.agents: List[str] = []
+        self.entries: List[Tuple[int, int, int, int]] = []
+        self._existing: Optional[PackedSession] = None
+        if append and self.path.exists():
+            with open(self.path, "rb") as f:
+                existing = self._existing = PackedSession(f.read())
+            self.agents, self.entries = existing.agents, list(existing.entries)
+            self._file = open(self.path, "r+b")
+            self._file.seek(existing.index_offset)
+            self._file.truncate()
+        else:
+            self._file = open(self.path, "wb")
+            self._file.write(PACK_MAGIC)
+        self._agent_index = {agent_id: i for i, agent_id in enumerate(self.agents)}
+        # Position in entries of each (agent, message ID)
+        self._keys = {(entry[0], entry[1]): i for i, entry in enumerate(self.entries)}
+
+    def _agent(self, agent_id: str) -> int:
+        index = self._agent_index.get(agent_id)
+        if index is None:
+            index = self._agent_index[agent_id] = len(self.agents)
+            self.agents.append(agent_id)
+        return index
+
+    def _write(self, agent: int, message_id: int, record: bytes) -> bool:
+        position = self._keys.get((agent, message_id))
+        if position is not None and self._existing is not None:
+            _, _, old_offset, old_length = self.entries[position]
+            if old_offset < self._existing.index_offset and (
+                self._existing.record(old_offset, old_length) == record
+            ):
+                return False
+        offset = self._file.tell()
+        self._file.write(record + b"\n")
+        entry = (agent, message_id, offset, len(record))
+        if position is None:
+            self._keys[(agent, message_id)] = len(self.entries)
+            self.entries.append(entry)
+        else:
+            self.entries[position] = entry
+        return True
+
+    def has_record(self, agent_id: Optional[str], message_id: int = AGENT_RECORD) -> bool:
+        """Check whether a record was already written (agent_id None: the session record)."""
+        agent = SESSION_RECORD if agent_id is None else self._agent_index.get(agent_id)
+        return agent is not None and (agent, message_id) in self._keys
+
+    def write_session(self, data: Any) -> bool:
+        """Write the session record. Returns False if the pack already holds it unchanged."""
+        return self._write(SESSION_RECORD, AGENT_RECORD, _compact(data))
+
+    def write_agent(self, agent_id: str, data: Any) -> bool:
+        """Write an agent record. Returns False if the pack already holds it unchanged."""
+        return self._write(self._agent(agent_id), AGENT_RECORD, _compact(data))
+
+    def write_message(self, agent_id: str, message_id: int, data: Any) -> bool:
+        """Write a message record. Returns False if the pack already holds it unchanged."""
+        return self._write(self._agent(agent_id), message_id, _compact(data))
+
+    def close(self) -> None:
+        index = _encode_index(self.agents, self.entries)
+        index_offset = self._file.tell()
+        self._file.write(index)
+        self._file.write(_FOOTER.pack(index_offset, len(index), FOOTER_MAGIC))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+def _json_file(directory: Path, stem: str) -> Optional[Path]:
+    # <stem>.json, or a compressed variant
+    for suffix in JSON_SUFFIXES:
+        path = directory / f"{stem}{suffix}"
+        if path.exists():
+            return path
+    return None
+
+
+def _read_json(path: Path) -> Any:
+    return json.loads(decompress_file(path.name, path.read_bytes()))
+
+
+def _message_id(path: Path, data: Dict[str, Any]) -> int:
+    message_id = data.get("message_id")
+    if isinstance(message_id, int):
+        return message_id
+    return int(split_compression(path.name)[0][: -len(".json")].rpartition("_")[2])
+
+
+def pack_session(session_dir: str, pack_path: Optional[str] = None) -> Dict[str, int]:
+    """
+    Pack a session directory, appending to an existing pack if there is one.
+
+    Records already in an existing pack (the session record, and agents and
+    messages by ID) are kept while unchanged, so packing again only adds
+    what is new or was rewritten in place (e.g. a redacted message).
+
+    Args:
+        session_dir: Path to a session_<id> directory
+        pack_path: Output file (default: session_<id>.pack next to the directory)
+
+    Returns:
+        Counts of agents and messages written
+    """
+    source = Path(session_dir)
+    target = Path(pack_path) if pack_path else source.with_name(source.name + PACK_SUFFIX)
+    append = target.exists()
+    tmp_path = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+
+    counts = {"agents": 0, "messages": 0}
+    completed = False
+    try:
+        if append:
+            shutil.copyfile(target, tmp_path)
+        writer = PackWriter(str(tmp_path), append=append)
+        try:
+            session_file = _json_file(source, "session")
+            if session_file is None:
+                raise FileNotFoundError(f"No session.json in {source}")
+            writer.write_session(_read_json(session_file))
+            agent_dirs = sorted(d for d in (source / "agents").glob("*") if d.is_dir())
+            for agent_dir in agent_dirs:
+                agent_file = _json_file(agent_dir, "agent")
+                if agent_file is not None and writer.write_agent(
+                    agent_dir.name, _read_json(agent_file)
+                ):
+                    counts["agents"] += 1
+                message_files = [
+                    path
+                    for path in sorted((agent_dir / "messages").glob("message_*.json*"))
+                    if split_compression(path.name)[0].endswith(".json")
+                ]
+                for message_file in message_files:
+                    data = _read_json(message_file)
+                    if writer.write_message(agent_dir.name, _message_id(message_file, data), data):
+                        counts["messages"] += 1
+        finally:
+            writer.close()
+        os.replace(tmp_path, target)
+        completed = True
+    finally:
+        if not completed:
+            tmp_path.unlink(missing_ok=True)
+    return counts
+
+
+def _verify_pack(reader: Any, session_dir: Path) -> None:
+    """
+    Check that a session's pack holds every message of its directory.
+
+    Messages are compared by content, so messages without a message_id
+    (packed under the number in their file name) are checked too.
+
+    Raises:
+        PackFormatError: If the directory could not be read or a message is missing
+    """
+    unpacked = reader.get_session(session_dir.name[len("session_") :])
+    if unpacked is None:
+        raise PackFormatError("Session directory could not be read back")
+    with reader.open_pack(session_dir.name + PACK_SUFFIX) as packed:
+        packed_messages = Counter(
+            _compact(dict(json.loads(record), agent_id=agent_id))
+            for agent_id, _, record in packed.message_records()
+        )
+    for message in unpacked["messages"]:
+        key = _compact(message)
+        if not packed_messages[key]:
+            raise PackFormatError("Packed session does not match the directory")
+        packed_messages[key] -= 1
+
+
+def pack_store(
+    storage_dir: str,
+    min_idle_seconds: float,
+    delete: bool = False,
+    dry_run: bool = False,
+    progress: Callable[[str], None] = print,
+) -> Dict[str, int]:
+    """
+    Pack every finished session directory of a sessions directory.
+
+    Each pack is read back and compared with the directory; with delete,
+    the directory is then removed.
+
+    Args:
+        storage_dir: Sessions directory
+        min_idle_seconds: Skip sessions updated more recently than this
+        delete: Remove session directories once their pack is verified
+        dry_run: Only report what would be packed
+        progress: Callback for progress messages
+
+    Returns:
+        Counts of packed, skipped (active) and failed sessions, and messages packed
+    """
+    from datetime import datetime, timezone
+
+    from strands_viewer.session_reader import SessionReader
+    from strands_viewer.timeline import seconds_since
+
+    reader = SessionReader(storage_dir)
+    now = datetime.now(timezone.utc)
+    report = {"packed": 0, "skipped_active": 0, "failed": 0, "messages": 0}
+
+    for session_dir in sorted(d for d in Path(storage_dir).glob("session_*") if d.is_dir()):
+        summary = reader.get_session_summary(session_dir.name)
+        if summary is None:
+            continue
+        idle = seconds_since(summary.get("updated_at"), now)
+        if idle is not None and idle < min_idle_seconds:
+            report["skipped_active"] += 1
+            continue
+        if dry_run:
+            progress(f"Would pack {session_dir.name} ({summary['message_count']} messages)")
+            report["packed"] += 1
+            continue
+
+        try:
+            counts = pack_session(str(session_dir))
+            _verify_pack(reader, session_dir)
+            if delete:
+                shutil.rmtree(session_dir)
+        except (OSError, ValueError) as e:
+            progress(f"❌ {session_dir.name}: {e}")
+            report["failed"] += 1
+            continue
+        report["packed"] += 1
+        report["messages"] += counts["messages"]
+        progress(f"Packed {session_dir.name} ({counts['messages']} new messages)")
+    return report
@@ -0,0 +1,268 @@
+"""
+Opt-in per-request profiling.
+
+When the viewer runs with a profile directory, requests carrying an
+X-Profile header (or every request, with profile_all) are profiled and the
+profile is written to that directory, one file per request:
+
+- speedscope: an evented timeline of the route handler, SessionReader
+  methods (including every JSON file load), export formatters and response
+  encoding. Open it at https://www.speedscope.app.
+- pstats: a deterministic cProfile of everything run on the event loop
+  while handling the request. Inspect with `python -m pstats FILE`.
+
+Nothing is installed unless profiling is enabled, so there is no overhead
+otherwise.
+"""
+
+import asyncio
+import contextvars
+import cProfile
+import functools
+import itertools
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from strands_viewer import export_formatter
+from strands_viewer.metrics import TimedJSONResponse
+from strands_viewer.raw_json import RawJSONResponse
+
+PROFILE_FORMATS = ("speedscope", "pstats")
+
+# Request header that turns on profiling for a single request
+PROFILE_HEADER = b"x-profile"
+
+# Response header naming the written profile file
+PROFILE_FILE_HEADER = b"x-profile-file"
+
+# SessionReader methods wrapped with profiling spans
+READER_METHODS = (
+    "list_sessions",
+    "get_session",
+    "get_messages",
+    "get_session_raw",
+    "get_messages_raw",
+    "get_agent_messages_raw",
+    "get_messages_since",
+    "get_messages_with_sizes",
+    "get_tool_calls",
+    "get_fingerprint",
+    "search_messages",
+    "_count_messages",
+    "_get_agents",
+    "_get_all_messages",
+    "_load_json",
+    "_load_many",
+    "open_pack",
+)
+
+# Export formatter functions wrapped with profiling spans
+FORMATTER_FUNCTIONS = ("format_markdown", "format_json", "format_text")
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# Span recorder of the request being profiled, or None
+_active_recorder = contextvars.ContextVar("strands_viewer_profile", default=None)
+
+
+class SpanRecorder:
+    """Records nested open/close events for a speedscope evented profile."""
+
+    def __init__(self):
+        self.frames: List[Dict[str, str]] = []
+        self.events: List[Dict[str, Any]] = []
+        self._frame_index: Dict[str, int] = {}
+        self._start = time.perf_counter()
+
+    def _frame(self, name: str) -> int:
+        index = self._frame_index.get(name)
+        if index is None:
+            index = len(self.frames)
+            self._frame_index[name] = index
+            self.frames.append({"name": name})
+        return index
+
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def open(self, name: str) -> None:
+        self.events.append({"type": "O", "frame": self._frame(name), "at": self._now_ms()})
+
+    def close(self, name: str) -> None:
+        self.events.append({"type": "C", "frame": self._frame(name), "at": self._now_ms()})
+
+    def rename(self, old: str, new: str) -> None:
+        """Rename a frame, e.g. once the matched route is known."""
+        index = self._frame_index.pop(old, None)
+        if index is not None and new not in self._frame_index:
+            self.frames[index]["name"] = new
+            self._frame_index[new] = index
+
+    def to_speedscope(self, name: str) -> Dict[str, Any]:
+        end = self.events[-1]["at"] if self.events else 0.0
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "strands-session-viewer",
+            "shared": {"frames": self.frames},
+            "profiles": [
+                {
+                    "type": "evented",
+                    "name": name,
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": end,
+                    "events": self.events,
+                }
+            ],
+        }
+
+
+def _wrap(func: Callable[..., Any], name: str) -> Callable[..., Any]:
+    """Wrap a function so calls are recorded as spans while a request is profiled."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        recorder = _active_recorder.get()
+        if recorder is None:
+            return func(*args, **kwargs)
+        recorder.open(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            recorder.close(name)
+
+    wrapper.__profiled__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def install_hooks(reader: Any) -> None:
+    """
+    Wrap SessionReader methods, export formatters and JSON response encoding.
+
+    Reader methods are wrapped on the given instance only; formatters and the
+    response class are wrapped once per process.
+    """
+    for method in READER_METHODS:
+        bound = getattr(reader, method)
+        if not getattr(bound, "__profiled__", False):
+            setattr(reader, method, _wrap(bound, f"SessionReader.{method}"))
+
+    for function in FORMATTER_FUNCTIONS:
+        original = getattr(export_formatter, function)
+        if not getattr(original, "__profiled__", False):
+            setattr(export_formatter, function, _wrap(original, f"export_formatter.{function}"))
+
+    if not getattr(TimedJSONResponse.render, "__profiled__", False):
+        TimedJSONResponse.render = _wrap(  # type: ignore[method-assign]
+            TimedJSONResponse.render, "JSONResponse.render"
+        )
+    if not getattr(RawJSONResponse.render, "__profiled__", False):
+        RawJSONResponse.render = _wrap(  # type: ignore[method-assign]
+            RawJSONResponse.render, "RawJSONResponse.render"
+        )
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests and writes one profile per request.
+
+    A request is profiled when it has an X-Profile header (its value may name
+    a format from PROFILE_FORMATS) or when profile_all is set. Profiled
+    requests run one at a time so their profiles don't mix.
+    """
+
+    def __init__(
+        self,
+        app: Any,
+        output_dir: str,
+        profile_format: str = "speedscope",
+        profile_all: bool = False,
+    ):
+        if profile_format not in PROFILE_FORMATS:
+            raise ValueError(
+                f"Unknown profile format: {profile_format}. Must be one of: {list(PROFILE_FORMATS)}"
+            )
+        self.app = app
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.profile_format = profile_format
+        self.profile_all = profile_all
+        self._lock: Optional[asyncio.Lock] = None
+        self._counter = itertools.count(1)
+
+    def _requested_format(self, scope: Dict[str, Any]) -> Optional[str]:
+        for key, value in scope.get("headers", []):
+            if key == PROFILE_HEADER:
+                requested = value.decode("latin-1").strip().lower()
+                if requested in ("0", "false", "off", "no"):
+                    return None
+                return requested if requested in PROFILE_FORMATS else self.profile_format
+        return self.profile_format if self.profile_all else None
+
+    def _output_path(self, scope: Dict[str, Any], profile_format: str) -> Path:
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", scope.get("path", "/")).strip("_") or "root"
+        extension = "prof" if profile_format == "pstats" else "speedscope.json"
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        return self.output_dir / (
+            f"{stamp}-{os.getpid()}-{next(self._counter):05d}-{scope.get('method', 'GET')}-{slug}"
+            f".{extension}"
+        )
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        profile_format = self._requested_format(scope) if scope["type"] == "http" else None
+        if profile_format is None:
+            await self.app(scope, receive, send)
+            return
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            await self._profile_request(scope, receive, send, profile_format)
+
+    async def _profile_request(
+        self, scope: Dict[str, Any], receive: Any, send: Any, profile_format: str
+    ) -> None:
+        path = self._output_path(scope, profile_format)
+        request_name = f"{scope.get('method', 'GET')} {scope.get('path', '/')}"
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_FILE_HEADER, path.name.encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        recorder = SpanRecorder()
+        profiler = cProfile.Profile() if profile_format == "pstats" else None
+        token = _active_recorder.set(recorder)
+        recorder.open(request_name)
+        try:
+            if profiler is not None:
+                profiler.enable()
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+        finally:
+            recorder.close(request_name)
+            _active_recorder.reset(token)
+
+            route = getattr(scope.get("route"), "path", None)
+            if route:
+                recorder.rename(request_name, f"{scope.get('method', 'GET')} {route}")
+
+            try:
+                if profiler is not None:
+                    profiler.dump_stats(str(path))
+                else:
+                    with open(path, "w", encoding="utf-8") as f:
+                        json.dump(recorder.to_speedscope(request_name), f)
+            except OSError as e:
+                print(f"⚠️  Could not write profile {path}: {e}")
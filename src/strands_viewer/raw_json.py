@@ -0,0 +1,67 @@
+"""
+Splicing already-encoded JSON into responses.
+
+Session views return message and agent files as they are on disk: the raw
+bytes of each file (or packed record) are spliced into the response body,
+with the agent ID injected as an extra key, instead of parsing every file
+and encoding the same data again.
+"""
+
+import json
+from typing import Any, List, Optional
+
+from starlette.responses import Response
+
+from strands_viewer.metrics import timed_phase
+
+
+class RawJSON(bytes):
+    """An already-encoded JSON value, spliced into encode_json output as-is."""
+
+
+def inject_field(raw: bytes, key: str, value: Any) -> Optional[RawJSON]:
+    """
+    Add a key to an encoded JSON object without parsing it.
+
+    Only the outer braces are checked, so the object must otherwise be valid
+    JSON. If the object already has the key, the added (last) one wins when
+    it is parsed.
+
+    Returns:
+        The object with the key added, or None if raw isn't a JSON object
+    """
+    body = raw.strip()
+    if not (body.startswith(b"{") and body.endswith(b"}")):
+        return None
+    field = json.dumps(key).encode("utf-8") + b":" + json.dumps(value).encode("utf-8")
+    inner = body[1:-1].strip()
+    if not inner:
+        return RawJSON(b"{" + field + b"}")
+    return RawJSON(b"{" + inner + b"," + field + b"}")
+
+
+def encode_json(value: Any) -> bytes:
+    """Encode a value as compact JSON, splicing RawJSON values in as-is."""
+    if isinstance(value, RawJSON):
+        return bytes(value)
+    if isinstance(value, dict):
+        items: List[bytes] = [
+            json.dumps(str(key)).encode("utf-8") + b":" + encode_json(item)
+            for key, item in value.items()
+        ]
+        return b"{" + b",".join(items) + b"}"
+    if isinstance(value, (list, tuple)):
+        return b"[" + b",".join(encode_json(item) for item in value) + b"]"
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+class RawJSONResponse(Response):
+    """JSON response whose content may contain RawJSON values; encoding is timed as serialize."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        with timed_phase("serialize"):
+            return encode_json(content)
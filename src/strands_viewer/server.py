@@ -2,33 +2,237 @@
 FastAPI server for Strands session viewer.
 """
 
+import asyncio
+import importlib.util
+import json
+import os
+import threading
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, HTTPException, Body
 from fastapi.responses import HTMLResponse, FileResponse, PlainTextResponse
 from pathlib import Path
-from typing import Optional, Dict, List
+from starlette.concurrency import run_in_threadpool
+from typing import Any, AsyncIterator, Callable, Optional, Dict, List, Union
 import uvicorn
 
 from strands_viewer.session_reader import SessionReader
+from strands_viewer.multi_root import MultiRootReader
+from strands_viewer.raw_json import RawJSONResponse
+from strands_viewer.storage import open_backend, state_dir_for
+from strands_viewer.warmup import Warmup
 from strands_viewer.export_formatter import format_session, get_filename
-
-try:
-    from strands_viewer.ai_analysis import SessionAnalyzer, STRANDS_AVAILABLE
-
-    AI_AVAILABLE = STRANDS_AVAILABLE
-except ImportError:
-    AI_AVAILABLE = False
-    SessionAnalyzer = None
+from strands_viewer.analysis_store import AnalysisStore
+from strands_viewer.analytics import DEFAULT_GROUP_BY, MessageStore
+from strands_viewer.dump import DEFAULT_DUMP_SUBDIR, DUMP_FORMATS, dump_store
+from strands_viewer.heuristics import (
+    analyze_session_heuristics,
+    format_heuristic_report,
+    summarize_tool_latency,
+)
+from strands_viewer.limits import (
+    DEFAULT_PROVIDER_CONCURRENCY,
+    DEFAULT_PROVIDER_RATES,
+    AdmissionController,
+    admission_rejection,
+    provider_for_model,
+)
+from strands_viewer.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    REGISTRY,
+    MetricsMiddleware,
+    TimedJSONResponse,
+    WorkerMetrics,
+    record_cache_lookup,
+    timed_phase,
+)
+
+# The AI stack (strands_viewer.ai_analysis and Strands) is imported on the first
+# AI request; at startup only check that Strands is installed.
+AI_AVAILABLE = importlib.util.find_spec("strands") is not None
+
+# Mirrors ai_analysis.ANALYSIS_TYPES without importing the AI stack
+ANALYSIS_TYPES = ("summarize", "errors", "improvements")
+
+AI_UNAVAILABLE_DETAIL = (
+    "AI analysis not available. Install with: pip install strands-session-viewer[ai]"
+)
+
+CHAT_MODES = ("tools", "cached")
+
+# Rule-based analysis type, available without the AI extra
+HEURISTIC_ANALYSIS = "heuristic"
+
+
+def _model_name(model) -> Optional[str]:
+    """Describe a model instance for stored analysis records."""
+    if model is None:
+        return None
+    config = getattr(model, "config", None)
+    model_id = config.get("model_id") if isinstance(config, dict) else None
+    return f"{type(model).__name__}:{model_id}" if model_id else type(model).__name__
+
+
+# Seconds an /api/analytics answer may lag behind the sessions (refresh=true to force)
+ANALYTICS_MAX_AGE_SECONDS = 60.0
+
+# Longest wait of a /messages?since= long-poll, and how often it checks for new messages
+MAX_SINCE_TIMEOUT = 60.0
+SINCE_POLL_INTERVAL = 0.5
 
 
 class SessionViewerApp:
     """Web application for viewing Strands sessions."""
 
-    def __init__(self, storage_dir: str, port: int = 8000, model=None):
+    def __init__(
+        self,
+        storage_dir: Union[str, Dict[str, str]],
+        port: int = 8000,
+        model=None,
+        model_factory: Optional[Callable[[], Any]] = None,
+        chat_mode: str = "tools",
+        analysis_dir: Optional[str] = None,
+        admission: Optional[AdmissionController] = None,
+        request_log: Optional[str] = None,
+        profile_dir: Optional[str] = None,
+        profile_format: str = "speedscope",
+        profile_all: bool = False,
+        shared_cache: Optional[str] = None,
+        warmup: bool = True,
+        metrics_dir: Optional[str] = None,
+    ):
+        if chat_mode not in CHAT_MODES:
+            raise ValueError(f"Unknown chat mode: {chat_mode}. Must be one of: {list(CHAT_MODES)}")
         self.storage_dir = storage_dir
         self.port = port
-        self.reader = SessionReader(storage_dir)
-        self.analyzer = SessionAnalyzer(model=model) if AI_AVAILABLE and SessionAnalyzer else None
+        self.chat_mode = chat_mode
+        self._model = model
+        self._model_factory = model_factory
+        self._analyzer: Any = None
+        self._analyzer_lock = threading.Lock()
+        self.reader = self._create_reader(storage_dir, shared_cache)
+        self.analysis_store = (
+            AnalysisStore(analysis_dir)
+            if analysis_dir
+            else AnalysisStore.for_storage_dir(str(self.reader.state_dir))
+        )
+        self.admission = admission or AdmissionController.for_provider(provider_for_model(model))
+        self.warmup = Warmup(self.reader) if warmup else None
+        # With several workers, /metrics sums the metrics of all of them
+        self.worker_metrics = WorkerMetrics(metrics_dir) if metrics_dir else None
+        self._analytics: Optional[MessageStore] = None
+        self._analytics_updated = 0.0
+        self._analytics_lock = threading.Lock()
+        self._dump_lock = threading.Lock()
         self.app = self._create_app()
+        if request_log:
+            from strands_viewer.loadtest import RequestLogMiddleware
+
+            self.app.add_middleware(RequestLogMiddleware, path=request_log)
+        if profile_dir:
+            from strands_viewer.profiling import ProfilingMiddleware, install_hooks
+
+            for reader in self._root_readers():
+                install_hooks(reader)
+            self.app.add_middleware(
+                ProfilingMiddleware,
+                output_dir=profile_dir,
+                profile_format=profile_format,
+                profile_all=profile_all,
+            )
+
+    @staticmethod
+    def _create_reader(
+        storage_dir: Union[str, Dict[str, str]], shared_cache: Optional[str]
+    ) -> Union[SessionReader, MultiRootReader]:
+        """
+        Create the session reader for one storage root, or for several namespaced roots.
+
+        With several roots each root gets its own reader and, when shared_cache
+        is set, its own cache file at <root>/.strands-viewer/cache.sqlite3 (for
+        S3 roots, below the current directory).
+        """
+        roots = storage_dir if isinstance(storage_dir, dict) else None
+        if roots is not None and len(roots) == 1:
+            storage_dir, roots = next(iter(roots.values())), None
+
+        if roots is None:
+            if not shared_cache:
+                return SessionReader(storage_dir)
+            from strands_viewer.shared_cache import CachingSessionReader, SharedCache
+
+            return CachingSessionReader(storage_dir, SharedCache(shared_cache))
+
+        readers: Dict[str, SessionReader] = {}
+        for namespace, path in roots.items():
+            if shared_cache:
+                from strands_viewer.shared_cache import CachingSessionReader, SharedCache
+
+                backend = open_backend(path)
+                cache = SharedCache.for_storage_dir(str(backend.state_dir))
+                readers[namespace] = CachingSessionReader(backend, cache)
+            else:
+                readers[namespace] = SessionReader(path)
+        return MultiRootReader(readers)
+
+    def _root_readers(self) -> List[SessionReader]:
+        if isinstance(self.reader, MultiRootReader):
+            return list(self.reader.readers.values())
+        return [self.reader]
+
+    @property
+    def model(self):
+        """The model instance, created by model_factory on first use."""
+        if self._model is None and self._model_factory is not None:
+            with self._analyzer_lock:
+                if self._model is None and self._model_factory is not None:
+                    factory, self._model_factory = self._model_factory, None
+                    try:
+                        self._model = factory()
+                    except ImportError as e:
+                        print(f"⚠️  Could not create model, using the default: {e}")
+        return self._model
+
+    @property
+    def analyzer(self):
+        """The SessionAnalyzer, created with the AI stack on first use (None without AI)."""
+        if self._analyzer is None and AI_AVAILABLE:
+            model = self.model
+            with self._analyzer_lock:
+                if self._analyzer is None:
+                    from strands_viewer.ai_analysis import STRANDS_AVAILABLE, SessionAnalyzer
+
+                    if STRANDS_AVAILABLE:
+                        self._analyzer = SessionAnalyzer(
+                            model=model, call_gate=self.admission.admit
+                        )
+        return self._analyzer
+
+    @analyzer.setter
+    def analyzer(self, analyzer):
+        self._analyzer = analyzer
+
+    async def _get_analyzer(self):
+        """Get the analyzer, importing the AI stack off the event loop on first use."""
+        if not AI_AVAILABLE:
+            return None
+        if self._analyzer is not None:
+            return self._analyzer
+        return await run_in_threadpool(lambda: self.analyzer)
+
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[None]:
+        """Start warming up in the background; the server accepts requests meanwhile."""
+        if self.warmup is not None:
+            self.warmup.start()
+        if self.worker_metrics is not None:
+            self.worker_metrics.start()
+        try:
+            yield
+        finally:
+            if self.worker_metrics is not None:
+                self.worker_metrics.stop()
 
     def _create_app(self) -> FastAPI:
         """Create FastAPI application."""
@@ -36,39 +240,248 @@ class SessionViewerApp:
             title="Strands Session Viewer",
             description="View and explore Strands agent sessions",
             version="0.1.0",
+            default_response_class=TimedJSONResponse,
+            lifespan=self._lifespan,
         )
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/healthz")
+        async def healthz():
+            """Liveness probe: the server is up and handling requests."""
+            return {"status": "ok"}
+
+        @app.get("/readyz")
+        async def readyz():
+            """Readiness probe: ready once the background warm-up has finished."""
+            if self.warmup is None:
+                return {"ready": True, "warmup": None}
+            body = {"ready": self.warmup.ready, "warmup": self.warmup.progress()}
+            if not self.warmup.ready:
+                return TimedJSONResponse(body, status_code=503)
+            return body
 
         # API Routes
         @app.get("/api/sessions")
-        async def list_sessions():
-            """List all available sessions."""
+        async def list_sessions(offset: int = 0, limit: Optional[int] = None):
+            """
+            List all available sessions, newest first.
+
+            With limit, returns one page of the listing plus the total count.
+            While the background warm-up is scanning, the sessions scanned so far
+            are returned with "partial": true and the warm-up progress.
+            """
+            if self.warmup is not None and self.warmup.status == "running":
+                return {
+                    "success": True,
+                    "sessions": self.warmup.partial_listing(),
+                    "partial": True,
+                    "warmup": self.warmup.progress(),
+                }
             try:
-                sessions = self.reader.list_sessions()
-                return {"success": True, "sessions": sessions}
+                # The warm-up scan's listing, until a session changes
+                scanned = self.warmup.listing() if self.warmup is not None else None
+                if limit is None and offset == 0:
+                    sessions = scanned if scanned is not None else self.reader.list_sessions()
+                    return {"success": True, "sessions": sessions}
+                start = max(0, offset)
+                count = None if limit is None else max(0, limit)
+                if scanned is not None:
+                    stop = start + count if count is not None else None
+                    sessions, total = scanned[start:stop], len(scanned)
+                else:
+                    sessions, total = self.reader.list_sessions_page(start, count)
+                return {
+                    "success": True,
+                    "sessions": sessions,
+                    "offset": offset,
+                    "limit": limit,
+                    "total": total,
+                }
             except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+                raise HTTPException(status_code=500, detail=str(e)) from e
 
         @app.get("/api/sessions/{session_id}")
         async def get_session(session_id: str):
             """Get detailed session information."""
             try:
-                session = self.reader.get_session(session_id)
+                # Agent and message files are spliced into the response unparsed
+                session = self.reader.get_session_raw(session_id)
                 if not session:
                     raise HTTPException(status_code=404, detail="Session not found")
-                return {"success": True, "session": session}
+                return RawJSONResponse({"success": True, "session": session})
             except HTTPException:
                 raise
             except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+                raise HTTPException(status_code=500, detail=str(e)) from e
 
         @app.get("/api/sessions/{session_id}/messages")
-        async def get_messages(session_id: str, limit: Optional[int] = None, offset: int = 0):
-            """Get messages for a session with pagination."""
+        async def get_messages(
+            session_id: str,
+            limit: Optional[int] = None,
+            offset: int = 0,
+            since: Optional[str] = None,
+            timeout: float = 0,
+        ):
+            """
+            Get messages for a session with pagination.
+
+            With since (a cursor from a previous response, or empty for all
+            messages), returns only messages added after the cursor plus the
+            next cursor, waiting up to timeout seconds for new messages.
+            """
+            if since is not None:
+                return await self._messages_since(session_id, since, timeout)
+            try:
+                messages = self.reader.get_messages_raw(session_id, limit, offset)
+                return RawJSONResponse({"success": True, "messages": messages})
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e)) from e
+
+        @app.get("/api/sessions/{session_id}/agents/{agent_id}/messages")
+        async def get_agent_messages(
+            session_id: str, agent_id: str, limit: Optional[int] = None, offset: int = 0
+        ):
+            """Get one agent's messages with pagination, reading only that agent's files."""
+            try:
+                messages = self.reader.get_agent_messages_raw(session_id, agent_id, limit, offset)
+                if messages is None:
+                    raise HTTPException(status_code=404, detail="Agent not found")
+                return RawJSONResponse({"success": True, "messages": messages})
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e)) from e
+
+        @app.get("/api/sessions/{session_id}/tool-calls")
+        async def get_tool_calls(session_id: str, tool: Optional[str] = None):
+            """
+            Get a session's tool calls with their latency, in call order.
+
+            Each call is paired with its result by toolUseId; tools has
+            per-tool latency percentiles for the session.
+            """
+            try:
+                calls = self.reader.get_tool_calls(session_id)
+                if calls is None:
+                    raise HTTPException(status_code=404, detail="Session not found")
+                timeline = [call for call in calls.values() if tool is None or call["name"] == tool]
+                return {
+                    "success": True,
+                    "session_id": session_id,
+                    "calls": timeline,
+                    "tools": summarize_tool_latency(timeline),
+                }
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e)) from e
+
+        @app.get("/api/analytics")
+        async def analytics(
+            group_by: Optional[str] = None,
+            level: str = "message",
+            refresh: bool = False,
+            session_type: Optional[str] = None,
+            agent: Optional[str] = None,
+            role: Optional[str] = None,
+            tool: Optional[str] = None,
+            status: Optional[str] = None,
+            day: Optional[str] = None,
+        ):
+            """
+            Aggregate message metadata across all sessions.
+
+            level=message counts messages, tool results, errors and bytes per
+            group (group_by: comma-separated MESSAGE_KEYS; the other parameters
+            filter). level=call gives tool call latency percentiles per group
+            of CALL_KEYS. level=session gives messages-per-session percentiles
+            per session_type and/or creation day, filtered by those two only.
+            Without group_by, each level groups by DEFAULT_GROUP_BY; a filter
+            the level has no key for is rejected with 400.
+            """
+            filters = {
+                key: value
+                for key, value in {
+                    "session_type": session_type,
+                    "agent": agent,
+                    "role": role,
+                    "tool": tool,
+                    "status": status,
+                    "day": day,
+                }.items()
+                if value is not None
+            }
+            if level not in DEFAULT_GROUP_BY:
+                raise HTTPException(
+                    status_code=400, detail="level must be message, call or session"
+                )
+            if group_by is None:
+                keys = list(DEFAULT_GROUP_BY[level])
+            else:
+                keys = [key.strip() for key in group_by.split(",") if key.strip()]
+
+            def run() -> Dict[str, Any]:
+                store = self._analytics_store(refresh)
+                started = time.perf_counter()
+                if level == "session":
+                    rows = store.session_stats(keys, filters)
+                elif level == "call":
+                    rows = store.tool_latency(keys, filters)
+                else:
+                    rows = store.query(keys, filters)
+                return {
+                    "success": True,
+                    "level": level,
+                    "group_by": keys,
+                    "rows": rows,
+                    "messages": store.rows,
+                    "calls": store.call_rows,
+                    "sessions": len(store.sessions),
+                    "engine": store.engine,
+                    "query_ms": round((time.perf_counter() - started) * 1000, 3),
+                }
+
+            try:
+                return await run_in_threadpool(run)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e)) from e
+
+        @app.post("/api/dump")
+        async def dump(format: Optional[str] = Body(None, embed=True)):
+            """
+            Write all sessions as partitioned tables for offline analytics.
+
+            The tables go to .strands-viewer/dump/ in the sessions directory
+            (see `strands-viewer dump`); only sessions changed since the last
+            dump are written again.
+            """
+            if format is not None and format not in DUMP_FORMATS:
+                raise HTTPException(
+                    status_code=400, detail=f"format must be one of: {', '.join(DUMP_FORMATS)}"
+                )
+            if not self._dump_lock.acquire(blocking=False):
+                raise HTTPException(status_code=409, detail="A dump is already running")
+            output = self.reader.state_dir / DEFAULT_DUMP_SUBDIR
+            try:
+                report = await run_in_threadpool(dump_store, self.reader, str(output), format)
+            except ImportError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e)) from e
+            finally:
+                self._dump_lock.release()
+            return {"success": True, "output": str(output), **report}
+
+        @app.get("/api/search")
+        async def search(q: str, session_id: Optional[str] = None, limit: int = 100):
+            """Search message text across all sessions, or within one session."""
             try:
-                messages = self.reader.get_messages(session_id, limit, offset)
-                return {"success": True, "messages": messages}
+                matches = self.reader.search_messages(q, session_id=session_id, limit=limit)
+                return {"success": True, "matches": matches}
             except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+                raise HTTPException(status_code=500, detail=str(e)) from e
 
         @app.get("/api/sessions/{session_id}/export")
         async def export_session(session_id: str, format: str = "markdown"):
@@ -77,7 +490,7 @@ class SessionViewerApp:
 
             Args:
                 session_id: Session ID to export
-                format: Export format (markdown, json, text)
+                format: Export format (markdown, json, text, otlp)
 
             Returns:
                 Formatted session content
@@ -90,15 +503,17 @@ class SessionViewerApp:
 
                 # Format the session
                 try:
-                    content = format_session(session, format)
+                    with timed_phase("format"):
+                        content = format_session(session, format)
                 except ValueError as e:
-                    raise HTTPException(status_code=400, detail=str(e))
+                    raise HTTPException(status_code=400, detail=str(e)) from e
 
                 # Determine content type
                 content_types = {
                     "markdown": "text/markdown",
                     "json": "application/json",
                     "text": "text/plain",
+                    "otlp": "application/json",
                 }
                 content_type = content_types.get(format, "text/plain")
 
@@ -115,14 +530,25 @@ class SessionViewerApp:
             except HTTPException:
                 raise
             except Exception as e:
-                raise HTTPException(status_code=500, detail=str(e))
+                raise HTTPException(status_code=500, detail=str(e)) from e
+
+        @app.get("/metrics")
+        async def metrics():
+            """Expose request, reader, cache and model metrics in Prometheus text format."""
+            if self.worker_metrics is not None:
+                text = await run_in_threadpool(self.worker_metrics.render)
+            else:
+                text = REGISTRY.render()
+            return PlainTextResponse(text, media_type=PROMETHEUS_CONTENT_TYPE)
 
         # AI Analysis Routes
         @app.get("/api/ai/status")
         async def ai_status():
             """Check if AI analysis is available."""
             return {
-                "available": AI_AVAILABLE and self.analyzer is not None,
+                "available": AI_AVAILABLE,
+                "heuristic": True,
+                "admission": self.admission.stats(),
                 "features": (
                     {
                         "summarize": AI_AVAILABLE,
@@ -135,22 +561,62 @@ class SessionViewerApp:
                 ),
             }
 
+        @app.get("/api/ai/metrics")
+        async def ai_metrics():
+            """Report cache-read vs. uncached input tokens and latency of cached chat turns."""
+            analyzer = await self._get_analyzer()
+            if analyzer is None:
+                raise HTTPException(status_code=503, detail="AI analysis not available.")
+            return {
+                "success": True,
+                "chat": analyzer.chat_metrics_summary(),
+                "admission": self.admission.stats(),
+            }
+
         @app.post("/api/sessions/{session_id}/analyze")
-        async def analyze_session(session_id: str, analysis_type: str = Body(..., embed=True)):
+        async def analyze_session(
+            session_id: str,
+            analysis_type: str = Body(..., embed=True),
+            enrich: bool = Body(False, embed=True),
+        ):
             """
             Analyze a session using AI.
 
             Args:
                 session_id: Session ID to analyze
-                analysis_type: Type of analysis (summarize, errors, improvements)
+                analysis_type: Type of analysis (heuristic, summarize, errors, improvements)
+                enrich: For heuristic analysis, also have the model explain the findings
 
             Returns:
-                Analysis results
+                Analysis results. Precomputed analyses (see `strands-viewer analyze`)
+                for the current session fingerprint are returned without a model call.
+                Heuristic analysis is rule-based and needs no model unless enriched.
             """
-            if not AI_AVAILABLE or not self.analyzer:
+            if analysis_type == HEURISTIC_ANALYSIS:
+                return await self._heuristic_analysis(session_id, enrich)
+
+            if analysis_type not in ANALYSIS_TYPES:
+                raise HTTPException(
+                    status_code=400, detail=f"Unknown analysis type: {analysis_type}"
+                )
+
+            fingerprint = self.reader.get_fingerprint(session_id)
+            if fingerprint is not None:
+                stored = self.analysis_store.get(session_id, analysis_type, fingerprint)
+                record_cache_lookup("analysis_store", hit=stored is not None)
+                if stored is not None:
+                    return {
+                        "success": True,
+                        "analysis": stored["analysis"],
+                        "cached": True,
+                        "created_at": stored.get("created_at"),
+                    }
+
+            analyzer = await self._get_analyzer()
+            if analyzer is None:
                 raise HTTPException(
                     status_code=503,
-                    detail="AI analysis not available. Install with: pip install strands-session-viewer[ai]",
+                    detail=AI_UNAVAILABLE_DETAIL,
                 )
 
             try:
@@ -159,21 +625,22 @@ class SessionViewerApp:
                 if not session:
                     raise HTTPException(status_code=404, detail="Session not found")
 
-                # Perform analysis based on type
-                if analysis_type == "summarize":
-                    result = self.analyzer.summarize_session(session)
-                elif analysis_type == "errors":
-                    result = self.analyzer.analyze_errors(session)
-                    if result is None:
-                        result = "No errors found in this session."
-                elif analysis_type == "improvements":
-                    result = self.analyzer.suggest_improvements(session)
-                else:
-                    raise HTTPException(
-                        status_code=400, detail=f"Unknown analysis type: {analysis_type}"
+                from strands_viewer.ai_analysis import run_analysis
+
+                result = await self._call_llm(run_analysis, analyzer, session, analysis_type)
+
+                try:
+                    self.analysis_store.put(
+                        session_id,
+                        analysis_type,
+                        fingerprint,
+                        result,
+                        model=_model_name(self.model),
                     )
+                except OSError as e:
+                    print(f"⚠️  Could not store analysis for session {session_id}: {e}")
 
-                return {"success": True, "analysis": result}
+                return {"success": True, "analysis": result, "cached": False}
 
             except HTTPException:
                 raise
@@ -182,13 +649,26 @@ class SessionViewerApp:
 
                 print(f"❌ Error during analysis: {e}")
                 traceback.print_exc()
-                raise HTTPException(status_code=500, detail=str(e))
+                raise HTTPException(status_code=500, detail=str(e)) from e
+
+        @app.get("/api/sessions/{session_id}/analyses")
+        async def list_analyses(session_id: str):
+            """List precomputed analyses that are current for the session."""
+            fingerprint = self.reader.get_fingerprint(session_id)
+            if fingerprint is None:
+                raise HTTPException(status_code=404, detail="Session not found")
+            try:
+                analyses = self.analysis_store.list_analyses(session_id, fingerprint)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            return {"success": True, "analyses": analyses}
 
         @app.post("/api/sessions/{session_id}/chat")
         async def chat_about_session(
             session_id: str,
             question: str = Body(..., embed=True),
             chat_history: Optional[List[Dict[str, str]]] = Body(None, embed=True),
+            mode: Optional[str] = Body(None, embed=True),
         ):
             """
             Ask questions about a session using AI.
@@ -197,14 +677,18 @@ class SessionViewerApp:
                 session_id: Session ID to analyze
                 question: User's question
                 chat_history: Optional previous conversation history
+                mode: "tools" (agent explores the session with tools) or "cached"
+                      (session rendered into a cached prompt prefix); defaults to
+                      the app's chat mode
 
             Returns:
-                AI response
+                AI response, plus token/latency metrics in cached mode
             """
-            if not AI_AVAILABLE or not self.analyzer:
+            analyzer = await self._get_analyzer()
+            if analyzer is None:
                 raise HTTPException(
                     status_code=503,
-                    detail="AI analysis not available. Install with: pip install strands-session-viewer[ai]",
+                    detail=AI_UNAVAILABLE_DETAIL,
                 )
 
             try:
@@ -213,10 +697,28 @@ class SessionViewerApp:
                 if not session:
                     raise HTTPException(status_code=404, detail="Session not found")
 
+                chat_mode = mode or self.chat_mode
+                if chat_mode not in CHAT_MODES:
+                    raise HTTPException(status_code=400, detail=f"Unknown chat mode: {chat_mode}")
+
+                # Sessions too large for the prefix fall back to tool-based exploration
+                if chat_mode == "cached" and analyzer.can_use_cached_chat(session):
+                    response = await self._call_llm(
+                        analyzer.answer_question_cached, session, question, chat_history
+                    )
+                    return {
+                        "success": True,
+                        "answer": response["answer"],
+                        "mode": "cached",
+                        "metrics": response["metrics"],
+                    }
+
                 # Get AI response
-                answer = self.analyzer.answer_question(session, question, chat_history)
+                answer = await self._call_llm(
+                    analyzer.answer_question, session, question, chat_history
+                )
 
-                return {"success": True, "answer": answer}
+                return {"success": True, "answer": answer, "mode": "tools"}
 
             except HTTPException:
                 raise
@@ -225,7 +727,7 @@ class SessionViewerApp:
 
                 print(f"❌ Error during chat: {e}")
                 traceback.print_exc()
-                raise HTTPException(status_code=500, detail=str(e))
+                raise HTTPException(status_code=500, detail=str(e)) from e
 
         # Serve the HTML interface
         @app.get("/", response_class=HTMLResponse)
@@ -238,7 +740,103 @@ class SessionViewerApp:
 
         return app
 
-    def run(self, open_browser: bool = False):
+    async def _call_llm(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a blocking analyzer call in the threadpool.
+
+        Each model request the call sends waits for admission (the analyzer's
+        call_gate), so a call making several requests is limited per request.
+
+        Raises:
+            HTTPException: 429 or 503 with a Retry-After header when the provider
+                           is saturated
+        """
+        try:
+            return await run_in_threadpool(fn, *args)
+        except Exception as e:
+            rejection = admission_rejection(e)
+            if rejection is None:
+                raise
+            raise HTTPException(
+                status_code=rejection.status_code,
+                detail=rejection.reason,
+                headers={"Retry-After": str(rejection.retry_after)},
+            ) from e
+
+    def _analytics_store(self, refresh: bool) -> MessageStore:
+        """The message metadata store, updated if it is older than ANALYTICS_MAX_AGE_SECONDS."""
+        with self._analytics_lock:
+            if self._analytics is None:
+                self._analytics = MessageStore.for_storage_dir(str(self.reader.state_dir))
+            now = time.monotonic()
+            if (
+                refresh
+                or not self._analytics_updated
+                or (now - self._analytics_updated > ANALYTICS_MAX_AGE_SECONDS)
+            ):
+                self._analytics.update(self.reader)
+                self._analytics_updated = time.monotonic()
+            return self._analytics
+
+    async def _messages_since(self, session_id: str, cursor: str, timeout: float) -> Any:
+        """Long-poll for messages after a cursor, returning as soon as there are any."""
+        deadline = time.monotonic() + min(max(timeout, 0.0), MAX_SINCE_TIMEOUT)
+        while True:
+            try:
+                result = await run_in_threadpool(self.reader.get_messages_since, session_id, cursor)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e)) from e
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=str(e)) from e
+            if result is None:
+                raise HTTPException(status_code=404, detail="Session not found")
+            messages, next_cursor = result
+            if messages or time.monotonic() >= deadline:
+                return RawJSONResponse(
+                    {"success": True, "messages": messages, "cursor": next_cursor}
+                )
+            await asyncio.sleep(SINCE_POLL_INTERVAL)
+
+    async def _heuristic_analysis(self, session_id: str, enrich: bool) -> Dict:
+        """Run the rule-based analysis, optionally enriched by the model."""
+        session = self.reader.get_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+
+        report = analyze_session_heuristics(session)
+        response = {
+            "success": True,
+            "analysis": format_heuristic_report(report),
+            "heuristics": report,
+            "cached": False,
+            "enriched": False,
+        }
+        if not enrich:
+            return response
+
+        analyzer = await self._get_analyzer()
+        if analyzer is None:
+            raise HTTPException(
+                status_code=503,
+                detail=AI_UNAVAILABLE_DETAIL,
+            )
+
+        try:
+            enriched = await self._call_llm(analyzer.enrich_heuristics, session, report)
+        except HTTPException:
+            raise
+        except Exception as e:
+            import traceback
+
+            print(f"❌ Error during analysis: {e}")
+            traceback.print_exc()
+            raise HTTPException(status_code=500, detail=str(e)) from e
+
+        response["analysis"] = f"{response['analysis']}\n{enriched}"
+        response["enriched"] = True
+        return response
+
+    def run(self, open_browser: bool = False, host: str = "0.0.0.0"):  # nosec B104
         """Run the server."""
         import webbrowser
 
@@ -249,8 +847,121 @@ class SessionViewerApp:
         print(f"📁 Storage directory: {self.storage_dir}")
         print(f"🌐 Open your browser to: http://localhost:{self.port}\n")
 
-        # Binding to all interfaces is intentional for LAN accessibility
-        uvicorn.run(self.app, host="0.0.0.0", port=self.port, log_level="info")  # nosec B104
+        uvicorn.run(self.app, host=host, port=self.port, log_level="info")
+
+
+# Environment variable carrying the viewer configuration to worker processes
+WORKER_CONFIG_ENV = "STRANDS_VIEWER_WORKER_CONFIG"
+
+
+def create_app() -> FastAPI:
+    """
+    Build the viewer app in a worker process from WORKER_CONFIG_ENV.
+
+    Used as the uvicorn app factory in multi-worker mode. Every worker creates
+    its own model client (on its first AI request) and admission controller;
+    the configured model call limits are split evenly across workers so the
+    totals stay the same.
+    """
+    config = json.loads(os.environ[WORKER_CONFIG_ENV])
+    workers = max(1, config.get("workers", 1))
+
+    model_factory = None
+    if config.get("model_provider"):
+        from strands_viewer.cli import _create_model
+
+        def model_factory():
+            return _create_model(config["model_provider"], config.get("model_id"))[0]
+
+    llm = config.get("llm", {})
+    provider = config.get("model_provider") or "bedrock"
+    concurrency = llm.get("max_concurrent") or DEFAULT_PROVIDER_CONCURRENCY.get(provider, 4)
+    rate = llm.get("rate_per_minute")
+    if rate is None:
+        rate = DEFAULT_PROVIDER_RATES.get(provider)
+    admission = AdmissionController.for_provider(
+        provider,
+        max_concurrent=max(1, concurrency // workers),
+        rate_per_minute=rate / workers if rate else None,
+        max_queue=max(1, llm.get("max_queue", 16) // workers),
+        queue_timeout=llm.get("queue_timeout", 30.0),
+    )
+
+    viewer = SessionViewerApp(
+        config["storage_dir"],
+        config.get("port", 8000),
+        model_factory=model_factory,
+        chat_mode=config.get("chat_mode", "tools"),
+        analysis_dir=config.get("analysis_dir"),
+        admission=admission,
+        request_log=config.get("request_log"),
+        profile_dir=config.get("profile_dir"),
+        profile_format=config.get("profile_format", "speedscope"),
+        profile_all=config.get("profile_all", False),
+        shared_cache=config.get("shared_cache"),
+        warmup=config.get("warmup", True),
+        metrics_dir=config.get("metrics_dir"),
+    )
+    return viewer.app
+
+
+def run_workers(
+    config: Dict[str, Any],
+    host: str = "0.0.0.0",  # nosec B104
+    port: int = 8000,
+    workers: int = 2,
+    open_browser: bool = False,
+):
+    """
+    Serve the viewer from several worker processes sharing one socket.
+
+    Args:
+        config: Keyword arguments for create_app (storage_dir, model_provider, ...)
+        host: Host to bind to
+        port: Port to listen on
+        workers: Number of worker processes
+        open_browser: Open the viewer in a browser
+    """
+    import shutil
+    import tempfile
+    import webbrowser
+
+    from strands_viewer.shared_cache import DEFAULT_CACHE_FILE, SharedCache
+
+    # Workers' metric snapshots, summed by /metrics; removed when the server stops
+    metrics_dir = tempfile.mkdtemp(prefix="strands-viewer-metrics-")
+    config = dict(config, port=port, workers=workers, metrics_dir=metrics_dir)
+    several_roots = isinstance(config["storage_dir"], dict) and len(config["storage_dir"]) > 1
+    if several_roots:
+        # Each root keeps its own cache file
+        config["shared_cache"] = str(DEFAULT_CACHE_FILE)
+        cache_location = f"<root>/{DEFAULT_CACHE_FILE} per root"
+    else:
+        if not config.get("shared_cache"):
+            state_dir = state_dir_for(config["storage_dir"])
+            config["shared_cache"] = str(SharedCache.for_storage_dir(str(state_dir)).path)
+        cache_location = config["shared_cache"]
+    os.environ[WORKER_CONFIG_ENV] = json.dumps(config)
+
+    if open_browser:
+        webbrowser.open(f"http://localhost:{port}")
+
+    print(f"\n🚀 Strands Session Viewer starting with {workers} workers...")
+    print(f"📁 Storage directory: {config['storage_dir']}")
+    print(f"💾 Shared cache: {cache_location}")
+    print(f"🌐 Open your browser to: http://localhost:{port}\n")
+
+    try:
+        uvicorn.run(
+            "strands_viewer.server:create_app",
+            factory=True,
+            host=host,
+            port=port,
+            workers=workers,
+            log_level="info",
+        )
+    finally:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
 
 
 def main(storage_dir: str = "./sessions", port: int = 8000, open_browser: bool = True, model=None):
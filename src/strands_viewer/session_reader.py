@@ -3,83 +3,392 @@ Session reader for Strands file session manager.
 Reads and parses session data from the filesystem.
 """
 
+import base64
+import binascii
+import hashlib
+import heapq
+import itertools
 import json
+import threading
+import time
+from collections import OrderedDict
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from strands_viewer.compression import JSON_SUFFIXES, decompress_file, split_compression
+from strands_viewer.metrics import READER_FILES_READ, READER_JSON_BYTES, timed_phase
+from strands_viewer.pack import PACK_SUFFIX, PackedSession
+from strands_viewer.raw_json import RawJSON, inject_field
+from strands_viewer.storage import FileInfo, LocalBackend, StorageBackend, open_backend
+from strands_viewer.timeline import pair_tool_calls
+
+T = TypeVar("T")
+
+# Message files read at a time from each agent while merging a page of a timeline
+MERGE_READ_CHUNK = 32
+
+# Message created_at values remembered per reader (by file version), so pages
+# of a merged timeline don't parse the same messages again
+CREATED_AT_CACHE_SIZE = 50_000
+
+# Age after which a message file that doesn't parse is taken as broken rather
+# than still being written
+PARTIAL_WRITE_SECONDS = 5.0
+
+# Entries whose changes invalidate a session listing
+LISTING_PATTERNS = (
+    "session_*/session.json",
+    "session_*/session.json.gz",
+    "session_*/session.json.zst",
+    "session_*/agents",
+    "session_*/agents/*/messages",
+    "session_*.pack",
+)
+
+
+def _is_agent_file(path: str) -> bool:
+    # session_<id>/agents/<agent>/agent.json[.gz|.zst]
+    parts = split_compression(path)[0].split("/")
+    return len(parts) == 4 and parts[3] == "agent.json"
+
+
+def _is_message_file(path: str) -> bool:
+    # session_<id>/agents/<agent>/messages/message_<n>.json[.gz|.zst]
+    parts = split_compression(path)[0].split("/")
+    return (
+        len(parts) == 5
+        and parts[3] == "messages"
+        and parts[4].startswith("message_")
+        and parts[4].endswith(".json")
+    )
+
+
+def _message_number(path: str) -> int:
+    # .../messages/message_<n>.json[.gz|.zst]
+    try:
+        return int(split_compression(path)[0].rsplit("_", 1)[1][: -len(".json")])
+    except ValueError:
+        return 0
+
+
+def _file_version(info: FileInfo) -> Hashable:
+    # A FileInfo names a version of a file's content (its size, mtime and ETag)
+    return info
+
+
+def _timeline_key(message: Dict[str, Any]) -> str:
+    return message.get("created_at") or ""
+
+
+def _agent_message_files(files: List[FileInfo]) -> List[Tuple[str, List[FileInfo]]]:
+    """Message files grouped by agent (in agent ID order), each agent's in message number order."""
+    by_agent: Dict[str, List[FileInfo]] = {}
+    for info in files:
+        if _is_message_file(info.path):
+            by_agent.setdefault(info.path.split("/")[2], []).append(info)
+    return [
+        (agent_id, sorted(infos, key=lambda info: _message_number(info.path)))
+        for agent_id, infos in sorted(by_agent.items())
+    ]
+
+
+def encode_cursor(positions: Dict[str, Tuple[int, int]]) -> str:
+    """Encode per-agent (last message number, mtime_ns of that file) as an opaque cursor."""
+    data = json.dumps(positions, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Decode a cursor from encode_cursor ("" is the start of the session).
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return {}
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return {str(agent): (int(number), int(mtime)) for agent, (number, mtime) in data.items()}
+    except (binascii.Error, TypeError, ValueError, AttributeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def merge_timelines(streams: Sequence[Iterable[T]], key: Callable[[T], Any]) -> Iterator[T]:
+    """
+    Lazily merge per-agent message streams, each already in order, into one timeline.
+
+    Message IDs restart at 0 for every agent, so streams are merged on
+    created_at. Ties keep the order of the streams (agents are given in ID
+    order) and, within an agent, message order.
+    """
+    return heapq.merge(*streams, key=key)
 
 
 class SessionReader:
-    """Reads session data from FileSessionManager storage."""
+    """Reads session data from FileSessionManager (or S3SessionManager) storage."""
+
+    # Whether parsed sessions and listings are kept in a cache that warm-up should fill
+    caches_sessions = False
+
+    def __init__(self, storage_dir: Union[str, StorageBackend]):
+        """
+        Args:
+            storage_dir: Sessions directory, s3://bucket/prefix URL, or a StorageBackend
+        """
+        if isinstance(storage_dir, StorageBackend):
+            self.backend = storage_dir
+        else:
+            self.backend = open_backend(storage_dir)
+        self.storage_dir = (
+            self.backend.root if isinstance(self.backend, LocalBackend) else self.backend.describe()
+        )
+        self._created_at: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._created_at_lock = threading.Lock()
+
+    @property
+    def state_dir(self) -> Path:
+        """Directory for viewer state (analysis store, caches) of this storage."""
+        return self.backend.state_dir
+
+    def _load_json(self, path: str) -> Any:
+        """Read, decompress if compressed, and parse a JSON file, recording disk and parse time."""
+        with timed_phase("disk"):
+            data = self.backend.read_bytes(path)
+        with timed_phase("parse"):
+            data = decompress_file(path, data)
+            parsed = json.loads(data)
+        READER_FILES_READ.inc()
+        READER_JSON_BYTES.inc(len(data))
+        return parsed
+
+    def _load_session_json(self, session_dir: str) -> Any:
+        """
+        Load a session directory's session.json, or its compressed variant.
+
+        Raises:
+            FileNotFoundError: If the directory has no session file
+        """
+        for suffix in JSON_SUFFIXES:
+            try:
+                return self._load_json(f"{session_dir}/session{suffix}")
+            except FileNotFoundError:
+                continue
+        raise FileNotFoundError(f"{session_dir}/session.json")
+
+    def _stat_session_json(self, session_dir: str) -> Optional[FileInfo]:
+        """Stat a session directory's session.json (or compressed variant); None if missing."""
+        for suffix in JSON_SUFFIXES:
+            info = self.backend.stat(f"{session_dir}/session{suffix}")
+            if info is not None:
+                return info
+        return None
+
+    def _read_many(self, files: List[FileInfo]) -> List[Optional[bytes]]:
+        """Read (concurrently, if the backend can) and decompress files; None on errors."""
+        with timed_phase("disk"):
+            contents = self.backend.read_many(files)
+        decoded: List[Optional[bytes]] = []
+        for info, data in zip(files, contents):
+            if data is not None and split_compression(info.path)[1] is not None:
+                try:
+                    with timed_phase("parse"):
+                        data = decompress_file(info.path, data)
+                except (ImportError, ValueError) as e:
+                    print(f"Error reading {info.path}: {e}")
+                    data = None
+            decoded.append(data)
+        return decoded
+
+    def _load_many(self, files: List[FileInfo]) -> List[Optional[Any]]:
+        """Read (concurrently, if the backend can) and parse JSON files; None on errors."""
+        contents = self._read_many(files)
+        parsed: List[Optional[Any]] = []
+        for info, data in zip(files, contents):
+            if data is None:
+                parsed.append(None)
+                continue
+            try:
+                with timed_phase("parse"):
+                    parsed.append(json.loads(data))
+            except ValueError as e:
+                print(f"Error reading {info.path}: {e}")
+                parsed.append(None)
+                continue
+            READER_FILES_READ.inc()
+            READER_JSON_BYTES.inc(len(data))
+        return parsed
+
+    def session_dirs(self) -> List[str]:
+        """Get the directories of all sessions, and packed files of sessions without one."""
+        dirs = [d for d in self.backend.list_dirs() if d.startswith("session_")]
+        unpacked = set(dirs)
+        for name in self.backend.list_names():
+            if (
+                name.startswith("session_")
+                and name.endswith(PACK_SUFFIX)
+                and name[: -len(PACK_SUFFIX)] not in unpacked
+            ):
+                dirs.append(name)
+        return dirs
 
-    def __init__(self, storage_dir: str):
-        self.storage_dir = Path(storage_dir)
-        if not self.storage_dir.exists():
-            raise ValueError(f"Storage directory does not exist: {storage_dir}")
+    def open_pack(self, path: str) -> PackedSession:
+        """Open a packed session file, memory-mapped where the backend allows."""
+        with timed_phase("disk"):
+            buffer = self.backend.map_file(path)
+        READER_FILES_READ.inc()
+        return PackedSession(buffer)
+
+    def _parse_record(self, data: bytes) -> Any:
+        """Parse one record of a packed session."""
+        with timed_phase("parse"):
+            parsed = json.loads(data)
+        READER_JSON_BYTES.inc(len(data))
+        return parsed
+
+    def _session_location(self, session_id: str) -> Optional[str]:
+        """The session's directory, or its packed file if it has no directory, or None."""
+        session_dir = f"session_{session_id}"
+        if self._stat_session_json(session_dir) is not None:
+            return session_dir
+        if self.backend.stat(session_dir + PACK_SUFFIX) is not None:
+            return session_dir + PACK_SUFFIX
+        return None
+
+    def _session_files(self, session_dir: str) -> List[FileInfo]:
+        """Agent and message files of a session, from one listing of its agents directory."""
+        return [
+            info
+            for info in self.backend.list_files(f"{session_dir}/agents", recursive=True)
+            if _is_agent_file(info.path) or _is_message_file(info.path)
+        ]
+
+    def get_session_summary(self, session_dir: str) -> Optional[Dict[str, Any]]:
+        """Get the listing entry of one session directory, or None if it can't be read."""
+        if session_dir.endswith(PACK_SUFFIX):
+            return self._get_packed_summary(session_dir)
+        try:
+            session_data = self._load_session_json(session_dir)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading session {session_dir}: {e}")
+            return None
+        try:
+            # Get message count
+            message_count = self._count_messages(session_dir)
+
+            return {
+                "session_id": session_data.get("session_id"),
+                "session_type": session_data.get("session_type"),
+                "created_at": session_data.get("created_at"),
+                "updated_at": session_data.get("updated_at"),
+                "message_count": message_count,
+                "path": f"{self.backend.describe()}/{session_dir}",
+            }
+        except Exception as e:
+            print(f"Error reading session {session_dir}: {e}")
+            return None
+
+    def _get_packed_summary(self, pack_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with self.open_pack(pack_path) as pack:
+                session_data = self._parse_record(pack.session_bytes())
+                message_count = pack.message_count
+        except (OSError, ValueError) as e:
+            print(f"Error reading session {pack_path}: {e}")
+            return None
+        return {
+            "session_id": session_data.get("session_id"),
+            "session_type": session_data.get("session_type"),
+            "created_at": session_data.get("created_at"),
+            "updated_at": session_data.get("updated_at"),
+            "message_count": message_count,
+            "path": f"{self.backend.describe()}/{pack_path}",
+        }
 
     def list_sessions(self) -> List[Dict[str, Any]]:
         """List all available sessions."""
         sessions = []
 
-        for session_dir in self.storage_dir.glob("session_*"):
-            if session_dir.is_dir():
-                session_file = session_dir / "session.json"
-                if session_file.exists():
-                    try:
-                        with open(session_file, "r", encoding="utf-8") as f:
-                            session_data = json.load(f)
-
-                        # Get message count
-                        message_count = self._count_messages(session_dir)
-
-                        sessions.append(
-                            {
-                                "session_id": session_data.get("session_id"),
-                                "session_type": session_data.get("session_type"),
-                                "created_at": session_data.get("created_at"),
-                                "updated_at": session_data.get("updated_at"),
-                                "message_count": message_count,
-                                "path": str(session_dir),
-                            }
-                        )
-                    except Exception as e:
-                        print(f"Error reading session {session_dir}: {e}")
+        for session_dir in self.session_dirs():
+            summary = self.get_session_summary(session_dir)
+            if summary is not None:
+                sessions.append(summary)
 
         # Sort by updated_at descending
         sessions.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
         return sessions
 
-    def _count_messages(self, session_dir: Path) -> int:
-        """Count total messages in a session."""
-        count = 0
-        agents_dir = session_dir / "agents"
-        if agents_dir.exists():
-            for agent_dir in agents_dir.iterdir():
-                if agent_dir.is_dir():
-                    messages_dir = agent_dir / "messages"
-                    if messages_dir.exists():
-                        count += len(list(messages_dir.glob("message_*.json")))
-        return count
+    def listing_signature(self) -> str:
+        """Hash of the files and directories that determine the session listing."""
+        return self.backend.signature(LISTING_PATTERNS)
+
+    def prime_listing(self, signature: str, sessions: List[Dict[str, Any]]) -> None:
+        """
+        Keep a listing built elsewhere (by the warm-up scan) for list_sessions.
+
+        Args:
+            signature: listing_signature() from before the listing was built
+            sessions: The listing, sorted like list_sessions()
+        """
+        # Nothing to keep it in without a cache
+
+    def list_sessions_page(
+        self, offset: int = 0, limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Get one page of the session listing.
+
+        Returns:
+            Tuple of (sessions on the page, total number of sessions)
+        """
+        sessions = self.list_sessions()
+        stop = offset + limit if limit is not None else None
+        return sessions[offset:stop], len(sessions)
+
+    def _count_messages(self, session_dir: str) -> int:
+        """Count total messages in a session, from file names alone."""
+        return sum(
+            1
+            for path in self.backend.list_names(f"{session_dir}/agents", recursive=True)
+            if _is_message_file(path)
+        )
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed session information."""
-        session_dir = self.storage_dir / f"session_{session_id}"
+        session_dir = f"session_{session_id}"
 
-        if not session_dir.exists():
-            return None
-
-        session_file = session_dir / "session.json"
-        if not session_file.exists():
+        try:
+            session_data = self._load_session_json(session_dir)
+        except FileNotFoundError:
+            return self._get_packed_session(session_id)
+        except Exception as e:
+            print(f"Error reading session {session_id}: {e}")
             return None
 
         try:
-            with open(session_file, "r", encoding="utf-8") as f:
-                session_data = json.load(f)
+            files = self._session_files(session_dir)
 
             # Get all agents
-            agents = self._get_agents(session_dir)
+            agents = self._get_agents(session_dir, files)
 
             # Get all messages across all agents
-            messages = self._get_all_messages(session_dir)
+            messages = self._get_all_messages(session_dir, files)
 
             return {
                 "session_id": session_data.get("session_id"),
@@ -93,53 +402,357 @@ class SessionReader:
             print(f"Error reading session {session_id}: {e}")
             return None
 
-    def _get_agents(self, session_dir: Path) -> List[Dict[str, Any]]:
+    def _get_packed_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Get detailed session information from a packed session file."""
+        pack_path = f"session_{session_id}{PACK_SUFFIX}"
+        try:
+            with self.open_pack(pack_path) as pack:
+                session_data = self._parse_record(pack.session_bytes())
+                agents = [self._parse_record(record) for _, record in pack.agent_records()]
+                messages = self._packed_messages(pack)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Error reading session {session_id}: {e}")
+            return None
+
+        return {
+            "session_id": session_data.get("session_id"),
+            "session_type": session_data.get("session_type"),
+            "created_at": session_data.get("created_at"),
+            "updated_at": session_data.get("updated_at"),
+            "agents": agents,
+            "messages": messages,
+        }
+
+    def _packed_messages(self, pack: PackedSession) -> List[Dict[str, Any]]:
+        """All messages of a packed session, in the same order as _get_all_messages."""
+        streams = []
+        for agent_id, entries in itertools.groupby(pack.message_entries(), key=itemgetter(0)):
+            stream = []
+            for _, _, offset, length in entries:
+                message_data = self._parse_record(pack.record(offset, length))
+                message_data["agent_id"] = agent_id
+                stream.append(message_data)
+            streams.append(stream)
+        return list(merge_timelines(streams, _timeline_key))
+
+    def _get_agents(
+        self, session_dir: str, files: Optional[List[FileInfo]] = None
+    ) -> List[Dict[str, Any]]:
         """Get all agents in a session."""
-        agents = []
-        agents_dir = session_dir / "agents"
-
-        if not agents_dir.exists():
-            return agents
-
-        for agent_dir in agents_dir.iterdir():
-            if agent_dir.is_dir():
-                agent_file = agent_dir / "agent.json"
-                if agent_file.exists():
-                    try:
-                        with open(agent_file, "r", encoding="utf-8") as f:
-                            agent_data = json.load(f)
-                        agents.append(agent_data)
-                    except Exception as e:
-                        print(f"Error reading agent {agent_dir}: {e}")
-
-        return agents
-
-    def _get_all_messages(self, session_dir: Path) -> List[Dict[str, Any]]:
+        if files is None:
+            files = self._session_files(session_dir)
+        agent_files = [info for info in files if _is_agent_file(info.path)]
+        return [agent for agent in self._load_many(agent_files) if agent is not None]
+
+    def _get_all_messages(
+        self, session_dir: str, files: Optional[List[FileInfo]] = None
+    ) -> List[Dict[str, Any]]:
         """Get all messages from all agents in chronological order."""
-        messages = []
-        agents_dir = session_dir / "agents"
-
-        if not agents_dir.exists():
-            return messages
-
-        for agent_dir in agents_dir.iterdir():
-            if agent_dir.is_dir():
-                messages_dir = agent_dir / "messages"
-                if messages_dir.exists():
-                    for message_file in messages_dir.glob("message_*.json"):
-                        try:
-                            with open(message_file, "r", encoding="utf-8") as f:
-                                message_data = json.load(f)
-
-                            # Add agent info to message
-                            message_data["agent_id"] = agent_dir.name
-                            messages.append(message_data)
-                        except Exception as e:
-                            print(f"Error reading message {message_file}: {e}")
-
-        # Sort by message_id (or created_at if available)
-        messages.sort(key=lambda x: x.get("message_id", 0))
-        return messages
+        if session_dir.endswith(PACK_SUFFIX):
+            with self.open_pack(session_dir) as pack:
+                return self._packed_messages(pack)
+        if files is None:
+            files = self._session_files(session_dir)
+        agents = _agent_message_files(files)
+
+        # Read every agent's messages in one batch, then merge the agents' timelines
+        loaded = iter(self._load_many([info for _, infos in agents for info in infos]))
+        streams = []
+        for agent_id, infos in agents:
+            stream = []
+            for message_data in itertools.islice(loaded, len(infos)):
+                if message_data is None:
+                    continue
+                message_data["agent_id"] = agent_id
+                stream.append(message_data)
+            streams.append(stream)
+        return list(merge_timelines(streams, _timeline_key))
+
+    def _fingerprint_files(self, session_id: str) -> Optional[Tuple[str, List[FileInfo]]]:
+        """
+        Locate a session and stat the files its fingerprint covers.
+
+        Returns:
+            Tuple of (session directory or packed file, its session, agent and
+            message files or the packed file), or None if the session does not exist
+        """
+        session_dir = f"session_{session_id}"
+        session_file = self._stat_session_json(session_dir)
+        if session_file is None:
+            pack_file = self.backend.stat(session_dir + PACK_SUFFIX)
+            if pack_file is None:
+                return None
+            return pack_file.path, [pack_file]
+        return session_dir, [session_file] + self._session_files(session_dir)
+
+    @staticmethod
+    def _fingerprint(location: str, files: List[FileInfo]) -> str:
+        """Fingerprint of the files from _fingerprint_files."""
+        if location.endswith(PACK_SUFFIX):
+            # A packed session changes only as a whole
+            pack_file = files[0]
+            return hashlib.sha256(
+                f"{pack_file.path}\0{pack_file.size}\0{pack_file.mtime_ns}".encode("utf-8")
+            ).hexdigest()
+
+        digest = hashlib.sha256()
+        for info in files:
+            relative = info.path[len(location) + 1 :]
+            version = f"\0{info.version}" if info.version else ""
+            digest.update(f"{relative}\0{info.size}\0{info.mtime_ns}{version}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_fingerprint(self, session_id: str) -> Optional[str]:
+        """
+        Get a fingerprint that changes whenever any file of a session changes.
+
+        The fingerprint hashes the relative path, size and modification time
+        (and version, where the backend has one) of the session, agent and
+        message files, without reading their contents.
+
+        Returns:
+            Hex digest, or None if the session does not exist
+        """
+        located = self._fingerprint_files(session_id)
+        if located is None:
+            return None
+        return self._fingerprint(*located)
+
+    def refresh_session(
+        self,
+        session_dir: str,
+        files: List[FileInfo],
+        previous: Optional[Dict[str, Any]] = None,
+        manifest: Optional[Dict[str, List[Any]]] = None,
+    ) -> Optional[Tuple[Dict[str, Any], Dict[str, List[Any]]]]:
+        """
+        Bring a session read earlier up to date, reading only files that changed since.
+
+        The manifest maps each file the previous session was read from to its
+        [size, mtime_ns, version]. Files whose entry differs (or that are new)
+        are read; messages of removed files are dropped. Messages are then
+        merged into the same timeline get_session would return. Without a
+        previous session, every file is read.
+
+        Args:
+            session_dir: Session directory (packed sessions aren't refreshed)
+            files: Its files, from _fingerprint_files
+            previous: The session returned by an earlier call
+            manifest: The manifest returned with it
+
+        Returns:
+            Tuple of (session, manifest), or None if the session can't be read
+        """
+        if previous is None or manifest is None:
+            previous, manifest = None, {}
+        current = {info.path: [info.size, info.mtime_ns, info.version or ""] for info in files}
+        changed = [info for info in files if manifest.get(info.path) != current[info.path]]
+        removed = [path for path in manifest if path not in current]
+        changed_paths = {info.path for info in changed}.union(removed)
+
+        streams: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        if previous is not None:
+            previous_streams = self._message_streams(previous["messages"], manifest)
+            if previous_streams is None:
+                return self.refresh_session(session_dir, files)
+            streams = previous_streams
+
+        try:
+            session_file = files[0]
+            if previous is None or session_file.path in changed_paths:
+                session_data = self._load_json(session_file.path)
+            else:
+                session_data = previous
+            if previous is None or any(_is_agent_file(path) for path in changed_paths):
+                agents = self._get_agents(session_dir, files)
+            else:
+                agents = previous["agents"]
+        except Exception as e:
+            print(f"Error reading session {session_dir}: {e}")
+            return None
+
+        for path in removed:
+            if _is_message_file(path):
+                streams.get(path.split("/")[2], {}).pop(path, None)
+        message_files = [info for info in changed if _is_message_file(info.path)]
+        for info, message_data in zip(message_files, self._load_many(message_files)):
+            agent_id = info.path.split("/")[2]
+            if message_data is None:
+                # Left out of the manifest, so it is read again next time
+                streams.get(agent_id, {}).pop(info.path, None)
+                del current[info.path]
+                continue
+            message_data["agent_id"] = agent_id
+            streams.setdefault(agent_id, {})[info.path] = message_data
+
+        session = {
+            "session_id": session_data.get("session_id"),
+            "session_type": session_data.get("session_type"),
+            "created_at": session_data.get("created_at"),
+            "updated_at": session_data.get("updated_at"),
+            "agents": agents,
+            "messages": self._merge_streams(streams),
+        }
+        return session, current
+
+    @staticmethod
+    def _message_streams(
+        messages: List[Dict[str, Any]], paths: Iterable[str]
+    ) -> Optional[Dict[str, Dict[str, Dict[str, Any]]]]:
+        """
+        Match the messages of a session to the message files they were read from.
+
+        The message files of an agent, in message number order, are the files
+        its messages (in timeline order) were read from, in the same order.
+
+        Args:
+            messages: Messages of a session, as from refresh_session
+            paths: Paths of the files they were read from (other paths are ignored)
+
+        Returns:
+            Agent ID -> (message file -> message), or None if they don't match up
+        """
+        by_agent: Dict[str, List[Dict[str, Any]]] = {}
+        for message in messages:
+            by_agent.setdefault(message["agent_id"], []).append(message)
+        streams: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for agent_id, infos in _agent_message_files([FileInfo(path, 0, 0) for path in paths]):
+            agent_messages = by_agent.pop(agent_id, [])
+            if len(agent_messages) != len(infos):
+                return None
+            streams[agent_id] = {info.path: m for info, m in zip(infos, agent_messages)}
+        return None if by_agent else streams
+
+    @staticmethod
+    def _merge_streams(streams: Dict[str, Dict[str, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Merge agents' (message file -> message) streams into the session timeline."""
+        return list(
+            merge_timelines(
+                [
+                    [stream[path] for path in sorted(stream, key=_message_number)]
+                    for _, stream in sorted(streams.items())
+                ],
+                _timeline_key,
+            )
+        )
+
+    def get_messages_with_sizes(
+        self, session_id: str
+    ) -> Optional[List[Tuple[Dict[str, Any], int]]]:
+        """
+        Get all messages of a session, like get_session, with their stored size in bytes.
+
+        The size is that of the message file (compressed, if it is) or packed record.
+
+        Returns:
+            (message, size) tuples in timeline order, or None if the session does not exist
+        """
+        location = self._session_location(session_id)
+        if location is None:
+            return None
+
+        streams: List[List[Tuple[Dict[str, Any], int]]] = []
+        if location.endswith(PACK_SUFFIX):
+            with self.open_pack(location) as pack:
+                for agent_id, entries in itertools.groupby(
+                    pack.message_entries(), key=itemgetter(0)
+                ):
+                    stream = []
+                    for _, _, offset, length in entries:
+                        message_data = self._parse_record(pack.record(offset, length))
+                        message_data["agent_id"] = agent_id
+                        stream.append((message_data, length))
+                    streams.append(stream)
+        else:
+            agents = _agent_message_files(self._session_files(location))
+            loaded = iter(self._load_many([info for _, infos in agents for info in infos]))
+            for agent_id, infos in agents:
+                stream = []
+                for info, message_data in zip(infos, itertools.islice(loaded, len(infos))):
+                    if message_data is None:
+                        continue
+                    message_data["agent_id"] = agent_id
+                    stream.append((message_data, info.size))
+                streams.append(stream)
+        return list(merge_timelines(streams, lambda record: _timeline_key(record[0])))
+
+    def iter_messages(self, session_id: str) -> Optional[Iterator[Dict[str, Any]]]:
+        """
+        Iterate over a session's messages in timeline order, like get_session.
+
+        Messages are read MERGE_READ_CHUNK at a time per agent as the iterator
+        is consumed, so memory use does not grow with the session's size.
+
+        Returns:
+            Iterator of messages with agent_id, or None if the session does not exist
+        """
+        location = self._session_location(session_id)
+        if location is None:
+            return None
+        return self._iter_messages(location)
+
+    def _iter_messages(self, location: str) -> Iterator[Dict[str, Any]]:
+        if location.endswith(PACK_SUFFIX):
+            with self.open_pack(location) as pack:
+
+                def read_records(chunk: List[Tuple[int, int]]) -> List[Optional[bytes]]:
+                    with timed_phase("disk"):
+                        return [pack.record(start, length) for start, length in chunk]
+
+                streams = [
+                    self._message_stream(
+                        location,
+                        agent_id,
+                        [(start, length) for _, _, start, length in entries],
+                        read_records,
+                    )
+                    for agent_id, entries in itertools.groupby(
+                        pack.message_entries(), key=itemgetter(0)
+                    )
+                ]
+                yield from merge_timelines(streams, _timeline_key)
+            return
+
+        streams = [
+            self._message_stream(location, agent_id, infos, self._read_counted)
+            for agent_id, infos in _agent_message_files(self._session_files(location))
+        ]
+        yield from merge_timelines(streams, _timeline_key)
+
+    def _message_stream(
+        self,
+        session_dir: str,
+        agent_id: str,
+        items: List[Any],
+        read: Callable[[List[Any]], List[Optional[bytes]]],
+    ) -> Iterator[Dict[str, Any]]:
+        """One agent's parsed messages with agent_id, read MERGE_READ_CHUNK items at a time."""
+        for start in range(0, len(items), MERGE_READ_CHUNK):
+            for data in read(items[start : start + MERGE_READ_CHUNK]):
+                if data is None:
+                    continue
+                try:
+                    message = self._parse_record(data)
+                except ValueError as e:
+                    print(f"Error reading message of {agent_id} in {session_dir}: {e}")
+                    continue
+                if isinstance(message, dict):
+                    message["agent_id"] = agent_id
+                    yield message
+
+    def get_tool_calls(self, session_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Get a session's tool calls paired with their results, indexed by toolUseId.
+
+        Returns:
+            See timeline.pair_tool_calls, or None if the session does not exist
+        """
+        session = self.get_session(session_id)
+        if session is None:
+            return None
+        return pair_tool_calls(session["messages"])
 
     def get_messages(
         self, session_id: str, limit: Optional[int] = None, offset: int = 0
@@ -158,3 +771,415 @@ class SessionReader:
             messages = messages[:limit]
 
         return messages
+
+    def _raw_stream(
+        self,
+        session_dir: str,
+        agent_id: str,
+        items: List[Any],
+        read: Callable[[List[Any]], List[Optional[bytes]]],
+        key: Optional[Callable[[Any], Hashable]] = None,
+        failed: Optional[List[Any]] = None,
+    ) -> Iterator[Tuple[str, RawJSON]]:
+        """
+        One agent's raw messages with agent_id injected, keyed by created_at.
+
+        Items (files or pack entries, in message order) are read MERGE_READ_CHUNK
+        at a time as the stream is consumed; the raw bytes are what is
+        returned. Without key (a single stream, with nothing to merge), no
+        message is parsed and every created_at is "". With key, which names
+        the version of an item's content (see _created_at), each message is
+        parsed for its created_at the first time it is seen. Items that can't
+        be read or parsed are skipped (and added to failed, if given).
+        """
+        for start in range(0, len(items), MERGE_READ_CHUNK):
+            chunk = items[start : start + MERGE_READ_CHUNK]
+            for item, data in zip(chunk, read(chunk)):
+                if data is None:
+                    if failed is not None:
+                        failed.append(item)
+                    continue
+                READER_JSON_BYTES.inc(len(data))
+                message = inject_field(data, "agent_id", agent_id)
+                try:
+                    if message is None:
+                        raise ValueError("not a JSON object")
+                    created_at = self._created_at_of(key(item), data) if key is not None else ""
+                except ValueError as e:
+                    print(f"Error reading message of {agent_id} in {session_dir}: {e}")
+                    if failed is not None:
+                        failed.append(item)
+                    continue
+                yield created_at, message
+
+    def _created_at_of(self, key: Hashable, data: bytes) -> str:
+        """
+        The created_at of an encoded message, parsed once per key and remembered.
+
+        Raises:
+            ValueError: If the message doesn't parse
+        """
+        with self._created_at_lock:
+            created_at = self._created_at.get(key)
+            if created_at is not None:
+                self._created_at.move_to_end(key)
+                return created_at
+        with timed_phase("parse"):
+            created_at = json.loads(data).get("created_at") or ""
+        with self._created_at_lock:
+            self._created_at[key] = created_at
+            while len(self._created_at) > CREATED_AT_CACHE_SIZE:
+                self._created_at.popitem(last=False)
+        return created_at
+
+    def _read_counted(self, files: List[FileInfo]) -> List[Optional[bytes]]:
+        contents = self._read_many(files)
+        READER_FILES_READ.inc(sum(1 for data in contents if data is not None))
+        return contents
+
+    def _raw_messages(
+        self,
+        session_dir: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        agent_id: Optional[str] = None,
+    ) -> Optional[List[RawJSON]]:
+        """
+        A page of a session's timeline (or of one agent's messages) as raw JSON.
+
+        The agents' message streams are merged lazily, so only about the
+        messages up to the end of the page are read.
+
+        Returns:
+            The messages, or None if agent_id is given and the session has no such agent
+        """
+        stop = offset + limit if limit else None
+        if session_dir.endswith(PACK_SUFFIX):
+            pack_info = self.backend.stat(session_dir)
+            with self.open_pack(session_dir) as pack:
+                if agent_id is not None and agent_id not in pack.agents:
+                    return None
+                groups = [
+                    (agent, [(start, length) for _, _, start, length in entries])
+                    for agent, entries in itertools.groupby(
+                        pack.message_entries(), key=itemgetter(0)
+                    )
+                    if agent_id is None or agent == agent_id
+                ]
+
+                def read_records(chunk: List[Tuple[int, int]]) -> List[Optional[bytes]]:
+                    with timed_phase("disk"):
+                        return [pack.record(start, length) for start, length in chunk]
+
+                key = (lambda item: (pack_info, item)) if len(groups) > 1 else None
+                streams = [
+                    self._raw_stream(session_dir, agent, items, read_records, key)
+                    for agent, items in groups
+                ]
+                timeline = merge_timelines(streams, itemgetter(0))
+                return [message for _, message in itertools.islice(timeline, offset, stop)]
+
+        if agent_id is None:
+            files = self._session_files(session_dir)
+        else:
+            if agent_id not in self.backend.list_dirs(f"{session_dir}/agents"):
+                return None
+            files = self.backend.list_files(f"{session_dir}/agents/{agent_id}/messages")
+        file_groups = _agent_message_files(files)
+        key = _file_version if len(file_groups) > 1 else None
+        streams = [
+            self._raw_stream(session_dir, agent, infos, self._read_counted, key)
+            for agent, infos in file_groups
+        ]
+        timeline = merge_timelines(streams, itemgetter(0))
+        return [message for _, message in itertools.islice(timeline, offset, stop)]
+
+    def _raw_records(self, records: Iterable[Tuple[str, Optional[bytes]]]) -> List[RawJSON]:
+        """
+        (name, bytes) records that parse as JSON, as raw JSON.
+
+        Each record is parsed to check it, so a broken file can't end up in a
+        response; like _load_many, records that can't be read or parsed are
+        skipped.
+        """
+        valid = []
+        for name, data in records:
+            if data is None:
+                continue
+            try:
+                with timed_phase("parse"):
+                    json.loads(data)
+            except ValueError as e:
+                print(f"Error reading {name}: {e}")
+                continue
+            READER_JSON_BYTES.inc(len(data))
+            valid.append(RawJSON(data))
+        return valid
+
+    def get_session_raw(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get session information like get_session, with agents and messages as raw JSON.
+
+        Only session.json and the (small) agent files are parsed; agent and
+        message files are returned as RawJSON (messages with agent_id
+        injected), to be spliced into a response.
+        """
+        location = self._session_location(session_id)
+        if location is None:
+            return None
+        try:
+            if location.endswith(PACK_SUFFIX):
+                with self.open_pack(location) as pack:
+                    session_data = self._parse_record(pack.session_bytes())
+                    agents = self._raw_records(
+                        (f"{location}:{agent_id}", record)
+                        for agent_id, record in pack.agent_records()
+                    )
+            else:
+                session_data = self._load_session_json(location)
+                agent_files = [
+                    info for info in self._session_files(location) if _is_agent_file(info.path)
+                ]
+                agents = self._raw_records(
+                    (info.path, data)
+                    for info, data in zip(agent_files, self._read_many(agent_files))
+                )
+            messages = self._raw_messages(location) or []
+        except (OSError, ValueError) as e:
+            print(f"Error reading session {session_id}: {e}")
+            return None
+
+        return {
+            "session_id": session_data.get("session_id"),
+            "session_type": session_data.get("session_type"),
+            "created_at": session_data.get("created_at"),
+            "updated_at": session_data.get("updated_at"),
+            "agents": agents,
+            "messages": messages,
+        }
+
+    def get_messages_raw(
+        self, session_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[RawJSON]:
+        """Get a page of messages like get_messages, as raw JSON; only that page is read."""
+        location = self._session_location(session_id)
+        if location is None:
+            return []
+        return self._raw_messages(location, offset, limit) or []
+
+    def get_agent_messages_raw(
+        self, session_id: str, agent_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> Optional[List[RawJSON]]:
+        """
+        Get a page of one agent's messages, in message order, as raw JSON.
+
+        Only the agent's own messages directory (or its pack entries) is read.
+
+        Args:
+            session_id: Session ID
+            agent_id: Agent directory name, as in the agent_id of messages (e.g. agent_default)
+            limit: Maximum number of messages (None: all)
+            offset: Number of messages to skip
+
+        Returns:
+            The messages, or None if the session or agent does not exist
+        """
+        if not agent_id or "/" in agent_id or agent_id.startswith("."):
+            return None
+        location = self._session_location(session_id)
+        if location is None:
+            return None
+        return self._raw_messages(location, offset, limit, agent_id=agent_id)
+
+    def _stat_message(self, session_dir: str, agent_id: str, number: int) -> Optional[FileInfo]:
+        """Stat message_<number>.json of an agent (or a compressed variant); None if missing."""
+        for suffix in JSON_SUFFIXES:
+            info = self.backend.stat(
+                f"{session_dir}/agents/{agent_id}/messages/message_{number}{suffix}"
+            )
+            if info is not None:
+                return info
+        return None
+
+    def _files_since(
+        self, session_dir: str, positions: Dict[str, Tuple[int, int]]
+    ) -> List[Tuple[str, List[FileInfo]]]:
+        """
+        Message files of a session directory added or rewritten after a cursor, by agent.
+
+        Agents in the cursor are probed from their last message number on:
+        that file is included again if its mtime changed (a rewrite, e.g. a
+        redaction), then message_<n+1>, message_<n+2>, ... are stat'ed until one
+        is missing, so the cost grows with the new messages rather than the
+        session. Agents not in the cursor have their messages directory listed.
+        """
+        groups = []
+        for agent_id in self.backend.list_dirs(f"{session_dir}/agents"):
+            if agent_id not in positions:
+                files = self.backend.list_files(f"{session_dir}/agents/{agent_id}/messages")
+                groups.extend(_agent_message_files(files))
+                continue
+            last_number, last_mtime_ns = positions[agent_id]
+            infos = []
+            last = self._stat_message(session_dir, agent_id, last_number)
+            if last is not None and last.mtime_ns != last_mtime_ns:
+                infos.append(last)
+            number = last_number + 1
+            while True:
+                info = self._stat_message(session_dir, agent_id, number)
+                if info is None:
+                    break
+                infos.append(info)
+                number += 1
+            if infos:
+                groups.append((agent_id, infos))
+        return groups
+
+    def get_messages_since(
+        self, session_id: str, cursor: str = ""
+    ) -> Optional[Tuple[List[RawJSON], str]]:
+        """
+        Get the messages of a session added (or rewritten) after a cursor, as raw JSON.
+
+        Message files are located from each agent's last message number and
+        its file's mtime, without listing or reading older files. A message
+        written while it is being read may be returned again on the next
+        call; clients should key messages by (agent_id, message_id).
+
+        Args:
+            session_id: Session ID
+            cursor: Cursor returned by a previous call, or "" for all messages
+
+        Returns:
+            Tuple of (messages in timeline order, cursor for the next call),
+            or None if the session does not exist
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        positions = decode_cursor(cursor)
+        location = self._session_location(session_id)
+        if location is None:
+            return None
+
+        if location.endswith(PACK_SUFFIX):
+            # Packed sessions are finished; their index gives the new entries directly
+            pack_info = self.backend.stat(location)
+            with self.open_pack(location) as pack:
+                groups = []
+                for agent_id, entries in itertools.groupby(
+                    pack.message_entries(), key=itemgetter(0)
+                ):
+                    last_number = positions.get(agent_id, (-1, 0))[0]
+                    items = [(e[1], e[2], e[3]) for e in entries if e[1] > last_number]
+                    if items:
+                        groups.append((agent_id, items))
+
+                def read_records(chunk: List[Tuple[int, int, int]]) -> List[Optional[bytes]]:
+                    with timed_phase("disk"):
+                        return [pack.record(start, length) for _, start, length in chunk]
+
+                key = (lambda item: (pack_info, item)) if len(groups) > 1 else None
+                streams = [
+                    self._raw_stream(location, agent_id, items, read_records, key)
+                    for agent_id, items in groups
+                ]
+                messages = [message for _, message in merge_timelines(streams, itemgetter(0))]
+                for agent_id, items in groups:
+                    positions[agent_id] = (items[-1][0], 0)
+            return messages, encode_cursor(positions)
+
+        file_groups = (
+            self._files_since(location, positions)
+            if positions
+            else _agent_message_files(self._session_files(location))
+        )
+        # Messages are always parsed (once per file version) here, as a parse
+        # error is how a file still being written is noticed
+        failed: List[FileInfo] = []
+        streams = [
+            self._raw_stream(location, agent_id, infos, self._read_counted, _file_version, failed)
+            for agent_id, infos in file_groups
+        ]
+        messages = [message for _, message in merge_timelines(streams, itemgetter(0))]
+
+        # Files that failed to parse may still be being written; the cursor stops
+        # before them so they are read again (a file left broken is skipped once
+        # it is PARTIAL_WRITE_SECONDS old)
+        settled_ns = time.time_ns() - int(PARTIAL_WRITE_SECONDS * 1_000_000_000)
+        retry = {info.path for info in failed if info.mtime_ns > settled_ns}
+        for agent_id, infos in file_groups:
+            for info in infos:
+                if info.path in retry:
+                    break
+                positions[agent_id] = (_message_number(info.path), info.mtime_ns)
+        return messages, encode_cursor(positions)
+
+    def search_messages(
+        self, query: str, session_id: Optional[str] = None, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """
+        Search message text and tool results for a query (case-insensitive).
+
+        Args:
+            query: Text to search for
+            session_id: Optional session to restrict the search to
+            limit: Maximum number of matches to return
+
+        Returns:
+            Matches with session ID, agent ID, message ID, role and surrounding context
+        """
+        query_lower = query.lower()
+        if not query_lower:
+            return []
+
+        if session_id is not None:
+            location = self._session_location(session_id)
+            session_dirs = [location] if location is not None else []
+        else:
+            session_dirs = self.session_dirs()
+
+        matches: List[Dict[str, Any]] = []
+        for session_dir in session_dirs:
+            current_id = session_dir[len("session_") :]
+            if current_id.endswith(PACK_SUFFIX):
+                current_id = current_id[: -len(PACK_SUFFIX)]
+
+            for message in self._get_all_messages(session_dir):
+                msg = message.get("message", {})
+                for content in msg.get("content", []):
+                    texts = [content.get("text")]
+                    if "toolResult" in content:
+                        texts.extend(
+                            rc.get("text") for rc in content["toolResult"].get("content", [])
+                        )
+
+                    for text in texts:
+                        if not text:
+                            continue
+                        match_pos = text.lower().find(query_lower)
+                        if match_pos < 0:
+                            continue
+
+                        # Get context around the match
+                        start = max(0, match_pos - 100)
+                        end = min(len(text), match_pos + len(query) + 100)
+                        context = text[start:end]
+                        if start > 0:
+                            context = "..." + context
+                        if end < len(text):
+                            context = context + "..."
+
+                        matches.append(
+                            {
+                                "session_id": current_id,
+                                "agent_id": message.get("agent_id"),
+                                "message_id": message.get("message_id"),
+                                "role": msg.get("role", "unknown"),
+                                "context": context,
+                            }
+                        )
+                        if len(matches) >= limit:
+                            return matches
+
+        return matches
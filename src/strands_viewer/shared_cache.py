@@ -0,0 +1,470 @@
+"""
+Session cache shared by all worker processes.
+
+With several uvicorn workers, each process would otherwise parse the same
+session files independently. SharedCache keeps parsed sessions and the
+session listing in one SQLite database that every worker reads and writes,
+and an event table through which a worker that rebuilds an entry tells the
+others to drop their in-memory copy.
+
+Sessions read from directories are stored as a record plus one row per
+message, so bringing a session up to date writes only the messages that
+changed. Entries are validated against the session fingerprint (or, for the
+listing, a signature of the directory tree), so a stale entry is never
+served even if an invalidation event has not been seen yet.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from strands_viewer.metrics import record_cache_lookup
+from strands_viewer.pack import PACK_SUFFIX
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.storage import FileInfo, StorageBackend
+
+# Namespace of sessions stored with put_session; their messages are kept in
+# the session_messages table, one row per message file
+SESSION_NAMESPACE = "session"
+
+# Namespace of packed sessions, stored whole (a pack changes only as a whole)
+PACKED_SESSION_NAMESPACE = "packed_session"
+
+# Default location of the cache database, relative to the sessions directory.
+DEFAULT_CACHE_FILE = Path(".strands-viewer") / "cache.sqlite3"
+
+# Seconds between polls of the invalidation event table.
+EVENT_POLL_INTERVAL = 1.0
+
+# Invalidation events older than this (seconds) are pruned.
+EVENT_RETENTION_SECONDS = 3600
+
+# Parsed sessions kept in memory per worker.
+LOCAL_CACHE_SIZE = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    value TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+CREATE TABLE IF NOT EXISTS session_messages (
+    key TEXT NOT NULL,
+    path TEXT NOT NULL,
+    manifest TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (key, path)
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    origin INTEGER NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class SharedCache:
+    """Fingerprint-validated key/value cache and invalidation log in a SQLite file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    @classmethod
+    def for_storage_dir(cls, storage_dir: str) -> "SharedCache":
+        """Create a cache in the default location for a sessions directory."""
+        return cls(str(Path(storage_dir) / DEFAULT_CACHE_FILE))
+
+    def _connection(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so each process opens its own
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(str(self.path), timeout=10.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, namespace: str, key: str, fingerprint: str) -> Optional[Any]:
+        """Get a cached value if it was stored for this fingerprint."""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute(
+                    "SELECT fingerprint, value FROM entries WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                )
+                .fetchone()
+            )
+        if row is None or row[0] != fingerprint:
+            return None
+        return json.loads(row[1])
+
+    def get_session(self, key: str) -> Optional[Tuple[str, Any, Dict[str, Tuple[Any, Any]]]]:
+        """
+        Get a session stored with put_session, whatever its fingerprint.
+
+        Returns:
+            Tuple of (fingerprint, record, message file -> (manifest entry,
+            message)), or None if the session is not stored
+        """
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                # One read transaction, so the record and its rows come from the same write
+                conn.execute("BEGIN")
+                row = conn.execute(
+                    "SELECT fingerprint, value FROM entries WHERE namespace = ? AND key = ?",
+                    (SESSION_NAMESPACE, key),
+                ).fetchone()
+                messages = conn.execute(
+                    "SELECT path, manifest, value FROM session_messages WHERE key = ?", (key,)
+                ).fetchall()
+        if row is None:
+            return None
+        rows = {path: (json.loads(entry), json.loads(value)) for path, entry, value in messages}
+        return row[0], json.loads(row[1]), rows
+
+    def put_session(
+        self,
+        key: str,
+        fingerprint: str,
+        record: Any,
+        changed: Dict[str, Tuple[Any, Any]],
+        removed: Sequence[str] = (),
+        replace: bool = False,
+    ) -> None:
+        """
+        Store a session as a record plus one row per message, and notify other workers.
+
+        Only the given message rows are written, so bringing a stored session
+        up to date costs a write per changed message rather than a rewrite of
+        the whole session.
+
+        Args:
+            key: Session ID
+            fingerprint: Session fingerprint
+            record: The session without its messages
+            changed: Message file -> (manifest entry, message) of new and changed messages
+            removed: Message files whose rows are deleted
+            replace: Delete all other message rows of the session first
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                if replace:
+                    conn.execute("DELETE FROM session_messages WHERE key = ?", (key,))
+                conn.executemany(
+                    "DELETE FROM session_messages WHERE key = ? AND path = ?",
+                    [(key, path) for path in removed],
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO session_messages VALUES (?, ?, ?, ?)",
+                    [
+                        (
+                            key,
+                            path,
+                            json.dumps(entry),
+                            json.dumps(message, ensure_ascii=False),
+                        )
+                        for path, (entry, message) in changed.items()
+                    ],
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (
+                        SESSION_NAMESPACE,
+                        key,
+                        fingerprint,
+                        json.dumps(record, ensure_ascii=False),
+                        now,
+                    ),
+                )
+                self._publish(conn, SESSION_NAMESPACE, key, now)
+
+    def put(self, namespace: str, key: str, fingerprint: str, value: Any) -> None:
+        """Store a value and notify other workers that the key changed."""
+        payload = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                    (namespace, key, fingerprint, payload, now),
+                )
+                self._publish(conn, namespace, key, now)
+
+    @staticmethod
+    def _publish(conn: sqlite3.Connection, namespace: str, key: str, now: float) -> None:
+        conn.execute(
+            "INSERT INTO events (namespace, key, origin, created_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, os.getpid(), now),
+        )
+        conn.execute("DELETE FROM events WHERE created_at < ?", (now - EVENT_RETENTION_SECONDS,))
+
+    def invalidate(self, namespace: str, key: str) -> None:
+        """Remove an entry and notify other workers."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key)
+                )
+                if namespace == SESSION_NAMESPACE:
+                    conn.execute("DELETE FROM session_messages WHERE key = ?", (key,))
+                conn.execute(
+                    "INSERT INTO events (namespace, key, origin, created_at) VALUES (?, ?, ?, ?)",
+                    (namespace, key, os.getpid(), time.time()),
+                )
+
+    def last_event_id(self) -> int:
+        with self._lock:
+            row = self._connection().execute("SELECT MAX(id) FROM events").fetchone()
+        return row[0] or 0
+
+    def events_since(self, event_id: int) -> List[Tuple[int, str, str, int]]:
+        """Get (id, namespace, key, origin pid) of events after event_id."""
+        with self._lock:
+            return (
+                self._connection()
+                .execute(
+                    "SELECT id, namespace, key, origin FROM events WHERE id > ? ORDER BY id",
+                    (event_id,),
+                )
+                .fetchall()
+            )
+
+
+class CachingSessionReader(SessionReader):
+    """
+    SessionReader that serves parsed sessions and the listing from a SharedCache.
+
+    Each worker also keeps recently used sessions in memory; entries are
+    dropped when another worker publishes an invalidation event for them.
+    Returned sessions are shared between requests and must not be mutated.
+    """
+
+    caches_sessions = True
+
+    def __init__(self, storage_dir: Union[str, StorageBackend], cache: SharedCache):
+        super().__init__(storage_dir)
+        self.cache = cache
+        self._local: "OrderedDict[Tuple[str, str], Tuple[str, Any]]" = OrderedDict()
+        self._local_lock = threading.Lock()
+        self._last_event_id = cache.last_event_id()
+        self._next_poll = 0.0
+
+    def _sync(self) -> None:
+        """Apply invalidation events published by other workers."""
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+        self._next_poll = now + EVENT_POLL_INTERVAL
+
+        events = self.cache.events_since(self._last_event_id)
+        if not events:
+            return
+        pid = os.getpid()
+        with self._local_lock:
+            for event_id, namespace, key, origin in events:
+                self._last_event_id = max(self._last_event_id, event_id)
+                if origin != pid:
+                    self._local.pop((namespace, key), None)
+
+    def _cached(self, namespace: str, key: str, fingerprint: str, build: Callable[[], Any]) -> Any:
+        """Get a value from the local or shared cache, building and storing it on a miss."""
+        value = self._get_local(namespace, key, fingerprint)
+        if value is not None:
+            return value
+
+        value = self.cache.get(namespace, key, fingerprint)
+        record_cache_lookup(f"{namespace}_shared", hit=value is not None)
+        if value is None:
+            value = build()
+            if value is None:
+                return None
+            self.cache.put(namespace, key, fingerprint, value)
+        self._keep_local(namespace, key, fingerprint, value)
+        return value
+
+    def _get_local(self, namespace: str, key: str, fingerprint: str) -> Any:
+        """Get a value from this worker's cache, or None if it is missing or stale."""
+        self._sync()
+        with self._local_lock:
+            entry = self._local.get((namespace, key))
+            if entry is not None and entry[0] == fingerprint:
+                self._local.move_to_end((namespace, key))
+                record_cache_lookup(f"{namespace}_local", hit=True)
+                return entry[1]
+        record_cache_lookup(f"{namespace}_local", hit=False)
+        return None
+
+    def _keep_local(self, namespace: str, key: str, fingerprint: str, value: Any) -> None:
+        with self._local_lock:
+            self._local[(namespace, key)] = (fingerprint, value)
+            self._local.move_to_end((namespace, key))
+            while len(self._local) > LOCAL_CACHE_SIZE:
+                self._local.popitem(last=False)
+
+    def list_sessions(self) -> List[Dict[str, Any]]:
+        """List all sessions, reusing the listing while no session changed."""
+        return self._cached("listing", "all", self.listing_signature(), super().list_sessions)
+
+    def prime_listing(self, signature: str, sessions: List[Dict[str, Any]]) -> None:
+        """Store a listing built by the warm-up scan in the shared and local cache."""
+        self.cache.put("listing", "all", signature, sessions)
+        self._keep_local("listing", "all", signature, sessions)
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a session, reusing the parsed session while its files are unchanged.
+
+        When files changed, the stored version of the session is brought up
+        to date by reading only the changed files (see refresh_session), and
+        only the rows of changed messages are written back.
+        """
+        located = self._fingerprint_files(session_id)
+        if located is None:
+            return None
+        location, files = located
+        fingerprint = self._fingerprint(location, files)
+
+        if location.endswith(PACK_SUFFIX):
+            return self._cached(
+                PACKED_SESSION_NAMESPACE,
+                session_id,
+                fingerprint,
+                lambda: super(CachingSessionReader, self).get_session(session_id),
+            )
+
+        session = self._get_local(SESSION_NAMESPACE, session_id, fingerprint)
+        if session is not None:
+            return session
+        stored = self.cache.get_session(session_id)
+        hit = stored is not None and stored[0] == fingerprint
+        record_cache_lookup(f"{SESSION_NAMESPACE}_shared", hit=hit)
+        if hit:
+            session = self._assemble(stored[1], stored[2])
+        else:
+            session = self._refresh(session_id, location, files, fingerprint, stored)
+            if session is None:
+                return None
+        self._keep_local(SESSION_NAMESPACE, session_id, fingerprint, session)
+        return session
+
+    def get_session_raw(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a session for a response, from the cached parsed session.
+
+        Unlike SessionReader.get_session_raw, which splices file contents into
+        the response, this goes through get_session so routes share the cache
+        and its incremental refresh.
+        """
+        return self.get_session(session_id)
+
+    def get_messages_raw(
+        self, session_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Any]:
+        """Get a page of messages for a response, from the cached parsed session."""
+        session = self.get_session(session_id)
+        if session is None:
+            return []
+        stop = offset + limit if limit is not None else None
+        return session["messages"][offset:stop]
+
+    def get_agent_messages_raw(
+        self, session_id: str, agent_id: str, limit: Optional[int] = None, offset: int = 0
+    ) -> Optional[List[Any]]:
+        """Get a page of one agent's messages for a response, from the cached parsed session."""
+        session = self.get_session(session_id)
+        if session is None:
+            return None
+        messages = [m for m in session["messages"] if m.get("agent_id") == agent_id]
+        if not messages:
+            # An agent without messages, or one that does not exist
+            return super().get_agent_messages_raw(session_id, agent_id, limit, offset)
+        stop = offset + limit if limit is not None else None
+        return messages[offset:stop]
+
+    def get_tool_calls(self, session_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Get a session's tool call pairing, built once per session fingerprint."""
+        fingerprint = self.get_fingerprint(session_id)
+        if fingerprint is None:
+            return None
+        return self._cached(
+            "tool_calls",
+            session_id,
+            fingerprint,
+            lambda: super(CachingSessionReader, self).get_tool_calls(session_id),
+        )
+
+    def _refresh(
+        self,
+        session_id: str,
+        session_dir: str,
+        files: List[FileInfo],
+        fingerprint: str,
+        stored: Optional[Tuple[str, Any, Dict[str, Tuple[Any, Any]]]],
+    ) -> Optional[Dict[str, Any]]:
+        """Bring the stored session up to date and write back the messages that changed."""
+        previous = manifest = None
+        if stored is not None:
+            with self._local_lock:
+                entry = self._local.get((SESSION_NAMESPACE, session_id))
+            _, record, rows = stored
+            if entry is not None and entry[0] == stored[0]:
+                # Same version as stored, already merged into a timeline
+                previous = entry[1]
+            else:
+                previous = self._assemble(record, rows)
+            manifest = dict(record["files"])
+            manifest.update((path, row[0]) for path, row in rows.items())
+        record_cache_lookup("manifest", hit=manifest is not None)
+
+        refreshed = self.refresh_session(session_dir, files, previous, manifest)
+        if refreshed is None:
+            return None
+        session, new_manifest = refreshed
+
+        streams = self._message_streams(session["messages"], new_manifest)
+        if streams is None:
+            return session
+        messages = {path: m for stream in streams.values() for path, m in stream.items()}
+        old_manifest = manifest or {}
+        record = {
+            "session": {key: value for key, value in session.items() if key != "messages"},
+            "files": {path: entry for path, entry in new_manifest.items() if path not in messages},
+        }
+        changed = {
+            path: (new_manifest[path], message)
+            for path, message in messages.items()
+            if old_manifest.get(path) != new_manifest[path]
+        }
+        removed = [path for path in old_manifest if path not in new_manifest]
+        self.cache.put_session(
+            session_id, fingerprint, record, changed, removed, replace=manifest is None
+        )
+        return session
+
+    def _assemble(self, record: Dict[str, Any], rows: Dict[str, Tuple[Any, Any]]) -> Dict[str, Any]:
+        """Rebuild a session from its stored record and message rows."""
+        streams: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for path, (_, message) in rows.items():
+            streams.setdefault(message["agent_id"], {})[path] = message
+        return dict(record["session"], messages=self._merge_streams(streams))
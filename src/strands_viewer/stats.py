@@ -0,0 +1,25 @@
+"""
+Summary statistics shared by the load tester, heuristics, analytics, admission control
+and chat metrics.
+"""
+
+import math
+from typing import List, Optional
+
+
+def percentile(sorted_values: List[float], p: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of an already sorted list.
+
+    Args:
+        sorted_values: Values in ascending order
+        p: Percentile, from 0 to 100
+
+    Returns:
+        The smallest value with at least p percent of the values at or below it,
+        or None for an empty list
+    """
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(p / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
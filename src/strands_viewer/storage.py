@@ -0,0 +1,410 @@
+"""
+Storage backends for session files.
+
+SessionReader reads the FileSessionManager / S3SessionManager layout
+(session_<id>/session.json, session_<id>/agents/agent_<id>/agent.json,
+session_<id>/agents/agent_<id>/messages/message_<n>.json) through a
+StorageBackend, addressing files by "/"-separated paths relative to the
+storage root:
+
+- LocalBackend: a directory on disk.
+- ArchiveBackend (strands_viewer.archive): a tar or zip archive, read through
+  a persisted member index.
+- S3Backend: an S3 bucket and key prefix (or any S3-compatible store), with
+  pooled connections, paginated LISTs with "/" delimiters, concurrent GETs
+  and an optional local read-through disk cache.
+"""
+
+import abc
+import fnmatch
+import hashlib
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+# URL scheme of S3 locations: s3://bucket/prefix
+S3_SCHEME = "s3://"
+
+# Concurrent GETs (and pooled connections) per S3 backend
+DEFAULT_S3_CONCURRENCY = 16
+
+# Environment variables configuring S3 backends opened by open_backend. The
+# endpoint, region and credentials come from the usual AWS settings
+# (AWS_ENDPOINT_URL, AWS_PROFILE, ...).
+S3_CONCURRENCY_ENV = "STRANDS_VIEWER_S3_CONCURRENCY"
+S3_CACHE_DIR_ENV = "STRANDS_VIEWER_S3_CACHE_DIR"
+
+
+class FileInfo(NamedTuple):
+    """A file in a storage backend."""
+
+    # Path relative to the storage root, "/"-separated
+    path: str
+    size: int
+    mtime_ns: int
+    # Content version (the ETag in S3), if the backend has one
+    version: Optional[str] = None
+
+
+class StorageBackend(abc.ABC):
+    """Read-only access to files below a storage root."""
+
+    # Where viewer state (analysis store, caches) is kept by default
+    state_dir: Path = Path(".")
+
+    @abc.abstractmethod
+    def describe(self) -> str:
+        """Human-readable location of the storage root."""
+        ...
+
+    @abc.abstractmethod
+    def list_dirs(self, prefix: str = "") -> List[str]:
+        """Names of the directories directly below prefix, sorted."""
+        ...
+
+    @abc.abstractmethod
+    def list_files(self, prefix: str = "", recursive: bool = False) -> List[FileInfo]:
+        """Files directly below prefix (or anywhere below it, if recursive), sorted by path."""
+        ...
+
+    def list_names(self, prefix: str = "", recursive: bool = False) -> List[str]:
+        """
+        Paths of the files list_files would return, sorted.
+
+        Cheaper than list_files where a backend has to stat files for their
+        size and modification time; use it when only the paths are needed.
+        """
+        return [info.path for info in self.list_files(prefix, recursive)]
+
+    @abc.abstractmethod
+    def stat(self, path: str) -> Optional[FileInfo]:
+        """Get a file's info, or None if it does not exist."""
+        ...
+
+    @abc.abstractmethod
+    def read_bytes(self, path: str) -> bytes:
+        """
+        Read a file.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        ...
+
+    def map_file(self, path: str) -> Any:
+        """
+        Get a file's contents as a sliceable buffer; local files are memory-mapped.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+        """
+        return self.read_bytes(path)
+
+    def read_many(self, files: Sequence[FileInfo]) -> List[Optional[bytes]]:
+        """Read several files; None for files that could not be read."""
+        contents: List[Optional[bytes]] = []
+        for info in files:
+            try:
+                contents.append(self.read_bytes(info.path))
+            except OSError as e:
+                print(f"Error reading {info.path}: {e}")
+                contents.append(None)
+        return contents
+
+    @abc.abstractmethod
+    def signature(self, patterns: Sequence[str]) -> str:
+        """Hash of the paths, sizes and modification times of entries matching glob patterns."""
+        ...
+
+
+class LocalBackend(StorageBackend):
+    """Session files in a local directory."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        if not self.root.exists():
+            raise ValueError(f"Storage directory does not exist: {root}")
+        self.state_dir = self.root
+
+    def describe(self) -> str:
+        return str(self.root)
+
+    def _info(self, path: Path) -> FileInfo:
+        stat = path.stat()
+        return FileInfo(path.relative_to(self.root).as_posix(), stat.st_size, stat.st_mtime_ns)
+
+    def list_dirs(self, prefix: str = "") -> List[str]:
+        directory = self.root / prefix
+        if not directory.is_dir():
+            return []
+        return sorted(d.name for d in directory.iterdir() if d.is_dir())
+
+    def _walk(self, prefix: str, recursive: bool) -> List[str]:
+        # File paths below prefix from directory entry types alone, without a stat per file
+        directory = os.path.join(self.root, prefix)
+        base = prefix.strip("/")
+        paths: List[str] = []
+        for dirpath, dirnames, filenames in os.walk(directory):
+            relative = os.path.relpath(dirpath, directory).replace(os.sep, "/")
+            relative = base if relative == "." else f"{base}/{relative}" if base else relative
+            paths.extend(f"{relative}/{name}" if relative else name for name in filenames)
+            if not recursive:
+                break
+            dirnames.sort()
+        paths.sort()
+        return paths
+
+    def list_names(self, prefix: str = "", recursive: bool = False) -> List[str]:
+        return self._walk(prefix, recursive)
+
+    def list_files(self, prefix: str = "", recursive: bool = False) -> List[FileInfo]:
+        files = []
+        for path in self._walk(prefix, recursive):
+            try:
+                stat = os.stat(os.path.join(self.root, path))
+            except OSError:
+                continue
+            files.append(FileInfo(path, stat.st_size, stat.st_mtime_ns))
+        return files
+
+    def stat(self, path: str) -> Optional[FileInfo]:
+        full_path = self.root / path
+        try:
+            return self._info(full_path) if full_path.is_file() else None
+        except OSError:
+            return None
+
+    def read_bytes(self, path: str) -> bytes:
+        with open(os.path.join(self.root, path), "rb") as f:
+            return f.read()
+
+    def map_file(self, path: str) -> Any:
+        with open(self.root / path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def signature(self, patterns: Sequence[str]) -> str:
+        digest = hashlib.sha256()
+        entries = [path for pattern in patterns for path in self.root.glob(pattern)]
+        for path in sorted(entries):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            relative = path.relative_to(self.root).as_posix()
+            digest.update(f"{relative}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+
+def _import_boto3() -> Any:
+    try:
+        import boto3
+    except ImportError as e:
+        raise ImportError(
+            "S3 storage requires boto3. Install with: pip install strands-session-viewer[s3]"
+        ) from e
+    return boto3
+
+
+class S3Backend(StorageBackend):
+    """
+    Session files in an S3 bucket below a key prefix, as written by S3SessionManager.
+
+    The client keeps a pool of max_workers connections, and read_many fetches
+    objects with that many concurrent GETs. With cache_dir, objects read by
+    read_many are also kept on local disk, keyed by key and ETag, so unchanged
+    objects are fetched from S3 only once.
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        client: Any = None,
+        max_workers: int = DEFAULT_S3_CONCURRENCY,
+        cache_dir: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+    ):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.max_workers = max(1, max_workers)
+        if client is None:
+            boto3 = _import_boto3()
+            from botocore.config import Config
+
+            client = boto3.client(
+                "s3",
+                endpoint_url=endpoint_url,
+                config=Config(
+                    max_pool_connections=self.max_workers,
+                    retries={"max_attempts": 5, "mode": "adaptive"},
+                ),
+            )
+        self.client = client
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs: Any) -> "S3Backend":
+        """Create a backend from an s3://bucket/prefix URL."""
+        bucket, _, prefix = url[len(S3_SCHEME) :].partition("/")
+        if not bucket:
+            raise ValueError(f"Invalid S3 URL: {url}")
+        return cls(bucket, prefix, **kwargs)
+
+    def describe(self) -> str:
+        return f"{S3_SCHEME}{self.bucket}/{self.prefix}".rstrip("/")
+
+    def _key(self, path: str) -> str:
+        path = path.strip("/")
+        if not self.prefix:
+            return path
+        return f"{self.prefix}/{path}" if path else self.prefix
+
+    def _relative(self, key: str) -> str:
+        return key[len(self.prefix) + 1 :] if self.prefix else key
+
+    def _list(self, prefix: str, delimiter: bool) -> Tuple[List[str], List[FileInfo]]:
+        key_prefix = self._key(prefix)
+        key_prefix = f"{key_prefix}/" if key_prefix else ""
+        params = {"Bucket": self.bucket, "Prefix": key_prefix}
+        if delimiter:
+            params["Delimiter"] = "/"
+
+        dirs: List[str] = []
+        files: List[FileInfo] = []
+        for page in self.client.get_paginator("list_objects_v2").paginate(**params):
+            for common in page.get("CommonPrefixes", []):
+                dirs.append(common["Prefix"][len(key_prefix) :].rstrip("/"))
+            for obj in page.get("Contents", []):
+                if obj["Key"].endswith("/"):
+                    continue
+                files.append(
+                    FileInfo(
+                        self._relative(obj["Key"]),
+                        obj["Size"],
+                        int(obj["LastModified"].timestamp() * 1_000_000_000),
+                        obj.get("ETag"),
+                    )
+                )
+        return dirs, files
+
+    def list_dirs(self, prefix: str = "") -> List[str]:
+        return sorted(self._list(prefix, delimiter=True)[0])
+
+    def list_files(self, prefix: str = "", recursive: bool = False) -> List[FileInfo]:
+        return sorted(self._list(prefix, delimiter=not recursive)[1])
+
+    @staticmethod
+    def _is_missing(error: Exception) -> bool:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def stat(self, path: str) -> Optional[FileInfo]:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._key(path))
+        except Exception as e:
+            if self._is_missing(e):
+                return None
+            raise
+        return FileInfo(
+            path.strip("/"),
+            head["ContentLength"],
+            int(head["LastModified"].timestamp() * 1_000_000_000),
+            head.get("ETag"),
+        )
+
+    def read_bytes(self, path: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(path))
+        except Exception as e:
+            if self._is_missing(e):
+                raise FileNotFoundError(f"{self.describe()}/{path}") from e
+            raise
+        return response["Body"].read()
+
+    def _cache_path(self, info: FileInfo) -> Optional[Path]:
+        if self.cache_dir is None or not info.version:
+            return None
+        name = hashlib.sha256(f"{self._key(info.path)}\0{info.version}".encode("utf-8"))
+        digest = name.hexdigest()
+        return self.cache_dir / digest[:2] / digest
+
+    def _read_cached(self, info: FileInfo) -> Optional[bytes]:
+        cache_path = self._cache_path(info)
+        if cache_path is not None:
+            try:
+                return cache_path.read_bytes()
+            except OSError:
+                pass
+        try:
+            data = self.read_bytes(info.path)
+        except Exception as e:
+            print(f"Error reading {info.path}: {e}")
+            return None
+        if cache_path is not None:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                print(f"⚠️  Could not cache {info.path}: {e}")
+        return data
+
+    def read_many(self, files: Sequence[FileInfo]) -> List[Optional[bytes]]:
+        if len(files) <= 1:
+            return [self._read_cached(info) for info in files]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(files))) as executor:
+            return list(executor.map(self._read_cached, files))
+
+    def signature(self, patterns: Sequence[str]) -> str:
+        # One recursive LIST; a pattern naming a directory matches the objects below it
+        digest = hashlib.sha256()
+        for info in self.list_files("", recursive=True):
+            if any(
+                fnmatch.fnmatchcase(info.path, pattern)
+                or fnmatch.fnmatchcase(info.path, f"{pattern}/*")
+                for pattern in patterns
+            ):
+                digest.update(f"{info.path}\0{info.size}\0{info.version}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+
+def open_backend(location: str, **kwargs: Any) -> StorageBackend:
+    """
+    Open the storage backend for a location.
+
+    Args:
+        location: A local directory, a .zip/.tar/.tar.gz/.tgz archive, or s3://bucket/prefix
+        **kwargs: Options for S3Backend (max_workers, cache_dir, endpoint_url);
+            max_workers and cache_dir default to S3_CONCURRENCY_ENV and S3_CACHE_DIR_ENV
+
+    Returns:
+        StorageBackend instance
+    """
+    from strands_viewer.archive import ArchiveBackend, archive_format
+
+    if archive_format(location) is not None and Path(location).is_file():
+        return ArchiveBackend(location)
+    if is_remote(location):
+        if os.environ.get(S3_CONCURRENCY_ENV):
+            kwargs.setdefault("max_workers", int(os.environ[S3_CONCURRENCY_ENV]))
+        kwargs.setdefault("cache_dir", os.environ.get(S3_CACHE_DIR_ENV) or None)
+        return S3Backend.from_url(location, **kwargs)
+    return LocalBackend(location)
+
+
+def is_remote(location: str) -> bool:
+    """Check whether a location is an object storage URL rather than a local directory."""
+    return location.startswith(S3_SCHEME)
+
+
+def state_dir_for(location: str) -> Path:
+    """Default directory for viewer state of a location, without opening it."""
+    if is_remote(location):
+        return Path(".")
+    path = Path(location)
+    return path.parent if path.is_file() else path
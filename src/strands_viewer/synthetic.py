@@ -0,0 +1,226 @@
+"""
+Deterministic generator of synthetic FileSessionManager session stores.
+
+Produces the same session/agent/message layout Strands writes to disk, at any
+scale, for benchmarks and load tests. The same arguments always produce
+byte-identical stores.
+
+Usage:
+    python -m strands_viewer.synthetic /tmp/sessions --sessions 100 --messages 200
+"""
+
+import argparse
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict
+
+# Fixed start time so generated timestamps are reproducible
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+TOOL_NAMES = ["shell", "file_read", "file_write", "http_request", "python_repl", "editor"]
+
+ERROR_TEMPLATES = [
+    "Command failed with exit code {n}",
+    "FileNotFoundError: [Errno 2] No such file or directory: '/tmp/work/{n}.txt'",
+    "Connection refused on port {n}",
+    "TimeoutError: operation timed out after {n} seconds",
+]
+
+WORDS = (
+    "agent session tool result error request response file data model token "
+    "message user assistant deploy build test check value config output input"
+).split()
+
+
+def _text(rng: random.Random, size: int) -> str:
+    """Generate pseudo-random text of approximately size characters."""
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+
+def _timestamp(seconds: float) -> str:
+    return (BASE_TIME + timedelta(seconds=seconds)).isoformat()
+
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def generate_store(
+    output_dir: str,
+    sessions: int = 10,
+    messages_per_session: int = 50,
+    agents_per_session: int = 1,
+    tool_result_bytes: int = 512,
+    error_rate: float = 0.05,
+    seed: int = 0,
+) -> Dict[str, int]:
+    """
+    Generate a synthetic session store.
+
+    Each agent's conversation cycles through a user prompt, an assistant tool
+    call, a tool result (an error with probability error_rate) and an assistant
+    reply. Messages of different agents in a session interleave in time.
+
+    Args:
+        output_dir: Directory to write session_* directories into (created if missing)
+        sessions: Number of sessions
+        messages_per_session: Messages per session, spread across its agents
+        agents_per_session: Number of agents per session
+        tool_result_bytes: Approximate size of each tool result text
+        error_rate: Fraction of tool results with error status
+        seed: Random seed
+
+    Returns:
+        Counts of generated sessions, agents, messages and errors
+    """
+    rng = random.Random(seed)
+    root = Path(output_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    totals = {"sessions": 0, "agents": 0, "messages": 0, "errors": 0}
+
+    for session_idx in range(sessions):
+        session_id = f"synthetic-{seed}-{session_idx:06d}"
+        session_dir = root / f"session_{session_id}"
+        start = session_idx * 3600.0
+        clock = start
+        agent_ids = ["default"] + [f"worker_{i}" for i in range(1, agents_per_session)]
+
+        counters = {agent_id: 0 for agent_id in agent_ids}
+        pending_calls: Dict[str, Dict[str, Any]] = {}
+
+        for agent_id in agent_ids:
+            agent_dir = session_dir / "agents" / f"agent_{agent_id}"
+            (agent_dir / "messages").mkdir(parents=True, exist_ok=True)
+            _write_json(
+                agent_dir / "agent.json",
+                {
+                    "agent_id": agent_id,
+                    "state": {},
+                    "conversation_manager_state": {
+                        "__name__": "SlidingWindowConversationManager",
+                        "removed_message_count": 0,
+                    },
+                    "created_at": _timestamp(start),
+                    "updated_at": _timestamp(start),
+                },
+            )
+            totals["agents"] += 1
+
+        for position in range(messages_per_session):
+            agent_id = agent_ids[position % len(agent_ids)]
+            message_id = counters[agent_id]
+            counters[agent_id] += 1
+            clock += rng.uniform(0.5, 20.0)
+            step = message_id % 4
+
+            if step == 0:
+                message = {"role": "user", "content": [{"text": _text(rng, 80)}]}
+            elif step == 1:
+                tool_use_id = f"tooluse_{session_idx}_{agent_id}_{message_id}"
+                tool_name = rng.choice(TOOL_NAMES)
+                pending_calls[agent_id] = {"toolUseId": tool_use_id, "name": tool_name}
+                message = {
+                    "role": "assistant",
+                    "content": [
+                        {"text": _text(rng, 60)},
+                        {
+                            "toolUse": {
+                                "toolUseId": tool_use_id,
+                                "name": tool_name,
+                                "input": {"command": _text(rng, 30)},
+                            }
+                        },
+                    ],
+                }
+            elif step == 2:
+                call = pending_calls.pop(agent_id, {"toolUseId": "unknown"})
+                is_error = rng.random() < error_rate
+                if is_error:
+                    totals["errors"] += 1
+                    text = rng.choice(ERROR_TEMPLATES).format(n=rng.randint(1, 9999))
+                else:
+                    text = _text(rng, tool_result_bytes)
+                message = {
+                    "role": "user",
+                    "content": [
+                        {
+                            "toolResult": {
+                                "toolUseId": call["toolUseId"],
+                                "status": "error" if is_error else "success",
+                                "content": [{"text": text}],
+                            }
+                        }
+                    ],
+                }
+            else:
+                message = {"role": "assistant", "content": [{"text": _text(rng, 200)}]}
+
+            messages_dir = session_dir / "agents" / f"agent_{agent_id}" / "messages"
+            _write_json(
+                messages_dir / f"message_{message_id}.json",
+                {
+                    "message": message,
+                    "message_id": message_id,
+                    "redact_message": None,
+                    "created_at": _timestamp(clock),
+                    "updated_at": _timestamp(clock),
+                },
+            )
+            totals["messages"] += 1
+
+        _write_json(
+            session_dir / "session.json",
+            {
+                "session_id": session_id,
+                "session_type": "AGENT",
+                "created_at": _timestamp(start),
+                "updated_at": _timestamp(clock),
+            },
+        )
+        totals["sessions"] += 1
+
+    return totals
+
+
+def main():
+    """Command-line entry point for generating a synthetic store."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic Strands session store")
+    parser.add_argument("output_dir", help="Directory to write sessions into")
+    parser.add_argument("--sessions", type=int, default=10, help="Number of sessions")
+    parser.add_argument("--messages", type=int, default=50, help="Messages per session")
+    parser.add_argument("--agents", type=int, default=1, help="Agents per session")
+    parser.add_argument(
+        "--tool-result-bytes", type=int, default=512, help="Approximate tool result size"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.05, help="Fraction of failed tool results"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    totals = generate_store(
+        args.output_dir,
+        sessions=args.sessions,
+        messages_per_session=args.messages,
+        agents_per_session=args.agents,
+        tool_result_bytes=args.tool_result_bytes,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    )
+    print(
+        f"Generated {totals['sessions']} sessions, {totals['agents']} agents, "
+        f"{totals['messages']} messages ({totals['errors']} errors) in {args.output_dir}"
+    )
+
+
+if __name__ == "__main__":
+    main()
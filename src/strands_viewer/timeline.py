@@ -0,0 +1,119 @@
+"""
+Timestamps and tool-call pairing shared by the heuristics, analytics, exporters,
+the session reader and the batch jobs.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def parse_timestamp(timestamp: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO timestamp from session data, or return None."""
+    if not timestamp:
+        return None
+    try:
+        return datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except (ValueError, AttributeError):
+        return None
+
+
+def seconds_since(timestamp: Optional[str], now: datetime) -> Optional[float]:
+    """
+    Seconds elapsed since an ISO timestamp, or None if it cannot be parsed.
+
+    Timestamps without a timezone are taken as UTC.
+
+    Args:
+        timestamp: ISO timestamp from session data (e.g. a session's updated_at)
+        now: Timezone-aware current time
+    """
+    parsed = parse_timestamp(timestamp)
+    if parsed is None:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (now - parsed).total_seconds()
+
+
+def iter_content(messages: List[Dict[str, Any]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (1-based message number, content block) for every content block."""
+    for msg_idx, msg_wrapper in enumerate(messages, 1):
+        for content in msg_wrapper.get("message", {}).get("content", []):
+            yield msg_idx, content
+
+
+def result_text(tool_result: Dict[str, Any]) -> str:
+    """
+    Get the first text block of a tool result.
+
+    Args:
+        tool_result: The toolResult of a content block
+
+    Returns:
+        The text, or "" if the result has no text content
+    """
+    for rc in tool_result.get("content", []):
+        if "text" in rc:
+            return rc["text"]
+    return ""
+
+
+def latency_ms(started: Optional[datetime], finished: Optional[datetime]) -> Optional[float]:
+    """
+    Milliseconds between two parsed timestamps (see parse_timestamp), to the microsecond.
+
+    Returns:
+        The latency, or None if either timestamp is missing or only one has a timezone
+    """
+    if started is None or finished is None:
+        return None
+    try:
+        return round((finished - started).total_seconds() * 1000, 3)
+    except TypeError:  # Mixed naive and aware timestamps
+        return None
+
+
+def pair_tool_calls(messages: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    Index tool calls by toolUseId, paired with the message holding their result.
+
+    A call's latency is the time between the created_at of the message with
+    the toolUse and that of the message with the matching toolResult. Results
+    without a known call are ignored.
+
+    Returns:
+        toolUseId -> call (tool_use_id, name, agent_id, call_message and
+        result_message numbers, started_at, finished_at, latency_ms, status),
+        in call order; result fields are None until a result is seen
+    """
+    calls: Dict[str, Dict[str, Any]] = {}
+    for msg_idx, content in iter_content(messages):
+        msg_wrapper = messages[msg_idx - 1]
+        if "toolUse" in content:
+            tool_use = content["toolUse"]
+            tool_use_id = tool_use.get("toolUseId")
+            if tool_use_id and tool_use_id not in calls:
+                calls[tool_use_id] = {
+                    "tool_use_id": tool_use_id,
+                    "name": tool_use.get("name", "unknown"),
+                    "agent_id": msg_wrapper.get("agent_id"),
+                    "call_message": msg_idx,
+                    "result_message": None,
+                    "started_at": msg_wrapper.get("created_at"),
+                    "finished_at": None,
+                    "latency_ms": None,
+                    "status": None,
+                }
+
+        if "toolResult" in content:
+            tool_result = content["toolResult"]
+            call = calls.get(tool_result.get("toolUseId", ""))
+            if call is not None and call["result_message"] is None:
+                call["result_message"] = msg_idx
+                call["finished_at"] = msg_wrapper.get("created_at")
+                call["latency_ms"] = latency_ms(
+                    parse_timestamp(call["started_at"]), parse_timestamp(call["finished_at"])
+                )
+                call["status"] = tool_result.get("status")
+
+    return calls
@@ -0,0 +1,140 @@
+"""
+Background warm-up of the session listing and caches.
+
+The server accepts requests immediately; a background thread scans the
+storage directory, building the session listing incrementally (served as a
+partial listing until the scan finishes). The finished listing is served
+until a session changes, and handed to the reader's cache when it has one,
+together with the most recently updated sessions, pre-parsed. Progress is
+reported by /readyz.
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from strands_viewer.session_reader import SessionReader
+
+# Most recently updated sessions pre-parsed into the reader cache, if it has one.
+WARMUP_SESSION_LIMIT = 20
+
+
+class Warmup:
+    """Scans sessions on a background thread and tracks progress."""
+
+    def __init__(self, reader: SessionReader, session_limit: int = WARMUP_SESSION_LIMIT):
+        self.reader = reader
+        self.session_limit = session_limit
+        self.status = "pending"
+        self.phase: Optional[str] = None
+        self.done = 0
+        self.total = 0
+        self.error: Optional[str] = None
+        self._sessions: List[Dict[str, Any]] = []
+        # Finished listing and the listing signature it was built at
+        self._listing: Optional[Tuple[str, List[Dict[str, Any]]]] = None
+        self._lock = threading.Lock()
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status in ("done", "failed")
+
+    def start(self) -> None:
+        """Start warming up in a daemon thread (once)."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.status = "running"
+            self._started_at = time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="strands-viewer-warmup")
+            self._thread.daemon = True
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for warm-up to finish. Returns True if it finished."""
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.ready
+
+    def _run(self) -> None:
+        try:
+            # Taken before the scan, so changes made during it invalidate the listing
+            signature = self.reader.listing_signature()
+            session_dirs = self.reader.session_dirs()
+            with self._lock:
+                self.phase = "listing"
+                self.total = len(session_dirs)
+
+            for session_dir in session_dirs:
+                summary = self.reader.get_session_summary(session_dir)
+                with self._lock:
+                    if summary is not None:
+                        self._sessions.append(summary)
+                    self.done += 1
+
+            listing = self.partial_listing()
+            with self._lock:
+                self._listing = (signature, listing)
+            self.reader.prime_listing(signature, listing)
+
+            if self.reader.caches_sessions:
+                recent = listing[: self.session_limit]
+                with self._lock:
+                    self.phase = "sessions"
+                    self.done = 0
+                    self.total = len(recent)
+                for summary in recent:
+                    self.reader.get_session(summary["session_id"])
+                    with self._lock:
+                        self.done += 1
+
+            self.status = "done"
+        except Exception as e:
+            print(f"⚠️  Warm-up failed: {e}")
+            self.error = str(e)
+            self.status = "failed"
+        finally:
+            self._finished_at = time.monotonic()
+
+    def partial_listing(self) -> List[Dict[str, Any]]:
+        """Sessions scanned so far, sorted like SessionReader.list_sessions()."""
+        with self._lock:
+            sessions = list(self._sessions)
+        sessions.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
+        return sessions
+
+    def listing(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        The listing of the finished scan, while no session has changed since.
+
+        Returns None before the scan finished and from the first change on
+        (the listing is then dropped, and the reader lists sessions itself).
+        """
+        with self._lock:
+            kept = self._listing
+        if kept is None:
+            return None
+        if self.reader.listing_signature() != kept[0]:
+            with self._lock:
+                self._listing = None
+            return None
+        return kept[1]
+
+    def progress(self) -> Dict[str, Any]:
+        """Warm-up status, phase, progress counter and elapsed time."""
+        with self._lock:
+            elapsed = None
+            if self._started_at is not None:
+                end = self._finished_at if self._finished_at is not None else time.monotonic()
+                elapsed = round(end - self._started_at, 3)
+            return {
+                "status": self.status,
+                "phase": self.phase,
+                "done": self.done,
+                "total": self.total,
+                "elapsed_seconds": elapsed,
+                "error": self.error,
+            }
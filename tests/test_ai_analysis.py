@@ -0,0 +1,219 @@
+"""Tests for SessionAnalyzer behavior that does not need a real model."""
+
+import asyncio
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from strands_viewer import ai_analysis
+from strands_viewer.ai_analysis import SessionAnalyzer
+from strands_viewer.metrics import CACHE_REQUESTS, LLM_CALL_DURATION, LLM_TOKENS
+
+
+class FakeAgent:
+    """Stand-in for strands.Agent that records prompts."""
+
+    prompts = []
+    lock = threading.Lock()
+
+    def __init__(self, model=None, tools=None, callback_handler=None, **kwargs):
+        self.model = model
+
+    def __call__(self, prompt):
+        with FakeAgent.lock:
+            FakeAgent.prompts.append(prompt)
+        return f"summary {len(FakeAgent.prompts)}"
+
+
+@pytest.fixture
+def fake_strands(monkeypatch):
+    """Pretend strands is installed, using FakeAgent for model calls."""
+    FakeAgent.prompts = []
+    monkeypatch.setattr(ai_analysis, "STRANDS_AVAILABLE", True)
+    monkeypatch.setattr(ai_analysis, "Agent", FakeAgent)
+    return FakeAgent
+
+
+def make_session(message_count, text_size):
+    """Create a session with message_count user messages."""
+    return {
+        "session_id": "big",
+        "session_type": "AGENT",
+        "messages": [
+            {"message": {"role": "user", "content": [{"text": f"{i} " + "z" * text_size}]}}
+            for i in range(message_count)
+        ],
+    }
+
+
+def test_summarize_chunked_map_reduce(fake_strands):
+    """Test that large sessions are summarized per chunk and then reduced."""
+    analyzer = SessionAnalyzer(context_budget_tokens=1000, chunk_tokens=500, max_parallel=3)
+    session = make_session(message_count=40, text_size=400)
+
+    result = analyzer.summarize_session(session)
+
+    segment_prompts = [p for p in fake_strands.prompts if "one segment" in p]
+    assert len(segment_prompts) > 1
+    assert "summary of the whole session" in fake_strands.prompts[-1]
+    assert result.startswith("summary")
+
+
+def test_summarize_small_session_skips_chunking(fake_strands, monkeypatch):
+    """Test that sessions within budget use the regular agent path."""
+    analyzer = SessionAnalyzer(context_budget_tokens=100000)
+    called = []
+    monkeypatch.setattr(analyzer, "summarize_session_chunked", lambda s: called.append(s))
+    monkeypatch.setattr(analyzer, "_get_agent", lambda s: FakeAgent())
+
+    analyzer.summarize_session(make_session(message_count=2, text_size=10))
+
+    assert called == []
+
+
+def test_summarize_chunked_reduces_hierarchically(fake_strands):
+    """Test that many partial summaries are reduced in more than one level."""
+    analyzer = SessionAnalyzer(chunk_tokens=50, max_parallel=2)
+    session = make_session(message_count=30, text_size=120)
+
+    analyzer.summarize_session_chunked(session)
+
+    reduce_prompts = [p for p in fake_strands.prompts if "Combine these" in p]
+    assert reduce_prompts
+
+
+def test_call_gate_is_held_per_model_request(fake_strands, monkeypatch):
+    """Test that a chunked summary passes the gate once for every model request."""
+    gated = []
+
+    @contextmanager
+    def gate():
+        gated.append(True)
+        yield
+
+    class FakeModel:
+        async def stream(self, prompt):
+            yield prompt
+
+    record_prompt = FakeAgent.__call__
+
+    def call(agent, prompt):
+        async def run():
+            return [event async for event in agent.model.stream(prompt)]
+
+        asyncio.run(run())
+        return record_prompt(agent, prompt)
+
+    monkeypatch.setattr(FakeAgent, "__call__", call)
+    analyzer = SessionAnalyzer(
+        model=FakeModel(), context_budget_tokens=1000, chunk_tokens=500, call_gate=gate
+    )
+    analyzer.summarize_session(make_session(message_count=40, text_size=400))
+
+    assert len(fake_strands.prompts) > 2
+    assert len(gated) == len(fake_strands.prompts)
+
+
+class FakeMetrics:
+    """Stand-in for strands EventLoopMetrics."""
+
+    def __init__(self, usage):
+        self.accumulated_usage = usage
+
+
+class FakeResult:
+    """Stand-in for strands AgentResult."""
+
+    def __init__(self, text, usage):
+        self.text = text
+        self.metrics = FakeMetrics(usage)
+
+    def __str__(self):
+        return self.text
+
+
+class FakeAnthropicModel:
+    """Model stand-in whose class name matches a prompt-caching provider."""
+
+
+FakeAnthropicModel.__name__ = "AnthropicModel"
+
+
+class CachingFakeAgent:
+    """Agent stand-in that records the seeded messages and reports cache usage."""
+
+    calls = []
+
+    def __init__(self, model=None, tools=None, messages=None, **kwargs):
+        self.messages = messages
+        self.tools = tools
+
+    def __call__(self, prompt):
+        CachingFakeAgent.calls.append((self.messages, prompt))
+        cached = 1000 if len(CachingFakeAgent.calls) > 1 else 0
+        return FakeResult(
+            "answer",
+            {
+                "inputTokens": 20,
+                "outputTokens": 5,
+                "cacheReadInputTokens": cached,
+                "cacheWriteInputTokens": 1000 - cached,
+            },
+        )
+
+
+def test_answer_question_cached(monkeypatch, temp_sessions_dir):
+    """Test that cached chat sends an identical session prefix and reports metrics."""
+    from strands_viewer.session_reader import SessionReader
+
+    CachingFakeAgent.calls = []
+    monkeypatch.setattr(ai_analysis, "STRANDS_AVAILABLE", True)
+    monkeypatch.setattr(ai_analysis, "Agent", CachingFakeAgent)
+
+    session = SessionReader(temp_sessions_dir).get_session("test_1")
+    analyzer = SessionAnalyzer(model=FakeAnthropicModel())
+    calls_before = LLM_CALL_DURATION.count(operation="chat_cached")
+    cache_read_before = LLM_TOKENS.value(type="cache_read")
+    prefix_hits_before = CACHE_REQUESTS.value(cache="session_prefix", result="hit")
+
+    first = analyzer.answer_question_cached(session, "What failed?")
+    second = analyzer.answer_question_cached(
+        session, "Why?", [{"role": "user", "content": "What failed?"}]
+    )
+
+    (first_messages, _), (second_messages, second_prompt) = CachingFakeAgent.calls
+    assert first_messages == second_messages
+    assert {"cachePoint": {"type": "default"}} in first_messages[0]["content"]
+    assert "Command failed with error" in first_messages[0]["content"][0]["text"]
+    assert "Previous conversation" in second_prompt
+
+    assert first["answer"] == "answer"
+    assert first["metrics"]["cache_write_input_tokens"] == 1000
+    assert second["metrics"]["cache_read_input_tokens"] == 1000
+    assert second["metrics"]["cache_hit_ratio"] > 0.9
+
+    summary = analyzer.chat_metrics_summary()
+    assert summary["turns"] == 2
+    assert summary["uncached_input_tokens"] == 40
+    assert summary["prefix_cache"] == {"hits": 1, "misses": 1}
+    latencies = [first["metrics"]["latency_ms"], second["metrics"]["latency_ms"]]
+    assert summary["latency_ms"]["p50"] == min(latencies)
+    assert summary["latency_ms"]["max"] == max(latencies)
+
+    assert LLM_CALL_DURATION.count(operation="chat_cached") == calls_before + 2
+    assert LLM_TOKENS.value(type="cache_read") == cache_read_before + 1000
+    assert CACHE_REQUESTS.value(cache="session_prefix", result="hit") == prefix_hits_before + 1
+
+
+def test_cached_chat_skips_cache_point_for_other_providers(monkeypatch):
+    """Test that providers without prompt caching get no cachePoint block."""
+    CachingFakeAgent.calls = []
+    monkeypatch.setattr(ai_analysis, "STRANDS_AVAILABLE", True)
+    monkeypatch.setattr(ai_analysis, "Agent", CachingFakeAgent)
+
+    analyzer = SessionAnalyzer(model=object())
+    analyzer.answer_question_cached(make_session(2, 10), "Hi?")
+
+    messages, _ = CachingFakeAgent.calls[0]
+    assert all("cachePoint" not in block for block in messages[0]["content"])
@@ -0,0 +1,164 @@
+"""Tests for the columnar message metadata store."""
+
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from strands_viewer.analytics import MessageStore
+from strands_viewer.server import SessionViewerApp
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.synthetic import generate_store
+
+
+def _by(rows, key):
+    return {row[key]: row for row in rows}
+
+
+def test_group_by_tool_and_day(temp_sessions_dir, tmp_path):
+    """Test message, tool result and error counts per group."""
+    store = MessageStore(str(tmp_path / "analytics"))
+    assert store.update(SessionReader(temp_sessions_dir)) == {"sessions": 2, "read": 2, "rows": 5}
+
+    tools = _by(store.query(["tool"]), "tool")
+    assert tools["shell"]["messages"] == 2
+    assert tools["shell"]["tool_results"] == 1
+    assert tools["shell"]["errors"] == 0
+    # The result of shell_2 has no matching call
+    assert tools["unknown"]["error_rate"] == 1.0
+    assert tools[None]["tool_results"] == 0
+
+    rows = store.query(["day", "status"], {"role": "user"})
+    assert {(r["day"], r["status"]): r["messages"] for r in rows} == {
+        ("2025-11-05", "none"): 2,
+        ("2025-11-05", "success"): 1,
+        ("2025-11-05", "error"): 1,
+    }
+    assert store.query(["session"], {"tool": "missing"}) == []
+    with pytest.raises(ValueError):
+        store.query(["color"])
+
+
+def test_incremental_update_and_persistence(tmp_path):
+    """Test that only changed sessions are read again and the columns survive a reload."""
+    sessions_dir = tmp_path / "sessions"
+    generate_store(str(sessions_dir), sessions=4, messages_per_session=12, agents_per_session=2)
+    reader = SessionReader(str(sessions_dir))
+    store = MessageStore(str(tmp_path / "analytics"))
+    assert store.update(reader)["read"] == 4
+    assert store.update(reader) == {"sessions": 4, "read": 0, "rows": 48}
+    expected = store.query(["session_type", "agent", "tool"])
+
+    messages_dir = next(sessions_dir.glob("session_*")) / "agents" / "agent_default" / "messages"
+    message = {"message": {"role": "user", "content": [{"text": "more"}]}, "message_id": 99}
+    (messages_dir / "message_99.json").write_text(json.dumps(message))
+    reloaded = MessageStore(str(tmp_path / "analytics"))
+    assert reloaded.query(["session_type", "agent", "tool"]) == expected
+    assert reloaded.update(reader) == {"sessions": 4, "read": 1, "rows": 49}
+
+    stats = reloaded.session_stats(["session_type"])
+    assert stats == [
+        {
+            "session_type": "AGENT",
+            "sessions": 4,
+            "mean": 12.25,
+            "p50": 12,
+            "p95": 13,
+            "p99": 13,
+            "max": 13,
+        }
+    ]
+
+
+def test_tool_latency(tmp_path):
+    """Test per-tool latency percentiles across sessions."""
+    sessions_dir = tmp_path / "sessions"
+    for n, seconds in enumerate([1, 2, 4]):
+        messages_dir = sessions_dir / f"session_s{n}" / "agents" / "agent_default" / "messages"
+        messages_dir.mkdir(parents=True)
+        (sessions_dir / f"session_s{n}" / "session.json").write_text(
+            json.dumps({"session_id": f"s{n}", "session_type": "AGENT", "updated_at": "2025-11-05"})
+        )
+        call = {"toolUse": {"toolUseId": f"c{n}", "name": "fetch", "input": {}}}
+        result = {"toolResult": {"toolUseId": f"c{n}", "status": "success", "content": []}}
+        for i, (role, content, second) in enumerate(
+            [("assistant", call, 0), ("user", result, seconds)]
+        ):
+            message = {
+                "message": {"role": role, "content": [content]},
+                "message_id": i,
+                "created_at": f"2025-11-05T10:00:0{second}+00:00",
+            }
+            (messages_dir / f"message_{i}.json").write_text(json.dumps(message))
+
+    store = MessageStore(str(tmp_path / "analytics"))
+    store.update(SessionReader(str(sessions_dir)))
+    assert store.call_rows == 3
+    (row,) = store.tool_latency(["tool"])
+    assert row["tool"] == "fetch"
+    assert (row["calls"], row["completed"], row["errors"]) == (3, 3, 0)
+    assert (row["p50_ms"], row["p95_ms"], row["max_ms"]) == (2000.0, 4000.0, 4000.0)
+    assert row["mean_ms"] == pytest.approx(2333.333)
+    assert store.tool_latency(["session"], {"status": "error"}) == []
+
+    reloaded = MessageStore(str(tmp_path / "analytics"))
+    assert reloaded.tool_latency(["session"]) == store.tool_latency(["session"])
+    with pytest.raises(ValueError):
+        store.tool_latency(["role"])
+
+
+def test_numpy_and_python_group_bys_agree(tmp_path, monkeypatch):
+    """Test that the vectorized group-by gives the same rows as the fallback."""
+    pytest.importorskip("numpy")
+    from strands_viewer import analytics
+
+    generate_store(str(tmp_path / "sessions"), sessions=5, messages_per_session=30, error_rate=0.3)
+    store = MessageStore(str(tmp_path / "analytics"))
+    store.update(SessionReader(str(tmp_path / "sessions")))
+    vectorized = store.query(["tool", "day", "status"], {"role": "user"})
+    latency = store.tool_latency(["tool", "status"])
+    monkeypatch.setattr(analytics, "_import_numpy", lambda: None)
+    assert store.query(["tool", "day", "status"], {"role": "user"}) == vectorized
+    assert store.tool_latency(["tool", "status"]) == latency
+
+
+def test_analytics_endpoint(temp_sessions_dir):
+    """Test /api/analytics at message and session level."""
+    client = TestClient(SessionViewerApp(temp_sessions_dir, warmup=False).app)
+    data = client.get("/api/analytics", params={"group_by": "tool,status"}).json()
+    assert data["success"] is True
+    assert data["messages"] == 5 and data["sessions"] == 2
+    assert {(r["tool"], r["status"]): r["messages"] for r in data["rows"]}[
+        ("shell", "success")
+    ] == 1
+    assert (Path(temp_sessions_dir) / ".strands-viewer" / "analytics" / "index.json").exists()
+
+    data = client.get("/api/analytics", params={"level": "session", "group_by": "day"}).json()
+    assert data["rows"][0]["day"] == "2025-11-05"
+    assert data["rows"][0]["max"] == 4
+
+    data = client.get("/api/analytics", params={"level": "call"}).json()
+    assert data["calls"] == 1
+    assert data["rows"][0]["tool"] == "shell" and data["rows"][0]["p99_ms"] == 1000.0
+
+    assert client.get("/api/analytics", params={"group_by": "color"}).status_code == 400
+    assert client.get("/api/analytics", params={"level": "agent"}).status_code == 400
+
+
+def test_analytics_levels_default_keys_and_filters(temp_sessions_dir):
+    """Test per-level default group-by keys and rejection of filters a level has no key for."""
+    client = TestClient(SessionViewerApp(temp_sessions_dir, warmup=False).app)
+    data = client.get("/api/analytics", params={"level": "session"}).json()
+    assert data["group_by"] == ["session_type"]
+    assert sum(r["sessions"] for r in data["rows"]) == 2
+
+    data = client.get("/api/analytics", params={"level": "session", "day": "2025-11-05"}).json()
+    assert sum(r["sessions"] for r in data["rows"]) >= 1
+    data = client.get("/api/analytics", params={"level": "session", "day": "1999-01-01"}).json()
+    assert data["rows"] == []
+
+    response = client.get("/api/analytics", params={"level": "session", "tool": "shell"})
+    assert response.status_code == 400
+    response = client.get("/api/analytics", params={"level": "call", "role": "user"})
+    assert response.status_code == 400
@@ -0,0 +1,112 @@
+"""Tests for reading sessions from archives."""
+
+import shutil
+import tarfile
+import zipfile
+
+import pytest
+
+from strands_viewer import archive as archive_module
+from strands_viewer.archive import ArchiveBackend
+from strands_viewer.multi_root import resolve_roots
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.synthetic import generate_store
+
+
+@pytest.fixture
+def sessions_dir(tmp_path):
+    """A synthetic sessions directory to archive."""
+    path = tmp_path / "sessions"
+    generate_store(str(path), sessions=3, messages_per_session=6, agents_per_session=2)
+    return path
+
+
+def _strip_paths(sessions):
+    return [{k: v for k, v in s.items() if k != "path"} for s in sessions]
+
+
+@pytest.mark.parametrize("fmt", ["zip", "tar", "gztar"])
+def test_archive_reads_like_directory(tmp_path, sessions_dir, fmt):
+    """Test that an archived store reads the same as the extracted directory."""
+    archive = shutil.make_archive(str(tmp_path / "archive" / "old"), fmt, str(sessions_dir))
+    reader = SessionReader(archive)
+    expected = SessionReader(str(sessions_dir))
+
+    assert isinstance(reader.backend, ArchiveBackend)
+    assert _strip_paths(reader.list_sessions()) == _strip_paths(expected.list_sessions())
+    session_id = expected.list_sessions()[0]["session_id"]
+    assert reader.get_session(session_id) == expected.get_session(session_id)
+    assert reader.get_fingerprint(session_id)
+    assert reader.get_session("missing") is None
+
+
+def test_stored_zip_and_top_level_directory(tmp_path, sessions_dir):
+    """Test uncompressed zip members and archives that keep the store under one directory."""
+    archive = tmp_path / "stored.zip"
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_STORED) as zf:
+        for path in sessions_dir.rglob("*.json"):
+            zf.write(path, f"sessions/{path.relative_to(sessions_dir).as_posix()}")
+
+    reader = SessionReader(str(archive))
+    expected = SessionReader(str(sessions_dir))
+    session_id = expected.list_sessions()[0]["session_id"]
+    assert reader.get_session(session_id) == expected.get_session(session_id)
+
+
+def test_index_is_persisted(tmp_path, sessions_dir, monkeypatch):
+    """Test that the member index is built once and reused until the archive changes."""
+    archive = tmp_path / "old.tar"
+    with tarfile.open(archive, "w") as tf:
+        tf.add(sessions_dir, arcname=".")
+
+    first = ArchiveBackend(str(archive))
+    assert first.index_path.exists()
+
+    def fail():
+        raise AssertionError("index rebuilt")
+
+    monkeypatch.setattr(ArchiveBackend, "_build_index", lambda self: fail())
+    second = ArchiveBackend(str(archive))
+    assert second.members == first.members
+
+    # A changed archive invalidates the index
+    with tarfile.open(archive, "a") as tf:
+        tf.add(sessions_dir / next(iter(first.list_dirs())) / "session.json", arcname="extra.json")
+    monkeypatch.undo()
+    assert "extra.json" in ArchiveBackend(str(archive)).members
+
+
+def test_tar_gz_reads_resume_from_checkpoints(tmp_path, sessions_dir, monkeypatch):
+    """Test that .tar.gz members read in any order, resuming from decompressor checkpoints."""
+    monkeypatch.setattr(archive_module, "GZIP_CHECKPOINT_SPACING", 4096)
+    monkeypatch.setattr(archive_module, "_GZIP_READ_SIZE", 512)
+    archive = shutil.make_archive(str(tmp_path / "old"), "gztar", str(sessions_dir))
+    backend = ArchiveBackend(archive)
+    names = sorted(backend.members, key=lambda name: backend.members[name][0])
+
+    expected = {}
+    with tarfile.open(archive, "r:gz") as tf:
+        for info in tf:
+            if info.isfile():
+                expected[info.name.lstrip("./")] = tf.extractfile(info).read()
+
+    for name in reversed(names):
+        assert backend.read_bytes(name) == expected[name]
+    stream = backend._open()
+    assert len(stream.checkpoints) > 2
+
+    restored = []
+    original = stream._restore
+    monkeypatch.setattr(stream, "_restore", lambda cp: restored.append(cp[0]) or original(cp))
+    assert backend.read_bytes(names[-2]) == expected[names[-2]]
+    assert backend.read_bytes(names[1]) == expected[names[1]]
+    assert restored[0] > 0
+
+
+def test_archives_as_roots(tmp_path, sessions_dir):
+    """Test that globs of archives mount each archive as a namespaced root."""
+    for name in ("2024", "2025"):
+        shutil.make_archive(str(tmp_path / "archive" / name), "zip", str(sessions_dir))
+
+    roots = resolve_roots([f"{tmp_path}/archive/*.zip"])
+    assert list(roots) == ["2024", "2025"]
@@ -0,0 +1,163 @@
+"""Tests for offline batch analysis and the analysis store."""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from strands_viewer.analysis_store import AnalysisStore
+from strands_viewer.batch import run_batch_analysis
+from strands_viewer.limits import TokenBucket
+from strands_viewer.server import SessionViewerApp
+from strands_viewer.session_reader import SessionReader
+
+
+class FakeAnalyzer:
+    """Analyzer stand-in that counts calls."""
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def summarize_session(self, session):
+        self.calls.append(("summarize", session["session_id"]))
+        if session["session_id"] == self.fail_on:
+            raise RuntimeError("model unavailable")
+        return f"Summary of {session['session_id']}"
+
+    def analyze_errors(self, session):
+        self.calls.append(("errors", session["session_id"]))
+        return None
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create an empty analysis store."""
+    return AnalysisStore(str(tmp_path / "analyses"))
+
+
+def test_store_roundtrip_and_fingerprint(store):
+    """Test that stored analyses are only returned for a matching fingerprint."""
+    store.put("s1", "summarize", "fp1", "hello", model="test")
+
+    assert store.get("s1", "summarize", "fp1")["analysis"] == "hello"
+    assert store.get("s1", "summarize") is not None
+    assert store.get("s1", "summarize", "fp2") is None
+    assert store.get("s1", "errors", "fp1") is None
+    assert [r["analysis_type"] for r in store.list_analyses("s1", "fp1")] == ["summarize"]
+
+    with pytest.raises(ValueError):
+        store.put("../escape", "summarize", "fp1", "nope")
+
+
+def test_fingerprint_changes_when_session_changes(temp_sessions_dir):
+    """Test that appending a message changes the session fingerprint."""
+    reader = SessionReader(temp_sessions_dir)
+    before = reader.get_fingerprint("test_2")
+    assert before == reader.get_fingerprint("test_2")
+
+    messages_dir = Path(temp_sessions_dir) / "session_test_2" / "agents" / "agent_default"
+    with open(messages_dir / "messages" / "message_2.json", "w") as f:
+        json.dump({"message": {"role": "assistant", "content": []}, "message_id": 2}, f)
+
+    assert reader.get_fingerprint("test_2") != before
+    assert reader.get_fingerprint("nonexistent") is None
+
+
+def test_batch_analysis_skips_current_results(temp_sessions_dir, store):
+    """Test that a second run does nothing while sessions are unchanged."""
+    reader = SessionReader(temp_sessions_dir)
+    analyzer = FakeAnalyzer()
+
+    report = run_batch_analysis(
+        reader, analyzer, store, min_idle_seconds=0, progress=lambda m: None
+    )
+    assert report.analyzed == 4
+    assert report.failed == 0
+    assert store.get("test_1", "errors")["analysis"] == "No errors found in this session."
+
+    analyzer.calls = []
+    report = run_batch_analysis(
+        reader, analyzer, store, min_idle_seconds=0, progress=lambda m: None
+    )
+    assert analyzer.calls == []
+    assert report.skipped_cached == 4
+
+    report = run_batch_analysis(
+        reader,
+        analyzer,
+        store,
+        ["summarize"],
+        min_idle_seconds=0,
+        force=True,
+        progress=lambda m: None,
+    )
+    assert report.analyzed == 2
+
+
+def test_batch_analysis_skips_active_sessions_and_records_failures(temp_sessions_dir, store):
+    """Test recently updated sessions are skipped and failures are reported."""
+    reader = SessionReader(temp_sessions_dir)
+
+    report = run_batch_analysis(
+        reader, FakeAnalyzer(), store, min_idle_seconds=10**12, progress=lambda m: None
+    )
+    assert report.analyzed == 0
+    assert report.skipped_active == 4
+
+    report = run_batch_analysis(
+        reader,
+        FakeAnalyzer(fail_on="test_1"),
+        store,
+        ["summarize"],
+        min_idle_seconds=0,
+        progress=lambda m: None,
+    )
+    assert report.analyzed == 1
+    assert report.failed == 1
+    assert report.errors[0]["session_id"] == "test_1"
+
+
+def test_server_serves_precomputed_analysis(temp_sessions_dir, store):
+    """Test /analyze returns a stored analysis without a model."""
+    reader = SessionReader(temp_sessions_dir)
+    store.put("test_1", "summarize", reader.get_fingerprint("test_1"), "Precomputed summary")
+
+    app = SessionViewerApp(temp_sessions_dir, analysis_dir=str(store.store_dir))
+    client = TestClient(app.app)
+
+    response = client.post("/api/sessions/test_1/analyze", json={"analysis_type": "summarize"})
+    assert response.status_code == 200
+    assert response.json()["analysis"] == "Precomputed summary"
+    assert response.json()["cached"] is True
+
+    response = client.get("/api/sessions/test_1/analyses")
+    assert [a["analysis_type"] for a in response.json()["analyses"]] == ["summarize"]
+
+    response = client.post("/api/sessions/test_1/analyze", json={"analysis_type": "bogus"})
+    assert response.status_code == 400
+
+
+def test_token_bucket():
+    """Test token bucket burst and refill behavior."""
+    bucket = TokenBucket(rate_per_minute=600, burst=2)
+
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert 0 < bucket.time_until_available() <= 0.1
+
+    start = time.monotonic()
+    assert bucket.acquire(timeout=1)
+    assert time.monotonic() - start < 0.5
+    assert not bucket.acquire(timeout=0)
+
+    bucket = TokenBucket(rate_per_minute=1, burst=1)
+    with bucket.admit():
+        pass
+    assert not bucket.try_acquire()
+
+    with pytest.raises(ValueError):
+        TokenBucket(0)
@@ -0,0 +1,94 @@
+"""Tests for token estimation and message chunking."""
+
+import pytest
+
+from strands_viewer.chunking import (
+    chunk_messages,
+    estimate_message_tokens,
+    estimate_tokens,
+    group_by_budget,
+    render_message,
+)
+
+
+def make_message(role, text):
+    """Create a minimal message wrapper."""
+    return {"message": {"role": role, "content": [{"text": text}]}}
+
+
+def test_estimate_tokens():
+    """Test the character-based token estimate."""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+    assert estimate_tokens("x" * 400) == 100
+
+
+def test_render_message_includes_tools():
+    """Test that tool calls and results are rendered."""
+    msg = {
+        "message": {
+            "role": "assistant",
+            "content": [
+                {"toolUse": {"toolUseId": "t1", "name": "shell", "input": {"command": "ls"}}},
+                {
+                    "toolResult": {
+                        "toolUseId": "t1",
+                        "status": "error",
+                        "content": [{"text": "boom"}],
+                    }
+                },
+            ],
+        }
+    }
+    text = render_message(msg, 3)
+
+    assert text.startswith("Message #3 (ASSISTANT):")
+    assert "[Tool Call: shell id=t1]" in text
+    assert '"command": "ls"' in text
+    assert "[Tool Result: error id=t1]" in text
+    assert "boom" in text
+
+
+def test_estimate_message_tokens_grows_with_content():
+    """Test that larger messages are estimated as more expensive."""
+    small = estimate_message_tokens(make_message("user", "hi"))
+    large = estimate_message_tokens(make_message("user", "hi " * 1000))
+    assert large > small > 0
+
+
+def test_chunk_messages_respects_budget():
+    """Test that every chunk fits the budget and messages stay in order."""
+    messages = [make_message("user", f"message {i} " + "x" * 200) for i in range(50)]
+    chunks = chunk_messages(messages, max_tokens=300)
+
+    assert len(chunks) > 1
+    assert all(chunk.tokens <= 300 for chunk in chunks)
+    assert chunks[0].first_message == 1
+    assert chunks[-1].last_message == 50
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.first_message == previous.last_message + 1
+
+
+def test_chunk_messages_truncates_oversized_message():
+    """Test that a single message larger than the budget is truncated."""
+    chunks = chunk_messages([make_message("user", "y" * 10000)], max_tokens=100)
+
+    assert len(chunks) == 1
+    assert chunks[0].tokens <= 100
+    assert chunks[0].text.endswith("... (truncated)")
+
+
+def test_chunk_messages_empty_and_invalid_budget():
+    """Test chunking edge cases."""
+    assert chunk_messages([], max_tokens=100) == []
+    with pytest.raises(ValueError):
+        chunk_messages([make_message("user", "hi")], max_tokens=1)
+
+
+def test_group_by_budget():
+    """Test grouping texts into budgeted batches."""
+    texts = ["a" * 40, "b" * 40, "c" * 40, "d" * 400]
+    batches = group_by_budget(texts, max_tokens=25)
+
+    assert batches == [["a" * 40, "b" * 40], ["c" * 40], ["d" * 400]]
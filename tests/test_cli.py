@@ -49,12 +49,13 @@ def test_cli_valid_directory_mock(temp_sessions_dir, monkeypatch):
     server_started = False
 
     class MockViewerApp:
-        def __init__(self, storage_dir, port, model=None):
+        def __init__(self, storage_dir, port, model=None, **kwargs):
             self.storage_dir = storage_dir
             self.port = port
             self.model = model
+            self.options = kwargs
 
-        def run(self, open_browser=False):
+        def run(self, open_browser=False, host="0.0.0.0"):
             nonlocal server_started
             server_started = True
 
@@ -72,6 +73,32 @@ def test_cli_valid_directory_mock(temp_sessions_dir, monkeypatch):
     assert server_started
 
 
+def test_cli_host_and_workers(temp_sessions_dir):
+    """Test that --host reaches the server and --workers switches to multi-worker mode."""
+    calls = {}
+
+    class MockViewerApp:
+        def __init__(self, storage_dir, port, model=None, **kwargs):
+            pass
+
+        def run(self, open_browser=False, host="0.0.0.0"):
+            calls["host"] = host
+
+    argv = ["strands-viewer", temp_sessions_dir, "--no-open", "--host", "127.0.0.1"]
+    with patch("strands_viewer.server.SessionViewerApp", MockViewerApp):
+        with patch.object(sys, "argv", argv):
+            main()
+    assert calls["host"] == "127.0.0.1"
+
+    def mock_run_workers(config, host, port, workers, open_browser):
+        calls["workers"] = (config["storage_dir"], host, port, workers)
+
+    with patch("strands_viewer.server.run_workers", mock_run_workers):
+        with patch.object(sys, "argv", argv + ["--workers", "3", "--port", "9001"]):
+            main()
+    assert calls["workers"][1:] == ("127.0.0.1", 9001, 3)
+
+
 def test_cli_custom_port(temp_sessions_dir):
     """Test CLI with custom port."""
     from argparse import ArgumentParser
@@ -85,3 +112,50 @@ def test_cli_custom_port(temp_sessions_dir):
     args = parser.parse_args([temp_sessions_dir, "--port", "9000", "--no-open"])
     assert args.port == 9000
     assert args.no_open is True
+
+
+def test_cli_analyze_unknown_type(temp_sessions_dir, capsys):
+    """Test the analyze subcommand rejects unknown analysis types."""
+    with patch.object(
+        sys, "argv", ["strands-viewer", "analyze", temp_sessions_dir, "--types", "bogus"]
+    ):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 1
+
+    captured = capsys.readouterr()
+    assert "Unknown analysis type" in captured.out
+
+
+def test_cli_analyze_help(capsys):
+    """Test the analyze subcommand help."""
+    with patch.object(sys, "argv", ["strands-viewer", "analyze", "--help"]):
+        with pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 0
+
+    captured = capsys.readouterr()
+    assert "--concurrency" in captured.out
+    assert "--rate-limit" in captured.out
+
+
+def test_cli_existing_path_named_like_subcommand(tmp_path, monkeypatch):
+    """Test a sessions directory named like a subcommand is served, not dispatched."""
+    (tmp_path / "export").mkdir()
+    monkeypatch.chdir(tmp_path)
+    served = []
+
+    class MockViewerApp:
+        def __init__(self, storage_dir, port, model=None, **kwargs):
+            served.append(storage_dir)
+
+        def run(self, open_browser=False, host="0.0.0.0"):
+            pass
+
+    with patch("strands_viewer.server.SessionViewerApp", MockViewerApp):
+        with patch.object(sys, "argv", ["strands-viewer", "export", "--no-open"]):
+            main()
+        with patch.object(sys, "argv", ["strands-viewer", "--no-open", "--", "export"]):
+            main()
+
+    assert len(served) == 2
@@ -0,0 +1,89 @@
+"""Tests for compressed session files."""
+
+import gzip
+
+import pytest
+from fastapi.testclient import TestClient
+
+from strands_viewer.compression import decompress, split_compression
+from strands_viewer.pack import pack_store
+from strands_viewer.server import SessionViewerApp
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.synthetic import generate_store
+
+
+def _compress_in_place(root, suffix, compress):
+    for path in list(root.rglob("*.json")):
+        path.with_name(path.name + suffix).write_bytes(compress(path.read_bytes()))
+        path.unlink()
+
+
+def _strip_paths(sessions):
+    return [{k: v for k, v in s.items() if k != "path"} for s in sessions]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """A synthetic store and its sessions as read before compression."""
+    generate_store(str(tmp_path), sessions=2, messages_per_session=12, agents_per_session=2)
+    reader = SessionReader(str(tmp_path))
+    listing = reader.list_sessions()
+    sessions = {s["session_id"]: reader.get_session(s["session_id"]) for s in listing}
+    return tmp_path, listing, sessions
+
+
+def _assert_reads_like(root, listing, sessions):
+    reader = SessionReader(str(root))
+    assert _strip_paths(reader.list_sessions()) == _strip_paths(listing)
+    client = TestClient(SessionViewerApp(str(root), warmup=False).app)
+    for session_id, session in sessions.items():
+        assert reader.get_session(session_id) == session
+        assert reader.get_fingerprint(session_id)
+        assert client.get(f"/api/sessions/{session_id}").json()["session"] == session
+        page = client.get(f"/api/sessions/{session_id}/messages?offset=1&limit=4").json()
+        assert page["messages"] == session["messages"][1:5]
+
+
+def test_gzip_files_read_like_plain(store):
+    """Test that gzipped session, agent and message files read the same as plain ones."""
+    root, listing, sessions = store
+    _compress_in_place(root, ".gz", gzip.compress)
+    assert not list(root.rglob("*.json"))
+    _assert_reads_like(root, listing, sessions)
+
+    # Packing reads compressed directories too
+    report = pack_store(str(root), min_idle_seconds=0, delete=True, progress=lambda message: None)
+    assert report["packed"] == len(sessions)
+    _assert_reads_like(root, listing, sessions)
+
+
+def test_zstd_files_read_like_plain(store):
+    """Test that zstd-compressed files read the same as plain ones."""
+    zstandard = pytest.importorskip("zstandard")
+    root, listing, sessions = store
+    _compress_in_place(root, ".zst", zstandard.ZstdCompressor().compress)
+    _assert_reads_like(root, listing, sessions)
+
+
+def test_corrupt_compressed_message_is_skipped(store, capsys):
+    """Test that a corrupt compressed message is reported and left out."""
+    root, _, sessions = store
+    message_file = next(root.rglob("message_*.json"))
+    message_file.with_name(message_file.name + ".gz").write_bytes(b"not gzip")
+    message_file.unlink()
+
+    session_id = message_file.relative_to(root).parts[0][len("session_") :]
+    session = SessionReader(str(root)).get_session(session_id)
+    assert len(session["messages"]) == len(sessions[session_id]["messages"]) - 1
+    assert "Error reading" in capsys.readouterr().out
+
+
+def test_split_compression():
+    """Test compression suffix detection and decoding."""
+    assert split_compression("message_3.json.gz") == ("message_3.json", "gzip")
+    assert split_compression("message_3.json.zst") == ("message_3.json", "zstd")
+    assert split_compression("message_3.json") == ("message_3.json", None)
+    data = b'{"a": 1}'
+    assert decompress(gzip.compress(data) + gzip.compress(data), "gzip") == data + data
+    with pytest.raises(ValueError):
+        decompress(b"x", "brotli")
@@ -0,0 +1,113 @@
+"""Tests for the partitioned table dump."""
+
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from strands_viewer.dump import MANIFEST_FILE, TABLES, dump_store
+from strands_viewer.server import SessionViewerApp
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.synthetic import generate_store
+
+
+def read_table(output, table):
+    """Read all JSON lines rows of a table."""
+    rows = []
+    for path in sorted((output / table).glob("session=*/part-0.jsonl")):
+        rows.extend(json.loads(line) for line in path.read_text().splitlines())
+    return rows
+
+
+def test_dump_tables(temp_sessions_dir, tmp_path):
+    """Test the rows of each table for the sample sessions."""
+    output = tmp_path / "dump"
+    report = dump_store(SessionReader(temp_sessions_dir), str(output), "jsonl", batch_rows=2)
+    assert report == {
+        "format": "jsonl",
+        "sessions": 2,
+        "written": 2,
+        "unchanged": 0,
+        "removed": 0,
+        "failed": 0,
+        "rows": 2 + 5 + 5 + 1 + 2,
+    }
+
+    for table, columns in TABLES.items():
+        for row in read_table(output, table):
+            assert list(row) == [name for name, _ in columns]
+
+    messages = [row for row in read_table(output, "messages") if row["session_id"] == "test_1"]
+    assert [(row["position"], row["role"]) for row in messages] == [
+        (0, "user"),
+        (1, "assistant"),
+        (2, "user"),
+        (3, "user"),
+    ]
+    assert messages[0]["text_chars"] == len("Hello, agent!")
+
+    (call,) = read_table(output, "tool_calls")
+    assert (call["name"], call["input"]) == ("shell", '{"command": "ls -la"}')
+    assert (call["result_message_id"], call["status"], call["latency_ms"]) == (3, "success", 1000.0)
+    results = read_table(output, "tool_results")
+    assert {(row["tool_use_id"], row["status"]) for row in results} == {
+        ("shell_1", "success"),
+        ("shell_2", "error"),
+    }
+    blocks = read_table(output, "content_blocks")
+    assert {row["type"] for row in blocks} == {"text", "toolUse", "toolResult"}
+
+
+def test_dump_is_incremental(tmp_path):
+    """Test that only changed sessions are written again and deleted ones are removed."""
+    sessions_dir = tmp_path / "sessions"
+    output = tmp_path / "dump"
+    generate_store(str(sessions_dir), sessions=3, messages_per_session=10)
+    reader = SessionReader(str(sessions_dir))
+    assert dump_store(reader, str(output), "jsonl")["written"] == 3
+    report = dump_store(reader, str(output), "jsonl")
+    assert (report["written"], report["unchanged"]) == (0, 3)
+
+    first, second = sorted(sessions_dir.glob("session_*"))[:2]
+    messages_dir = first / "agents" / "agent_default" / "messages"
+    message = {"message": {"role": "user", "content": [{"text": "again"}]}, "message_id": 99}
+    (messages_dir / "message_99.json").write_text(json.dumps(message))
+    shutil.rmtree(second)
+
+    report = dump_store(reader, str(output), "jsonl")
+    assert (report["written"], report["unchanged"], report["removed"]) == (1, 1, 1)
+    assert len(read_table(output, "sessions")) == 2
+    assert len(read_table(output, "messages")) == 21
+    manifest = json.loads((output / MANIFEST_FILE).read_text())
+    assert len(manifest["sessions"]) == 2
+
+
+def test_dump_parquet(tmp_path):
+    """Test that Parquet partitions hold the same rows as JSON lines."""
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    generate_store(str(tmp_path / "sessions"), sessions=2, messages_per_session=12)
+    reader = SessionReader(str(tmp_path / "sessions"))
+    dump_store(reader, str(tmp_path / "parquet"), "parquet", batch_rows=5)
+    dump_store(reader, str(tmp_path / "jsonl"), "jsonl")
+
+    for table in TABLES:
+        paths = sorted((tmp_path / "parquet" / table).glob("session=*/part-0.parquet"))
+        rows = pa.concat_tables([pq.read_table(path) for path in paths]).to_pylist()
+        assert rows == read_table(tmp_path / "jsonl", table)
+
+
+def test_dump_endpoint(temp_sessions_dir):
+    """Test POST /api/dump."""
+    client = TestClient(SessionViewerApp(temp_sessions_dir, warmup=False).app)
+    data = client.post("/api/dump", json={"format": "jsonl"}).json()
+    assert data["success"] is True
+    assert data["written"] == 2
+    output = Path(temp_sessions_dir) / ".strands-viewer" / "dump"
+    assert data["output"] == str(output)
+    assert len(read_table(output, "sessions")) == 2
+    assert client.post("/api/dump", json={"format": "jsonl"}).json()["unchanged"] == 2
+    assert client.post("/api/dump", json={"format": "csv"}).status_code == 400
@@ -6,6 +6,7 @@ import pytest
 from fastapi.testclient import TestClient
 
 from strands_viewer.export_formatter import (
+    export_store,
     format_markdown,
     format_json,
     format_text,
@@ -13,6 +14,7 @@ from strands_viewer.export_formatter import (
     get_filename,
 )
 from strands_viewer.server import SessionViewerApp
+from strands_viewer.session_reader import SessionReader
 
 
 @pytest.fixture
@@ -112,6 +114,7 @@ def test_get_filename():
     assert get_filename("test_123", "markdown") == "session_test_123.md"
     assert get_filename("test_123", "json") == "session_test_123.json"
     assert get_filename("test_123", "text") == "session_test_123.txt"
+    assert get_filename("test_123", "otlp") == "session_test_123.otlp.json"
 
 
 def test_export_endpoint_markdown(temp_sessions_dir):
@@ -143,6 +146,37 @@ def test_export_endpoint_json(temp_sessions_dir):
     assert parsed["session_id"] == "test_1"
 
 
+def test_export_endpoint_otlp(temp_sessions_dir):
+    """Test the export endpoint with OTLP trace format."""
+    client = TestClient(SessionViewerApp(temp_sessions_dir, port=8000).app)
+
+    response = client.get("/api/sessions/test_1/export?format=otlp")
+
+    assert response.status_code == 200
+    assert "application/json" in response.headers["content-type"]
+    spans = response.json()["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [span["name"] for span in spans] == ["session test_1", "turn 1", "execute_tool shell"]
+
+
+def test_export_store(temp_sessions_dir, tmp_path):
+    """Test bulk export to a directory and to a combined OTLP lines file."""
+    reader = SessionReader(temp_sessions_dir)
+    report = export_store(reader, str(tmp_path / "out"), "markdown", progress=lambda _: None)
+    assert report == {"exported": 2, "failed": 0}
+    assert sorted(p.name for p in (tmp_path / "out").iterdir()) == [
+        "session_test_1.md",
+        "session_test_2.md",
+    ]
+
+    export_store(reader, str(tmp_path / "traces.jsonl"), "otlp")
+    lines = (tmp_path / "traces.jsonl").read_text().splitlines()
+    assert len(lines) == 2
+    assert all("resourceSpans" in json.loads(line) for line in lines)
+
+    with pytest.raises(ValueError):
+        export_store(reader, str(tmp_path / "all.jsonl"), "markdown")
+
+
 def test_export_endpoint_text(temp_sessions_dir):
     """Test the export endpoint with text format."""
     app = SessionViewerApp(temp_sessions_dir, port=8000)
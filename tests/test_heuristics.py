@@ -0,0 +1,182 @@
+"""Tests for rule-based session analysis."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from strands_viewer.heuristics import (
+    analyze_session_heuristics,
+    cluster_errors,
+    collect_tool_errors,
+    detect_retry_loops,
+    find_long_gaps,
+    format_heuristic_report,
+    normalize_error_text,
+    summarize_tool_latency,
+)
+from strands_viewer.server import SessionViewerApp
+from strands_viewer.timeline import pair_tool_calls
+
+
+def tool_call(tool_use_id, name, command, created_at):
+    """Create an assistant message with one tool call."""
+    return {
+        "message": {
+            "role": "assistant",
+            "content": [
+                {"toolUse": {"toolUseId": tool_use_id, "name": name, "input": {"cmd": command}}}
+            ],
+        },
+        "created_at": created_at,
+    }
+
+
+def tool_result(tool_use_id, status, text, created_at):
+    """Create a user message with one tool result."""
+    return {
+        "message": {
+            "role": "user",
+            "content": [
+                {
+                    "toolResult": {
+                        "toolUseId": tool_use_id,
+                        "status": status,
+                        "content": [{"text": text}],
+                    }
+                }
+            ],
+        },
+        "created_at": created_at,
+    }
+
+
+@pytest.fixture
+def retry_session():
+    """Session where the agent retries a failing shell command."""
+    messages = [
+        {
+            "message": {"role": "user", "content": [{"text": "Deploy it"}]},
+            "created_at": "2025-11-05T10:00:00+00:00",
+        }
+    ]
+    for i in range(3):
+        messages.append(tool_call(f"t{i}", "shell", "deploy", f"2025-11-05T10:0{i}:01+00:00"))
+        messages.append(
+            tool_result(
+                f"t{i}",
+                "error",
+                f"Connection refused on port {8000 + i} after {i + 1}.5s",
+                f"2025-11-05T10:0{i}:02+00:00",
+            )
+        )
+    messages.append(tool_call("t9", "http_request", "GET /", "2025-11-05T10:30:00+00:00"))
+    messages.append(tool_result("t9", "success", "ok", "2025-11-05T10:30:01+00:00"))
+    return {"session_id": "retry", "messages": messages}
+
+
+def test_normalize_error_text():
+    """Test that variable parts of error messages are normalized away."""
+    a = normalize_error_text("File '/tmp/a/b.txt' not found (errno 2)")
+    b = normalize_error_text("File '/var/x/y.txt' not found (errno 17)")
+    assert a == b
+    assert normalize_error_text("id 123e4567-e89b-12d3-a456-426614174000") == "id <uuid>"
+
+
+def test_error_clusters_and_failing_tools(retry_session):
+    """Test that similar errors cluster together and are attributed to tools."""
+    errors = collect_tool_errors(retry_session["messages"])
+    assert [e["tool_name"] for e in errors] == ["shell", "shell", "shell"]
+
+    clusters = cluster_errors(errors)
+    assert len(clusters) == 1
+    assert clusters[0]["count"] == 3
+    assert clusters[0]["tools"] == ["shell"]
+    assert clusters[0]["message_numbers"] == [3, 5, 7]
+
+
+def test_detect_retry_loops(retry_session):
+    """Test that repeated calls of the same tool are reported as a retry loop."""
+    loops = detect_retry_loops(retry_session["messages"])
+    assert loops == [
+        {
+            "tool": "shell",
+            "count": 3,
+            "errors": 3,
+            "identical_input": True,
+            "first_message": 2,
+            "last_message": 6,
+        }
+    ]
+    assert detect_retry_loops(retry_session["messages"], min_repeats=4) == []
+
+
+def test_find_long_gaps(retry_session):
+    """Test that gaps above the threshold are found, longest first."""
+    gaps = find_long_gaps(retry_session["messages"], threshold_seconds=300)
+    assert len(gaps) == 1
+    assert gaps[0]["after_message"] == 7
+    assert gaps[0]["seconds"] == pytest.approx(1678)
+
+
+def test_pair_tool_calls(retry_session):
+    """Test that calls are indexed by toolUseId and paired with their results."""
+    messages = retry_session["messages"] + [tool_call("t10", "shell", "ls", "bad timestamp")]
+    calls = pair_tool_calls(messages)
+    assert list(calls) == ["t0", "t1", "t2", "t9", "t10"]
+    assert calls["t1"]["call_message"] == 4
+    assert calls["t1"]["result_message"] == 5
+    assert calls["t1"]["latency_ms"] == 1000.0
+    assert calls["t1"]["status"] == "error"
+    assert calls["t10"]["result_message"] is None
+    assert calls["t10"]["latency_ms"] is None
+
+    summary = summarize_tool_latency(calls.values())
+    assert [entry["tool"] for entry in summary] == ["shell", "http_request"]
+    assert summary[0]["calls"] == 4
+    assert summary[0]["completed"] == 3
+    assert summary[0]["errors"] == 3
+    assert summary[0]["p95_ms"] == 1000.0
+
+
+def test_analyze_session_heuristics(retry_session):
+    """Test the full heuristic report and its Markdown rendering."""
+    report = analyze_session_heuristics(retry_session)
+
+    assert report["message_count"] == 9
+    assert report["tool_usage"] == {"shell": 3, "http_request": 1}
+    assert report["error_count"] == 3
+    assert report["failing_tools"] == [
+        {"tool": "shell", "calls": 3, "errors": 3, "error_rate": 1.0}
+    ]
+    assert report["duration_seconds"] == pytest.approx(1801)
+
+    markdown = format_heuristic_report(report)
+    assert "### Error Clusters" in markdown
+    assert "### Retry Loops" in markdown
+    assert "`shell` called 3× in a row" in markdown
+
+
+def test_heuristic_analysis_endpoint(temp_sessions_dir):
+    """Test /analyze returns the heuristic report without the AI extra."""
+    client = TestClient(SessionViewerApp(temp_sessions_dir).app)
+
+    response = client.post("/api/sessions/test_1/analyze", json={"analysis_type": "heuristic"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["success"] is True
+    assert data["heuristics"]["error_count"] == 1
+    assert data["heuristics"]["tool_usage"] == {"shell": 1}
+    assert "## Quick Analysis" in data["analysis"]
+
+    response = client.post("/api/sessions/nonexistent/analyze", json={"analysis_type": "heuristic"})
+    assert response.status_code == 404
+
+
+def test_tool_calls_endpoint(temp_sessions_dir):
+    """Test the per-session tool call latency timeline."""
+    client = TestClient(SessionViewerApp(temp_sessions_dir, warmup=False).app)
+    data = client.get("/api/sessions/test_1/tool-calls").json()
+    assert [call["tool_use_id"] for call in data["calls"]] == ["shell_1"]
+    assert data["calls"][0]["latency_ms"] == 1000.0
+    assert data["tools"][0]["p50_ms"] == 1000.0
+    assert client.get("/api/sessions/test_1/tool-calls", params={"tool": "x"}).json()["calls"] == []
+    assert client.get("/api/sessions/missing/tool-calls").status_code == 404
@@ -0,0 +1,100 @@
+"""Tests for the HTTP load-testing harness."""
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from strands_viewer.loadtest import (
+    LoadTestResult,
+    classify_path,
+    load_request_log,
+    parse_mix,
+    percentile,
+    run_load_test,
+)
+from strands_viewer.server import SessionViewerApp
+from strands_viewer.synthetic import generate_store
+
+
+def test_parse_mix():
+    """Test parsing route weights and rejecting bad ones."""
+    assert parse_mix("list=1,open=3") == {"list": 1.0, "open": 3.0}
+    assert parse_mix("search") == {"search": 1.0}
+
+    with pytest.raises(ValueError):
+        parse_mix("delete=1")
+    with pytest.raises(ValueError):
+        parse_mix("list=abc")
+    with pytest.raises(ValueError):
+        parse_mix("list=0")
+
+
+def test_percentile_and_summary():
+    """Test nearest-rank percentiles and the per-route summary."""
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == 0.05
+    assert percentile(values, 99) == 0.099
+    assert percentile([], 50) is None
+
+    result = LoadTestResult()
+    for value in values:
+        result.record("open", value, ok=value < 0.1)
+    result.elapsed = 2.0
+
+    summary = result.summary()
+    assert summary["open"]["requests"] == 100
+    assert summary["open"]["errors"] == 1
+    assert summary["open"]["throughput_rps"] == 50.0
+    assert summary["open"]["p95_ms"] == 95.0
+    assert summary["all"]["requests"] == 100
+    assert "open" in result.format_table()
+
+
+def test_classify_path():
+    """Test labelling recorded paths with route names."""
+    assert classify_path("/api/sessions") == "list"
+    assert classify_path("/api/sessions/abc") == "open"
+    assert classify_path("/api/sessions/abc/messages") == "paginate"
+    assert classify_path("/api/sessions/abc/export") == "export"
+    assert classify_path("/api/search") == "search"
+    assert classify_path("/") == "other"
+
+
+def test_run_load_test_in_process(tmp_path):
+    """Test a short in-process run covering every route of the mix."""
+    generate_store(str(tmp_path), sessions=3, messages_per_session=20)
+
+    result = run_load_test(storage_dir=str(tmp_path), clients=3, total_requests=60, duration=None)
+
+    summary = result.summary()
+    assert summary["all"]["requests"] == 60
+    assert summary["all"]["errors"] == 0
+    assert set(summary) - {"all"} <= {"list", "open", "paginate", "export", "search"}
+
+
+def test_record_and_replay(tmp_path):
+    """Test recording requests with the middleware and replaying the log."""
+    sessions_dir = tmp_path / "sessions"
+    log_path = tmp_path / "requests.jsonl"
+    generate_store(str(sessions_dir), sessions=2, messages_per_session=8)
+
+    client = TestClient(SessionViewerApp(str(sessions_dir), request_log=str(log_path)).app)
+    client.get("/api/sessions")
+    client.get("/api/sessions/synthetic-0-000001/messages", params={"limit": 5})
+    client.get("/api/search", params={"q": "error"})
+
+    entries = load_request_log(str(log_path))
+    assert [e["path"] for e in entries] == [
+        "/api/sessions",
+        "/api/sessions/synthetic-0-000001/messages",
+        "/api/search",
+    ]
+    assert entries[1]["query"] == "limit=5"
+    assert json.loads(log_path.read_text().splitlines()[0])["method"] == "GET"
+
+    result = run_load_test(storage_dir=str(sessions_dir), clients=2, replay_log=str(log_path))
+    summary = result.summary()
+    assert summary["all"]["requests"] == 3
+    assert summary["all"]["errors"] == 0
+    assert summary["paginate"]["requests"] == 1
@@ -0,0 +1,128 @@
+"""Tests for Prometheus metrics and Server-Timing instrumentation."""
+
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from strands_viewer.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    MetricsRegistry,
+    READER_FILES_READ,
+    WorkerMetrics,
+    format_server_timing,
+)
+from strands_viewer.server import SessionViewerApp
+
+
+def test_counter_and_histogram_render():
+    """Test the Prometheus text rendering of counters and histograms."""
+    counter = Counter("test_requests_total", "Requests.", ["route"])
+    counter.inc(route="/a")
+    counter.inc(2, route="/a")
+    assert 'test_requests_total{route="/a"} 3' in counter.render()
+    with pytest.raises(ValueError):
+        counter.inc(-1, route="/a")
+    with pytest.raises(ValueError):
+        counter.inc(other="x")
+
+    histogram = Histogram("test_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+    text = histogram.render()
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "test_latency_seconds_count 3" in text
+
+
+def test_format_server_timing():
+    """Test the Server-Timing header value in phase order."""
+    header = format_server_timing({"parse": 0.002, "disk": 0.0015}, total=0.01)
+    assert header == "disk;dur=1.50, parse;dur=2.00, total;dur=10.00"
+
+
+def test_server_timing_header(temp_sessions_dir):
+    """Test that responses carry disk, parse and serialize timings."""
+    client = TestClient(SessionViewerApp(temp_sessions_dir).app)
+
+    response = client.get("/api/sessions/test_1")
+    timing = response.headers["server-timing"]
+    for phase in ("disk", "parse", "serialize", "total"):
+        assert f"{phase};dur=" in timing
+
+    response = client.get("/api/sessions/test_1/export", params={"format": "markdown"})
+    assert "format;dur=" in response.headers["server-timing"]
+
+
+def test_metrics_endpoint(temp_sessions_dir):
+    """Test that /metrics reports route latency, bytes served and reader counters."""
+    client = TestClient(SessionViewerApp(temp_sessions_dir).app)
+    files_before = READER_FILES_READ.value()
+
+    client.get("/api/sessions")
+    client.get("/api/sessions/test_1")
+    assert READER_FILES_READ.value() > files_before
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    text = response.text
+    assert (
+        'strands_viewer_http_request_duration_seconds_count{method="GET",'
+        'route="/api/sessions/{session_id}"}' in text
+    )
+    assert (
+        'strands_viewer_http_requests_total{method="GET",route="/api/sessions",status="200"}'
+        in text
+    )
+    assert 'strands_viewer_http_response_bytes_total{route="/api/sessions"}' in text
+    assert "strands_viewer_http_requests_in_flight" in text
+    assert "strands_viewer_reader_json_bytes_total" in text
+
+
+def _worker_registry():
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("test_requests_total", "Requests.", ["route"]))
+    latency = registry.register(Histogram("test_latency_seconds", "Latency.", buckets=(1.0,)))
+    in_flight = registry.register(Gauge("test_in_flight", "In flight."))
+    return registry, requests, latency, in_flight
+
+
+def test_worker_metrics_sum_across_workers(tmp_path):
+    """Test that /metrics totals include other workers' snapshots, without stale gauges."""
+    other, requests, latency, in_flight = _worker_registry()
+    requests.inc(2, route="/a")
+    latency.observe(0.5)
+    in_flight.inc()
+    (tmp_path / "1.json").write_text(json.dumps(other.export()))
+
+    registry, requests, latency, in_flight = _worker_registry()
+    requests.inc(route="/a")
+    requests.inc(route="/b")
+    latency.observe(2.0)
+    in_flight.inc()
+    metrics = WorkerMetrics(str(tmp_path), registry)
+    metrics.start()
+    try:
+        text = metrics.render()
+    finally:
+        metrics.stop()
+    assert 'test_requests_total{route="/a"} 3' in text
+    assert 'test_requests_total{route="/b"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1"} 1' in text
+    assert "test_latency_seconds_count 2" in text
+    assert "test_in_flight 2" in text
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+
+    # A worker that stopped writing keeps its counts but not its gauges
+    os.utime(tmp_path / "1.json", (0, 0))
+    text = metrics.render()
+    assert 'test_requests_total{route="/a"} 3' in text
+    assert "test_in_flight 1" in text
@@ -0,0 +1,81 @@
+"""Tests for serving several storage roots from one viewer."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from strands_viewer.multi_root import MultiRootReader, resolve_roots
+from strands_viewer.server import SessionViewerApp
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.synthetic import generate_store
+
+
+@pytest.fixture
+def roots(tmp_path):
+    """Two services' session directories."""
+    billing = tmp_path / "billing" / "sessions"
+    search = tmp_path / "search" / "sessions"
+    generate_store(str(billing), sessions=3, messages_per_session=4, seed=1)
+    generate_store(str(search), sessions=4, messages_per_session=4, seed=2)
+    return {"billing": str(billing), "search": str(search)}
+
+
+def test_resolve_roots(tmp_path, roots):
+    """Test namespaces from NAME=PATH, directory names and globs."""
+    resolved = resolve_roots([f"{tmp_path}/*/sessions"])
+    assert list(resolved) == ["billing", "search"]
+
+    resolved = resolve_roots([f"b={roots['billing']}", roots["search"], roots["search"]])
+    assert list(resolved) == ["b", "search", "search-2"]
+
+    with pytest.raises(ValueError):
+        resolve_roots([f"x={roots['billing']}", f"x={roots['search']}"])
+    with pytest.raises(ValueError):
+        resolve_roots([f"{tmp_path}/missing-*"])
+
+
+def test_merged_listing_and_pagination(roots):
+    """Test that the merged listing is sorted newest first and pages lazily."""
+    reader = MultiRootReader({ns: SessionReader(path) for ns, path in roots.items()})
+
+    sessions = reader.list_sessions()
+    assert len(sessions) == 7
+    assert {s["namespace"] for s in sessions} == {"billing", "search"}
+    updated = [s["updated_at"] for s in sessions]
+    assert updated == sorted(updated, reverse=True)
+
+    page, total = reader.list_sessions_page(offset=2, limit=3)
+    assert total == 7
+    assert page == sessions[2:5]
+
+
+def test_namespaced_session_access(roots):
+    """Test that namespaced IDs route to the right root."""
+    reader = MultiRootReader({ns: SessionReader(path) for ns, path in roots.items()})
+    local_id = SessionReader(roots["search"]).list_sessions()[0]["session_id"]
+    session_id = f"search:{local_id}"
+
+    session = reader.get_session(session_id)
+    assert session["session_id"] == session_id
+    assert session["namespace"] == "search"
+    assert reader.get_messages(session_id, limit=2)
+    assert reader.get_fingerprint(session_id)
+
+    assert reader.get_session(local_id) is None
+    assert reader.get_session(f"unknown:{local_id}") is None
+
+
+def test_viewer_serves_several_roots(roots):
+    """Test the API with several roots."""
+    viewer = SessionViewerApp(roots, warmup=False)
+    client = TestClient(viewer.app)
+
+    body = client.get("/api/sessions", params={"limit": 2}).json()
+    assert body["total"] == 7
+    assert len(body["sessions"]) == 2
+
+    session_id = body["sessions"][0]["session_id"]
+    response = client.get(f"/api/sessions/{session_id}")
+    assert response.status_code == 200
+    assert response.json()["session"]["session_id"] == session_id
+
+    assert client.get(f"/api/sessions/{session_id}/messages").json()["success"]
@@ -0,0 +1,91 @@
+"""Tests for OpenTelemetry trace export."""
+
+from strands_viewer.otlp import STATUS_ERROR, STATUS_OK, session_to_otlp
+
+
+def message(agent_id, role, content, created_at, message_id):
+    """Create a message of an agent."""
+    return {
+        "message": {"role": role, "content": content},
+        "message_id": message_id,
+        "agent_id": agent_id,
+        "created_at": f"2025-11-05T10:00:{created_at}+00:00",
+    }
+
+
+def spans_by_name(trace):
+    """Map span names to spans."""
+    spans = trace["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    return {span["name"]: span for span in spans}
+
+
+def attributes(span):
+    """Map attribute keys to their values."""
+    return {a["key"]: next(iter(a["value"].values())) for a in span["attributes"]}
+
+
+def test_session_to_otlp_spans():
+    """Test the session, turn and tool call spans and their times and status."""
+    call = {"toolUse": {"toolUseId": "t1", "name": "shell", "input": {}}}
+    failure = {"toolResult": {"toolUseId": "t1", "status": "error", "content": [{"text": "boom"}]}}
+    session = {
+        "session_id": "s1",
+        "session_type": "AGENT",
+        "created_at": "2025-11-05T10:00:00+00:00",
+        "messages": [
+            message("a", "user", [{"text": "Run it"}], "01", 0),
+            message("a", "assistant", [call], "02", 1),
+            message("a", "user", [failure], "04.5", 2),
+            message("a", "assistant", [{"text": "It failed"}], "05", 3),
+            message("a", "user", [{"text": "Thanks"}], "10", 4),
+            message("a", "assistant", [{"text": "Bye"}], "not a time", 5),
+        ],
+    }
+    spans = spans_by_name(session_to_otlp(session))
+    assert set(spans) == {"session s1", "turn 1", "turn 2", "execute_tool shell"}
+
+    root, turn1, turn2 = spans["session s1"], spans["turn 1"], spans["turn 2"]
+    tool = spans["execute_tool shell"]
+    assert "parentSpanId" not in root
+    assert turn1["parentSpanId"] == root["spanId"] == turn2["parentSpanId"]
+    assert tool["parentSpanId"] == turn1["spanId"]
+    assert len({span["traceId"] for span in spans.values()}) == 1
+    assert len(root["traceId"]) == 32 and len(root["spanId"]) == 16
+
+    start = 1762336801 * 10**9
+    assert turn1["startTimeUnixNano"] == str(start)
+    assert turn1["endTimeUnixNano"] == str(start + 4 * 10**9)
+    assert int(tool["endTimeUnixNano"]) - int(tool["startTimeUnixNano"]) == 2_500_000_000
+    # The last message has no timestamp and takes the previous one
+    assert turn2["endTimeUnixNano"] == str(start + 9 * 10**9)
+
+    assert tool["status"] == {"code": STATUS_ERROR, "message": "boom"}
+    assert turn1["status"]["code"] == STATUS_ERROR
+    assert turn2["status"]["code"] != STATUS_ERROR
+    assert attributes(tool)["gen_ai.tool.call.id"] == "t1"
+    assert attributes(root)["strands.session.tool_calls"] == "1"
+
+
+def test_session_to_otlp_is_deterministic_per_agent():
+    """Test that IDs are stable and turns are split per agent."""
+    call = {"toolUse": {"toolUseId": "t1", "name": "search", "input": {}}}
+    result = {"toolResult": {"toolUseId": "t1", "status": "success", "content": []}}
+    session = {
+        "session_id": "s2",
+        "messages": [
+            message("lead", "user", [{"text": "Research"}], "00", 0),
+            message("worker", "user", [{"text": "Search"}], "01", 0),
+            message("worker", "assistant", [call], "02", 1),
+            message("lead", "assistant", [{"text": "Waiting"}], "03", 1),
+            message("worker", "user", [result], "04", 2),
+        ],
+    }
+    trace = session_to_otlp(session)
+    assert session_to_otlp(session) == trace
+
+    spans = spans_by_name(trace)
+    assert attributes(spans["turn 1"])["gen_ai.agent.id"] == "lead"
+    assert attributes(spans["turn 1"])["strands.turn.messages"] == "2"
+    assert attributes(spans["turn 2"])["gen_ai.agent.id"] == "worker"
+    assert spans["execute_tool search"]["parentSpanId"] == spans["turn 2"]["spanId"]
+    assert spans["execute_tool search"]["status"] == {"code": STATUS_OK}
@@ -0,0 +1,134 @@
+"""Tests for packed session files."""
+
+import json
+
+import pytest
+
+from strands_viewer.pack import (
+    PACK_SUFFIX,
+    PackedSession,
+    PackFormatError,
+    pack_session,
+    pack_store,
+)
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.synthetic import generate_store
+
+
+def _strip_paths(sessions):
+    return [{k: v for k, v in s.items() if k != "path"} for s in sessions]
+
+
+def test_packed_store_reads_like_directories(tmp_path):
+    """Test that packed sessions read the same as the directories they replaced."""
+    generate_store(str(tmp_path), sessions=3, messages_per_session=8, agents_per_session=2)
+    expected = SessionReader(str(tmp_path))
+    listing = expected.list_sessions()
+    sessions = {s["session_id"]: expected.get_session(s["session_id"]) for s in listing}
+    matches = expected.search_messages("error")
+    assert matches
+
+    report = pack_store(
+        str(tmp_path), min_idle_seconds=0, delete=True, progress=lambda message: None
+    )
+    assert report["packed"] == 3
+    assert report["messages"] == 24
+    assert not [d for d in tmp_path.iterdir() if d.is_dir() and d.name.startswith("session_")]
+
+    reader = SessionReader(str(tmp_path))
+    assert _strip_paths(reader.list_sessions()) == _strip_paths(listing)
+    for session_id, session in sessions.items():
+        assert reader.get_session(session_id) == session
+        assert reader.get_fingerprint(session_id)
+    assert reader.search_messages("error") == matches
+    assert list(reader.iter_messages(listing[0]["session_id"])) == (
+        sessions[listing[0]["session_id"]]["messages"]
+    )
+    assert (
+        reader.get_messages(listing[0]["session_id"], limit=3)
+        == sessions[listing[0]["session_id"]]["messages"][:3]
+    )
+
+
+def test_pack_appends_new_messages(tmp_path):
+    """Test that packing again appends only records not already packed."""
+    generate_store(str(tmp_path), sessions=1, messages_per_session=4)
+    session_dir = next(tmp_path.glob("session_*"))
+    assert pack_session(str(session_dir)) == {"agents": 1, "messages": 4}
+
+    message = {"message": {"role": "user", "content": [{"text": "again"}]}, "message_id": 4}
+    messages_dir = session_dir / "agents" / "agent_default" / "messages"
+    (messages_dir / "message_4.json").write_text(json.dumps(message))
+    assert pack_session(str(session_dir)) == {"agents": 0, "messages": 1}
+
+    with PackedSession((tmp_path / (session_dir.name + PACK_SUFFIX)).read_bytes()) as packed:
+        assert packed.message_count == 5
+        assert json.loads(packed.message_records()[-1][2]) == message
+
+
+def test_pack_rewrites_changed_records(tmp_path):
+    """Test that records changed in place since the last pack are written again."""
+    generate_store(str(tmp_path), sessions=1, messages_per_session=4)
+    session_dir = next(tmp_path.glob("session_*"))
+    pack_session(str(session_dir))
+
+    message_file = session_dir / "agents" / "agent_default" / "messages" / "message_1.json"
+    message = json.loads(message_file.read_text())
+    message["message"]["content"] = [{"text": "[redacted]"}]
+    message_file.write_text(json.dumps(message))
+    session_file = session_dir / "session.json"
+    session = dict(json.loads(session_file.read_text()), updated_at="2030-01-01T00:00:00Z")
+    session_file.write_text(json.dumps(session))
+    assert pack_session(str(session_dir)) == {"agents": 0, "messages": 1}
+
+    with PackedSession((tmp_path / (session_dir.name + PACK_SUFFIX)).read_bytes()) as packed:
+        assert packed.message_count == 4
+        assert json.loads(packed.message_records()[1][2]) == message
+        assert json.loads(packed.session_bytes()) == session
+
+
+def test_pack_store_keeps_directories_by_default(tmp_path):
+    """Test that directories are only removed with delete, including messages without IDs."""
+    generate_store(str(tmp_path), sessions=1, messages_per_session=4)
+    session_dir = next(tmp_path.glob("session_*"))
+    message_file = session_dir / "agents" / "agent_default" / "messages" / "message_2.json"
+    message = json.loads(message_file.read_text())
+    del message["message_id"]
+    message_file.write_text(json.dumps(message))
+
+    report = pack_store(str(tmp_path), min_idle_seconds=0, progress=lambda message: None)
+    assert report["packed"] == 1 and report["failed"] == 0
+    assert session_dir.is_dir()
+
+    report = pack_store(
+        str(tmp_path), min_idle_seconds=0, delete=True, progress=lambda message: None
+    )
+    assert report["packed"] == 1 and report["failed"] == 0
+    assert not session_dir.exists()
+
+
+def test_corrupt_pack_leaves_no_temporary_file(tmp_path):
+    """Test that failing to append to a corrupt pack removes the temporary copy."""
+    generate_store(str(tmp_path), sessions=1, messages_per_session=4)
+    session_dir = next(tmp_path.glob("session_*"))
+    (tmp_path / (session_dir.name + PACK_SUFFIX)).write_bytes(b"not a pack")
+
+    with pytest.raises(PackFormatError):
+        pack_session(str(session_dir))
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_active_sessions_are_skipped(tmp_path):
+    """Test that recently updated sessions are left unpacked."""
+    generate_store(str(tmp_path), sessions=2, messages_per_session=4)
+    report = pack_store(str(tmp_path), min_idle_seconds=1e12, progress=lambda message: None)
+    assert report == {"packed": 0, "skipped_active": 2, "failed": 0, "messages": 0}
+    assert not list(tmp_path.glob(f"*{PACK_SUFFIX}"))
+
+
+def test_invalid_pack():
+    """Test that truncated or foreign files are rejected."""
+    with pytest.raises(PackFormatError):
+        PackedSession(b"{}\n")
+    with pytest.raises(PackFormatError):
+        PackedSession(b"SVPACK1\n" + b"\0" * 40)
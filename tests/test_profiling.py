@@ -0,0 +1,74 @@
+"""Tests for opt-in request profiling."""
+
+import json
+import pstats
+
+from fastapi.testclient import TestClient
+
+from strands_viewer.profiling import SpanRecorder
+from strands_viewer.server import SessionViewerApp
+
+
+def test_span_recorder_speedscope():
+    """Test that spans become a nested speedscope evented profile."""
+    recorder = SpanRecorder()
+    recorder.open("request")
+    recorder.open("load")
+    recorder.close("load")
+    recorder.close("request")
+    recorder.rename("request", "GET /api/sessions")
+
+    profile = recorder.to_speedscope("test")
+    assert [f["name"] for f in profile["shared"]["frames"]] == ["GET /api/sessions", "load"]
+    events = profile["profiles"][0]["events"]
+    assert [(e["type"], e["frame"]) for e in events] == [("O", 0), ("O", 1), ("C", 1), ("C", 0)]
+    assert profile["profiles"][0]["endValue"] == events[-1]["at"]
+
+
+def test_profiling_disabled_by_default(temp_sessions_dir):
+    """Test that no hooks are installed without a profile directory."""
+    viewer = SessionViewerApp(temp_sessions_dir)
+    assert not getattr(viewer.reader.get_session, "__profiled__", False)
+
+    response = TestClient(viewer.app).get("/api/sessions", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+    assert "x-profile-file" not in response.headers
+
+
+def test_profile_requested_by_header(temp_sessions_dir, tmp_path):
+    """Test that only requests with X-Profile are profiled, as speedscope timelines."""
+    client = TestClient(SessionViewerApp(temp_sessions_dir, profile_dir=str(tmp_path)).app)
+
+    assert "x-profile-file" not in client.get("/api/sessions").headers
+    response = client.get("/api/sessions/test_1", headers={"X-Profile": "1"})
+    assert response.status_code == 200
+
+    files = list(tmp_path.iterdir())
+    assert [f.name for f in files] == [response.headers["x-profile-file"]]
+
+    profile = json.loads(files[0].read_text())
+    names = {frame["name"] for frame in profile["shared"]["frames"]}
+    assert "GET /api/sessions/{session_id}" in names
+    assert "SessionReader.get_session_raw" in names
+    assert "SessionReader._load_json" in names
+    assert "RawJSONResponse.render" in names
+
+
+def test_profile_all_pstats(temp_sessions_dir, tmp_path):
+    """Test profiling every request with cProfile output."""
+    viewer = SessionViewerApp(
+        temp_sessions_dir, profile_dir=str(tmp_path), profile_format="pstats", profile_all=True
+    )
+    client = TestClient(viewer.app)
+
+    response = client.get("/api/sessions/test_1/export", params={"format": "markdown"})
+    assert response.status_code == 200
+    assert response.headers["x-profile-file"].endswith(".prof")
+
+    stats = pstats.Stats(str(tmp_path / response.headers["x-profile-file"]))
+    functions = {name for (_, _, name) in stats.stats}
+    assert "get_session" in functions
+    assert "format_markdown" in functions
+
+    response = client.get("/api/sessions", headers={"X-Profile": "off"})
+    assert "x-profile-file" not in response.headers
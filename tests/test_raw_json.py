@@ -0,0 +1,111 @@
+"""Tests for raw JSON passthrough in session responses."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from strands_viewer import session_reader
+from strands_viewer.pack import pack_store
+from strands_viewer.raw_json import RawJSON, encode_json, inject_field
+from strands_viewer.server import SessionViewerApp
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.synthetic import generate_store
+
+
+def test_inject_field():
+    """Test adding a key to encoded objects without parsing them."""
+    assert json.loads(inject_field(b' {"a": 1}\n', "agent_id", "x")) == {"a": 1, "agent_id": "x"}
+    assert json.loads(inject_field(b"{ }", "agent_id", "x")) == {"agent_id": "x"}
+    assert inject_field(b"[1, 2]", "agent_id", "x") is None
+    assert inject_field(b"", "agent_id", "x") is None
+
+
+def test_encode_json_splices_raw_values():
+    """Test that RawJSON values are copied into the output as they are."""
+    body = encode_json({"ok": True, "items": [RawJSON(b'{"a": [1, 2]}'), None, "é"]})
+    assert body == b'{"ok":true,"items":[{"a": [1, 2]},null,"\xc3\xa9"]}'
+
+
+def _parsed_responses(client, session_id, reader):
+    session = client.get(f"/api/sessions/{session_id}").json()
+    assert session == {"success": True, "session": reader.get_session(session_id)}
+    page = client.get(f"/api/sessions/{session_id}/messages?offset=2&limit=3").json()
+    assert page == {"success": True, "messages": reader.get_messages(session_id, 3, 2)}
+
+
+def test_session_responses_match_parsed(tmp_path):
+    """Test that spliced responses equal the parsed session, for directories and packs."""
+    generate_store(str(tmp_path), sessions=2, messages_per_session=12, agents_per_session=2)
+    reader = SessionReader(str(tmp_path))
+    session_ids = [s["session_id"] for s in reader.list_sessions()]
+    client = TestClient(SessionViewerApp(str(tmp_path), warmup=False).app)
+    for session_id in session_ids:
+        _parsed_responses(client, session_id, reader)
+    assert client.get("/api/sessions/missing").status_code == 404
+    assert client.get("/api/sessions/missing/messages").json()["messages"] == []
+
+    pack_store(str(tmp_path), min_idle_seconds=0, delete=True, progress=lambda message: None)
+    client = TestClient(SessionViewerApp(str(tmp_path), warmup=False).app)
+    for session_id in session_ids:
+        _parsed_responses(client, session_id, SessionReader(str(tmp_path)))
+
+
+def test_corrupt_agent_file_is_skipped(tmp_path):
+    """Test that an agent file that doesn't parse is left out of the spliced response."""
+    generate_store(str(tmp_path), sessions=1, messages_per_session=6, agents_per_session=2)
+    reader = SessionReader(str(tmp_path))
+    session_id = reader.list_sessions()[0]["session_id"]
+    agent_file = tmp_path / f"session_{session_id}" / "agents" / "agent_default" / "agent.json"
+    agent_file.write_bytes(agent_file.read_bytes()[:-5])
+
+    response = TestClient(SessionViewerApp(str(tmp_path), warmup=False).app).get(
+        f"/api/sessions/{session_id}"
+    )
+    assert response.status_code == 200
+    session = response.json()["session"]
+    assert session == reader.get_session(session_id)
+    assert [agent["agent_id"] for agent in session["agents"]] == ["worker_1"]
+
+
+def test_agent_messages_endpoint(tmp_path):
+    """Test the agent-scoped messages endpoint for directories and packs."""
+    generate_store(str(tmp_path), sessions=1, messages_per_session=20, agents_per_session=2)
+    session_id = SessionReader(str(tmp_path)).list_sessions()[0]["session_id"]
+    expected = [
+        m
+        for m in SessionReader(str(tmp_path)).get_session(session_id)["messages"]
+        if m["agent_id"] == "agent_default"
+    ]
+    url = f"/api/sessions/{session_id}/agents/agent_default/messages"
+
+    client = TestClient(SessionViewerApp(str(tmp_path), warmup=False).app)
+    assert client.get(url, params={"limit": 3}).json()["messages"] == expected[:3]
+    missing = client.get(f"/api/sessions/{session_id}/agents/agent_missing/messages")
+    assert missing.status_code == 404
+
+    pack_store(str(tmp_path), min_idle_seconds=0, delete=True, progress=lambda message: None)
+    client = TestClient(SessionViewerApp(str(tmp_path), warmup=False).app)
+    assert client.get(url, params={"offset": 4}).json()["messages"] == expected[4:]
+
+
+def test_raw_pages_parse_messages_only_to_merge(tmp_path, monkeypatch):
+    """Test that one agent's messages aren't parsed and merged pages parse each file once."""
+    generate_store(str(tmp_path), sessions=1, messages_per_session=20, agents_per_session=2)
+    reader = SessionReader(str(tmp_path))
+    session_id = reader.list_sessions()[0]["session_id"]
+    expected = reader.get_messages(session_id)
+
+    parsed = []
+    loads = json.loads
+    monkeypatch.setattr(
+        session_reader.json, "loads", lambda data, **kw: parsed.append(data) or loads(data, **kw)
+    )
+    assert len(reader.get_agent_messages_raw(session_id, "agent_default")) == 10
+    assert parsed == []
+
+    page = reader.get_messages_raw(session_id, limit=5)
+    assert [loads(m) for m in page] == expected[:5]
+    first = len(parsed)
+    assert first > 0
+    assert [loads(m) for m in reader.get_messages_raw(session_id, limit=5)] == expected[:5]
+    assert len(parsed) == first
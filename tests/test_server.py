@@ -1,5 +1,10 @@
 """Tests for FastAPI server."""
 
+import json
+import threading
+import time
+from pathlib import Path
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -103,3 +108,43 @@ def test_api_error_handling(test_client):
     assert response.status_code == 200  # Returns empty list, not an error
     data = response.json()
     assert data["messages"] == []
+
+
+def test_messages_since_long_poll(temp_sessions_dir, test_client):
+    """Test that a since long-poll returns once a new message is written, or at its timeout."""
+    data = test_client.get("/api/sessions/test_1/messages", params={"since": ""}).json()
+    assert len(data["messages"]) == 4
+    cursor = data["cursor"]
+
+    started = time.monotonic()
+    data = test_client.get(
+        "/api/sessions/test_1/messages", params={"since": cursor, "timeout": 0.6}
+    ).json()
+    assert data == {"success": True, "messages": [], "cursor": cursor}
+    assert time.monotonic() - started >= 0.5
+
+    messages_dir = (
+        Path(temp_sessions_dir) / "session_test_1" / "agents" / "agent_default" / "messages"
+    )
+    message = {
+        "message": {"role": "user", "content": []},
+        "message_id": 5,
+        "created_at": "2025-11-05T10:00:05",
+    }
+    writer = threading.Timer(
+        0.3, lambda: (messages_dir / "message_5.json").write_text(json.dumps(message))
+    )
+    writer.start()
+    data = test_client.get(
+        "/api/sessions/test_1/messages", params={"since": cursor, "timeout": 10}
+    ).json()
+    writer.join()
+    assert [m["message_id"] for m in data["messages"]] == [5]
+    assert data["cursor"] != cursor
+
+    assert (
+        test_client.get("/api/sessions/test_1/messages", params={"since": "x!"}).status_code == 400
+    )
+    assert (
+        test_client.get("/api/sessions/missing/messages", params={"since": ""}).status_code == 404
+    )
@@ -1,8 +1,13 @@
 """Tests for SessionReader."""
 
+import json
+import os
+from pathlib import Path
+
 import pytest
 
 from strands_viewer.session_reader import SessionReader
+from strands_viewer.synthetic import generate_store
 
 
 def test_session_reader_init(temp_sessions_dir):
@@ -120,3 +125,108 @@ def test_count_messages(temp_sessions_dir):
 
     assert session1["message_count"] == 4
     assert session2["message_count"] == 1
+
+
+def test_multi_agent_timeline_merged_by_created_at(temp_sessions_dir):
+    """Test that agents' messages interleave by created_at, each agent in message order."""
+    session_dir = Path(temp_sessions_dir) / "session_test_1"
+    # A second agent whose IDs restart at 0; agent_default has messages 1-3
+    messages_dir = session_dir / "agents" / "agent_worker" / "messages"
+    messages_dir.mkdir(parents=True)
+    for message_id, second in [(0, "00:00"), (1, "00:01"), (2, "00:59")]:
+        message = {
+            "message": {"role": "user", "content": [{"text": f"worker {message_id}"}]},
+            "message_id": message_id,
+            "created_at": f"2025-11-05T10:{second}.500000+00:00",
+        }
+        (messages_dir / f"message_{message_id}.json").write_text(json.dumps(message))
+
+    reader = SessionReader(temp_sessions_dir)
+    messages = reader.get_session("test_1")["messages"]
+    assert [m["created_at"] for m in messages] == sorted(m["created_at"] for m in messages)
+    assert [(m["agent_id"], m["message_id"]) for m in messages][:3] == [
+        ("agent_worker", 0),
+        ("agent_default", 1),
+        ("agent_worker", 1),
+    ]
+    raw = reader.get_messages_raw("test_1", limit=4, offset=1)
+    assert [json.loads(m) for m in raw] == messages[1:5]
+    assert list(reader.iter_messages("test_1")) == messages
+    assert reader.iter_messages("missing") is None
+
+
+def test_agent_messages(tmp_path):
+    """Test paging through one agent's messages."""
+    generate_store(str(tmp_path), sessions=1, messages_per_session=30, agents_per_session=3)
+    reader = SessionReader(str(tmp_path))
+    session_id = reader.list_sessions()[0]["session_id"]
+    expected = [
+        m for m in reader.get_session(session_id)["messages"] if m["agent_id"] == "agent_worker_1"
+    ]
+
+    page = reader.get_agent_messages_raw(session_id, "agent_worker_1", limit=4, offset=2)
+    assert [json.loads(m) for m in page] == expected[2:6]
+    assert reader.get_agent_messages_raw(session_id, "agent_missing") is None
+    assert reader.get_agent_messages_raw(session_id, "../agent_default") is None
+    assert reader.get_agent_messages_raw("missing", "agent_default") is None
+
+
+def _write_message(messages_dir, message_id, text, second):
+    message = {
+        "message": {"role": "user", "content": [{"text": text}]},
+        "message_id": message_id,
+        "created_at": f"2025-11-05T10:01:{second:02d}.000000+00:00",
+    }
+    (messages_dir / f"message_{message_id}.json").write_text(json.dumps(message))
+
+
+def test_messages_since_cursor(temp_sessions_dir):
+    """Test that a cursor returns only messages added or rewritten after it."""
+    reader = SessionReader(temp_sessions_dir)
+    messages, cursor = reader.get_messages_since("test_1")
+    assert [json.loads(m) for m in messages] == reader.get_session("test_1")["messages"]
+    assert reader.get_messages_since("test_1", cursor) == ([], cursor)
+
+    messages_dir = (
+        Path(temp_sessions_dir) / "session_test_1" / "agents" / "agent_default" / "messages"
+    )
+    _write_message(messages_dir, 5, "new", 1)
+    worker_dir = messages_dir.parent.parent / "agent_worker" / "messages"
+    worker_dir.mkdir(parents=True)
+    _write_message(worker_dir, 0, "worker", 2)
+
+    read = []
+    original = reader.backend.read_many
+    reader.backend.read_many = lambda files: read.extend(f.path for f in files) or original(files)
+    messages, cursor = reader.get_messages_since("test_1", cursor)
+    assert [(m["agent_id"], m["message_id"]) for m in map(json.loads, messages)] == [
+        ("agent_default", 5),
+        ("agent_worker", 0),
+    ]
+    assert len(read) == 2
+
+    # A rewritten last message is returned again
+    _write_message(messages_dir, 5, "redacted", 1)
+    os.utime(messages_dir / "message_5.json", ns=(1, 1))
+    messages, _ = reader.get_messages_since("test_1", cursor)
+    assert [json.loads(m)["message"]["content"][0]["text"] for m in messages] == ["redacted"]
+
+    assert reader.get_messages_since("missing") is None
+    with pytest.raises(ValueError):
+        reader.get_messages_since("test_1", "not a cursor")
+
+
+def test_messages_since_retries_partial_writes(temp_sessions_dir):
+    """Test that a message file caught mid-write is returned by the next call."""
+    reader = SessionReader(temp_sessions_dir)
+    _, cursor = reader.get_messages_since("test_1")
+    messages_dir = (
+        Path(temp_sessions_dir) / "session_test_1" / "agents" / "agent_default" / "messages"
+    )
+    (messages_dir / "message_5.json").write_text('{"message": {"role": "us')
+
+    messages, cursor = reader.get_messages_since("test_1", cursor)
+    assert messages == []
+    _write_message(messages_dir, 5, "complete", 1)
+    messages, _ = reader.get_messages_since("test_1", cursor)
+    assert [json.loads(m)["message_id"] for m in messages] == [5]
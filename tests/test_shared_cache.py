@@ -0,0 +1,213 @@
+"""Tests for the cross-worker shared session cache."""
+
+import json
+import os
+
+from fastapi.testclient import TestClient
+
+from strands_viewer import server
+from strands_viewer.metrics import CACHE_REQUESTS
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.shared_cache import CachingSessionReader, SharedCache
+from strands_viewer.synthetic import generate_store
+
+
+def test_shared_cache_get_put_and_events(tmp_path):
+    """Test fingerprint validation and the invalidation event log."""
+    cache = SharedCache(str(tmp_path / "cache.sqlite3"))
+    assert cache.get("session", "a", "fp1") is None
+
+    cache.put("session", "a", "fp1", {"value": 1})
+    assert cache.get("session", "a", "fp1") == {"value": 1}
+    assert cache.get("session", "a", "fp2") is None
+
+    cache.invalidate("session", "a")
+    assert cache.get("session", "a", "fp1") is None
+    assert [(ns, key) for _, ns, key, _ in cache.events_since(0)] == [
+        ("session", "a"),
+        ("session", "a"),
+    ]
+
+
+def test_shared_cache_session_rows(tmp_path):
+    """Test that sessions are stored as a record plus per-message rows."""
+    cache = SharedCache(str(tmp_path / "cache.sqlite3"))
+    assert cache.get_session("a") is None
+
+    record = {"session": {"session_id": "a"}, "files": {"s/session.json": [1, 1, ""]}}
+    rows = {"m1": ([2, 2, ""], {"n": 1}), "m2": ([3, 3, ""], {"n": 2})}
+    cache.put_session("a", "fp1", record, rows)
+    assert cache.get_session("a") == (
+        "fp1",
+        record,
+        {p: (list(e), m) for p, (e, m) in rows.items()},
+    )
+
+    cache.put_session("a", "fp2", record, {"m3": ([4, 4, ""], {"n": 3})}, removed=["m1"])
+    fingerprint, _, stored = cache.get_session("a")
+    assert fingerprint == "fp2"
+    assert sorted(stored) == ["m2", "m3"]
+
+    cache.put_session("a", "fp3", record, {"m4": ([5, 5, ""], {"n": 4})}, replace=True)
+    assert sorted(cache.get_session("a")[2]) == ["m4"]
+
+    cache.invalidate("session", "a")
+    assert cache.get_session("a") is None
+
+
+def test_workers_share_parsed_sessions(tmp_path):
+    """Test that a second reader serves a session parsed by the first from the shared cache."""
+    sessions_dir = tmp_path / "sessions"
+    generate_store(str(sessions_dir), sessions=2, messages_per_session=6)
+    cache_path = str(tmp_path / "cache.sqlite3")
+
+    first = CachingSessionReader(str(sessions_dir), SharedCache(cache_path))
+    second = CachingSessionReader(str(sessions_dir), SharedCache(cache_path))
+
+    expected = first.get_session("synthetic-0-000000")
+    shared_hits = CACHE_REQUESTS.value(cache="session_shared", result="hit")
+    assert second.get_session("synthetic-0-000000") == expected
+    assert CACHE_REQUESTS.value(cache="session_shared", result="hit") == shared_hits + 1
+
+    assert first.list_sessions() == second.list_sessions()
+    assert len(second.list_sessions()) == 2
+
+
+def test_changed_session_is_reloaded(tmp_path):
+    """Test that cached sessions and listings are rebuilt when session files change."""
+    sessions_dir = tmp_path / "sessions"
+    generate_store(str(sessions_dir), sessions=1, messages_per_session=4)
+    reader = CachingSessionReader(str(sessions_dir), SharedCache(str(tmp_path / "cache.sqlite3")))
+
+    session_id = "synthetic-0-000000"
+    assert len(reader.get_session(session_id)["messages"]) == 4
+    assert reader.list_sessions()[0]["message_count"] == 4
+
+    messages_dir = sessions_dir / f"session_{session_id}" / "agents" / "agent_default" / "messages"
+    new_message = {"message": {"role": "user", "content": [{"text": "more"}]}, "message_id": 4}
+    (messages_dir / "message_4.json").write_text(json.dumps(new_message))
+
+    assert len(reader.get_session(session_id)["messages"]) == 5
+    assert reader.list_sessions()[0]["message_count"] == 5
+
+
+def test_changed_session_rereads_only_changed_files(tmp_path):
+    """Test that a refresh reads only new and modified files and matches a full read."""
+    sessions_dir = tmp_path / "sessions"
+    generate_store(str(sessions_dir), sessions=1, messages_per_session=40, agents_per_session=2)
+    cache_path = str(tmp_path / "cache.sqlite3")
+    reader = CachingSessionReader(str(sessions_dir), SharedCache(cache_path))
+    session_id = "synthetic-0-000000"
+    assert len(reader.get_session(session_id)["messages"]) == 40
+
+    agents_dir = sessions_dir / f"session_{session_id}" / "agents"
+    new_message = {
+        "message": {"role": "user", "content": [{"text": "more"}]},
+        "message_id": 20,
+        "created_at": "2100-01-01T00:00:00+00:00",
+    }
+    (agents_dir / "agent_worker_1" / "messages" / "message_20.json").write_text(
+        json.dumps(new_message)
+    )
+    redacted = agents_dir / "agent_default" / "messages" / "message_3.json"
+    data = json.loads(redacted.read_text())
+    data["message"]["content"] = [{"text": "[redacted]"}]
+    redacted.write_text(json.dumps(data))
+    os.utime(redacted, ns=(1, 1))
+    (agents_dir / "agent_default" / "messages" / "message_5.json").unlink()
+
+    read = []
+    original = reader.backend.read_many
+    reader.backend.read_many = lambda files: read.extend(f.path for f in files) or original(files)
+    written = []
+    put_session = reader.cache.put_session
+    reader.cache.put_session = lambda key, fingerprint, record, changed, removed, replace: (
+        written.append((sorted(changed), list(removed), replace))
+        or put_session(key, fingerprint, record, changed, removed, replace)
+    )
+    session = reader.get_session(session_id)
+    assert sorted(path.rsplit("/", 3)[1:] for path in read) == [
+        ["agent_default", "messages", "message_3.json"],
+        ["agent_worker_1", "messages", "message_20.json"],
+    ]
+    # Only the rows of changed messages are written back
+    [(changed, removed, replace)] = written
+    assert [path.rsplit("/", 3)[1:] for path in changed] == [
+        ["agent_default", "messages", "message_3.json"],
+        ["agent_worker_1", "messages", "message_20.json"],
+    ]
+    assert [path.rsplit("/", 1)[1] for path in removed] == ["message_5.json"]
+    assert not replace
+    assert session == SessionReader(str(sessions_dir)).get_session(session_id)
+    assert session["messages"][-1]["message"]["content"][0]["text"] == "more"
+
+    # Another worker refreshes from the shared copy and its manifest
+    other = CachingSessionReader(str(sessions_dir), SharedCache(cache_path))
+    (agents_dir / "agent_default" / "messages" / "message_20.json").write_text(
+        json.dumps(new_message)
+    )
+    assert other.get_session(session_id) == SessionReader(str(sessions_dir)).get_session(session_id)
+
+
+def test_invalidation_events_evict_other_workers(tmp_path):
+    """Test that an entry rebuilt by another process is dropped from local memory."""
+    sessions_dir = tmp_path / "sessions"
+    generate_store(str(sessions_dir), sessions=1, messages_per_session=4)
+    cache = SharedCache(str(tmp_path / "cache.sqlite3"))
+    reader = CachingSessionReader(str(sessions_dir), cache)
+
+    reader.get_session("synthetic-0-000000")
+    assert ("session", "synthetic-0-000000") in reader._local
+
+    # Simulate another worker publishing an event for the same key
+    with cache._connection() as conn:
+        conn.execute(
+            "INSERT INTO events (namespace, key, origin, created_at) VALUES (?, ?, ?, ?)",
+            ("session", "synthetic-0-000000", os.getpid() + 1, 0.0),
+        )
+    reader._next_poll = 0.0
+    reader._sync()
+    assert ("session", "synthetic-0-000000") not in reader._local
+
+
+def test_create_app_factory(tmp_path, monkeypatch):
+    """Test building a worker app from the environment configuration."""
+    sessions_dir = tmp_path / "sessions"
+    generate_store(str(sessions_dir), sessions=1, messages_per_session=4)
+    config = {
+        "storage_dir": str(sessions_dir),
+        "workers": 2,
+        "shared_cache": str(tmp_path / "cache.sqlite3"),
+    }
+    monkeypatch.setenv(server.WORKER_CONFIG_ENV, json.dumps(config))
+
+    client = TestClient(server.create_app())
+    response = client.get("/api/sessions/synthetic-0-000000")
+    assert response.status_code == 200
+    assert len(response.json()["session"]["messages"]) == 4
+    assert (tmp_path / "cache.sqlite3").exists()
+
+
+def test_session_routes_use_the_cache(tmp_path):
+    """Test that the session and messages routes are served from the cached session."""
+    sessions_dir = tmp_path / "sessions"
+    generate_store(str(sessions_dir), sessions=1, messages_per_session=10, agents_per_session=2)
+    app = server.SessionViewerApp(
+        str(sessions_dir), shared_cache=str(tmp_path / "cache.sqlite3"), warmup=False
+    )
+    client = TestClient(app.app)
+    session_id = "synthetic-0-000000"
+    expected = SessionReader(str(sessions_dir)).get_session(session_id)
+
+    session = client.get(f"/api/sessions/{session_id}").json()["session"]
+    assert session["messages"] == expected["messages"]
+    local_hits = CACHE_REQUESTS.value(cache="session_local", result="hit")
+
+    page = client.get(f"/api/sessions/{session_id}/messages?limit=3&offset=2").json()
+    assert page["messages"] == expected["messages"][2:5]
+    agent_page = client.get(f"/api/sessions/{session_id}/agents/agent_default/messages").json()
+    assert agent_page["messages"] == [
+        m for m in expected["messages"] if m["agent_id"] == "agent_default"
+    ]
+    assert CACHE_REQUESTS.value(cache="session_local", result="hit") == local_hits + 2
+    assert client.get(f"/api/sessions/{session_id}/agents/agent_nobody/messages").status_code == 404
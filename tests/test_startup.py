@@ -0,0 +1,125 @@
+"""Startup-time checks based on `python -X importtime`."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Modules that must only be imported on the first AI request
+LAZY_MODULES = (
+    "strands",
+    "anthropic",
+    "openai",
+    "ollama",
+    "dotenv",
+    "strands_viewer.ai_analysis",
+    "strands_viewer.models",
+)
+
+# Heavy optional dependencies and the server stack, imported only by the
+# subcommands and routes that use them
+CLI_LAZY_MODULES = LAZY_MODULES + (
+    "boto3",
+    "botocore",
+    "numpy",
+    "pyarrow",
+    "zstandard",
+    "httpx",
+    "fastapi",
+    "starlette",
+    "uvicorn",
+)
+
+# Opt-in budget for importing the CLI module alone (microseconds, cumulative);
+# wall-clock times vary too much across machines to check by default
+CLI_IMPORT_BUDGET_ENV = "STRANDS_VIEWER_CLI_IMPORT_BUDGET_US"
+
+
+def import_times(statement):
+    """Run a statement under -X importtime and map module names to cumulative microseconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_import_is_fast():
+    """Test that importing the CLI pulls in neither the server, the AI stack nor heavy extras."""
+    times = import_times("import strands_viewer.cli")
+    loaded = [
+        name
+        for name in times
+        if any(name == lazy or name.startswith(lazy + ".") for lazy in CLI_LAZY_MODULES)
+    ]
+    assert loaded == []
+
+
+@pytest.mark.skipif(
+    CLI_IMPORT_BUDGET_ENV not in os.environ,
+    reason=f"set {CLI_IMPORT_BUDGET_ENV} to check the CLI import time",
+)
+def test_cli_import_time_budget():
+    """Test that importing the CLI module stays within the configured time budget."""
+    times = import_times("import strands_viewer.cli")
+    assert times["strands_viewer.cli"] < int(os.environ[CLI_IMPORT_BUDGET_ENV])
+
+
+@pytest.mark.parametrize("module", ["strands_viewer.server", "strands_viewer.models"])
+def test_server_startup_skips_ai_stack(module):
+    """Test that the server and model factories import no model SDKs or .env loading."""
+    times = import_times(f"import {module}")
+    loaded = [
+        name
+        for name in times
+        if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)
+        and name != module
+        and not name.startswith("strands_viewer.models")
+    ]
+    assert loaded == []
+
+
+def test_model_created_on_first_ai_request(temp_sessions_dir, tmp_path, monkeypatch):
+    """Test that the model and analyzer are built on the first analysis request, once."""
+    from fastapi.testclient import TestClient
+
+    from strands_viewer import ai_analysis, server
+
+    created = []
+
+    class FakeAgent:
+        def __init__(self, model=None, **kwargs):
+            self.model = model
+
+        def __call__(self, prompt):
+            return "summary"
+
+    def model_factory():
+        created.append(True)
+        return None
+
+    monkeypatch.setattr(server, "AI_AVAILABLE", True)
+    monkeypatch.setattr(ai_analysis, "STRANDS_AVAILABLE", True)
+    monkeypatch.setattr(ai_analysis, "Agent", FakeAgent)
+    monkeypatch.setattr(ai_analysis, "tool", lambda fn: fn)
+
+    viewer = server.SessionViewerApp(
+        temp_sessions_dir, model_factory=model_factory, analysis_dir=str(tmp_path)
+    )
+    client = TestClient(viewer.app)
+    assert client.get("/api/ai/status").json()["available"] is True
+    assert created == []
+
+    for _ in range(2):
+        response = client.post("/api/sessions/test_1/analyze", json={"analysis_type": "summarize"})
+        assert response.status_code == 200
+    assert created == [True]
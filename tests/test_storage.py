@@ -0,0 +1,108 @@
+"""Tests for storage backends."""
+
+from pathlib import Path
+
+import pytest
+
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.storage import LocalBackend, S3Backend, StorageBackend, open_backend
+from strands_viewer.synthetic import generate_store
+
+
+def test_local_backend(tmp_path):
+    """Test listing, stat and reads of a local directory."""
+    generate_store(str(tmp_path), sessions=2, messages_per_session=4, agents_per_session=2)
+    backend = open_backend(str(tmp_path))
+    assert isinstance(backend, LocalBackend)
+
+    session_dirs = backend.list_dirs()
+    assert len(session_dirs) == 2
+    assert backend.list_dirs(f"{session_dirs[0]}/agents") == ["agent_default", "agent_worker_1"]
+
+    files = backend.list_files(f"{session_dirs[0]}/agents", recursive=True)
+    assert len([f for f in files if "/messages/" in f.path]) == 4
+    assert backend.list_names(f"{session_dirs[0]}/agents", recursive=True) == [
+        f.path for f in files
+    ]
+    assert backend.list_names() == [f.path for f in backend.list_files()]
+    assert backend.stat(f"{session_dirs[0]}/session.json").size > 0
+    assert backend.stat(f"{session_dirs[0]}/missing.json") is None
+    assert backend.read_many(files) == [(tmp_path / f.path).read_bytes() for f in files]
+
+    with pytest.raises(FileNotFoundError):
+        backend.read_bytes("missing.json")
+
+
+def test_storage_backend_is_abstract():
+    """Test that a backend must implement the listing and read methods."""
+
+    class Incomplete(StorageBackend):
+        def describe(self):
+            return "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_reader_on_backend(tmp_path):
+    """Test that SessionReader reads the same sessions through an explicit backend."""
+    generate_store(str(tmp_path), sessions=2, messages_per_session=6, agents_per_session=2)
+    by_path = SessionReader(str(tmp_path))
+    by_backend = SessionReader(LocalBackend(str(tmp_path)))
+
+    assert by_backend.list_sessions() == by_path.list_sessions()
+    session_id = by_path.list_sessions()[0]["session_id"]
+    session = by_backend.get_session(session_id)
+    assert len(session["agents"]) == 2
+    assert len(session["messages"]) == 6
+    assert {m["agent_id"] for m in session["messages"]} == {"agent_default", "agent_worker_1"}
+
+
+@pytest.fixture
+def s3_store(tmp_path):
+    """A synthetic session store uploaded to a moto S3 bucket."""
+    pytest.importorskip("boto3")
+    moto = pytest.importorskip("moto")
+    import boto3
+
+    with moto.mock_aws():
+        client = boto3.client("s3", region_name="us-east-1")
+        client.create_bucket(Bucket="sessions")
+        local = tmp_path / "local"
+        generate_store(str(local), sessions=3, messages_per_session=6, agents_per_session=2)
+        for path in local.rglob("*.json"):
+            key = f"prod/{path.relative_to(local).as_posix()}"
+            client.put_object(Bucket="sessions", Key=key, Body=path.read_bytes())
+        yield client, local
+
+
+def test_s3_backend_matches_local(s3_store):
+    """Test that an S3 store reads like the same store on disk."""
+    client, local = s3_store
+    s3_reader = SessionReader(S3Backend("sessions", "prod", client=client))
+    local_reader = SessionReader(str(local))
+
+    strip = [{k: v for k, v in s.items() if k != "path"} for s in s3_reader.list_sessions()]
+    assert strip == [
+        {k: v for k, v in s.items() if k != "path"} for s in local_reader.list_sessions()
+    ]
+
+    session_id = local_reader.list_sessions()[0]["session_id"]
+    assert s3_reader.get_session(session_id) == local_reader.get_session(session_id)
+    assert s3_reader.get_fingerprint(session_id)
+    assert s3_reader.get_session("missing") is None
+
+
+def test_s3_read_through_cache(s3_store, tmp_path):
+    """Test that cached objects are served from disk until their ETag changes."""
+    client, local = s3_store
+    backend = S3Backend("sessions", "prod", client=client, cache_dir=str(tmp_path / "cache"))
+    session_dir = backend.list_dirs()[0]
+    files = backend.list_files(f"{session_dir}/agents", recursive=True)
+
+    first = backend.read_many(files)
+    assert len(list(Path(tmp_path / "cache").rglob("*"))) > len(files)
+
+    # Served from the cache: deleting the object doesn't matter
+    client.delete_object(Bucket="sessions", Key=f"prod/{files[0].path}")
+    assert backend.read_many(files) == first
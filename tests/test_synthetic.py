@@ -0,0 +1,68 @@
+"""Tests for the synthetic session store generator."""
+
+from pathlib import Path
+
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.synthetic import generate_store
+
+
+def read_tree(root):
+    """Map relative file paths to contents."""
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(Path(root).rglob("*"))
+        if path.is_file()
+    }
+
+
+def test_generate_store_is_deterministic(tmp_path):
+    """Test that the same arguments produce byte-identical stores."""
+    generate_store(str(tmp_path / "a"), sessions=3, messages_per_session=12, seed=7)
+    generate_store(str(tmp_path / "b"), sessions=3, messages_per_session=12, seed=7)
+    generate_store(str(tmp_path / "c"), sessions=3, messages_per_session=12, seed=8)
+
+    assert read_tree(tmp_path / "a") == read_tree(tmp_path / "b")
+    assert read_tree(tmp_path / "a") != read_tree(tmp_path / "c")
+
+
+def test_generated_store_is_readable(tmp_path):
+    """Test that SessionReader reads the generated layout."""
+    totals = generate_store(
+        str(tmp_path),
+        sessions=4,
+        messages_per_session=40,
+        agents_per_session=2,
+        error_rate=1.0,
+    )
+    assert totals == {"sessions": 4, "agents": 8, "messages": 160, "errors": 40}
+
+    reader = SessionReader(str(tmp_path))
+    sessions = reader.list_sessions()
+    assert len(sessions) == 4
+    assert all(s["message_count"] == 40 for s in sessions)
+
+    session = reader.get_session(sessions[0]["session_id"])
+    assert len(session["agents"]) == 2
+    assert {m["agent_id"] for m in session["messages"]} == {"agent_default", "agent_worker_1"}
+
+    statuses = [
+        content["toolResult"]["status"]
+        for m in session["messages"]
+        for content in m["message"]["content"]
+        if "toolResult" in content
+    ]
+    assert statuses and set(statuses) == {"error"}
+
+
+def test_search_messages(temp_sessions_dir):
+    """Test searching message text and tool results."""
+    reader = SessionReader(temp_sessions_dir)
+
+    matches = reader.search_messages("command FAILED")
+    assert len(matches) == 1
+    assert matches[0]["session_id"] == "test_1"
+    assert matches[0]["message_id"] == 4
+
+    assert len(reader.search_messages("message", session_id="test_2")) == 1
+    assert reader.search_messages("hello", session_id="test_2") == []
+    assert len(reader.search_messages("e", limit=2)) == 2
@@ -0,0 +1,68 @@
+"""Tests for shared timestamp and tool-call helpers."""
+
+from datetime import datetime, timezone
+
+from strands_viewer.timeline import (
+    latency_ms,
+    pair_tool_calls,
+    parse_timestamp,
+    result_text,
+    seconds_since,
+)
+
+
+def test_parse_timestamp():
+    """Test that ISO timestamps parse, with Z taken as UTC, and anything else is None."""
+    assert parse_timestamp("2024-01-01T00:00:00Z") == datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert parse_timestamp("2024-01-01T00:00:00") == datetime(2024, 1, 1)
+    assert parse_timestamp("bad timestamp") is None
+    assert parse_timestamp(None) is None
+
+
+def test_seconds_since_treats_naive_timestamps_as_utc():
+    """Test elapsed seconds for aware and naive timestamps."""
+    now = datetime(2024, 1, 1, 0, 1, tzinfo=timezone.utc)
+    assert seconds_since("2024-01-01T00:00:00Z", now) == 60.0
+    assert seconds_since("2024-01-01T00:00:00", now) == 60.0
+    assert seconds_since("", now) is None
+
+
+def test_latency_ms():
+    """Test latency between parsed timestamps, and None for missing or mixed ones."""
+    started = parse_timestamp("2024-01-01T00:00:00Z")
+    finished = parse_timestamp("2024-01-01T00:00:01.000250Z")
+    assert latency_ms(started, finished) == 1000.25
+    assert latency_ms(started, None) is None
+    assert latency_ms(parse_timestamp("2024-01-01T00:00:00"), finished) is None
+
+
+def test_result_text():
+    """Test that the first text block of a tool result is returned."""
+    assert result_text({"content": [{"json": {}}, {"text": "boom"}]}) == "boom"
+    assert result_text({"content": []}) == ""
+
+
+def test_pair_tool_calls_ignores_unknown_results():
+    """Test that calls pair with their first result and orphan results are ignored."""
+    messages = [
+        {
+            "message": {"content": [{"toolUse": {"toolUseId": "t1", "name": "shell"}}]},
+            "created_at": "2024-01-01T00:00:00Z",
+            "agent_id": "a",
+        },
+        {
+            "message": {
+                "content": [
+                    {"toolResult": {"toolUseId": "t1", "status": "success"}},
+                    {"toolResult": {"toolUseId": "t2", "status": "error"}},
+                ]
+            },
+            "created_at": "2024-01-01T00:00:02Z",
+        },
+    ]
+    calls = pair_tool_calls(messages)
+    assert list(calls) == ["t1"]
+    assert calls["t1"]["agent_id"] == "a"
+    assert calls["t1"]["result_message"] == 2
+    assert calls["t1"]["latency_ms"] == 2000.0
+    assert calls["t1"]["status"] == "success"
@@ -0,0 +1,138 @@
+"""Tests for background warm-up and the health/readiness probes."""
+
+import threading
+
+from fastapi.testclient import TestClient
+
+from strands_viewer.metrics import CACHE_REQUESTS
+from strands_viewer.server import SessionViewerApp
+from strands_viewer.session_reader import SessionReader
+from strands_viewer.shared_cache import CachingSessionReader, SharedCache
+from strands_viewer.synthetic import generate_store
+from strands_viewer.warmup import Warmup
+
+
+def test_warmup_builds_listing(tmp_path):
+    """Test that warm-up scans every session and reports progress."""
+    generate_store(str(tmp_path), sessions=5, messages_per_session=4)
+    reader = SessionReader(str(tmp_path))
+    warmup = Warmup(reader)
+    assert warmup.progress()["status"] == "pending"
+
+    warmup.start()
+    assert warmup.wait(timeout=10)
+
+    progress = warmup.progress()
+    assert progress["status"] == "done"
+    assert progress["done"] == progress["total"] == 5
+    assert warmup.partial_listing() == reader.list_sessions()
+
+
+def test_warmup_primes_cache(tmp_path):
+    """Test that warm-up pre-parses recent sessions into a caching reader."""
+    sessions_dir = tmp_path / "sessions"
+    generate_store(str(sessions_dir), sessions=3, messages_per_session=4)
+    reader = CachingSessionReader(str(sessions_dir), SharedCache(str(tmp_path / "cache.sqlite3")))
+
+    warmup = Warmup(reader, session_limit=2)
+    warmup.start()
+    warmup.wait(timeout=10)
+    assert warmup.progress()["phase"] == "sessions"
+    assert warmup.progress()["done"] == 2
+
+    local_hits = CACHE_REQUESTS.value(cache="session_local", result="hit")
+    reader.get_session(warmup.partial_listing()[0]["session_id"])
+    assert CACHE_REQUESTS.value(cache="session_local", result="hit") == local_hits + 1
+
+
+def test_partial_listing_and_readiness(tmp_path):
+    """Test that listing is served partially and /readyz fails until warm-up finishes."""
+    generate_store(str(tmp_path), sessions=3, messages_per_session=4)
+    viewer = SessionViewerApp(str(tmp_path))
+
+    # Hold the scan after the first session
+    release = threading.Event()
+    scanned = threading.Event()
+    original = viewer.reader.get_session_summary
+
+    def slow_summary(session_dir):
+        summary = original(session_dir)
+        scanned.set()
+        release.wait(timeout=10)
+        return summary
+
+    viewer.reader.get_session_summary = slow_summary
+
+    with TestClient(viewer.app) as client:
+        assert client.get("/healthz").json() == {"status": "ok"}
+        assert scanned.wait(timeout=10)
+
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["warmup"]["total"] == 3
+
+        data = client.get("/api/sessions").json()
+        assert data["partial"] is True
+        assert len(data["sessions"]) <= 1
+
+        release.set()
+        viewer.warmup.wait(timeout=10)
+
+        response = client.get("/readyz")
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+
+        data = client.get("/api/sessions").json()
+        assert "partial" not in data
+        assert len(data["sessions"]) == 3
+
+
+def test_readiness_without_warmup(temp_sessions_dir):
+    """Test that /readyz is ready at once when warm-up is disabled."""
+    client = TestClient(SessionViewerApp(temp_sessions_dir, warmup=False).app)
+    assert client.get("/readyz").json() == {"ready": True, "warmup": None}
+
+
+def test_finished_listing_is_served_until_a_session_changes(tmp_path):
+    """Test that the scanned listing is reused after warm-up and dropped on a change."""
+    generate_store(str(tmp_path), sessions=3, messages_per_session=4)
+    viewer = SessionViewerApp(str(tmp_path))
+
+    with TestClient(viewer.app) as client:
+        assert viewer.warmup.wait(timeout=10)
+        scans = []
+        original = viewer.reader.get_session_summary
+        viewer.reader.get_session_summary = lambda d: scans.append(d) or original(d)
+
+        assert len(client.get("/api/sessions").json()["sessions"]) == 3
+        page = client.get("/api/sessions?offset=1&limit=1").json()
+        assert page["total"] == 3 and len(page["sessions"]) == 1
+        assert scans == []
+
+        generate_store(str(tmp_path / "more"), sessions=1, messages_per_session=2, seed=1)
+        (tmp_path / "more" / "session_synthetic-1-000000").rename(
+            tmp_path / "session_synthetic-1-000000"
+        )
+        assert len(client.get("/api/sessions").json()["sessions"]) == 4
+        assert len(scans) == 4
+
+
+def test_warmup_primes_listing_of_every_root(tmp_path):
+    """Test that warm-up fills the listing cache of each caching root of a multi-root reader."""
+    from strands_viewer.multi_root import MultiRootReader
+
+    readers = {}
+    for name in ("a", "b"):
+        generate_store(str(tmp_path / name), sessions=2, messages_per_session=2)
+        cache = SharedCache(str(tmp_path / f"{name}.sqlite3"))
+        readers[name] = CachingSessionReader(str(tmp_path / name), cache)
+    reader = MultiRootReader(readers)
+
+    warmup = Warmup(reader, session_limit=1)
+    warmup.start()
+    assert warmup.wait(timeout=10)
+    assert warmup.progress()["phase"] == "sessions"
+
+    local_hits = CACHE_REQUESTS.value(cache="listing_local", result="hit")
+    assert reader.list_sessions() == warmup.listing()
+    assert CACHE_REQUESTS.value(cache="listing_local", result="hit") == local_hits + 2